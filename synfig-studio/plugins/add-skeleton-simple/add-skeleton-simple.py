@@ -9,74 +9,126 @@
 # (at your option) any later version.
 
 import os
+import re
 import sys
+import json
 import codecs
+import hashlib
+import argparse
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import plugin_io
 
-def check_substring(data, substring):
-	s = "\n".join(data);
-	if substring in s:
-			return True
-	return False
-
-def process(filename):
-	def merge_defs():
-		defs=False
-		for l in template_contents:
-			if defs:
-				if not "</defs>" in l:
-					inputfile_f.write(l)
-				else:
-					break
-			elif "<defs>" in l:
-				defs=True
-	
-	template_filename = os.path.join(os.path.dirname(sys.argv[0]), 'stickman.sif')
+STK_INDEX = re.compile(r'\(stk(\d+)')
+
+def highest_index(line, num):
+	# The new skeletons are numbered after the highest index already in use
+	if "(stk" in line:
+		for match in STK_INDEX.finditer(line):
+			num = max(num, int(match.group(1)))
+	return num
+
+def line_start(text, pos):
+	return text.rfind("\n", 0, pos) + 1
+
+def compile_template(text):
+	# Splits the template into the lines inside its root <defs> and the
+	# lines of its root canvas after them, both cut at every "(stk" so that
+	# a skeleton is instantiated by joining the pieces with its prefix
+	end = line_start(text, text.rfind("</canvas>"))
+	first_layer = text.find("<layer")
+	defs_start = text.find("<defs>")
+	if defs_start != -1 and (first_layer == -1 or defs_start < first_layer):
+		defs_end = text.find("</defs>", defs_start)
+		defs = text[text.index("\n", defs_start) + 1:line_start(text, defs_end)]
+		canvas = text[text.index("\n", defs_end) + 1:end]
+	else:
+		defs = ""
+		canvas = text[line_start(text, first_layer):end] if first_layer != -1 else ""
+	return {"defs": defs.split("(stk"), "canvas": canvas.split("(stk")}
+
+def get_cache_filename(template_filename):
+	cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+	key = hashlib.sha1(template_filename.encode("utf-8")).hexdigest()
+	return os.path.join(cache_dir, "synfig", "add-skeleton-simple", key + ".json")
+
+def load_template(template_filename):
+	# The compiled template is cached on disk, keyed by the modification
+	# time and size of the template
+	template_filename = os.path.abspath(template_filename)
+	stat = os.stat(template_filename)
+	key = [template_filename, stat.st_mtime_ns, stat.st_size]
+	cache_filename = get_cache_filename(template_filename)
+	try:
+		with open(cache_filename, 'r', encoding='utf-8') as cache_f:
+			cached = json.load(cache_f)
+		if cached.get("key") == key:
+			return cached["template"]
+	except (OSError, ValueError):
+		pass
 
 	template_f = codecs.open(template_filename, 'r', encoding='utf-8')
-	template_contents = template_f.readlines()
+	template = compile_template(template_f.read())
 	template_f.close()
-	
-	# Read the input file
-	inputfile_f = codecs.open(filename, 'r', encoding='utf-8')
-	inputfile_contents = inputfile_f.readlines()
-	inputfile_f.close()
-	
-	# Now write results to the same file
-	inputfile_f = open(filename, 'w', encoding='utf-8')
-
-	num=1
-	while check_substring(inputfile_contents, '(stk%s' % num):
-		num+=1
-
-	for i, line in enumerate(template_contents):
-		template_contents[i] = line.replace('(stk','(stk%s' % num)
-
-	defs_found=False
-	for line in inputfile_contents:
-		if "</defs>" in line:
-			defs_found=True
-			merge_defs()
-		if line == "</canvas>\n":
-			if not defs_found:
-				inputfile_f.write("<defs>\n")
-				merge_defs()
-				inputfile_f.write("</defs>\n")
-			canvas=False
-			for l in template_contents:
-				if canvas:
-					if not l == "</canvas>\n":
-						inputfile_f.write(l)
-					else:
-						break
-				elif "</defs>" in l:
-					canvas=True
-		inputfile_f.write(line)
-
-	inputfile_f.close()
+
+	# The cache is only an optimization, failing to write it is harmless
+	try:
+		os.makedirs(os.path.dirname(cache_filename), exist_ok=True)
+		tmp_filename = "%s.%d.tmp" % (cache_filename, os.getpid())
+		with open(tmp_filename, 'w', encoding='utf-8') as cache_f:
+			json.dump({"key": key, "template": template}, cache_f)
+		os.replace(tmp_filename, cache_filename)
+	except OSError:
+		pass
+	return template
+
+def process(filename, count=1, template_filename=None):
+	if template_filename is None:
+		template_filename = os.path.join(os.path.dirname(sys.argv[0]), 'stickman.sif')
+	template = load_template(template_filename)
+
+	# One pass over the file: the lines before the first place where the
+	# skeletons are inserted are copied as they are read, the rest is held
+	# until the end as the skeletons are numbered after the highest index
+	# used anywhere in the file
+	with plugin_io.rewrite(filename) as (src, dst):
+		num = 0
+		held = None
+		for line in src:
+			num = highest_index(line, num)
+			if held is None and ("</defs>" in line or line == "</canvas>\n"):
+				held = []
+			if held is None:
+				dst.write(line)
+			else:
+				held.append(line)
+
+		new_defs = ""
+		new_canvas = ""
+		for n in range(num + 1, num + 1 + count):
+			prefix = '(stk%s' % n
+			new_defs += prefix.join(template["defs"])
+			new_canvas += prefix.join(template["canvas"])
+
+		defs_found = False
+		for line in held or []:
+			if "</defs>" in line:
+				defs_found = True
+				line = new_defs + line
+			if line == "</canvas>\n":
+				if not defs_found:
+					line = "<defs>\n" + new_defs + "</defs>\n" + new_canvas + line
+				else:
+					line = new_canvas + line
+			dst.write(line)
+
+parser = argparse.ArgumentParser(description="Adds simple skeletons to a Synfig file")
+parser.add_argument("filename")
+parser.add_argument("count", nargs="?", type=int, default=1, help="number of skeletons to add")
+parser.add_argument("--template", help="Synfig file used instead of the stickman, its ids start with (stk")
 
 if len(sys.argv) < 2:
 	sys.exit()
 else:
-	process(sys.argv[1])
-	
+	args = parser.parse_args()
+	process(args.filename, max(1, args.count), args.template)
 
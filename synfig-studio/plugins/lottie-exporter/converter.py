@@ -0,0 +1,245 @@
+# pylint: disable=line-too-long
+"""
+converter.py
+Importable API of the exporter, converts a Synfig document held in memory
+into the lottie format without reading or writing any file on its own
+
+    import converter
+    lottie = converter.convert(sif_bytes)
+    data = converter.convert_to_bytes(sif_bytes, {"bake": ["all"]}, image_loader)
+
+The conversion state lives in the settings module, so only one conversion
+can run at a time in a process
+"""
+
+import os
+import io
+import json
+from lxml import etree
+from canvas import gen_canvas
+from layers.shape import gen_layer_shape
+from layers.solid import gen_layer_solid
+from layers.image import gen_layer_image
+from misc import Count
+from model import parse_canvas, parse_frames, clip_canvas, set_frame_rate
+from helpers.valueNode import resolve_value_nodes
+from optimizer import optimize, trim
+import settings
+
+# Value of the gamma option which keeps the colors linear
+LINEAR_GAMMA = "linear"
+
+# Options understood by the conversion, see lottie-exporter.py for their meaning
+DEFAULT_OPTIONS = {
+    "bake": [],
+    "bake_step": settings.DEFAULT_BAKE_STEP,
+    "optimize": True,
+    "precision": settings.DEFAULT_PRECISION,
+    "time_window": None,
+    "frame_rate": None,
+    "gamma": settings.GAMMA,
+}
+
+
+def init(options=None, image_loader=None, file_name=None):
+    """
+    Resets the conversion state and applies the options
+
+    Args:
+        options      (:obj: `dict`, optional)     : Overrides of DEFAULT_OPTIONS
+        image_loader (:obj: `callable`, optional) : Returns the bytes of an image given its
+                                                    file name as written in the .sif file
+        file_name    (:obj: `str`, optional)      : Name of the .sif file, images are
+                                                    resolved relative to it
+
+    Returns:
+        (None)
+    """
+    opts = dict(DEFAULT_OPTIONS)
+    if options is not None:
+        unknown = set(options.keys()) - set(DEFAULT_OPTIONS.keys())
+        if unknown:
+            raise ValueError("Unknown options: " + ", ".join(sorted(unknown)))
+        opts.update(options)
+    if opts["bake_step"] < 1:
+        raise ValueError("bake_step must be at least 1")
+    if opts["frame_rate"] is not None and opts["frame_rate"] <= 0:
+        raise ValueError("frame_rate must be positive")
+    gamma = get_gamma(opts["gamma"])
+
+    settings.init()
+    settings.bake_types = set(opts["bake"])
+    settings.bake_step = opts["bake_step"]
+    settings.optimize_output = opts["optimize"]
+    settings.precision = opts["precision"]
+    settings.image_loader = image_loader
+    settings.time_window = opts["time_window"]
+    settings.frame_rate = opts["frame_rate"]
+    settings.gamma = gamma
+    settings.file_name["fn"] = file_name
+    settings.file_name["fd"] = os.path.dirname(file_name) if file_name else ""
+
+
+def get_gamma(value):
+    """
+    Validates the gamma of the output colors
+
+    Args:
+        value (float | str) : Gamma, or "linear" to keep the colors linear
+
+    Returns:
+        (float) : Gamma, 1 for linear colors
+    """
+    if value == LINEAR_GAMMA:
+        return 1.0
+    gamma = float(value)
+    if gamma <= 0:
+        raise ValueError("gamma must be positive")
+    return gamma
+
+
+def get_window_frame(text, fps):
+    """
+    Converts a boundary of the time window into frames, the boundary is a
+    Synfig time string like "2s", "48f" or "1s 12f", a bare number is taken
+    as seconds like in Synfig
+
+    Args:
+        text (str | float) : Boundary of the time window
+        fps  (float)       : Frames per second of the canvas
+
+    Returns:
+        (float) : Boundary in frames
+    """
+    text = str(text).strip()
+    try:
+        return float(text) * fps
+    except ValueError:
+        return parse_frames(text, fps)
+
+
+def get_root(source):
+    """
+    Returns the root <canvas> element of a Synfig document
+
+    Args:
+        source (bytes | file object | lxml.etree._Element | lxml.etree._ElementTree) : .sif document
+
+    Returns:
+        (lxml.etree._Element) : Root canvas
+    """
+    if isinstance(source, etree._ElementTree):
+        return source.getroot()
+    elif isinstance(source, etree._Element):
+        return source
+    elif isinstance(source, (bytes, bytearray)):
+        return etree.parse(io.BytesIO(source)).getroot()
+    elif hasattr(source, "read"):
+        return etree.parse(source).getroot()
+    raise TypeError("Expected bytes, a file object or an lxml element, got " + type(source).__name__)
+
+
+def gen_lottie(root):
+    """
+    Converts the root canvas into the lottie dictionary, init() must have been
+    called before
+
+    Args:
+        root (lxml.etree._Element) : Root canvas of the Synfig document
+
+    Returns:
+        (dict) : Lottie format animation
+    """
+    canvas = parse_canvas(root)
+    if settings.time_window is not None:
+        begin, end = [get_window_frame(text, canvas.fps) for text in settings.time_window]
+        clip_canvas(canvas, begin, end)
+    if settings.frame_rate is not None and settings.frame_rate != canvas.fps:
+        set_frame_rate(canvas, settings.frame_rate)
+    if settings.time_window is not None:
+        settings.time_window = (canvas.begin_frame, canvas.end_frame)
+    resolve_value_nodes(canvas)
+    gen_canvas(settings.lottie_format, canvas)
+
+    num_layers = Count()
+    settings.lottie_format["layers"] = []
+    shape_layer = {"star", "circle", "rectangle", "simple_circle"}
+    solid_layer = {"SolidColor"}
+    image_layer = {"import"}
+    supported_layers = shape_layer.union(solid_layer)
+    supported_layers = supported_layers.union(image_layer)
+    for child in canvas.layers:
+        if not child.active:   # Only render the active layers
+            continue
+        if child.type not in supported_layers:  # Only supported layers
+            continue
+        settings.lottie_format["layers"].insert(0, {})
+        if child.type in shape_layer:           # Goto shape layer
+            gen_layer_shape(settings.lottie_format["layers"][0],
+                            child,
+                            num_layers.inc())
+        elif child.type in solid_layer:         # Goto solid layer
+            gen_layer_solid(settings.lottie_format["layers"][0],
+                            child,
+                            num_layers.inc())
+        elif child.type in image_layer:
+            gen_layer_image(settings.lottie_format["layers"][0],
+                            child,
+                            num_layers.inc())
+
+    if settings.optimize_output:
+        optimize(settings.lottie_format, settings.precision)
+    elif settings.time_window is not None:
+        trim(settings.lottie_format)
+    return settings.lottie_format
+
+
+def dumps(lottie):
+    """
+    Serializes the lottie dictionary, compactly if the output is optimized
+
+    Args:
+        lottie (dict) : Lottie format animation
+
+    Returns:
+        (str) : Lottie JSON
+    """
+    if settings.optimize_output:
+        return json.dumps(lottie, separators=(",", ":"))
+    return json.dumps(lottie)
+
+
+def convert(source, options=None, image_loader=None, file_name=None):
+    """
+    Converts a Synfig document into the lottie dictionary
+
+    Args:
+        source       (bytes | file object | lxml.etree._Element | lxml.etree._ElementTree) : .sif document
+        options      (:obj: `dict`, optional)     : Overrides of DEFAULT_OPTIONS
+        image_loader (:obj: `callable`, optional) : Returns the bytes of an image given its file name
+        file_name    (:obj: `str`, optional)      : Name of the .sif file, used for images
+                                                    when no image_loader is given
+
+    Returns:
+        (dict) : Lottie format animation
+    """
+    init(options, image_loader, file_name)
+    return gen_lottie(get_root(source))
+
+
+def convert_to_bytes(source, options=None, image_loader=None, file_name=None):
+    """
+    Converts a Synfig document into serialized lottie JSON
+
+    Args:
+        source       (bytes | file object | lxml.etree._Element | lxml.etree._ElementTree) : .sif document
+        options      (:obj: `dict`, optional)     : Overrides of DEFAULT_OPTIONS
+        image_loader (:obj: `callable`, optional) : Returns the bytes of an image given its file name
+        file_name    (:obj: `str`, optional)      : Name of the .sif file, used for images
+                                                    when no image_loader is given
+
+    Returns:
+        (bytes) : UTF-8 encoded lottie JSON
+    """
+    lottie = convert(source, options, image_loader, file_name)
+    return dumps(lottie).encode("utf-8")
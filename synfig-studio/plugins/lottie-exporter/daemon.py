@@ -0,0 +1,339 @@
+# pylint: disable=line-too-long
+"""
+daemon.py
+Keeps a pool of warm exporter processes behind a Unix socket, so that a
+conversion does not pay for the interpreter startup and the imports
+
+    python3 daemon.py serve --socket /tmp/lottie.sock --workers 4
+    python3 daemon.py convert --socket /tmp/lottie.sock FILE_NAME.sif
+    python3 daemon.py stats --socket /tmp/lottie.sock
+
+Every request and response is a single line of JSON:
+    {"cmd": "convert", "path": "a.sif", "output": "a.json", "options": {...}}
+    {"cmd": "convert", "sif": "<canvas ...>", "file_name": "a.sif", "options": {...}}
+    {"cmd": "stats"}
+    {"cmd": "shutdown"}
+A conversion answers with the output path if an output was asked for, and
+with the lottie JSON otherwise
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import socketserver
+import multiprocessing
+from collections import deque
+import settings
+
+DEFAULT_WORKERS = max(1, multiprocessing.cpu_count())
+LATENCY_SAMPLES = 1000      # Latencies kept for the percentiles
+PERCENTILES = (50, 90, 99)
+
+
+def init_worker():
+    """
+    Imports the whole exporter once per worker process
+
+    Args:
+        (None)
+
+    Returns:
+        (None)
+    """
+    import converter    # pylint: disable=unused-import,import-outside-toplevel
+
+
+def convert_job(job):
+    """
+    Runs a single conversion inside a worker process
+
+    Args:
+        job (dict) : Convert request as received on the socket
+
+    Returns:
+        (int, dict) : Process id of the worker and the response
+    """
+    import converter    # pylint: disable=import-outside-toplevel
+    try:
+        options = job.get("options")
+        if "path" in job.keys():
+            with open(job["path"], "rb") as fil:
+                data = converter.convert_to_bytes(fil, options, file_name=job["path"])
+        else:
+            data = converter.convert_to_bytes(job["sif"].encode("utf-8"), options,
+                                              file_name=job.get("file_name"))
+        if job.get("output"):
+            with open(job["output"], "wb") as fil:
+                fil.write(data)
+            response = {"ok": True, "output": job["output"]}
+        else:
+            response = {"ok": True, "lottie": data.decode("utf-8")}
+    except Exception as excep:    # pylint: disable=broad-except
+        response = {"ok": False, "error": "{0}: {1}".format(type(excep).__name__, excep)}
+    return os.getpid(), response
+
+
+class Stats:
+    """
+    Counters of the daemon, shared by all the connection threads
+    """
+
+    def __init__(self, workers):
+        """
+        Args:
+            workers (int) : Number of worker processes
+
+        Returns:
+            (None)
+        """
+        self.lock = threading.Lock()
+        self.workers = workers
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.per_worker = {}
+
+    def start(self):
+        """
+        Records a job being submitted to the pool
+
+        Args:
+            (None)
+
+        Returns:
+            (None)
+        """
+        with self.lock:
+            self.in_flight += 1
+
+    def finish(self, pid, ok, latency):
+        """
+        Records a finished job
+
+        Args:
+            pid     (int)   : Process id of the worker which ran the job
+            ok      (bool)  : Whether the conversion succeeded
+            latency (float) : Seconds between receiving the request and the result
+
+        Returns:
+            (None)
+        """
+        with self.lock:
+            self.in_flight -= 1
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self.latencies.append(latency)
+            self.per_worker[pid] = self.per_worker.get(pid, 0) + 1
+
+    def get(self):
+        """
+        Returns a snapshot of the counters
+
+        Args:
+            (None)
+
+        Returns:
+            (dict) : Queue depth, job counts, latency percentiles in ms and per worker counts
+        """
+        with self.lock:
+            latencies = sorted(self.latencies)
+            ret = {
+                "workers": self.workers,
+                "in_flight": self.in_flight,
+                "queue_depth": max(0, self.in_flight - self.workers),
+                "completed": self.completed,
+                "failed": self.failed,
+                "per_worker": {str(pid): count for pid, count in self.per_worker.items()},
+            }
+        ret["latency_ms"] = {}
+        for pct in PERCENTILES:
+            key = "p" + str(pct)
+            if latencies:
+                idx = min(len(latencies) - 1, int(len(latencies) * pct / 100.0))
+                ret["latency_ms"][key] = round(latencies[idx] * 1000, 3)
+            else:
+                ret["latency_ms"][key] = None
+        return ret
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Serves the requests of one client connection, one JSON line at a time
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line.decode("utf-8"))
+            except ValueError as excep:
+                self.respond({"ok": False, "error": "Bad request: " + str(excep)})
+                continue
+            self.respond(self.server.dispatch(request))
+            if request.get("cmd") == "shutdown":
+                return
+
+    def respond(self, response):
+        """
+        Writes a response line to the client
+
+        Args:
+            response (dict) : Response to be sent
+
+        Returns:
+            (None)
+        """
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class Daemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server handing the conversions over to the worker pool
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path, workers=DEFAULT_WORKERS):
+        """
+        Args:
+            socket_path (str)                 : Path of the Unix socket
+            workers     (:obj: `int`, optional) : Number of worker processes
+
+        Returns:
+            (None)
+        """
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.socket_path = socket_path
+        self.pool = multiprocessing.Pool(workers, initializer=init_worker)
+        self.stats = Stats(workers)
+        socketserver.UnixStreamServer.__init__(self, socket_path, RequestHandler)
+
+    def dispatch(self, request):
+        """
+        Executes a request
+
+        Args:
+            request (dict) : Request received on the socket
+
+        Returns:
+            (dict) : Response to be sent back
+        """
+        cmd = request.get("cmd")
+        if cmd == "convert":
+            if "path" not in request.keys() and "sif" not in request.keys():
+                return {"ok": False, "error": "convert needs either 'path' or 'sif'"}
+            begin = time.time()
+            self.stats.start()
+            pid, response = self.pool.apply(convert_job, (request,))
+            self.stats.finish(pid, response["ok"], time.time() - begin)
+            return response
+        elif cmd == "stats":
+            response = self.stats.get()
+            response["ok"] = True
+            return response
+        elif cmd == "shutdown":
+            threading.Thread(target=self.shutdown).start()
+            return {"ok": True}
+        return {"ok": False, "error": "Unknown command: " + str(cmd)}
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        self.pool.close()
+        self.pool.join()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def request(socket_path, message):
+    """
+    Sends a single request to a running daemon and waits for its response
+
+    Args:
+        socket_path (str)  : Path of the Unix socket
+        message     (dict) : Request to be sent
+
+    Returns:
+        (dict) : Response of the daemon
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as fil:
+            return json.loads(fil.readline().decode("utf-8"))
+
+
+def main(argv):
+    """
+    Command line entry point, either serves or talks to a daemon
+
+    Args:
+        argv (list) : Command line arguments without the program name
+
+    Returns:
+        (int) : Exit status
+    """
+    parser = argparse.ArgumentParser(description="Warm lottie conversion daemon")
+    sub = parser.add_subparsers(dest="cmd")
+    serve = sub.add_parser("serve", help="start the daemon")
+    serve.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    convert = sub.add_parser("convert", help="convert a file through the daemon")
+    convert.add_argument("file_name")
+    convert.add_argument("--output", help="defaults to FILE_NAME with the .json extension")
+    convert.add_argument("--bake", action="append", default=[], metavar="TYPE")
+    convert.add_argument("--bake-step", type=int, default=settings.DEFAULT_BAKE_STEP, metavar="N")
+    convert.add_argument("--no-optimize", action="store_true")
+    convert.add_argument("--precision", type=int, default=settings.DEFAULT_PRECISION, metavar="N")
+    convert.add_argument("--time-window", nargs=2, metavar=("BEGIN", "END"))
+    convert.add_argument("--frame-rate", type=float, metavar="FPS")
+    convert.add_argument("--gamma", default=settings.GAMMA, metavar="GAMMA")
+    sub.add_parser("stats", help="print the statistics of the daemon")
+    sub.add_parser("shutdown", help="stop the daemon")
+    for cmd_parser in sub.choices.values():
+        cmd_parser.add_argument("--socket", required=True, help="path of the Unix socket")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "serve":
+        server = Daemon(args.socket, args.workers)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+    elif args.cmd == "convert":
+        output = args.output
+        if output is None:
+            output = os.path.splitext(args.file_name)[0] + ".json"
+        response = request(args.socket, {
+            "cmd": "convert",
+            "path": os.path.abspath(args.file_name),
+            "output": os.path.abspath(output),
+            "options": {"bake": args.bake,
+                        "bake_step": args.bake_step,
+                        "optimize": not args.no_optimize,
+                        "precision": args.precision,
+                        "time_window": args.time_window,
+                        "frame_rate": args.frame_rate,
+                        "gamma": args.gamma}})
+    elif args.cmd in {"stats", "shutdown"}:
+        response = request(args.socket, {"cmd": args.cmd})
+    else:
+        parser.print_help()
+        return 1
+
+    print(json.dumps(response, indent=2))
+    return 0 if response.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -7,6 +7,7 @@ import settings
 from misc import Count, is_animated
 from properties.value import gen_properties_value
 from properties.valueKeyframed import gen_value_Keyframed
+from helpers.color import encode_color
 sys.path.append("../")
 
 
@@ -16,7 +17,7 @@ def gen_effects_color(lottie, layer, idx):
 
     Args:
         lottie (dict)                : Lottie format effects stored in this
-        layer  (lxml.etree._Element) : Synfig format layer
+        layer  (model.Layer)         : Synfig format layer
         idx    (int)                 : Index/Count of effect
 
     Returns:
@@ -29,25 +30,19 @@ def gen_effects_color(lottie, layer, idx):
     lottie["ix"] = idx                      # Index
     lottie["v"] = {}                        # Value of color
     for child in layer:
-        if child.tag == "param":
-            if child.attrib["name"] == "color":
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    gen_value_Keyframed(lottie["v"], child[0], index.inc())
+        if child.name == "color":
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                gen_value_Keyframed(lottie["v"], child.value, index.inc())
 
+            else:
+                if is_animate == 0:
+                    val = child.value
                 else:
-                    if is_animate == 0:
-                        val = child[0]
-                    else:
-                        val = child[0][0][0]
-                    red = float(val[0].text)
-                    green = float(val[1].text)
-                    blue = float(val[2].text)
-                    red, green, blue = red ** (1/settings.GAMMA), green **\
-                    (1/settings.GAMMA), blue ** (1/ settings.GAMMA)
-                    alpha = float(val[3].text)
-                    gen_properties_value(lottie["v"],
-                                         [red, green, blue, alpha],
-                                         index.inc(),
-                                         settings.DEFAULT_ANIMATED,
-                                         settings.NO_INFO)
+                    val = child.value[0].value
+                red, green, blue, alpha = encode_color(val).get_val()
+                gen_properties_value(lottie["v"],
+                                     [red, green, blue, alpha],
+                                     index.inc(),
+                                     settings.DEFAULT_ANIMATED,
+                                     settings.NO_INFO)
@@ -15,7 +15,7 @@ def gen_effects_hfeather(lottie, layer, idx):
 
     Args:
         lottie (dict)                : Lottie format effects stored in this
-        layer  (lxml.etree._Element) : Synfig format layer
+        layer  (model.Layer)         : Synfig format layer
         idx    (int)                 : Index/Count of effect
 
     Returns:
@@ -35,7 +35,7 @@ def gen_effects_vfeather(lottie, layer, idx):
 
     Args:
         lottie (dict)                : Lottie format effects stored in this
-        layer  (lxml.etree._Element) : Synfig format layer
+        layer  (model.Layer)         : Synfig format layer
         idx    (int)                 : Index/Count of effect
 
     Returns:
@@ -20,7 +20,7 @@ def gen_effects_fill(lottie, layer, idx):
 
     Args:
         lottie (dict)                : Lottie format layer
-        layer  (lxml.etree._Element) : Synfig format layer
+        layer  (model.Layer)         : Synfig format layer
         idx    (int)                 : Index/Count of effect
 
     Returns:
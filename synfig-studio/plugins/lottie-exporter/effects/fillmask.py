@@ -15,7 +15,7 @@ def gen_effects_fillmask(lottie, layer, idx):
 
     Args:
         lottie (dict)                : Lottie format effects stored in this
-        layer  (lxml.etree._Element) : Synfig format layer
+        layer  (model.Layer)         : Synfig format layer
         idx    (int)                 : Index/Count of effect
 
     Returns:
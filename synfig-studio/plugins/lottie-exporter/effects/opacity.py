@@ -16,7 +16,7 @@ def gen_effects_opacity(lottie, layer, idx):
 
     Args:
         lottie (dict)                : Lottie format effects stored in this
-        layer  (lxml.etree._Element) : Synfig format layer
+        layer  (model.Layer)         : Synfig format layer
         idx    (int)                 : Index/Count of effect
 
     Returns:
@@ -28,18 +28,18 @@ def gen_effects_opacity(lottie, layer, idx):
     lottie["ix"] = idx                          # Index
     lottie["v"] = {}                            # Value of opacity
     for child in layer:
-        if child.attrib["name"] == "amount":
-            is_animate = is_animated(child[0])
+        if child.name == "amount":
+            is_animate = is_animated(child.value)
             if is_animate == 2:
                 # Telling the function that this is for opacity
-                child[0].attrib['type'] = 'effects_opacity'
-                gen_value_Keyframed(lottie["v"], child[0], index.inc())
+                child.value.type = 'effects_opacity'
+                gen_value_Keyframed(lottie["v"], child.value, index.inc())
 
             else:
                 if is_animate == 0:
-                    val = float(child[0].attrib["value"])
+                    val = child.value
                 else:
-                    val = float(child[0][0][0].attrib["value"])
+                    val = child.value[0].value
                 gen_properties_value(lottie["v"],
                                      val,
                                      index.inc(),
@@ -0,0 +1,375 @@
+# pylint: disable=line-too-long
+"""
+estimate.py
+Predicts how long a Synfig document takes to be converted, how much memory
+the conversion needs and how big the lottie output is, from a quick scan of
+the document instead of the conversion itself, so that export farms can
+schedule the documents
+
+    python3 estimate.py estimate FILE_NAME.sif [FILE_NAME.sif ...]
+    python3 estimate.py calibrate scenes/*.sif --output model.json
+    python3 estimate.py estimate FILE_NAME.sif --model model.json --json
+
+The scan counts the layers of every supported type, the waypoints of every
+parameter, the frames which the exporter samples one by one (the baked
+animations and the convert value nodes) and the animated frames of the
+rectangles and imported images, whose corners are converted together. The
+predictions are linear in these counts, calibrate measures real conversions
+on the machine it runs on and fits the coefficients with non negative least
+squares
+"""
+
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from lxml import etree
+import settings
+import converter
+from model import parse_canvas, Animated, ValueNode
+from properties.bakedKeyframed import is_baked
+
+# Layers converted by the exporter, as in converter.gen_lottie()
+SUPPORTED_LAYERS = ("star", "circle", "rectangle", "simple_circle", "SolidColor", "import")
+# Parameters converted together into positions and sizes, over the union of
+# their animated spans
+PAIRS = {"rectangle": ("point1", "point2"), "import": ("tl", "br")}
+FEATURES = ["layers_" + _type for _type in SUPPORTED_LAYERS] + \
+    ["waypoints", "sampled_frames", "rectangle_frames", "rectangle_work", "import_frames"]
+TARGETS = ("seconds", "peak_bytes", "output_bytes")
+FIT_ITERATIONS = 2000       # Sweeps of the coordinate descent
+MIN_MEASURE = 1e-6          # Floor of the measures, which are divided by
+
+# Calibrated with Python 3.11 on generated scenes of every supported layer
+# and on the images of Synfig Studio, run calibrate to fit a model to another
+# machine or interpreter
+DEFAULT_MODEL = {
+    "features": FEATURES,
+    "seconds": {"intercept": 0.000422, "coefs": {
+        "layers_star": 0.0, "layers_circle": 0.00031, "layers_rectangle": 0.000431,
+        "layers_simple_circle": 0.0, "layers_SolidColor": 0.000114, "layers_import": 0.000188,
+        "waypoints": 5.14e-05, "sampled_frames": 4.27e-05, "rectangle_frames": 0.0,
+        "rectangle_work": 8.46e-06, "import_frames": 0.0}},
+    "peak_bytes": {"intercept": 5480.0, "coefs": {
+        "layers_star": 10400.0, "layers_circle": 4610.0, "layers_rectangle": 9860.0,
+        "layers_simple_circle": 0.0, "layers_SolidColor": 12000.0, "layers_import": 4160.0,
+        "waypoints": 3040.0, "sampled_frames": 2550.0, "rectangle_frames": 1480.0,
+        "rectangle_work": 53.6, "import_frames": 0.0}},
+    "output_bytes": {"intercept": 119.0, "coefs": {
+        "layers_star": 239.0, "layers_circle": 369.0, "layers_rectangle": 475.0,
+        "layers_simple_circle": 0.0, "layers_SolidColor": 772.0, "layers_import": 313.0,
+        "waypoints": 108.0, "sampled_frames": 107.0, "rectangle_frames": 41.3,
+        "rectangle_work": 4.41, "import_frames": 2.31}},
+}
+
+
+def count_value(value):
+    """
+    Counts the waypoints of a parameter and tells whether it is sampled at
+    every frame
+
+    Args:
+        value (model.Animated | model.ValueNode | any) : Value of a parameter
+
+    Returns:
+        (int, bool, float, float) : Waypoints, whether the value is sampled,
+                                    first and last animated times in seconds
+    """
+    if isinstance(value, Animated):
+        if len(value) < 2:
+            return len(value), False, None, None
+        return len(value), is_baked(value), value[0].time, value[-1].time
+    elif isinstance(value, ValueNode):
+        # Value nodes are sampled over the whole canvas, their waypoints are
+        # still what the evaluation goes through
+        count = 0
+        for link in value.links.values():
+            count += count_value(link)[0]
+        return count, True, None, None
+    return 0, False, None, None
+
+
+def get_sampled_frames(first, last, canvas):
+    """
+    Returns the number of frames sampled between two times, at the baking step
+
+    Args:
+        first  (float | None) : First time in seconds, None for the whole canvas
+        last   (float | None) : Last time in seconds, None for the whole canvas
+        canvas (model.Canvas) : Canvas of the document
+
+    Returns:
+        (int) : Number of sampled frames
+    """
+    begin, end = canvas.begin_frame, canvas.end_frame
+    if first is not None:
+        begin = max(begin, first * canvas.fps)
+        end = min(end, last * canvas.fps)
+    if end <= begin:
+        return 1
+    return int((end - begin) / settings.bake_step) + 2
+
+
+def scan(root):
+    """
+    Scans a document, converter.init() must have been called before
+
+    Args:
+        root (lxml.etree._Element) : Root canvas of the Synfig document
+
+    Returns:
+        (dict) : Canvas, layers per type, animated parameters and features
+    """
+    canvas = parse_canvas(root)
+    features = dict.fromkeys(FEATURES, 0)
+    params = []
+    for layer in canvas.layers:
+        if not layer.active or layer.type not in SUPPORTED_LAYERS:
+            continue
+        features["layers_" + layer.type] += 1
+        spans = {}
+        for param in layer:
+            count, sampled, first, last = count_value(param.value)
+            if count == 0 and not sampled:
+                continue
+            span = 0.0 if first is None else round((last - first) * canvas.fps, 3)
+            frames = get_sampled_frames(first, last, canvas) if sampled else 0
+            spans[param.name] = (first, last, count)
+            features["waypoints"] += count
+            features["sampled_frames"] += frames
+            params.append({"layer": layer.desc or layer.type, "layer_type": layer.type,
+                           "param": param.name, "waypoints": count,
+                           "span_frames": span, "sampled_frames": frames})
+        pair = [spans[name] for name in PAIRS.get(layer.type, ()) if spans.get(name, (None,))[0] is not None]
+        if pair:
+            first = min(span[0] for span in pair)
+            last = max(span[1] for span in pair)
+            frames = max(0.0, min(last * canvas.fps, canvas.end_frame) - max(first * canvas.fps, canvas.begin_frame))
+            features[layer.type + "_frames"] += round(frames, 3)
+            if layer.type == "rectangle":
+                # Every frame inserted between the waypoints of the corners
+                # goes through the waypoints of both of them
+                features["rectangle_work"] += round(frames * sum(span[2] for span in pair), 3)
+    return {
+        "frames": round(canvas.end_frame - canvas.begin_frame, 3),
+        "fps": canvas.fps,
+        "layers": {_type: features["layers_" + _type] for _type in SUPPORTED_LAYERS},
+        "params": params,
+        "features": features,
+    }
+
+
+def predict(model, features):
+    """
+    Applies the model to the features of a document
+
+    Args:
+        model    (dict) : Intercept and coefficients of every target
+        features (dict) : Features of the document, see scan()
+
+    Returns:
+        (dict) : Predicted seconds, peak bytes and output bytes
+    """
+    ret = {}
+    for target in TARGETS:
+        fit = model[target]
+        value = fit["intercept"] + sum(coef * features.get(name, 0) for name, coef in fit["coefs"].items())
+        ret[target] = round(value, 6) if target == "seconds" else int(round(value))
+    return ret
+
+
+def measure(file_name, options):
+    """
+    Converts a document and measures the conversion
+
+    Args:
+        file_name (str)  : Synfig file to be converted
+        options   (dict) : Options of the conversion
+
+    Returns:
+        (dict) : Seconds, peak bytes allocated by Python and output bytes
+    """
+    with open(file_name, "rb") as fil:
+        data = fil.read()
+    # Tracing the allocations slows the conversion down, it is timed separately
+    begin = time.perf_counter()
+    output = converter.convert_to_bytes(data, options, file_name=file_name)
+    seconds = time.perf_counter() - begin
+    tracemalloc.start()
+    try:
+        converter.convert_to_bytes(data, options, file_name=file_name)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": seconds, "peak_bytes": peak, "output_bytes": len(output)}
+
+
+def fit_nnls(rows, values):
+    """
+    Fits non negative coefficients to the rows by least squares of the
+    relative errors, as the costs of documents span several orders of
+    magnitude, using coordinate descent over normalized columns
+
+    Args:
+        rows   (list) : Lists of the feature values of every sample, the first
+                        being 1 for the intercept
+        values (list) : Measured value of every sample, all positive
+
+    Returns:
+        (list) : Coefficient of every feature
+    """
+    rows = [[x / value for x in row] for row, value in zip(rows, values)]
+    values = [1.0] * len(rows)
+    size = len(rows[0])
+    cols = [[row[j] for row in rows] for j in range(size)]
+    norms = [sum(x * x for x in col) ** 0.5 for col in cols]
+    cols = [[x / norm for x in col] if norm > 0 else col for col, norm in zip(cols, norms)]
+    coefs = [0.0] * size
+    residual = list(values)
+    for _ in range(FIT_ITERATIONS):
+        change = 0.0
+        for j in range(size):
+            if norms[j] == 0:
+                continue
+            col = cols[j]
+            new = max(0.0, coefs[j] + sum(c * r for c, r in zip(col, residual)))
+            delta = new - coefs[j]
+            if delta != 0.0:
+                residual = [r - delta * c for r, c in zip(residual, col)]
+                coefs[j] = new
+                change = max(change, abs(delta))
+        if change < 1e-12:
+            break
+    return [coef / norm if norm > 0 else 0.0 for coef, norm in zip(coefs, norms)]
+
+
+def calibrate(file_names, options):
+    """
+    Measures the conversion of documents and fits a model to them
+
+    Args:
+        file_names (list) : Synfig files to be converted
+        options    (dict) : Options of the conversion
+
+    Returns:
+        (dict) : Model, with the mean relative error of every target
+    """
+    rows = []
+    measures = []
+    for file_name in file_names:
+        converter.init(options, file_name=file_name)
+        features = scan(etree.parse(file_name).getroot())["features"]
+        rows.append([1.0] + [float(features[name]) for name in FEATURES])
+        measures.append(measure(file_name, options))
+
+    model = {"features": FEATURES, "samples": len(rows)}
+    for target in TARGETS:
+        values = [max(float(cur[target]), MIN_MEASURE) for cur in measures]
+        coefs = fit_nnls(rows, values)
+        model[target] = {"intercept": coefs[0], "coefs": dict(zip(FEATURES, coefs[1:]))}
+        errors = [abs(sum(c * x for c, x in zip(coefs, row)) - value) / value
+                  for row, value in zip(rows, values)]
+        model[target]["mean_error"] = round(sum(errors) / len(errors), 4)
+    return model
+
+
+def estimate(file_name, options, model):
+    """
+    Scans a document and predicts the cost of its conversion
+
+    Args:
+        file_name (str)  : Synfig file to be estimated
+        options   (dict) : Options of the conversion
+        model     (dict) : Model of the costs, see calibrate()
+
+    Returns:
+        (dict) : Scan results and predictions
+    """
+    converter.init(options, file_name=file_name)
+    begin = time.perf_counter()
+    ret = scan(etree.parse(file_name).getroot())
+    ret["scan_seconds"] = round(time.perf_counter() - begin, 6)
+    ret["file_name"] = file_name
+    ret["predicted"] = predict(model, ret["features"])
+    return ret
+
+
+def print_estimate(result):
+    """
+    Prints the scan results and predictions of a document
+
+    Args:
+        result (dict) : Result of estimate()
+
+    Returns:
+        (None)
+    """
+    print("{0}: {1} frames at {2} fps".format(result["file_name"], result["frames"], result["fps"]))
+    print("  layers: " + ", ".join("{0} {1}".format(count, _type)
+                                   for _type, count in result["layers"].items() if count))
+    row = "  {0:<24} {1:<14} {2:>5} {3:>10} {4:>8}"
+    if result["params"]:
+        print(row.format("layer", "param", "wpts", "span", "sampled"))
+        for cur in result["params"]:
+            print(row.format(cur["layer"][:24], cur["param"][:14], cur["waypoints"],
+                             cur["span_frames"], cur["sampled_frames"]))
+    pred = result["predicted"]
+    print("  predicted: {0:.3f} s, {1:.1f} MB peak, {2:.1f} kB output".format(
+        pred["seconds"], pred["peak_bytes"] / 1e6, pred["output_bytes"] / 1e3))
+
+
+def main(argv):
+    """
+    Command line entry point
+
+    Args:
+        argv (list) : Command line arguments without the program name
+
+    Returns:
+        (int) : Exit status
+    """
+    parser = argparse.ArgumentParser(description="Predicts the cost of converting Synfig files")
+    sub = parser.add_subparsers(dest="cmd")
+    est = sub.add_parser("estimate", help="scan files and predict their conversion cost")
+    est.add_argument("--model", help="model written by calibrate, a built-in one by default")
+    est.add_argument("--json", action="store_true", help="print the results as JSON")
+    cal = sub.add_parser("calibrate", help="convert files and fit a model to the measures")
+    cal.add_argument("--output", help="file the model is written to, printed by default")
+    for cmd_parser in sub.choices.values():
+        cmd_parser.add_argument("file_names", nargs="+", metavar="FILE_NAME")
+        cmd_parser.add_argument("--bake", action="append", default=[], metavar="TYPE")
+        cmd_parser.add_argument("--bake-step", type=int, default=settings.DEFAULT_BAKE_STEP, metavar="N")
+    args = parser.parse_args(argv)
+    if args.cmd is None:
+        parser.print_help()
+        return 1
+    options = {"bake": args.bake, "bake_step": args.bake_step}
+
+    if args.cmd == "calibrate":
+        model = calibrate(args.file_names, options)
+        text = json.dumps(model, indent=2)
+        if args.output:
+            with open(args.output, "w") as fil:
+                fil.write(text + "\n")
+        else:
+            print(text)
+        return 0
+
+    model = DEFAULT_MODEL
+    if args.model:
+        with open(args.model) as fil:
+            model = json.load(fil)
+    results = [estimate(file_name, options, model) for file_name in args.file_names]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print_estimate(result)
+        total = sum(result["predicted"]["seconds"] for result in results)
+        print("total predicted: {0:.3f} s for {1} files".format(total, len(results)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
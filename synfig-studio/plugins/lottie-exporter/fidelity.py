@@ -0,0 +1,404 @@
+# pylint: disable=line-too-long
+"""
+fidelity.py
+Measures how far the exported keyframes drift from Synfig's own
+interpolation and how long every animated parameter takes to be converted
+
+    python3 fidelity.py FILE_NAME.sif
+    python3 fidelity.py FILE_NAME.sif --precision 2 --json
+
+Every animated parameter of the canvas is converted on its own by the
+keyframe generators, post processed like the exporter does, and both the
+Synfig waypoints (see helpers/interpolation.py) and the lottie keyframes
+(the way lottie-web plays them) are evaluated at every frame. The errors are
+in lottie units, i.e. pixels, degrees, percents or color components
+"""
+
+import sys
+import json
+import math
+import time
+import argparse
+from lxml import etree
+import settings
+import converter
+from canvas import gen_canvas
+from model import parse_canvas, Animated, Waypoint
+from optimizer import strip_internal, quantize
+from properties.valueKeyframed import gen_value_Keyframed
+from properties.multiDimensionalKeyframed import gen_properties_multi_dimensional_keyframed
+from properties.bakedKeyframed import get_baked_value
+from helpers.interpolation import evaluate, set_components
+
+# Types whose lottie values can be compared to the Synfig ones
+CHECKED_TYPES = {"vector", "real", "angle", "color", "opacity", "circle_radius"}
+ARC_SAMPLES = 150           # Segments used to measure the length of spatial curves
+EASE_ITERATIONS = 30        # Bisection steps used to invert the easing curves
+# Easing tangents of a keyframe whose "o" or "i" the exporter left empty
+LINEAR_EASING = {"o": (0.0, 0.0), "i": (1.0, 1.0)}
+
+
+def get_check_type(layer, param):
+    """
+    Returns the type the layers give to the parameter before converting it
+
+    Args:
+        layer (model.Layer) : Layer holding the parameter
+        param (model.Param) : Animated parameter
+
+    Returns:
+        (str) : Type of the animation as converted by the exporter
+    """
+    if param.name == "amount":
+        return "opacity"
+    elif param.name == "radius" and layer.type in {"circle", "simple_circle"}:
+        return "circle_radius"
+    return param.value.type
+
+
+def convert_track(animated):
+    """
+    Converts an animation into lottie keyframes the way the layers do
+
+    Args:
+        animated (model.Animated) : Synfig format animation
+
+    Returns:
+        (dict, float) : Lottie property and the seconds spent converting it
+    """
+    track = {}
+    begin = time.perf_counter()
+    if animated.type == "vector":
+        gen_properties_multi_dimensional_keyframed(track, animated, 0)
+    else:
+        gen_value_Keyframed(track, animated, 0)
+    if settings.optimize_output:
+        strip_internal(track)
+        quantize(track, settings.precision)
+    return track, time.perf_counter() - begin
+
+
+def get_reference(animated, frames):
+    """
+    Evaluates the animation with Synfig's interpolation at every frame and
+    converts the values into lottie units
+
+    Args:
+        animated (model.Animated) : Synfig format animation
+        frames   (list)           : Sorted frames
+
+    Returns:
+        (list) : Lottie format value at every frame
+    """
+    fr = settings.lottie_format["fr"]
+    times = [frame / fr for frame in frames]
+    template = animated[0].value
+    samples = Animated(animated.type)
+    for tim, comps in zip(times, evaluate(animated, times)):
+        samples.append(Waypoint(tim, set_components(template, comps), "linear", "linear"))
+    return [get_baked_value(samples, i) for i in range(len(samples))]
+
+
+def ease(progress, out_x, out_y, in_x, in_y):
+    """
+    Evaluates the cubic bezier easing curve from (0, 0) to (1, 1)
+
+    Args:
+        progress (float) : Linear progress between the two keyframes
+        out_x    (float) : x of the out tangent of the first keyframe
+        out_y    (float) : y of the out tangent of the first keyframe
+        in_x     (float) : x of the in tangent of the second keyframe
+        in_y     (float) : y of the in tangent of the second keyframe
+
+    Returns:
+        (float) : Eased progress
+    """
+    def bezier(u, p1, p2):
+        return 3 * (1 - u) * (1 - u) * u * p1 + 3 * (1 - u) * u * u * p2 + u * u * u
+
+    low, high = 0.0, 1.0
+    for _ in range(EASE_ITERATIONS):
+        mid = (low + high) / 2
+        if bezier(mid, out_x, in_x) < progress:
+            low = mid
+        else:
+            high = mid
+    return bezier((low + high) / 2, out_y, in_y)
+
+
+def get_tangent(tangent, dim):
+    """
+    Returns a component of an easing tangent, which may be shared by all the
+    dimensions
+
+    Args:
+        tangent (float | list) : Lottie tangent component
+        dim     (int)          : Dimension of the value
+
+    Returns:
+        (float) : Tangent component for this dimension
+    """
+    if isinstance(tangent, list):
+        return tangent[dim] if dim < len(tangent) else tangent[0]
+    return tangent
+
+
+def get_easing(keyframe, key, dim):
+    """
+    Returns an easing tangent of a keyframe for a dimension, the tangents the
+    exporter leaves empty for the interpolations it does not map are linear
+
+    Args:
+        keyframe (dict) : Lottie keyframe
+        key      (str)  : "o" for the out tangent, "i" for the in tangent
+        dim      (int)  : Dimension of the value
+
+    Returns:
+        (float, float) : x and y of the tangent
+    """
+    tangent = keyframe.get(key)
+    if not tangent or "x" not in tangent.keys() or "y" not in tangent.keys():
+        return LINEAR_EASING[key]
+    return get_tangent(tangent["x"], dim), get_tangent(tangent["y"], dim)
+
+
+def get_spatial_point(start, end, out_tan, in_tan, progress):
+    """
+    Returns the point at a fraction of the length of a spatial bezier curve,
+    as lottie-web moves along position curves at constant speed
+
+    Args:
+        start    (list)  : Value of the first keyframe
+        end      (list)  : Value of the second keyframe
+        out_tan  (list)  : Spatial out tangent of the first keyframe
+        in_tan   (list)  : Spatial in tangent of the second keyframe
+        progress (float) : Eased progress
+
+    Returns:
+        (list) : Point on the curve
+    """
+    pts = [start,
+           [s + t for s, t in zip(start, out_tan)],
+           [e + t for e, t in zip(end, in_tan)],
+           end]
+
+    def point(u):
+        v = 1 - u
+        return [v*v*v*a + 3*v*v*u*b + 3*v*u*u*c + u*u*u*d for a, b, c, d in zip(*pts)]
+
+    samples = [point(i / ARC_SAMPLES) for i in range(ARC_SAMPLES + 1)]
+    lengths = [0.0]
+    for prev, cur in zip(samples, samples[1:]):
+        lengths.append(lengths[-1] + math.hypot(*[c - p for c, p in zip(cur, prev)]))
+    if lengths[-1] == 0:
+        return list(start)
+    target = progress * lengths[-1]
+    for i in range(1, len(lengths)):
+        if lengths[i] >= target:
+            seg = lengths[i] - lengths[i-1]
+            frac = (target - lengths[i-1]) / seg if seg else 0.0
+            return [p + (c - p) * frac for p, c in zip(samples[i-1], samples[i])]
+    return list(samples[-1])
+
+
+def get_lottie_value(keyframes, frame):
+    """
+    Evaluates lottie keyframes at a frame the way lottie-web does
+
+    Args:
+        keyframes (list)  : Lottie keyframes
+        frame     (float) : Frame at which the value is needed
+
+    Returns:
+        (list) : Value at the frame
+    """
+    if frame < keyframes[0]["t"]:
+        return keyframes[0]["s"]
+    for cur, nxt in zip(keyframes, keyframes[1:]):
+        if frame >= nxt["t"]:
+            continue
+        if cur.get("h") == 1 or "e" not in cur.keys():
+            return cur["s"]
+        progress = (frame - cur["t"]) / (nxt["t"] - cur["t"])
+        start, end = cur["s"], cur["e"]
+        if "to" in cur.keys() and "ti" in cur.keys():
+            eased = ease(progress, *get_easing(cur, "o", 0), *get_easing(cur, "i", 0))
+            return get_spatial_point(start, end, cur["to"], cur["ti"], eased)
+        ret = []
+        for dim, (s_val, e_val) in enumerate(zip(start, end)):
+            eased = ease(progress, *get_easing(cur, "o", dim), *get_easing(cur, "i", dim))
+            ret.append(s_val + (e_val - s_val) * eased)
+        return ret
+    last = keyframes[-1]
+    if "s" in last.keys():
+        return last["s"]
+    return keyframes[-2]["e"]
+
+
+def get_track_value(track, frame):
+    """
+    Evaluates a lottie property at a frame, animated or not
+
+    Args:
+        track (dict)  : Lottie property
+        frame (float) : Frame at which the value is needed
+
+    Returns:
+        (list) : Value at the frame
+    """
+    if track.get("a") == 1:
+        return get_lottie_value(track["k"], frame)
+    value = track["k"]
+    return value if isinstance(value, list) else [value]
+
+
+def check_animated(animated, frames):
+    """
+    Converts an animation and measures the error of the lottie keyframes
+
+    Args:
+        animated (model.Animated) : Synfig format animation, left untouched
+        frames   (list)           : Sorted frames at which the error is measured
+
+    Returns:
+        (dict) : Waypoints, keyframes, bytes, max and RMS error and conversion time in ms
+    """
+    reference = get_reference(animated, frames)
+    track, seconds = convert_track(animated.copy())
+    max_err, sq_sum, count = 0.0, 0.0, 0
+    for frame, expected in zip(frames, reference):
+        got = get_track_value(track, frame)
+        for exp, val in zip(expected, got):
+            err = abs(exp - val)
+            if animated.type == "angle":
+                # Turns are equivalent, the converted angles wrap around
+                err = err % 360
+                err = min(err, 360 - err)
+            max_err = max(max_err, err)
+            sq_sum += err * err
+            count += 1
+    return {"waypoints": len(animated),
+            "keyframes": len(track["k"]) if track.get("a") == 1 else 0,
+            "bytes": len(json.dumps(track, separators=(",", ":"))),
+            "max_error": max_err,
+            "rms_error": math.sqrt(sq_sum / count) if count else 0.0,
+            "ms": seconds * 1000}
+
+
+def check_canvas(root):
+    """
+    Measures every animated parameter of the supported types in the canvas,
+    converter.init() must have been called before
+
+    Args:
+        root (lxml.etree._Element) : Root canvas of the Synfig document
+
+    Returns:
+        (list) : One result dictionary per animated parameter
+    """
+    canvas = parse_canvas(root)
+    gen_canvas(settings.lottie_format, canvas)
+    first, last = int(math.ceil(canvas.begin_frame)), int(math.floor(canvas.end_frame))
+    frames = list(range(first, last + 1))
+    results = []
+    for layer in canvas.layers:
+        for param in layer:
+            if not isinstance(param.value, Animated) or len(param.value) < 2:
+                continue
+            animated = param.value.copy()
+            animated.type = get_check_type(layer, param)
+            if animated.type not in CHECKED_TYPES:
+                continue
+            result = {"layer": layer.desc or layer.type, "param": param.name, "type": animated.type}
+            result.update(check_animated(animated, frames))
+            results.append(result)
+    return results
+
+
+def summarize(results):
+    """
+    Aggregates the results per type
+
+    Args:
+        results (list) : Results of check_canvas()
+
+    Returns:
+        (dict) : Count, max error, RMS error and total time in ms per type
+    """
+    summary = {}
+    for res in results:
+        cur = summary.setdefault(res["type"], {"count": 0, "max_error": 0.0, "sq_sum": 0.0, "ms": 0.0})
+        cur["count"] += 1
+        cur["max_error"] = max(cur["max_error"], res["max_error"])
+        cur["sq_sum"] += res["rms_error"] ** 2
+        cur["ms"] += res["ms"]
+    for cur in summary.values():
+        cur["rms_error"] = math.sqrt(cur.pop("sq_sum") / cur["count"])
+    return summary
+
+
+def print_report(results, summary):
+    """
+    Prints the results as a table
+
+    Args:
+        results (list) : Results of check_canvas()
+        summary (dict) : Results of summarize()
+
+    Returns:
+        (None)
+    """
+    row = "{0:<24} {1:<14} {2:<14} {3:>5} {4:>5} {5:>7} {6:>10} {7:>10} {8:>9}"
+    print(row.format("layer", "param", "type", "wpts", "kfs", "bytes", "max err", "rms err", "ms"))
+    for res in results:
+        print(row.format(res["layer"][:24], res["param"][:14], res["type"], res["waypoints"],
+                         res["keyframes"], res["bytes"], "{0:.4f}".format(res["max_error"]),
+                         "{0:.4f}".format(res["rms_error"]), "{0:.3f}".format(res["ms"])))
+    print()
+    row = "{0:<14} {1:>6} {2:>10} {3:>10} {4:>9}"
+    print(row.format("type", "count", "max err", "rms err", "ms"))
+    for _type, cur in sorted(summary.items()):
+        print(row.format(_type, cur["count"], "{0:.4f}".format(cur["max_error"]),
+                         "{0:.4f}".format(cur["rms_error"]), "{0:.3f}".format(cur["ms"])))
+
+
+def main(argv):
+    """
+    Command line entry point
+
+    Args:
+        argv (list) : Command line arguments without the program name
+
+    Returns:
+        (int) : Exit status
+    """
+    parser = argparse.ArgumentParser(description="Compares the exported keyframes with Synfig's interpolation")
+    parser.add_argument("file_name", help="Synfig file to be checked")
+    parser.add_argument("--bake", action="append", default=[], metavar="TYPE")
+    parser.add_argument("--bake-step", type=int, default=settings.DEFAULT_BAKE_STEP, metavar="N")
+    parser.add_argument("--no-optimize", action="store_true",
+                        help="measure the keyframes before they are rounded")
+    parser.add_argument("--precision", type=int, default=settings.DEFAULT_PRECISION, metavar="N")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    converter.init({"bake": args.bake,
+                    "bake_step": args.bake_step,
+                    "optimize": not args.no_optimize,
+                    "precision": args.precision},
+                   file_name=args.file_name)
+    begin = time.perf_counter()
+    results = check_canvas(etree.parse(args.file_name).getroot())
+    total = (time.perf_counter() - begin) * 1000
+    summary = summarize(results)
+
+    if args.json:
+        print(json.dumps({"properties": results, "types": summary, "total_ms": total}, indent=2))
+    else:
+        print_report(results, summary)
+        print("\ntotal {0:.3f} ms".format(total))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
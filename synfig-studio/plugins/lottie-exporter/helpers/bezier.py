@@ -56,3 +56,31 @@ def get_bezier_val(P0, P1, P2, P3, t):
     """
     bezier = (((1 - t)**3) * P0) + (3*((1 - t)**2) * t*P1) + (3*(1 - t)*(t**2)*P2) + ((t**3)*P3)
     return bezier
+
+
+def split_bezier(P0, P1, P2, P3, t0, t1):
+    """
+    Returns the control points of the part of a bezier curve between the times
+    t0 and t1, using de Casteljau's algorithm
+
+    Args:
+        P0 (float) : First control point
+        P1 (float) : Second control point
+        P2 (float) : Third control point
+        P3 (float) : Fourth control point
+        t0 (float) : Time at which the part starts, 0 <= t0 < t1
+        t1 (float) : Time at which the part ends, t0 < t1 <= 1
+
+    Returns:
+        (float, float, float, float) : Control points of the part
+    """
+    # Keep the part before t1
+    P01, P12, P23 = P0 + (P1 - P0)*t1, P1 + (P2 - P1)*t1, P2 + (P3 - P2)*t1
+    P012, P123 = P01 + (P12 - P01)*t1, P12 + (P23 - P12)*t1
+    P0, P1, P2, P3 = P0, P01, P012, P012 + (P123 - P012)*t1
+
+    # Keep the part of it after t0
+    t = t0 / t1
+    P01, P12, P23 = P0 + (P1 - P0)*t, P1 + (P2 - P1)*t, P2 + (P3 - P2)*t
+    P012, P123 = P01 + (P12 - P01)*t, P12 + (P23 - P12)*t
+    return P012 + (P123 - P012)*t, P123, P23, P3
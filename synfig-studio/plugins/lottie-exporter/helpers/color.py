@@ -0,0 +1,59 @@
+"""
+Module contains the functions converting the Synfig colors, which are stored
+in linear light, into the gamma encoded colors used by lottie
+Every distinct channel value is encoded only once per conversion, the
+results are kept in settings.gamma_table
+"""
+
+import sys
+import settings
+import misc
+sys.path.append("..")
+
+
+def gamma_encode(channel):
+    """
+    Applies the output gamma to a single color channel
+
+    Args:
+        channel (float) : Linear channel value
+
+    Returns:
+        (float) : Gamma encoded channel value
+    """
+    if settings.gamma == 1:
+        return channel
+    table = settings.gamma_table
+    if channel not in table.keys():
+        table[channel] = channel ** (1/settings.gamma)
+    return table[channel]
+
+
+def encode_color(color):
+    """
+    Applies the output gamma to the red, green and blue channels of a color,
+    alpha is kept as it is
+
+    Args:
+        color (misc.Color) : Synfig format color
+
+    Returns:
+        (misc.Color) : Gamma encoded color
+    """
+    return misc.Color(gamma_encode(color.red),
+                      gamma_encode(color.green),
+                      gamma_encode(color.blue),
+                      color.alpha)
+
+
+def encode_color_track(animated):
+    """
+    Converts all the waypoints of a color animation in one pass
+
+    Args:
+        animated (model.Animated) : Synfig format color animation
+
+    Returns:
+        (list) : Lottie format [red, green, blue, alpha] of every waypoint
+    """
+    return [encode_color(waypoint.value).get_val() for waypoint in animated]
@@ -0,0 +1,329 @@
+# pylint: disable=line-too-long
+"""
+Module contains the functions required to evaluate an animated parameter the
+way Synfig does it, i.e. using the hermite curves built from the waypoint
+interpolations (see synfig-core/src/synfig/valuenodes/valuenode_animatedinterface.cpp)
+All the values are evaluated in Synfig units
+"""
+
+import sys
+import misc
+sys.path.append("..")
+
+TIME_ADJUST = 0.5
+
+# Types which are only ever interpolated as constant
+CONSTANT_TYPES = {"points", "bool", "string", "integer"}
+
+
+class Segment:
+    """
+    Stores the hermite curve between two neighbouring waypoints as a cubic
+    bezier curve, for every component of the value
+    """
+    __slots__ = ("t0", "t1", "p1", "p2", "tan1", "tan2", "constant")
+
+    def __init__(self, t0, t1, p1, p2, constant=False):
+        """
+        Args:
+            t0       (float) : Time of the first waypoint in seconds
+            t1       (float) : Time of the second waypoint in seconds
+            p1       (list)  : Components of the first waypoint
+            p2       (list)  : Components of the second waypoint
+            constant (:obj: `bool`, optional) : True for a constant interval
+
+        Returns:
+            (None)
+        """
+        self.t0 = t0
+        self.t1 = t1
+        self.p1 = p1
+        self.p2 = p2
+        self.tan1 = [0.0] * len(p1)
+        self.tan2 = [0.0] * len(p1)
+        self.constant = constant
+
+    def get_dt(self):
+        """
+        Returns the time span of the segment
+
+        Args:
+            (None)
+
+        Returns:
+            (float) : Time span in seconds
+        """
+        return self.t1 - self.t0
+
+    def get_control_points(self):
+        """
+        Returns the four bezier control points of every component
+
+        Args:
+            (None)
+
+        Returns:
+            (list) : List of [P0, P1, P2, P3] for every component
+        """
+        ret = []
+        for p1, p2, tan1, tan2 in zip(self.p1, self.p2, self.tan1, self.tan2):
+            ret.append([p1, p1 + tan1 / 3.0, p2 - tan2 / 3.0, p2])
+        return ret
+
+    def evaluate(self, times):
+        """
+        Evaluates the segment at all the given times in one go
+
+        Args:
+            times (list) : Times in seconds, all of them inside the segment
+
+        Returns:
+            (list) : Components of the value at every time
+        """
+        if self.constant:
+            return [list(self.p1) for _ in times]
+        dt = self.get_dt()
+        # Power basis coefficients of the bezier for every component
+        coeffs = []
+        for P0, P1, P2, P3 in self.get_control_points():
+            coeffs.append((P0,
+                           3 * (P1 - P0),
+                           3 * (P2 - 2 * P1 + P0),
+                           P3 - 3 * P2 + 3 * P1 - P0))
+        ret = []
+        for time in times:
+            s = (time - self.t0) / dt if dt else 1.0
+            ret.append([c0 + s * (c1 + s * (c2 + s * c3)) for c0, c1, c2, c3 in coeffs])
+        return ret
+
+
+def get_components(value):
+    """
+    Splits a Synfig value into a list of floats
+
+    Args:
+        value (float | int | bool | misc.Vector | misc.Color) : Synfig value
+
+    Returns:
+        (list) : Components of the value
+    """
+    if isinstance(value, misc.Vector):
+        return [value.val1, value.val2]
+    elif isinstance(value, misc.Color):
+        return [value.red, value.green, value.blue, value.alpha]
+    return [float(value)]
+
+
+def set_components(template, comps):
+    """
+    Builds a Synfig value of the same type as template from a list of floats
+
+    Args:
+        template (float | int | bool | misc.Vector | misc.Color) : Value giving the type
+        comps    (list)                                          : Components of the value
+
+    Returns:
+        (float | int | bool | misc.Vector | misc.Color) : Synfig value
+    """
+    if isinstance(template, misc.Vector):
+        return misc.Vector(comps[0], comps[1])
+    elif isinstance(template, misc.Color):
+        return misc.Color(comps[0], comps[1], comps[2], comps[3])
+    elif isinstance(template, bool):
+        return comps[0] >= 0.5
+    elif isinstance(template, int):
+        return int(round(comps[0]))
+    return comps[0]
+
+
+def tcb_tangent(p_prev, p_cur, p_next, waypoint, side):
+    """
+    Tension, continuity and bias tangent at waypoint
+
+    Args:
+        p_prev   (list)           : Components of the previous waypoint
+        p_cur    (list)           : Components of this waypoint
+        p_next   (list)           : Components of the next waypoint
+        waypoint (model.Waypoint) : Waypoint holding the TCB values
+        side     (str)            : "out" for the tangent leaving the waypoint, "in" otherwise
+
+    Returns:
+        (list) : Tangent for every component
+    """
+    tens, cont, bias = waypoint.tension, waypoint.continuity, waypoint.bias
+    if side == "out":
+        f_prev = (1 - tens) * (1 + cont) * (1 + bias) / 2.0
+        f_next = (1 - tens) * (1 - cont) * (1 - bias) / 2.0
+    else:
+        f_prev = (1 - tens) * (1 - cont) * (1 + bias) / 2.0
+        f_next = (1 - tens) * (1 + cont) * (1 - bias) / 2.0
+    return [(c - p) * f_prev + (n - c) * f_next for p, c, n in zip(p_prev, p_cur, p_next)]
+
+
+def clamped_tangent(p1, p2, p3, t1, t2, t3):
+    """
+    Clamped tangent of a single component, as in Synfig
+
+    Args:
+        p1 (float) : Previous value
+        p2 (float) : Current value
+        p3 (float) : Next value
+        t1 (float) : Previous time
+        t2 (float) : Current time
+        t3 (float) : Next time
+
+    Returns:
+        (float) : Clamped tangent
+    """
+    bias = 0.0
+    tangent = 0.0
+    pm = p1 + (p3 - p1)*(t2 - t1)/(t3 - t1)
+    if p3 > p1:
+        if p3 > p2 > p1:
+            if p2 > pm:
+                bias = (pm - p2) / (p3 - pm)
+            elif p2 < pm:
+                bias = (pm - p2) / (pm - p1)
+            tangent = (p2 - p1) * (1.0 + bias) / 2.0 + (p3 - p2) * (1.0 - bias) / 2.0
+    elif p1 > p3:
+        if p1 > p2 > p3:
+            if p2 > pm:
+                bias = (pm - p2) / (pm - p1)
+            elif p2 < pm:
+                bias = (pm - p2) / (p3 - pm)
+            tangent = (p2 - p1) * (1.0 + bias) / 2.0 + (p3 - p2) * (1.0 - bias) / 2.0
+    return tangent
+
+
+def calc_segments(animated):
+    """
+    Builds the hermite segments of an animation following Synfig's rules for
+    linear, ease, constant, TCB and clamped interpolations along with the
+    time adjustment of the tangents
+
+    Args:
+        animated (model.Animated) : Synfig format animation
+
+    Returns:
+        (list) : List of helpers.interpolation.Segment
+    """
+    segments = []
+    is_angle = animated.type == "angle"
+    always_constant = animated.type in CONSTANT_TYPES
+    num = len(animated)
+    comps = [get_components(waypoint.value) for waypoint in animated]
+    for i in range(num - 1):
+        cur, nxt = animated[i], animated[i+1]
+        after_next = animated[i+2] if i + 2 < num else None
+        cur_after, cur_before = cur.after, cur.before
+        next_before = nxt.before
+        if is_angle:
+            cur_after = "linear" if cur_after == "auto" else cur_after
+            cur_before = "linear" if cur_before == "auto" else cur_before
+            next_before = "linear" if next_before == "auto" else next_before
+
+        p1, p2 = comps[i], comps[i+1]
+        if always_constant or "constant" in {cur_after, next_before}:
+            segments.append(Segment(cur.time, nxt.time, p1, list(p1), True))
+            continue
+
+        seg = Segment(cur.time, nxt.time, p1, p2)
+        prev = segments[-1] if segments else None
+        diff = [b - a for a, b in zip(p1, p2)]
+
+        # ANY/TCB ---- ANY/ANY and iter is middle waypoint
+        if cur_after == "auto" and prev is not None and not is_angle:
+            if cur.before != "auto":
+                seg.tan1 = list(prev.tan2)
+            else:
+                seg.tan1 = tcb_tangent(prev.p1, p1, p2, cur, "out")
+        elif cur_after in {"linear", "halt"} or (cur_after in {"auto", "clamped"} and prev is None):
+            seg.tan1 = list(diff)
+
+        # ANY/CLAMPED ---- ANY/ANY and iter is middle waypoint
+        if cur_after == "clamped" and prev is not None and not is_angle:
+            seg.tan1 = [clamped_tangent(a, b, c, prev.t0, cur.time, nxt.time)
+                        for a, b, c in zip(prev.p1, p1, p2)]
+
+        # TCB/!TCB, the previous in tangent should be same as this out tangent
+        if cur_before == "auto" and cur.after != "auto" and prev is not None:
+            prev.tan2 = list(seg.tan1)
+
+        # ANY/ANY ---- TCB/ANY ---- ANY/ANY
+        if next_before == "auto" and after_next is not None and not is_angle:
+            seg.tan2 = tcb_tangent(p1, p2, comps[i+2], nxt, "in")
+        elif next_before in {"linear", "halt"} or (next_before in {"auto", "clamped"} and after_next is None):
+            seg.tan2 = list(diff)
+
+        # ANY/ANY ---- CLAMPED/ANY ---- ANY/ANY
+        if next_before == "clamped" and after_next is not None and not is_angle:
+            seg.tan2 = [clamped_tangent(a, b, c, cur.time, nxt.time, after_next.time)
+                        for a, b, c in zip(p1, p2, comps[i+2])]
+
+        # Adjust for time
+        dt = seg.get_dt()
+        if cur_after == "halt":
+            seg.tan1 = [0.0 for _ in seg.tan1]
+        elif cur_after != "linear" and prev is not None:
+            factor = (dt * (TIME_ADJUST + 1)) / (dt * TIME_ADJUST + prev.get_dt())
+            seg.tan1 = [tan * factor for tan in seg.tan1]
+        if next_before == "halt":
+            seg.tan2 = [0.0 for _ in seg.tan2]
+        elif next_before != "linear" and after_next is not None:
+            factor = (dt * (TIME_ADJUST + 1)) / (dt * TIME_ADJUST + after_next.time - nxt.time)
+            seg.tan2 = [tan * factor for tan in seg.tan2]
+        segments.append(seg)
+    return segments
+
+
+def evaluate(animated, times, segments=None):
+    """
+    Evaluates the animation at all the given times
+    The times must be sorted, all the segments are walked only once
+
+    Args:
+        animated (model.Animated)          : Synfig format animation
+        times    (list)                    : Sorted times in seconds
+        segments (:obj: `list`, optional)  : Precomputed segments of the animation
+
+    Returns:
+        (list) : Components of the value at every time
+    """
+    if segments is None:
+        segments = calc_segments(animated)
+    first = get_components(animated[0].value)
+    last = get_components(animated[-1].value)
+    ret = []
+    i, idx, num = 0, 0, len(times)
+    while i < num and times[i] <= animated[0].time:
+        ret.append(list(first))
+        i += 1
+    while i < num and idx < len(segments):
+        seg = segments[idx]
+        j = i
+        while j < num and times[j] < seg.t1:
+            j += 1
+        if j > i:
+            ret.extend(seg.evaluate(times[i:j]))
+        i = j
+        idx += 1
+    while i < num:
+        ret.append(list(last))
+        i += 1
+    return ret
+
+
+def get_value_at_time(animated, time, segments=None):
+    """
+    Returns the value of the animation at the given time
+
+    Args:
+        animated (model.Animated)         : Synfig format animation
+        time     (float)                  : Time in seconds
+        segments (:obj: `list`, optional) : Precomputed segments of the animation
+
+    Returns:
+        (float | int | bool | misc.Vector | misc.Color) : Synfig value at time
+    """
+    comps = evaluate(animated, [time], segments)[0]
+    return set_components(animated[0].value, comps)
@@ -18,10 +18,10 @@ def gen_helpers_transform(lottie, layer, pos=[0, 0], anchor=[0, 0, 0], scale=[10
 
     Args:
         lottie (dict)                : Lottie format layer
-        layer  (lxml.etree._Element) : Synfig format layer
-        pos    (:obj: `list | lxml.etree._Element`, optional) : position of layer
+        layer  (model.Layer)         : Synfig format layer
+        pos    (:obj: `list | model.Animated`, optional) : position of layer
         anchor (:obj: `list`) : anchor point of layer
-        scale (:obj: `list | lxml.etree._Element`, optional) : scale of layer
+        scale (:obj: `list | model.Animated | dict`, optional) : scale of layer
 
     Returns:
         (None)
@@ -73,6 +73,10 @@ def gen_helpers_transform(lottie, layer, pos=[0, 0], anchor=[0, 0, 0], scale=[10
                              index.inc(),
                              settings.DEFAULT_ANIMATED,
                              settings.NO_INFO)
+    # This means scale is already in lottie format
+    elif isinstance(scale, dict):
+        lottie["s"] = scale
+        lottie["s"]["ix"] = index.inc()
     # This means scale parameter is animated
     else:
         gen_value_Keyframed(lottie["s"], scale, index.inc())
@@ -0,0 +1,173 @@
+# pylint: disable=line-too-long
+"""
+Module contains the functions required to evaluate the convert value nodes
+like <add>, <scale>, <linear>, <composite> and <radial_composite>
+A node is evaluated over a whole list of times at once, its links being
+evaluated over the same list, and the results are cached per node and time
+so that subtrees shared through exported values are computed only once
+"""
+
+import sys
+import math
+import settings
+import misc
+from model import Animated, ValueNode, Waypoint, CONVERT_LINKS
+from helpers.interpolation import evaluate, get_components
+sys.path.append("..")
+
+
+def make_value(_type, comps):
+    """
+    Builds a Synfig value of the given type from its components
+
+    Args:
+        _type (str)  : Type of the value
+        comps (list) : Components of the value
+
+    Returns:
+        (float | misc.Vector | misc.Color) : Synfig value
+    """
+    if _type == "vector":
+        return misc.Vector(comps[0], comps[1])
+    elif _type == "color":
+        return misc.Color(comps[0], comps[1], comps[2], comps[3])
+    return comps[0]
+
+
+def calc_node(node, times, cache):
+    """
+    Computes a convert value node from the values of its links
+
+    Args:
+        node  (model.ValueNode) : Synfig format convert value node
+        times (list)            : Sorted times in seconds
+        cache (dict)            : Already evaluated values, see evaluate_value()
+
+    Returns:
+        (list) : Components of the value at every time
+    """
+    links = {name: evaluate_value(link, times, cache) for name, link in node.links.items()}
+    kind = node.kind
+    if kind == "add":
+        return [[(l + r) * s[0] for l, r in zip(lhs, rhs)]
+                for lhs, rhs, s in zip(links["lhs"], links["rhs"], links["scalar"])]
+    elif kind == "subtract":
+        return [[(l - r) * s[0] for l, r in zip(lhs, rhs)]
+                for lhs, rhs, s in zip(links["lhs"], links["rhs"], links["scalar"])]
+    elif kind == "scale":
+        return [[c * s[0] for c in link]
+                for link, s in zip(links["link"], links["scalar"])]
+    elif kind == "linear":
+        return [[o + m * time for m, o in zip(slope, offset)]
+                for time, slope, offset in zip(times, links["slope"], links["offset"])]
+    elif kind == "radial_composite":
+        ret = []
+        for radius, theta in zip(links["radius"], links["theta"]):
+            angle = math.radians(theta[0])
+            ret.append([radius[0] * math.cos(angle), radius[0] * math.sin(angle)])
+        return ret
+    # composite, the links are the components in order
+    names = CONVERT_LINKS[kind][node.type]
+    return [[links[name][i][0] for name in names] for i in range(len(times))]
+
+
+def evaluate_value(value, times, cache):
+    """
+    Evaluates a static value, an animation or a convert value node at all the
+    given times, only the times not already in the cache are computed
+
+    Args:
+        value (float | int | misc.Vector | misc.Color | model.Animated | model.ValueNode) : Synfig value
+        times (list) : Sorted times in seconds
+        cache (dict) : Maps id() of the nodes to the node and its values by time
+
+    Returns:
+        (list) : Components of the value at every time
+    """
+    if not isinstance(value, (Animated, ValueNode)):
+        comps = get_components(value)
+        return [comps] * len(times)
+
+    if id(value) not in cache.keys():
+        # The node is kept alongside so that its id can not be reused
+        cache[id(value)] = (value, {})
+    known = cache[id(value)][1]
+    missing = [time for time in times if time not in known.keys()]
+    if missing:
+        if isinstance(value, Animated):
+            computed = evaluate(value, missing)
+        else:
+            computed = calc_node(value, missing, cache)
+        known.update(zip(missing, computed))
+    return [known[time] for time in times]
+
+
+def get_sample_frames(begin_frame, end_frame):
+    """
+    Returns the frames at which the convert value nodes are sampled: both the
+    ends of the canvas and the multiples of the baking step in between
+
+    Args:
+        begin_frame (float) : First frame of the canvas
+        end_frame   (float) : Last frame of the canvas
+
+    Returns:
+        (list) : Sorted frames
+    """
+    step = settings.bake_step
+    frames = [begin_frame]
+    frame = (math.floor(begin_frame / step) + 1) * step
+    while frame < end_frame:
+        frames.append(frame)
+        frame += step
+    if end_frame > begin_frame:
+        frames.append(end_frame)
+    return frames
+
+
+def bake_value_node(node, frames, fps, cache):
+    """
+    Converts a convert value node into linear waypoints at the sampled frames,
+    samples in the middle of a run of equal values are left out
+
+    Args:
+        node   (model.ValueNode) : Synfig format convert value node
+        frames (list)            : Sorted frames to be sampled
+        fps    (float)           : Frames per second of the canvas
+        cache  (dict)            : Already evaluated values, see evaluate_value()
+
+    Returns:
+        (float | misc.Vector | misc.Color) : If the value never changes
+        (model.Animated) : Otherwise
+    """
+    times = [frame / fps for frame in frames]
+    values = evaluate_value(node, times, cache)
+    if all(comps == values[0] for comps in values[1:]):
+        return make_value(node.type, values[0])
+
+    anim = Animated(node.type)
+    last = len(values) - 1
+    for i, (time, comps) in enumerate(zip(times, values)):
+        if 0 < i < last and values[i-1] == comps == values[i+1]:
+            continue
+        anim.append(Waypoint(time, make_value(node.type, comps), "linear", "linear"))
+    return anim
+
+
+def resolve_value_nodes(canvas):
+    """
+    Replaces the convert value nodes of all the layers by the values or the
+    animations the keyframe generators understand
+
+    Args:
+        canvas (model.Canvas) : Canvas to be changed in place
+
+    Returns:
+        (None)
+    """
+    frames = get_sample_frames(canvas.begin_frame, canvas.end_frame)
+    cache = {}
+    for layer in canvas.layers:
+        for param in layer:
+            if isinstance(param.value, ValueNode):
+                param.value = bake_value_node(param.value, frames, canvas.fps, cache)
@@ -4,17 +4,20 @@ Will store all the functions corresponding to Image Layer in lottie
 """
 
 import sys
-import copy
-from lxml import etree
 import settings
 from helpers.transform import gen_helpers_transform
-from misc import Count, is_animated, get_frame
+from misc import Count, Vector, is_animated, get_frame_range
+from model import Animated, Waypoint
 from helpers.blendMode import get_blend
 from sources.image import add_image_asset
 from shapes.rectangle import gen_dummy_waypoint, get_vector_at_frame, to_Synfig_axis
 from properties.multiDimensionalKeyframed import gen_properties_multi_dimensional_keyframed
+from properties.valueKeyframed import gen_value_Keyframed
+from helpers.bezier import split_bezier
 sys.path.append("..")
 
+SCALE_EPSILON = 1e-6    # Scale differences in percent which are treated as equal
+
 
 def gen_layer_image(lottie, layer, idx):
     """
@@ -22,7 +25,7 @@ def gen_layer_image(lottie, layer, idx):
 
     Args:
         lottie (dict)               : Lottie generated image stored here
-        layer  (lxml.etree._Element): Synfig format image layer
+        layer  (model.Layer)        : Synfig format image layer
         idx    (int)                : Stores the index(number of) of image layer
 
     Returns:
@@ -46,8 +49,8 @@ def gen_layer_image(lottie, layer, idx):
     # setting the reference id
     lottie["refId"] = asset["id"]
 
-    pos1_animate = is_animated(st["tl"][0])
-    pos2_animate = is_animated(st["br"][0])
+    pos1_animate = is_animated(st["tl"].value)
+    pos2_animate = is_animated(st["br"].value)
     # If pos1 is not animated
     if pos1_animate in {0, 1}:
         st["tl"] = gen_dummy_waypoint(st["tl"], pos1_animate, "vector")
@@ -55,10 +58,10 @@ def gen_layer_image(lottie, layer, idx):
     if pos2_animate in {0, 1}:
         st["br"] = gen_dummy_waypoint(st["br"], pos2_animate, "vector")
 
-    st["scale"] = gen_image_scale(st["tl"][0], st["br"][0], asset["w"], asset["h"])
+    scale = gen_image_scale(st["tl"].value, st["br"].value, asset["w"], asset["h"])
     anchor = [0, 0, 0]
 
-    gen_helpers_transform(lottie["ks"], layer, st["tl"][0], anchor, st["scale"][0])
+    gen_helpers_transform(lottie["ks"], layer, st["tl"].value, anchor, scale)
 
 
     lottie["ao"] = settings.LAYER_DEFAULT_AUTO_ORIENT
@@ -73,41 +76,199 @@ def gen_layer_image(lottie, layer, idx):
 def gen_image_scale(animated_1, animated_2, width, height):
     """
     In Synfig, no scale parameter is available for image layer, so it will be
-    created here for Lottie conversion
+    created here for Lottie conversion. The scale is linear in point1 and
+    point2, so its keyframes are the differences of the bezier curves of both
+    the points, split at the union of their keyframes
 
     Args:
-        animated_1 (lxml.etree._Element): point1 animation in Synfig format
-        animated_2 (lxml.etree._Element): point2 animation in Synfig format
+        animated_1 (model.Animated)     : point1 animation in Synfig format
+        animated_2 (model.Animated)     : point2 animation in Synfig format
         width      (int)                : Width of the original image
         height     (int)                : Height of the original image
 
     Returns:
-        (lxml.etree._Element) : Scale parameter in Synfig format
+        (dict) : Scale parameter in Lottie format
     """
-    st = '<param name="image_scale"><real value="0.0000000000"/></param>'
-    root = etree.fromstring(st)
-    is_animate = is_animated(root)
-    root = gen_dummy_waypoint(root, is_animate, "image_scale")
-
     anim1_path, anim2_path = {}, {}
     gen_properties_multi_dimensional_keyframed(anim1_path, animated_1, 0)
     gen_properties_multi_dimensional_keyframed(anim2_path, animated_2, 0)
 
-    # Filling the first 2 frames with there original scale values
-    fill_image_scale_at_frame(root[0], anim1_path, anim2_path, width, height, 0)
-    fill_image_scale_at_frame(root[0], anim1_path, anim2_path, width, height, 1)
+    scale = {}
+    keyframes = gen_scale_keyframes(anim1_path["k"], anim2_path["k"], width, height)
+    if keyframes is None:
+        # The curves of the points are not known, sample every frame instead
+        gen_value_Keyframed(scale, sample_image_scale(anim1_path, anim2_path, width, height), 0)
+    else:
+        scale["ix"] = 0
+        scale["a"] = 1
+        scale["k"] = keyframes
+    return scale
+
+
+def gen_scale_keyframes(keyframes_1, keyframes_2, width, height):
+    """
+    Generates the lottie keyframes of the scale from the keyframes of point1
+    and point2
+
+    Args:
+        keyframes_1 (list) : point1 keyframes in Lottie format
+        keyframes_2 (list) : point2 keyframes in Lottie format
+        width       (int)  : Width of the original image
+        height      (int)  : Height of the original image
+
+    Returns:
+        (list) : Scale keyframes in Lottie format
+        (None) : If a curve of the points is not known
+    """
+    times = sorted(set(keyframe["t"] for keyframe in keyframes_1 + keyframes_2))
+    segments = []
+    for first, last in list(zip(times, times[1:])) + [(times[-1], times[-1])]:
+        points_1 = get_segment(keyframes_1, first, last)
+        points_2 = get_segment(keyframes_2, first, last)
+        if points_1 is None or points_2 is None:
+            return None
+        # Lottie's y-axis points downwards, as does the scale's
+        segments.append((first, last,
+                         [(p2 - p1) * 100 / width for p1, p2 in zip(points_1[0], points_2[0])],
+                         [(p2 - p1) * 100 / height for p1, p2 in zip(points_1[1], points_2[1])]))
+
+    ret = []
+    for (first, last, points_x, points_y), following in zip(segments, segments[1:]):
+        if is_constant(points_x) and is_constant(points_y):
+            ret.append({"t": first,
+                        "s": [points_x[0], points_y[0]],
+                        "e": [following[2][0], following[3][0]],
+                        "h": 1})
+        else:
+            gen_segment_keyframes(ret, first, last, [points_x, points_y])
+
+    # The last segment only holds the final value
+    final = [segments[-1][2][0], segments[-1][3][0]]
+    ret.append({"t": times[-1]})
+    if "h" in ret[-2].keys():
+        ret[-1]["h"] = 1
+        ret[-1]["s"] = final
+    elif ret[-2]["e"] != final:
+        ret[-1]["s"] = final
+    return ret
+
+
+def get_segment(keyframes, first, last):
+    """
+    Returns the bezier control points of a lottie animation between two frames,
+    which have to lie in the same interval of the animation
+
+    Args:
+        keyframes (list)  : Keyframes in Lottie format
+        first     (float) : Frame at which the segment starts
+        last      (float) : Frame at which the segment ends
+
+    Returns:
+        (list) : Control points of every dimension
+        (None) : If the curve of the interval is not known
+    """
+    i = 0
+    while i < len(keyframes) and keyframes[i]["t"] <= first:
+        i += 1
+    i -= 1
+    if i < 0:
+        value = keyframes[0]["s"]
+    elif i >= len(keyframes) - 1:
+        value = keyframes[-1]["s"] if "s" in keyframes[-1].keys() else keyframes[-2]["e"]
+    elif "h" in keyframes[i].keys():
+        value = keyframes[i]["s"]
+    elif "synfig_to" not in keyframes[i].keys():
+        return None
+    else:
+        keyframe = keyframes[i]
+        this_fr, next_fr = keyframe["t"], keyframes[i+1]["t"]
+        return [split_bezier(st, st + to, en - ti, en,
+                             (first - this_fr) / (next_fr - this_fr),
+                             (last - this_fr) / (next_fr - this_fr))
+                for st, to, ti, en in zip(keyframe["s"], keyframe["synfig_to"], keyframe["synfig_ti"], keyframe["e"])]
+    return [(val, val, val, val) for val in value]
+
+
+def is_constant(points):
+    """
+    Tells whether all the control points of a bezier curve are equal
 
-    mx_fr = max(get_frame(animated_1[-1]), get_frame(animated_2[-1]))
-    fr = 2
+    Args:
+        points (tuple) : Control points of one dimension
+
+    Returns:
+        (bool) : True if the curve is a constant
+    """
+    return all(abs(point - points[0]) < SCALE_EPSILON for point in points[1:])
+
+
+def gen_segment_keyframes(keyframes, first, last, points):
+    """
+    Appends the keyframes of one bezier segment of the scale. Lottie eases the
+    progress between the start and the end values, so a dimension which ends
+    where it started without being constant can not be expressed, such a
+    segment is split in halves
+
+    Args:
+        keyframes (list)  : Scale keyframes in Lottie format
+        first     (float) : Frame at which the segment starts
+        last      (float) : Frame at which the segment ends
+        points    (list)  : Control points of every dimension
+
+    Returns:
+        (None)
+    """
+    out_y, in_y = [], []
+    for p0, p1, p2, p3 in points:
+        if not is_constant((p0, p3)):
+            out_y.append((p1 - p0) / (p3 - p0))
+            in_y.append((p2 - p0) / (p3 - p0))
+        elif is_constant((p0, p1, p2, p3)):
+            out_y.append(1 / 3)
+            in_y.append(2 / 3)
+        elif last - first > 1:
+            middle = (first + last) / 2
+            gen_segment_keyframes(keyframes, first, middle, [split_bezier(*pts, 0, 0.5) for pts in points])
+            gen_segment_keyframes(keyframes, middle, last, [split_bezier(*pts, 0.5, 1) for pts in points])
+            return
+        else:
+            # Less than a frame long, the difference is not visible
+            out_y.append(1 / 3)
+            in_y.append(2 / 3)
+
+    # With the time handles at a third, the progress of lottie is a cubic
+    # bezier of the time, like the curves of Synfig
+    keyframes.append({"t": first,
+                      "s": [pts[0] for pts in points],
+                      "e": [pts[3] for pts in points],
+                      "i": {"x": [2 / 3] * len(points), "y": in_y},
+                      "o": {"x": [1 / 3] * len(points), "y": out_y}})
+
+
+def sample_image_scale(anim1_path, anim2_path, width, height):
+    """
+    Generates the scale at every frame, with linear interpolation in between
+
+    Args:
+        anim1_path (dict) : point1 animation in Lottie format
+        anim2_path (dict) : point2 animation in Lottie format
+        width      (int)  : Width of the original image
+        height     (int)  : Height of the original image
+
+    Returns:
+        (model.Animated) : Scale animation in Synfig format
+    """
+    scale_animated = Animated("image_scale")
+    # At least 2 frames are filled, with the original scale values
+    mx_fr = max(anim1_path["k"][-1]["t"], anim2_path["k"][-1]["t"])
+    fr, mx_fr = get_frame_range(0, max(1, round(mx_fr)))
+    mx_fr = max(mx_fr, fr + 1)
     while fr <= mx_fr:
-        new_waypoint = copy.deepcopy(root[0][0])
-        time = fr / settings.lottie_format["fr"]
-        time = str(time) + "s"
-        new_waypoint.attrib["time"] = time
-        root[0].append(new_waypoint)
-        fill_image_scale_at_frame(root[0], anim1_path, anim2_path, width, height, fr)
+        new_waypoint = Waypoint(fr / settings.lottie_format["fr"], None)
+        scale_animated.append(new_waypoint)
+        fill_image_scale_at_frame(scale_animated, anim1_path, anim2_path, width, height, fr)
         fr += 1
-    return root
+    return scale_animated
 
 
 def fill_image_scale_at_frame(scale_animated, anim1_path, anim2_path, width, height, frame):
@@ -116,9 +277,7 @@ def fill_image_scale_at_frame(scale_animated, anim1_path, anim2_path, width, hei
     comparison with original width and height of image
 
     Args:
-        scale_animated (lxml.etree._Element) : Scale animation in Synfig format
-        animated_1     (lxml.etree._Element) : point1 animation in Synfig format
-        animated_2     (lxml.etree._Element) : point2 animation in Synfig format
+        scale_animated (model.Animated)      : Scale animation in Synfig format
         anim1_path     (dict)                : point1 animation in Lottie format
         anim2_path     (dict)                : point2 animation in Lottie format
         width          (int)                 : Width of original image
@@ -137,8 +296,7 @@ def fill_image_scale_at_frame(scale_animated, anim1_path, anim2_path, width, hei
     scale_x = (pos2[0] - pos1[0]) * 100 / width
     scale_y = (pos1[1] - pos2[1]) * 100 / height
 
-    # Assumption: all frames till the maximum are present in the animation
-    scale_animated[frame][0].attrib["value"] = str(scale_x)
-    scale_animated[frame][0].attrib["value2"] = str(scale_y)
-    scale_animated[frame].attrib["before"] = "linear"
-    scale_animated[frame].attrib["after"] = "linear"
+    # The waypoint of this frame is the last one in the animation
+    scale_animated[-1].value = Vector(scale_x, scale_y)
+    scale_animated[-1].before = "linear"
+    scale_animated[-1].after = "linear"
@@ -20,7 +20,7 @@ def gen_layer_shape(lottie, layer, idx):
 
     Args:
         lottie (dict)               : Lottie generate shape stored here
-        layer  (lxml.etree._Element): Synfig format shape layer
+        layer  (model.Layer)        : Synfig format shape layer
         idx    (int)                : Stores the index(number of) of shape layer
 
     Returns:
@@ -41,11 +41,11 @@ def gen_layer_shape(lottie, layer, idx):
     lottie["ao"] = settings.LAYER_DEFAULT_AUTO_ORIENT
     lottie["shapes"] = []   # Shapes to be filled yet
     lottie["shapes"].append({})
-    if layer.attrib["type"] == "star":
+    if layer.type == "star":
         gen_shapes_star(lottie["shapes"][0], layer, index.inc())
-    elif layer.attrib["type"] in {"circle", "simple_circle"}:
+    elif layer.type in {"circle", "simple_circle"}:
         gen_shapes_circle(lottie["shapes"][0], layer, index.inc())
-    elif layer.attrib["type"] == "rectangle":
+    elif layer.type == "rectangle":
         gen_shapes_rectangle(lottie["shapes"][0], layer, index.inc())
 
     lottie["shapes"].append({})  # For the fill or color
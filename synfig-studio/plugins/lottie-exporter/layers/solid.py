@@ -5,7 +5,7 @@ Will store all the functions corresponding to solids in lottie
 import sys
 import settings
 from helpers.transform import gen_helpers_transform
-from misc import Count, get_color_hex
+from misc import Count, get_color_hex, is_animated
 from helpers.blendMode import get_blend
 from effects.fill import gen_effects_fill
 sys.path.append("..")
@@ -17,7 +17,7 @@ def gen_layer_solid(lottie, layer, idx):
 
     Args:
         lottie (dict)               : Lottie generated solid layer stored here
-        layer  (lxml.etree._Element): Synfig format solid layer
+        layer  (model.Layer)        : Synfig format solid layer
         idx    (int)                : Stores the index(number of) of solid layer
 
     Returns:
@@ -44,9 +44,11 @@ def gen_layer_solid(lottie, layer, idx):
     lottie["sh"] = settings.lottie_format["h"]  # Solid Height
 
     for chld in layer:
-        if chld.tag == "param":
-            if chld.attrib["name"] == "color":
-                lottie["sc"] = get_color_hex(chld[0])   # Solid Color
+        if chld.name == "color":
+            color = chld.value
+            if is_animated(color) != 0:
+                color = color[0].value
+            lottie["sc"] = get_color_hex(color)   # Solid Color
 
     lottie["ip"] = settings.lottie_format["ip"]
     lottie["op"] = settings.lottie_format["op"]
@@ -8,14 +8,11 @@ output  : FILE_NAME.json
 Supported Layers are mentioned below
 """
 import os
-import json
 import sys
+import argparse
 from lxml import etree
-from canvas import gen_canvas
-from layers.shape import gen_layer_shape
-from layers.solid import gen_layer_solid
-from layers.image import gen_layer_image
-from misc import Count
+from converter import gen_lottie, dumps
+import converter
 import settings
 
 
@@ -51,43 +48,13 @@ def parse(file_name):
     """
     tree = etree.parse(file_name)
     root = tree.getroot()  # canvas
-    gen_canvas(settings.lottie_format, root)
 
-    # Storing the file name
+    # Storing the file name and directory, the images are relative to it
     settings.file_name["fn"] = file_name
-
-    # Storing the file directory
     settings.file_name["fd"] = os.path.dirname(file_name)
 
-    num_layers = Count()
-    settings.lottie_format["layers"] = []
-    shape_layer = {"star", "circle", "rectangle", "simple_circle"}
-    solid_layer = {"SolidColor"}
-    image_layer = {"import"}
-    supported_layers = shape_layer.union(solid_layer)
-    supported_layers = supported_layers.union(image_layer)
-    for child in root:
-        if child.tag == "layer":
-            if child.attrib["active"] == "false":   # Only render the active layers
-                continue
-            if child.attrib["type"] not in supported_layers:  # Only supported layers
-                continue
-            settings.lottie_format["layers"].insert(0, {})
-            if child.attrib["type"] in shape_layer:           # Goto shape layer
-                gen_layer_shape(settings.lottie_format["layers"][0],
-                                child,
-                                num_layers.inc())
-            elif child.attrib["type"] in solid_layer:         # Goto solid layer
-                gen_layer_solid(settings.lottie_format["layers"][0],
-                                child,
-                                num_layers.inc())
-            elif child.attrib["type"] in image_layer:
-                gen_layer_image(settings.lottie_format["layers"][0],
-                                child,
-                                num_layers.inc())
-
-    lottie_string = json.dumps(settings.lottie_format)
-    return write_to(file_name, "json", lottie_string)
+    lottie = gen_lottie(root)
+    return write_to(file_name, "json", dumps(lottie))
 
 
 def gen_html(file_name):
@@ -131,10 +98,65 @@ def gen_html(file_name):
     write_to(file_name, "html", html_text.format(file_name=store_file_name))
 
 
-if len(sys.argv) < 2:
-    sys.exit()
-else:
-    settings.init()
-    FILE_NAME = sys.argv[1]
-    new_file_name = parse(FILE_NAME)
+def parse_args(argv):
+    """
+    Parses the command line arguments of the exporter
+
+    Args:
+        argv (list) : Command line arguments without the program name
+
+    Returns:
+        (argparse.Namespace) : Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Converts Synfig .sif files into Lottie format")
+    parser.add_argument("file_name", help="Synfig file which needs to be converted")
+    parser.add_argument("--bake", action="append", default=[], metavar="TYPE",
+                        help="sample the animations of this type (e.g. vector, real, angle, "
+                             "color) at every bake step instead of converting their "
+                             "interpolations, '" + settings.BAKE_ALL + "' bakes every type; "
+                             "may be given more than once")
+    parser.add_argument("--bake-step", type=int, default=settings.DEFAULT_BAKE_STEP,
+                        metavar="N", help="frames between two baked keyframes")
+    parser.add_argument("--no-optimize", action="store_true",
+                        help="keep the internal keys, constant animations and full precision floats")
+    parser.add_argument("--precision", type=int, default=settings.DEFAULT_PRECISION,
+                        metavar="N", help="decimal places kept by the optimizer")
+    parser.add_argument("--time-window", nargs=2, metavar=("BEGIN", "END"),
+                        help="only export this part of the animation, e.g. 2s 5s or 48f 120f")
+    parser.add_argument("--frame-rate", type=float, metavar="FPS",
+                        help="frame rate of the output, defaults to the one of the canvas")
+    parser.add_argument("--gamma", default=settings.GAMMA, metavar="GAMMA",
+                        help="gamma applied to the colors, '" + converter.LINEAR_GAMMA + "' "
+                             "keeps them linear (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if args.bake_step < 1:
+        parser.error("--bake-step must be at least 1")
+    return args
+
+
+def main(argv):
+    """
+    Converts the file given on the command line and generates its HTML preview
+
+    Args:
+        argv (list) : Command line arguments without the program name
+
+    Returns:
+        (None)
+    """
+    args = parse_args(argv)
+    converter.init({"bake": args.bake,
+                    "bake_step": args.bake_step,
+                    "optimize": not args.no_optimize,
+                    "precision": args.precision,
+                    "time_window": args.time_window,
+                    "frame_rate": args.frame_rate,
+                    "gamma": args.gamma})
+    new_file_name = parse(args.file_name)
     gen_html(new_file_name)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit()
+    main(sys.argv[1:])
@@ -3,7 +3,10 @@ misc.py
 Some miscellaneous functions will be provided here
 """
 
+import math
 import settings
+import model
+import helpers.color
 
 
 class Count:
@@ -252,71 +255,63 @@ def change_axis(x_val, y_val):
 
 def parse_position(animated, i):
     """
-    To convert the synfig coordinates from units(initially a string) to pixels
+    To convert the synfig coordinates from units to pixels
     Depends on whether a vector is provided to it or a real value
     If real value is provided, then time is also taken into consideration
 
     Args:
-        animated (lxml.etree._Element) : Stores animation which contains waypoints
-        i        (int)                 : Iterator over animation
+        animated (model.Animated) : Stores animation which contains waypoints
+        i        (int)            : Iterator over animation
 
     Returns:
         (misc.Vector) If the animated type is not color
         (misc.Color)  Else if the animated type is color
     """
-    if animated.attrib["type"] == "vector":
-        pos = [float(animated[i][0][0].text),
-               float(animated[i][0][1].text)]
-        pos = [settings.PIX_PER_UNIT*x for x in pos]
+    waypoint = animated[i]
+    if animated.type == "vector":
+        pos = [settings.PIX_PER_UNIT*waypoint.value.val1,
+               settings.PIX_PER_UNIT*waypoint.value.val2]
         #pos = change_axis(pos[0], pos[1])   # This is very important
 
-    elif animated.attrib["type"] == "real":
+    elif animated.type == "real":
         pos = parse_value(animated, i)
 
-    elif animated.attrib["type"] == "circle_radius":
+    elif animated.type == "circle_radius":
         pos = parse_value(animated, i)
         pos[0] *= 2 # Diameter
 
-    elif animated.attrib["type"] == "angle":
-        pos = [get_angle(float(animated[i][0].attrib["value"])),
-               float(animated[i].attrib["time"][:-1]) * settings.lottie_format["fr"]]
+    elif animated.type == "angle":
+        pos = [get_angle(waypoint.value),
+               waypoint.time * settings.lottie_format["fr"]]
 
-    elif animated.attrib["type"] == "opacity":
-        pos = [float(animated[i][0].attrib["value"]) * settings.OPACITY_CONSTANT,
-               float(animated[i].attrib["time"][:-1]) * settings.lottie_format["fr"]]
+    elif animated.type == "opacity":
+        pos = [waypoint.value * settings.OPACITY_CONSTANT,
+               waypoint.time * settings.lottie_format["fr"]]
 
-    elif animated.attrib["type"] == "effects_opacity":
-        pos = [float(animated[i][0].attrib["value"]),
-               float(animated[i].attrib["time"][:-1]) * settings.lottie_format["fr"]]
+    elif animated.type == "effects_opacity":
+        pos = [waypoint.value,
+               waypoint.time * settings.lottie_format["fr"]]
 
-    elif animated.attrib["type"] == "points":
-        pos = [int(animated[i][0].attrib["value"]),
-               float(animated[i].attrib["time"][:-1]) * settings.lottie_format["fr"]]
+    elif animated.type == "points":
+        pos = [int(waypoint.value),
+               waypoint.time * settings.lottie_format["fr"]]
 
-    elif animated.attrib["type"] == "rectangle_size":
-        pos = parse_value(animated, i)
-        vec = Vector(pos[0], pos[1], animated.attrib["type"])
-        vec.add_new_val(float(animated[i][0].attrib["value2"]) * settings.PIX_PER_UNIT)
+    elif animated.type == "rectangle_size":
+        vec = Vector(waypoint.value.val1 * settings.PIX_PER_UNIT,
+                     waypoint.time * settings.lottie_format["fr"],
+                     animated.type)
+        vec.add_new_val(waypoint.value.val2 * settings.PIX_PER_UNIT)
         return vec
 
-    elif animated.attrib["type"] == "image_scale":
-        val = float(animated[i][0].attrib["value"])
-        val2 = get_frame(animated[i])
-        vec = Vector(val, val2, animated.attrib["type"])
-        vec.add_new_val(float(animated[i][0].attrib["value2"]))
+    elif animated.type == "image_scale":
+        vec = Vector(waypoint.value.val1, get_frame(waypoint), animated.type)
+        vec.add_new_val(waypoint.value.val2)
         return vec
 
-    elif animated.attrib["type"] == "color":
-        red = float(animated[i][0][0].text)
-        green = float(animated[i][0][1].text)
-        blue = float(animated[i][0][2].text)
-        alpha = float(animated[i][0][3].text)
-        red = red ** (1/settings.GAMMA)
-        green = green ** (1/settings.GAMMA)
-        blue = blue ** (1/settings.GAMMA)
-        return Color(red, green, blue, alpha)
+    elif animated.type == "color":
+        return helpers.color.encode_color(waypoint.value)
 
-    return Vector(pos[0], pos[1], animated.attrib["type"])
+    return Vector(pos[0], pos[1], animated.type)
 
 
 def parse_value(animated, i):
@@ -325,14 +320,14 @@ def parse_value(animated, i):
     and also take into consideration the time parameter
 
     Args:
-        animated (lxml.etree._Element) : Stores animation which holds waypoints
-        i        (int)                 : Iterator for animation
+        animated (model.Animated) : Stores animation which holds waypoints
+        i        (int)            : Iterator for animation
 
     Returns:
         (list)  : [value, time] is returned
     """
-    pos = [float(animated[i][0].attrib["value"]) * settings.PIX_PER_UNIT,
-           float(animated[i].attrib["time"][:-1]) * settings.lottie_format["fr"]]
+    pos = [animated[i].value * settings.PIX_PER_UNIT,
+           animated[i].time * settings.lottie_format["fr"]]
     return pos
 
 
@@ -362,7 +357,7 @@ def is_animated(node):
     Tells whether a parater is animated or not
 
     Args:
-        node (lxml.etree._Element) : Animation which stores waypoints
+        node (model.Animated | any) : Value of the parameter
 
     Returns:
         (int) : Depending upon whether the parameter is animated, following
@@ -372,7 +367,7 @@ def is_animated(node):
                 2: If more than one waypoint is present
     """
     case = 0
-    if node.tag == "animated":
+    if isinstance(node, model.Animated):
         if len(node) == 1:
             case = 1
         else:
@@ -393,88 +388,94 @@ def clamp_col(color):
     Returns:
         (int) : Color value between 0-255
     """
-    color = color ** (1/settings.GAMMA)
+    color = helpers.color.gamma_encode(color)
     color *= 255
     color = int(color)
     return max(0, min(color, 255))
 
 
-def get_color_hex(node):
+def get_color_hex(color):
     """
-    Convert the <color></color> from rgba to hex format
+    Convert the color from rgba to hex format
 
     Args:
-        node (lxml.etree._Element) : Synfig format color parameter
+        color (misc.Color) : Synfig format color parameter
 
     Returns:
         (str) : hex format of color
     """
-    red, green, blue = 1, 0, 0
-    for col in node:
-        if col.tag == "r":
-            red = float(col.text)
-        elif col.tag == "g":
-            green = float(col.text)
-        elif col.tag == "b":
-            blue = float(col.text)
     # Convert to 0-255 range
-    red, green, blue = clamp_col(red), clamp_col(green), clamp_col(blue)
+    red, green, blue = clamp_col(color.red), clamp_col(color.green), clamp_col(color.blue)
 
     # https://stackoverflow.com/questions/3380726/converting-a-rgb-color-tuple-to-a-six-digit-code-in-python/3380739#3380739
     ret = "#{0:02x}{1:02x}{2:02x}".format(red, green, blue)
     return ret
 
+def get_frame_range(first, last):
+    """
+    Clips the range of frames [first, last] to the time window being exported,
+    so that the per frame computations are skipped outside of it
+
+    Args:
+        first (int) : First frame of the range
+        last  (int) : Last frame of the range
+
+    Returns:
+        (int, int) : Clipped first and last frame
+    """
+    if settings.time_window is not None:
+        first = max(first, int(math.floor(settings.time_window[0])))
+        last = min(last, int(math.ceil(settings.time_window[1])))
+    return first, last
+
+
 def get_frame(waypoint):
     """
     Given a waypoint, it parses the time to frames
 
     Args:
-        waypoint (lxml.etree._Element) : Synfig format waypoint
+        waypoint (model.Waypoint) : Synfig format waypoint
 
     Returns:
         (int) : the frame at which waypoint is present
     """
-    frame = float(waypoint.attrib["time"][:-1]) * settings.lottie_format["fr"]
+    frame = waypoint.time * settings.lottie_format["fr"]
     frame = round(frame)
     return frame
 
 def get_time(waypoint):
     """
-    Given a waypoint, it parses the string time to float time
+    Given a waypoint, it returns the time of the waypoint
 
     Args:
-        waypoint (lxml.etree._Element) : Synfig format waypoint
+        waypoint (model.Waypoint) : Synfig format waypoint
 
     Returns:
         (float) : the time in seconds at which the waypoint is present
     """
-    time = float(waypoint.attrib["time"][:-1])
-    return time
+    return waypoint.time
 
 def get_vector(waypoint):
     """
-    Given a waypoint, it parses the string vector into Vector class defined in
-    this convertor
+    Given a waypoint, it returns a copy of its vector
 
     Args:
-        waypoint (lxml.etree._Element) : Synfig format waypoint
+        waypoint (model.Waypoint) : Synfig format waypoint
 
     Returns:
         (misc.Vector) : x and y axis values stores in Vector format
     """
-    x = float(waypoint[0][0].text)
-    y = float(waypoint[0][1].text)
-    return Vector(x, y)
+    return Vector(waypoint.value.val1, waypoint.value.val2)
 
 def set_vector(waypoint, pos):
     """
     Given a waypoint and pos(Vector), it set's the waypoint's vectors
 
     Args:
-        waypoint (lxml.etree._Element) : Synfig format waypoint
+        waypoint (model.Waypoint) : Synfig format waypoint
+        pos      (misc.Vector)    : New value of the waypoint
 
     Returns:
         (None)
     """
-    waypoint[0][0].text = str(pos.val1)
-    waypoint[0][1].text = str(pos.val2)
+    waypoint.value = Vector(pos.val1, pos.val2)
@@ -0,0 +1,648 @@
+"""
+model.py
+Lightweight typed model of the Synfig document. The .sif tree is parsed once
+into these classes and every generator works on them instead of on the lxml
+elements, so that no numeric value has to be converted back and forth through
+strings
+"""
+
+import copy
+import misc
+
+
+# Types which convert value nodes can compute
+NUMERIC_TYPES = {"real", "angle", "vector", "color"}
+
+# Links of the convert value nodes understood by the exporter, by node and type
+CONVERT_LINKS = {
+    "add": dict.fromkeys(NUMERIC_TYPES, ("lhs", "rhs", "scalar")),
+    "subtract": dict.fromkeys(NUMERIC_TYPES, ("lhs", "rhs", "scalar")),
+    "scale": dict.fromkeys(NUMERIC_TYPES, ("link", "scalar")),
+    "linear": dict.fromkeys(NUMERIC_TYPES, ("slope", "offset")),
+    "composite": {"vector": ("x", "y"),
+                  "color": ("red", "green", "blue", "alpha")},
+    "radial_composite": {"vector": ("radius", "theta")},
+}
+# Older files name the slope of angles "rate"
+LINK_ALIASES = {"rate": "slope"}
+
+
+class Waypoint:
+    """
+    Stores a single waypoint of an animated parameter
+    time is always stored in seconds
+    value is stored in Synfig units, i.e. without any conversion
+    """
+    __slots__ = ("time", "value", "before", "after", "tension", "continuity", "bias")
+
+    def __init__(self, time, value, before="clamped", after="clamped",
+                 tension=0.0, continuity=0.0, bias=0.0):
+        """
+        Args:
+            time       (float)                         : Time of the waypoint in seconds
+            value      (float | misc.Vector | misc.Color | int | bool | str) : Value of waypoint
+            before     (:obj: `str`, optional)         : In interpolation
+            after      (:obj: `str`, optional)         : Out interpolation
+            tension    (:obj: `float`, optional)       : TCB tension
+            continuity (:obj: `float`, optional)       : TCB continuity
+            bias       (:obj: `float`, optional)       : TCB bias
+
+        Returns:
+            (None)
+        """
+        self.time = time
+        self.value = value
+        self.before = before
+        self.after = after
+        self.tension = tension
+        self.continuity = continuity
+        self.bias = bias
+
+    def __str__(self):
+        return "({0}s, {1}, {2}/{3})".format(self.time, self.value, self.before,
+                                              self.after)
+
+    def copy(self):
+        """
+        Returns an independent copy of the waypoint, the value is copied too
+        as it may be modified in place by the generators
+
+        Args:
+            (None)
+
+        Returns:
+            (model.Waypoint) : Copy of this waypoint
+        """
+        return Waypoint(self.time, copy.copy(self.value), self.before,
+                        self.after, self.tension, self.continuity, self.bias)
+
+
+class Animated:
+    """
+    Stores an animated parameter, i.e. the type of the animation and the list
+    of its waypoints sorted by time
+    Supports len(), indexing, iteration and insertion like the <animated>
+    element it replaces
+    """
+    __slots__ = ("type", "waypoints", "ref")
+
+    def __init__(self, _type, waypoints=None):
+        """
+        Args:
+            _type     (str)                              : Type of the animation
+            waypoints (:obj: `list`, optional)           : List of model.Waypoint
+
+        Returns:
+            (None)
+        """
+        self.type = _type
+        self.waypoints = waypoints if waypoints is not None else []
+        # Id of the exported value this animation is a reference to, if any
+        self.ref = None
+
+    def __str__(self):
+        return "<{0}: {1}>".format(self.type,
+                                   ", ".join(str(w) for w in self.waypoints))
+
+    def __len__(self):
+        return len(self.waypoints)
+
+    def __getitem__(self, i):
+        return self.waypoints[i]
+
+    def __iter__(self):
+        return iter(self.waypoints)
+
+    def insert(self, i, waypoint):
+        """
+        Inserts a waypoint at index i
+
+        Args:
+            i        (int)            : Index at which the waypoint is inserted
+            waypoint (model.Waypoint) : Waypoint to be inserted
+
+        Returns:
+            (None)
+        """
+        self.waypoints.insert(i, waypoint)
+
+    def append(self, waypoint):
+        """
+        Appends a waypoint at the end of the animation
+
+        Args:
+            waypoint (model.Waypoint) : Waypoint to be appended
+
+        Returns:
+            (None)
+        """
+        self.waypoints.append(waypoint)
+
+    def copy(self):
+        """
+        Returns a copy of the animation with copies of all its waypoints
+        The copy is not a reference to any exported value
+
+        Args:
+            (None)
+
+        Returns:
+            (model.Animated) : Copy of this animation
+        """
+        return Animated(self.type, [w.copy() for w in self.waypoints])
+
+
+class ValueNode:
+    """
+    Stores a convert value node like <add> or <composite>, i.e. a value
+    computed from its links, each link being a static value, a model.Animated
+    or another model.ValueNode
+    """
+    __slots__ = ("kind", "type", "links")
+
+    def __init__(self, kind, _type, links=None):
+        """
+        Args:
+            kind  (str)                    : Tag of the value node, e.g. "add"
+            _type (str)                    : Type of the computed value
+            links (:obj: `dict`, optional) : Values of the links by their names
+
+        Returns:
+            (None)
+        """
+        self.kind = kind
+        self.type = _type
+        self.links = links if links is not None else {}
+
+    def __str__(self):
+        return "<{0} {1}: {2}>".format(self.kind, self.type,
+                                       ", ".join("{0}={1}".format(name, link)
+                                                 for name, link in self.links.items()))
+
+
+class Param:
+    """
+    Stores a parameter of a layer: its name and either a static value or a
+    model.Animated
+    """
+    __slots__ = ("name", "value")
+
+    def __init__(self, name, value):
+        """
+        Args:
+            name  (str)                  : Name of the parameter
+            value (model.Animated | any) : Value of the parameter
+
+        Returns:
+            (None)
+        """
+        self.name = name
+        self.value = value
+
+
+class Layer:
+    """
+    Stores a Synfig layer with its parameters in document order
+    """
+    __slots__ = ("type", "active", "desc", "params")
+
+    def __init__(self, _type, active=True, desc=None, params=None):
+        """
+        Args:
+            _type  (str)                        : Type of the layer
+            active (:obj: `bool`, optional)     : Whether the layer is rendered
+            desc   (:obj: `str`, optional)      : Description of the layer
+            params (:obj: `list`, optional)     : List of model.Param
+
+        Returns:
+            (None)
+        """
+        self.type = _type
+        self.active = active
+        self.desc = desc
+        self.params = params if params is not None else []
+
+    def __iter__(self):
+        return iter(self.params)
+
+    def get_param(self, name):
+        """
+        Returns the parameter with the given name
+
+        Args:
+            name (str) : Name of the parameter
+
+        Returns:
+            (model.Param) : If the parameter is present
+            (None)        : Otherwise
+        """
+        for param in self.params:
+            if param.name == name:
+                return param
+        return None
+
+
+class Canvas:
+    """
+    Stores the attributes of the root canvas and its layers
+    begin_frame and end_frame are stored in frames, as in Lottie
+    """
+
+    def __init__(self):
+        """
+        Args:
+            (None)
+
+        Returns:
+            (None)
+        """
+        self.width = None
+        self.height = None
+        self.view_box = []
+        self.fps = 0.0
+        self.begin_frame = 0.0
+        self.end_frame = 0.0
+        self.name = None
+        self.layers = []
+
+
+def parse_frames(text, fps):
+    """
+    Converts a Synfig time string like "2s", "12f" or "1s 6f" into frames
+
+    Args:
+        text (str)   : Synfig format time
+        fps  (float) : Frames per second of the canvas
+
+    Returns:
+        (float) : Time in frames
+    """
+    frames = 0
+    for part in text.split():
+        if part[-1] == "s":
+            frames += float(part[:-1]) * fps
+        elif part[-1] == "f":
+            frames += float(part[:-1])
+    return frames
+
+
+def parse_time(text, fps):
+    """
+    Converts a Synfig time string like "2s", "12f" or "1s 6f" into seconds
+
+    Args:
+        text (str)   : Synfig format time
+        fps  (float) : Frames per second of the canvas
+
+    Returns:
+        (float) : Time in seconds
+    """
+    seconds = 0
+    for part in text.split():
+        if part[-1] == "s":
+            seconds += float(part[:-1])
+        elif part[-1] == "f":
+            seconds += float(part[:-1]) / fps
+    return seconds
+
+
+def parse_value(node, fps, exported=None):
+    """
+    Converts a Synfig value node into its typed value
+    Value nodes which are not understood by the exporter are kept as lxml
+    elements
+
+    Args:
+        node     (lxml.etree._Element)             : Synfig format value node
+        fps      (float)                           : Frames per second of the canvas
+        exported (:obj: `model.Exported`, optional) : Values exported by the canvas
+
+    Returns:
+        (model.Animated | model.ValueNode | float | int | bool | str | misc.Vector | misc.Color | lxml.etree._Element)
+    """
+    tag = node.tag
+    if tag in {"real", "angle", "distance"}:
+        return float(node.attrib["value"])
+    elif tag == "vector":
+        x_val, y_val = 0.0, 0.0
+        for chld in node:
+            if chld.tag == "x":
+                x_val = float(chld.text)
+            elif chld.tag == "y":
+                y_val = float(chld.text)
+        return misc.Vector(x_val, y_val)
+    elif tag == "color":
+        col = misc.Color(1.0, 0.0, 0.0, 1.0)
+        for chld in node:
+            if chld.tag == "r":
+                col.red = float(chld.text)
+            elif chld.tag == "g":
+                col.green = float(chld.text)
+            elif chld.tag == "b":
+                col.blue = float(chld.text)
+            elif chld.tag == "a":
+                col.alpha = float(chld.text)
+        return col
+    elif tag == "integer":
+        return int(node.attrib["value"])
+    elif tag == "bool":
+        return node.attrib["value"] == "true"
+    elif tag == "string":
+        return node.text if node.text is not None else ""
+    elif tag == "time":
+        return parse_time(node.attrib["value"], fps)
+    elif tag == "animated":
+        return parse_animated(node, fps)
+    elif tag in CONVERT_LINKS.keys():
+        return parse_convert(node, fps, exported)
+    return node
+
+
+def is_numeric(value):
+    """
+    Tells whether a parsed value can be used as a link of a convert value node
+
+    Args:
+        value (any) : Parsed value
+
+    Returns:
+        (bool) : True for numbers, vectors, colors and their animations
+    """
+    if isinstance(value, (Animated, ValueNode)):
+        return value.type in NUMERIC_TYPES
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, (float, int, misc.Vector, misc.Color))
+
+
+def parse_convert(node, fps, exported=None):
+    """
+    Converts a convert value node like <add> into model.ValueNode, links are
+    either child elements or references to exported values in attributes
+
+    Args:
+        node     (lxml.etree._Element)             : Synfig format convert value node
+        fps      (float)                           : Frames per second of the canvas
+        exported (:obj: `model.Exported`, optional) : Values exported by the canvas
+
+    Returns:
+        (model.ValueNode) : If the value node is understood by the exporter
+        (lxml.etree._Element) : Otherwise
+    """
+    _type = node.attrib.get("type")
+    names = CONVERT_LINKS[node.tag].get(_type)
+    if names is None:
+        return node
+    links = {}
+    for name, ref in node.attrib.items():
+        name = LINK_ALIASES.get(name, name)
+        if name in names and exported is not None:
+            links[name] = exported.get(ref)
+    for chld in node:
+        name = LINK_ALIASES.get(chld.tag, chld.tag)
+        if name not in names:
+            continue
+        if len(chld):
+            links[name] = parse_value(chld[0], fps, exported)
+        elif "use" in chld.attrib.keys() and exported is not None:
+            links[name] = exported.get(chld.attrib["use"])
+    if any(not is_numeric(links.get(name)) for name in names):
+        return node
+    return ValueNode(node.tag, _type, links)
+
+
+def parse_animated(node, fps):
+    """
+    Converts an <animated> element into model.Animated
+
+    Args:
+        node (lxml.etree._Element) : Synfig format animation
+        fps  (float)               : Frames per second of the canvas
+
+    Returns:
+        (model.Animated) : Typed animation
+    """
+    anim = Animated(node.attrib["type"])
+    for waypoint in node:
+        if waypoint.tag != "waypoint" or len(waypoint) == 0:
+            continue
+        attrib = waypoint.attrib
+        anim.append(Waypoint(parse_time(attrib["time"], fps),
+                             parse_value(waypoint[0], fps),
+                             attrib.get("before", "clamped"),
+                             attrib.get("after", "clamped"),
+                             float(attrib.get("tension", 0.0)),
+                             float(attrib.get("continuity", 0.0)),
+                             float(attrib.get("bias", 0.0))))
+    anim.waypoints.sort(key=lambda w: w.time)
+    return anim
+
+
+class Exported:
+    """
+    Stores the value nodes exported in the <defs> section of the canvas
+    Every node is parsed only once, the first time it is referenced
+    """
+
+    def __init__(self, fps):
+        """
+        Args:
+            fps (float) : Frames per second of the canvas
+
+        Returns:
+            (None)
+        """
+        self.fps = fps
+        self.nodes = {}
+        self.values = {}
+
+    def add_defs(self, defs):
+        """
+        Registers all the exported value nodes of a <defs> element
+
+        Args:
+            defs (lxml.etree._Element) : Synfig format <defs> section
+
+        Returns:
+            (None)
+        """
+        for node in defs:
+            if "id" in node.attrib.keys():
+                self.nodes[node.attrib["id"]] = node
+
+    def get(self, use):
+        """
+        Returns the value referenced by the use attribute of a parameter
+        Animations are copied, as the generators are free to modify them,
+        convert value nodes are shared so that their evaluation is cached
+
+        Args:
+            use (str) : Reference like ":name", values exported from other
+                        files are not supported
+
+        Returns:
+            (model.Animated | model.ValueNode | float | int | bool | str | misc.Vector | misc.Color | lxml.etree._Element) : If found
+            (None) : Otherwise
+        """
+        ref = use[1:] if use.startswith(":") else use
+        if ref not in self.nodes.keys():
+            return None
+        if ref not in self.values.keys():
+            self.values[ref] = parse_value(self.nodes[ref], self.fps, self)
+        value = self.values[ref]
+        if isinstance(value, Animated):
+            value = value.copy()
+            value.ref = ref
+        elif isinstance(value, (misc.Vector, misc.Color)):
+            value = copy.copy(value)
+        return value
+
+
+def parse_layer(node, fps, exported=None):
+    """
+    Converts a <layer> element into model.Layer
+
+    Args:
+        node     (lxml.etree._Element)          : Synfig format layer
+        fps      (float)                        : Frames per second of the canvas
+        exported (:obj: `model.Exported`, optional) : Values exported by the canvas
+
+    Returns:
+        (model.Layer) : Typed layer
+    """
+    layer = Layer(node.attrib["type"],
+                  node.attrib.get("active", "true") != "false",
+                  node.attrib.get("desc"))
+    for chld in node:
+        if chld.tag != "param":
+            continue
+        if len(chld):
+            value = parse_value(chld[0], fps, exported)
+        elif "use" in chld.attrib.keys() and exported is not None:
+            value = exported.get(chld.attrib["use"])
+        else:
+            value = None
+        layer.params.append(Param(chld.attrib["name"], value))
+    return layer
+
+
+def parse_canvas(root):
+    """
+    Converts the root <canvas> element into model.Canvas
+
+    Args:
+        root (lxml.etree._Element) : Synfig format animation file
+
+    Returns:
+        (model.Canvas) : Typed canvas
+    """
+    canvas = Canvas()
+    canvas.view_box = [float(itr) for itr in root.attrib["view-box"].split()]
+    if "width" in root.attrib.keys():
+        canvas.width = int(root.attrib["width"])
+    if "height" in root.attrib.keys():
+        canvas.height = int(root.attrib["height"])
+    canvas.fps = float(root.attrib["fps"])
+    canvas.begin_frame = parse_frames(root.attrib["begin-time"], canvas.fps)
+    canvas.end_frame = parse_frames(root.attrib["end-time"], canvas.fps)
+    exported = Exported(canvas.fps)
+    for child in root:
+        if child.tag == "defs":
+            exported.add_defs(child)
+    for child in root:
+        if child.tag == "name" and canvas.name is None:
+            canvas.name = child.text
+        elif child.tag == "layer":
+            canvas.layers.append(parse_layer(child, canvas.fps, exported))
+    return canvas
+
+
+def clip_animated(anim, begin, end):
+    """
+    Removes the waypoints which can not affect the animation between begin
+    and end. The waypoints around the window are kept as Synfig computes the
+    tangents of a waypoint from its neighbours, hence the values inside the
+    window, including its boundaries, remain exactly the same
+
+    Args:
+        anim  (model.Animated) : Animation to be clipped in place
+        begin (float)          : Start of the window in seconds
+        end   (float)          : End of the window in seconds
+
+    Returns:
+        (None)
+    """
+    first, last = 0, len(anim) - 1
+    for i, waypoint in enumerate(anim):
+        if waypoint.time <= begin:
+            first = i
+    for i in range(len(anim) - 1, first - 1, -1):
+        if anim[i].time >= end:
+            last = i
+    first, last = max(0, first - 1), min(len(anim) - 1, last + 1)
+    anim.waypoints = anim.waypoints[first:last+1]
+
+
+def clip_canvas(canvas, begin_frame, end_frame):
+    """
+    Restricts the canvas and the animations of all its layers to a time window
+
+    Args:
+        canvas      (model.Canvas) : Canvas to be clipped in place
+        begin_frame (float)        : Start of the window in frames
+        end_frame   (float)        : End of the window in frames
+
+    Returns:
+        (None)
+    """
+    canvas.begin_frame = max(canvas.begin_frame, begin_frame)
+    canvas.end_frame = min(canvas.end_frame, end_frame)
+    begin, end = canvas.begin_frame / canvas.fps, canvas.end_frame / canvas.fps
+    for layer in canvas.layers:
+        for param in layer:
+            if isinstance(param.value, Animated):
+                clip_animated(param.value, begin, end)
+
+
+def snap_holds(anim, fps):
+    """
+    Moves the waypoints bounding constant intervals onto the nearest frame of
+    the given frame rate, so that the jumps happen exactly on an output frame
+
+    Args:
+        anim (model.Animated) : Animation to be snapped in place
+        fps  (float)          : Output frames per second
+
+    Returns:
+        (None)
+    """
+    prev_time = None
+    for i, waypoint in enumerate(anim):
+        if "constant" in {waypoint.before, waypoint.after}:
+            time = round(waypoint.time * fps) / fps
+            next_time = anim[i+1].time if i + 1 < len(anim) else None
+            # Never make two waypoints share the same time or change their order
+            if (prev_time is None or time > prev_time) and (next_time is None or time < next_time):
+                waypoint.time = time
+        prev_time = waypoint.time
+
+
+def set_frame_rate(canvas, fps):
+    """
+    Changes the frame rate of the canvas, the times of all the waypoints are
+    in seconds and remain the same, except around constant intervals
+
+    Args:
+        canvas (model.Canvas) : Canvas to be changed in place
+        fps    (float)        : New frames per second
+
+    Returns:
+        (None)
+    """
+    canvas.begin_frame = canvas.begin_frame * fps / canvas.fps
+    canvas.end_frame = canvas.end_frame * fps / canvas.fps
+    canvas.fps = fps
+    for layer in canvas.layers:
+        for param in layer:
+            if isinstance(param.value, Animated):
+                snap_holds(param.value, fps)
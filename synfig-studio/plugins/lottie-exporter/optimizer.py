@@ -0,0 +1,213 @@
+"""
+optimizer.py
+Post processing pass over the generated lottie dictionary, which removes
+everything the players never read:
+    - keys used internally by the exporter (synfig_*)
+    - keyframes lying completely outside the in and out point
+    - animated properties whose value never changes
+and rounds the numbers to a fixed precision
+"""
+
+import settings
+
+INTERNAL_PREFIX = "synfig_"
+
+
+def optimize(lottie, precision=settings.DEFAULT_PRECISION):
+    """
+    Optimizes the lottie dictionary in place
+
+    Args:
+        lottie    (dict)                : Lottie format animation
+        precision (:obj: `int`, optional) : Number of decimal places to keep
+
+    Returns:
+        (dict) : The same optimized dictionary
+    """
+    strip_internal(lottie)
+    quantize(lottie, precision)
+    fold_animations(lottie, lottie.get("ip"), lottie.get("op"))
+    return lottie
+
+
+def trim(lottie):
+    """
+    Only removes the keyframes lying outside the in and out points, used for
+    exports of a time window which are not optimized otherwise
+
+    Args:
+        lottie (dict) : Lottie format animation
+
+    Returns:
+        (dict) : The same trimmed dictionary
+    """
+    fold_animations(lottie, lottie.get("ip"), lottie.get("op"), False)
+    return lottie
+
+
+def strip_internal(obj):
+    """
+    Recursively removes the keys used internally by the exporter
+
+    Args:
+        obj (dict | list | any) : Part of the lottie dictionary
+
+    Returns:
+        (None)
+    """
+    if isinstance(obj, dict):
+        for key in [key for key in obj.keys() if key.startswith(INTERNAL_PREFIX)]:
+            del obj[key]
+        for val in obj.values():
+            strip_internal(val)
+    elif isinstance(obj, list):
+        for val in obj:
+            strip_internal(val)
+
+
+def quantize_number(num, precision):
+    """
+    Rounds a float to precision decimal places, integral results are stored
+    as int so that they are written without the trailing ".0"
+
+    Args:
+        num       (float) : Number to be rounded
+        precision (int)   : Number of decimal places to keep
+
+    Returns:
+        (int | float) : Rounded number
+    """
+    num = round(num, precision)
+    if num.is_integer():
+        return int(num)
+    return num
+
+
+def quantize(obj, precision):
+    """
+    Recursively rounds all the floats of the lottie dictionary
+
+    Args:
+        obj       (dict | list) : Part of the lottie dictionary
+        precision (int)         : Number of decimal places to keep
+
+    Returns:
+        (None)
+    """
+    if isinstance(obj, dict):
+        items = obj.items()
+    elif isinstance(obj, list):
+        items = enumerate(obj)
+    else:
+        return
+    for key, val in items:
+        if isinstance(val, float):
+            obj[key] = quantize_number(val, precision)
+        elif isinstance(val, (dict, list)):
+            quantize(val, precision)
+
+
+def is_keyframed(obj):
+    """
+    Tells whether the dictionary is an animated lottie property
+
+    Args:
+        obj (dict) : Part of the lottie dictionary
+
+    Returns:
+        (bool) : True if the property holds keyframes
+    """
+    if obj.get("a") != 1 or not isinstance(obj.get("k"), list) or not obj["k"]:
+        return False
+    return all(isinstance(keyframe, dict) and "t" in keyframe for keyframe in obj["k"])
+
+
+def trim_keyframes(keyframes, in_point, out_point):
+    """
+    Removes the keyframes which can not affect any frame between the in point
+    and the out point, i.e. all the keyframes before the last keyframe at or
+    before in_point and after the first keyframe at or after out_point
+
+    Args:
+        keyframes (list)          : Keyframes in lottie format, sorted by time
+        in_point  (float | None)  : First frame of the animation
+        out_point (float | None)  : Last frame of the animation
+
+    Returns:
+        (list) : Keyframes which are to be kept
+    """
+    first, last = 0, len(keyframes) - 1
+    if in_point is not None:
+        for i, keyframe in enumerate(keyframes):
+            if keyframe["t"] <= in_point:
+                first = i
+    if out_point is not None:
+        for i in range(len(keyframes) - 1, first - 1, -1):
+            if keyframes[i]["t"] >= out_point:
+                last = i
+
+    # At least one interval is kept, the last keyframe may not hold a value
+    if len(keyframes) >= 2:
+        first = min(first, len(keyframes) - 2)
+        last = max(last, first + 1)
+    return keyframes[first:last+1]
+
+
+def get_static_value(keyframes):
+    """
+    Returns the value of the keyframes if it never changes
+
+    Args:
+        keyframes (list) : Keyframes in lottie format
+
+    Returns:
+        (list | None) : The value if it is constant, None otherwise
+    """
+    values = []
+    for keyframe in keyframes:
+        for key in ("s", "e"):
+            if key in keyframe.keys():
+                values.append(keyframe[key])
+    if not values or any(val != values[0] for val in values[1:]):
+        return None
+    return values[0]
+
+
+def fold_animations(obj, in_point, out_point, fold=True):
+    """
+    Recursively trims the keyframes of the animated properties and converts
+    the properties with a constant value into static ones
+
+    Args:
+        obj       (dict | list)  : Part of the lottie dictionary
+        in_point  (float | None) : In point of the enclosing layer/composition
+        out_point (float | None) : Out point of the enclosing layer/composition
+        fold      (:obj: `bool`, optional) : If False, the keyframes are only trimmed
+
+    Returns:
+        (None)
+    """
+    if isinstance(obj, list):
+        for val in obj:
+            fold_animations(val, in_point, out_point, fold)
+        return
+    if not isinstance(obj, dict):
+        return
+
+    # Layers carry their own in and out points
+    if "ty" in obj.keys() and "ip" in obj.keys() and "op" in obj.keys():
+        in_point, out_point = obj["ip"], obj["op"]
+
+    if is_keyframed(obj):
+        obj["k"] = trim_keyframes(obj["k"], in_point, out_point)
+        value = get_static_value(obj["k"]) if fold else None
+        if value is not None:
+            # Single dimensional values and shapes are stored unwrapped
+            if isinstance(value, list) and len(value) == 1:
+                value = value[0]
+            obj["a"] = 0
+            obj["k"] = value
+        return
+
+    for val in obj.values():
+        fold_animations(val, in_point, out_point, fold)
@@ -0,0 +1,311 @@
+# pylint: disable=line-too-long
+"""
+playback.py
+Estimates how expensive an exported lottie animation is to play back, so
+that heavy exports are caught before they reach slow devices
+
+    python3 playback.py FILE_NAME.json
+    python3 playback.py FILE_NAME.json --top 10 --json
+
+Every layer is broken down into what a player goes through at every frame:
+the layer itself, its shapes, its effects and their properties (a solid
+carries the 7 properties of effects/fill.py), its animated tracks (the baked
+ones being recognized by their evenly spaced keyframes) and the pixels of its
+image asset. The cost is in arbitrary units, weighted by WEIGHTS and by the
+part of the animation the layer is visible in, and is only meant to compare
+exports with each other
+"""
+
+import sys
+import json
+import argparse
+from collections import Counter
+
+# Types of the lottie layers
+LAYER_TYPES = {0: "precomp", 1: "solid", 2: "image", 3: "null", 4: "shape", 5: "text"}
+# Shape items which are drawn, the others (groups, fills, transforms...) only
+# modify them
+DRAWN_SHAPES = {"rc", "el", "sr", "sh"}
+PAINT_SHAPES = {"fl", "st", "gf", "gs"}
+BAKED_MIN_KEYFRAMES = 8     # Fewer keyframes are never taken for a baked track
+BAKED_EVEN_RATIO = 0.9      # Part of the gaps between keyframes which have to be equal in a baked track
+DEFAULT_TOP = 5             # Layers flagged as the top offenders
+DENSE_KEYFRAMES = 0.5       # Keyframes per frame above which a track is dense
+
+# Cost of every item a layer is made of, averaged over the frames of the
+# animation the layer is visible in, except for the keyframes which are paid
+# for once
+WEIGHTS = {
+    "layer": 1.0,
+    "shape": 0.5,
+    "paint": 0.5,
+    "effect": 0.5,
+    "effect_property": 0.1,
+    "track": 0.2,
+    "baked_track": 0.2,     # On top of "track", for the keyframe lookup and the bigger file
+    "keyframe": 0.001,      # Parsing and lookup
+    "megapixel": 4.0,
+}
+
+
+def get_tracks(node):
+    """
+    Yields the animated properties found anywhere in a lottie node
+
+    Args:
+        node (dict | list) : Part of a lottie layer
+
+    Yields:
+        (list) : Keyframes of every animated property
+    """
+    if isinstance(node, dict):
+        keys = node.get("k")
+        if isinstance(keys, list) and keys and isinstance(keys[0], dict) and "t" in keys[0]:
+            yield keys
+        for key, value in node.items():
+            if isinstance(value, (dict, list)):
+                yield from get_tracks(value)
+    elif isinstance(node, list):
+        for value in node:
+            if isinstance(value, (dict, list)):
+                yield from get_tracks(value)
+
+
+def is_baked(keyframes):
+    """
+    Tells whether a track has been sampled at a fixed step rather than
+    converted from the waypoints
+
+    Args:
+        keyframes (list) : Keyframes of the track
+
+    Returns:
+        (bool) : True if most of the keyframes are evenly spaced
+    """
+    if len(keyframes) < BAKED_MIN_KEYFRAMES:
+        return False
+    times = [keyframe["t"] for keyframe in keyframes]
+    gaps = Counter(round(t1 - t0, 3) for t0, t1 in zip(times, times[1:]))
+    return gaps.most_common(1)[0][1] >= BAKED_EVEN_RATIO * (len(times) - 1)
+
+
+def count_shapes(shapes, counts):
+    """
+    Counts the drawn shapes, the paints and the items of a shape list
+
+    Args:
+        shapes (list) : Shape items of a layer or a group
+        counts (dict) : Counters to be increased
+
+    Returns:
+        (None)
+    """
+    for item in shapes:
+        counts["shape_items"] += 1
+        if item.get("ty") in DRAWN_SHAPES:
+            counts["shapes"] += 1
+        elif item.get("ty") in PAINT_SHAPES:
+            counts["paints"] += 1
+        count_shapes(item.get("it", []), counts)
+
+
+def count_effects(effects, counts):
+    """
+    Counts the effects and the properties of the effects of a layer
+
+    Args:
+        effects (list) : Effects of a layer
+        counts  (dict) : Counters to be increased
+
+    Returns:
+        (None)
+    """
+    for effect in effects:
+        counts["effects"] += 1
+        counts["effect_properties"] += len(effect.get("ef", []))
+
+
+def analyze_layer(layer, lottie, assets):
+    """
+    Counts what a layer is made of and computes its cost
+
+    Args:
+        layer  (dict) : Lottie layer
+        lottie (dict) : Whole lottie animation
+        assets (dict) : Assets of the animation by their id
+
+    Returns:
+        (dict) : Counts, keyframes per second, cost and its breakdown
+    """
+    frames = max(lottie["op"] - lottie["ip"], 1)
+    visible = max(0, min(layer.get("op", lottie["op"]), lottie["op"]) - max(layer.get("ip", lottie["ip"]), lottie["ip"]))
+    counts = Counter()
+    count_shapes(layer.get("shapes", []), counts)
+    count_effects(layer.get("ef", []), counts)
+    dense = 0
+    for keyframes in get_tracks(layer):
+        counts["tracks"] += 1
+        counts["keyframes"] += len(keyframes)
+        if is_baked(keyframes):
+            counts["baked_tracks"] += 1
+        if len(keyframes) > DENSE_KEYFRAMES * frames:
+            dense += 1
+
+    area = 0
+    asset = assets.get(layer.get("refId"))
+    if asset is not None and "w" in asset and "h" in asset:
+        area = asset["w"] * asset["h"]
+    elif layer.get("ty") == 1:
+        area = layer.get("sw", 0) * layer.get("sh", 0)
+
+    per_frame = {
+        "layer": WEIGHTS["layer"],
+        "shapes": WEIGHTS["shape"] * counts["shapes"] + WEIGHTS["paint"] * counts["paints"],
+        "effects": WEIGHTS["effect"] * counts["effects"] + WEIGHTS["effect_property"] * counts["effect_properties"],
+        "tracks": WEIGHTS["track"] * counts["tracks"] + WEIGHTS["baked_track"] * counts["baked_tracks"],
+        "pixels": WEIGHTS["megapixel"] * area / 1e6,
+    }
+    breakdown = {key: round(value * visible / frames, 3) for key, value in per_frame.items()}
+    breakdown["keyframes"] = round(WEIGHTS["keyframe"] * counts["keyframes"], 3)
+
+    # Nested compositions are played along with the layer
+    nested = []
+    if asset is not None and "layers" in asset:
+        nested = [analyze_layer(child, lottie, assets) for child in asset["layers"]]
+        breakdown["precomp"] = round(sum(child["cost"] for child in nested) * visible / frames, 3)
+
+    seconds = visible / lottie.get("fr", 1) if visible else 0
+    return {
+        "name": layer.get("nm", ""),
+        "type": LAYER_TYPES.get(layer.get("ty"), str(layer.get("ty"))),
+        "visible_frames": round(visible, 3),
+        "shapes": counts["shapes"],
+        "paints": counts["paints"],
+        "effects": counts["effects"],
+        "effect_properties": counts["effect_properties"],
+        "tracks": counts["tracks"],
+        "baked_tracks": counts["baked_tracks"],
+        "dense_tracks": dense,
+        "keyframes": counts["keyframes"],
+        "keyframes_per_second": round(counts["keyframes"] / seconds, 3) if seconds else 0.0,
+        "pixel_area": area,
+        "cost": round(sum(breakdown.values()), 3),
+        "breakdown": breakdown,
+        "layers": nested,
+    }
+
+
+def get_flags(result):
+    """
+    Lists the reasons a layer is expensive
+
+    Args:
+        result (dict) : Result of analyze_layer()
+
+    Returns:
+        (list) : Human readable reasons, the main cost first
+    """
+    main = max(result["breakdown"].items(), key=lambda item: item[1])[0]
+    flags = ["mostly " + main]
+    if result["baked_tracks"]:
+        flags.append("{0} baked tracks".format(result["baked_tracks"]))
+    if result["dense_tracks"]:
+        flags.append("{0} dense tracks".format(result["dense_tracks"]))
+    if result["effects"]:
+        flags.append("{0} effects with {1} properties".format(result["effects"], result["effect_properties"]))
+    return flags
+
+
+def analyze(lottie, top=DEFAULT_TOP):
+    """
+    Analyzes a whole lottie animation
+
+    Args:
+        lottie (dict)                  : Lottie animation
+        top    (:obj: `int`, optional) : Number of top offenders to flag
+
+    Returns:
+        (dict) : Totals, the results of every layer and the top offenders
+    """
+    assets = {asset["id"]: asset for asset in lottie.get("assets", []) if "id" in asset}
+    layers = [analyze_layer(layer, lottie, assets) for layer in lottie.get("layers", [])]
+    frames = max(lottie["op"] - lottie["ip"], 1)
+    seconds = frames / lottie.get("fr", 1)
+    totals = {"layers": len(layers), "frames": frames, "fps": lottie.get("fr")}
+    for key in ("shapes", "paints", "effects", "effect_properties", "tracks", "baked_tracks",
+                "dense_tracks", "keyframes", "pixel_area"):
+        totals[key] = sum(layer[key] for layer in layers)
+    totals["keyframes_per_second"] = round(totals["keyframes"] / seconds, 3)
+    totals["cost"] = round(sum(layer["cost"] for layer in layers), 3)
+
+    ranked = sorted(range(len(layers)), key=lambda i: -layers[i]["cost"])
+    offenders = []
+    for i in ranked[:top]:
+        share = layers[i]["cost"] / totals["cost"] if totals["cost"] else 0.0
+        offenders.append({"index": i, "name": layers[i]["name"], "cost": layers[i]["cost"],
+                          "share": round(share, 3), "flags": get_flags(layers[i])})
+    return {"totals": totals, "layers": layers, "offenders": offenders}
+
+
+def print_report(report):
+    """
+    Prints the analysis as a table
+
+    Args:
+        report (dict) : Result of analyze()
+
+    Returns:
+        (None)
+    """
+    row = "{0:<24} {1:<7} {2:>6} {3:>7} {4:>6} {5:>6} {6:>8} {7:>7} {8:>9} {9:>8}"
+    print(row.format("layer", "type", "shapes", "effects", "tracks", "baked", "kfs", "kfs/s", "pixels", "cost"))
+    for layer in report["layers"]:
+        print(row.format(layer["name"][:24], layer["type"], layer["shapes"], layer["effects"],
+                         layer["tracks"], layer["baked_tracks"], layer["keyframes"],
+                         "{0:.1f}".format(layer["keyframes_per_second"]), layer["pixel_area"],
+                         "{0:.2f}".format(layer["cost"])))
+    totals = report["totals"]
+    print()
+    print("{0} layers, {1} shapes, {2} effects ({3} properties), {4} tracks ({5} baked), "
+          "{6} keyframes ({7:.1f}/s), {8} asset pixels".format(
+              totals["layers"], totals["shapes"], totals["effects"], totals["effect_properties"],
+              totals["tracks"], totals["baked_tracks"], totals["keyframes"],
+              totals["keyframes_per_second"], totals["pixel_area"]))
+    print("cost {0:.2f}".format(totals["cost"]))
+    if report["offenders"]:
+        print("\ntop offenders:")
+        for cur in report["offenders"]:
+            print("  {0:>3}. {1:<24} {2:>8.2f} {3:>5.0%}  {4}".format(
+                cur["index"], cur["name"][:24], cur["cost"], cur["share"], ", ".join(cur["flags"])))
+
+
+def main(argv):
+    """
+    Command line entry point
+
+    Args:
+        argv (list) : Command line arguments without the program name
+
+    Returns:
+        (int) : Exit status, 1 if the cost exceeds --max-cost
+    """
+    parser = argparse.ArgumentParser(description="Estimates the playback cost of a lottie animation")
+    parser.add_argument("file_name", help="lottie JSON file to be analyzed")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, metavar="N", help="top offenders to flag")
+    parser.add_argument("--max-cost", type=float, metavar="COST", help="fail if the total cost is above")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.file_name) as fil:
+        report = analyze(json.load(fil), args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if args.max_cost is not None and report["totals"]["cost"] > args.max_cost:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,150 @@
+"""
+Stores all the functions required for baking an animated parameter, i.e.
+sampling it the way Synfig interpolates it at every Nth frame and generating
+linear keyframes in lottie
+"""
+
+import sys
+import math
+import settings
+from misc import parse_position
+from model import Animated, Waypoint
+from helpers.interpolation import calc_segments, evaluate, set_components
+from helpers.color import encode_color_track
+sys.path.append("..")
+
+# Types whose values are always held, baking them is of no use
+NOT_BAKED = {"points"}
+
+
+def is_baked(animated):
+    """
+    Tells whether the animation should be baked, depending upon the types
+    selected by the user
+
+    Args:
+        animated (model.Animated) : Synfig format animation
+
+    Returns:
+        (bool) : True if the animation is to be baked
+    """
+    if animated.type in NOT_BAKED or len(animated) < 2:
+        return False
+    return settings.BAKE_ALL in settings.bake_types or animated.type in settings.bake_types
+
+
+def get_sample_frames(t0, t1, fr):
+    """
+    Returns the starting frame of the interval [t0, t1) followed by all the
+    frames inside it which are multiples of the baking step
+
+    Args:
+        t0 (float) : Start of the interval in seconds
+        t1 (float) : End of the interval in seconds
+        fr (float) : Frame rate of the animation
+
+    Returns:
+        (list) : Sorted frames
+    """
+    step = settings.bake_step
+    start, end = t0 * fr, t1 * fr
+    frames = [start]
+    frame = (math.floor(start / step) + 1) * step
+    while frame < end:
+        frames.append(frame)
+        frame += step
+    return frames
+
+
+def gen_baked_keyframed(lottie, animated, idx):
+    """
+    Generates linear keyframes by sampling the animation at the baking step,
+    the waypoints themselves are always sampled, constant intervals are kept
+    as hold keyframes
+
+    Args:
+        lottie   (dict)           : Lottie generated keyframes will be stored here
+        animated (model.Animated) : Synfig format animation
+        idx      (int)            : Index/Count of animation
+
+    Returns:
+        (None)
+    """
+    lottie["a"] = 1
+    lottie["ix"] = idx
+    lottie["k"] = []
+    fr = settings.lottie_format["fr"]
+
+    frames, holds = [], []
+    segments = calc_segments(animated)
+    for seg in segments:
+        if seg.constant:
+            frames.append(seg.t0 * fr)
+            holds.append(True)
+        else:
+            cur = get_sample_frames(seg.t0, seg.t1, fr)
+            frames.extend(cur)
+            holds.extend([False] * len(cur))
+    frames.append(animated[-1].time * fr)
+
+    # Sample all the frames in one pass over the segments
+    values = evaluate(animated, [frame / fr for frame in frames], segments)
+    template = animated[0].value
+    samples = Animated(animated.type)
+    for frame, comps in zip(frames, values):
+        samples.append(Waypoint(frame / fr, set_components(template, comps),
+                                "linear", "linear"))
+    if samples.type == "color":
+        converted = encode_color_track(samples)
+    else:
+        converted = [get_baked_value(samples, i) for i in range(len(samples))]
+
+    for i in range(len(samples) - 1):
+        keyframe = {"t": frames[i], "s": converted[i], "e": converted[i+1]}
+        if holds[i]:
+            keyframe["h"] = 1
+            keyframe["e"] = converted[i]
+            lottie["k"].append(keyframe)
+            continue
+
+        # Tangents of a straight line, kept in Synfig format for the layers
+        # which evaluate the curves themselves
+        third = [(e - s) / settings.TANGENT_FACTOR for s, e in zip(keyframe["s"], keyframe["e"])]
+        if animated.type == "vector":
+            keyframe["i"] = {"x": 1, "y": 1}
+            keyframe["o"] = {"x": 0, "y": 0}
+            keyframe["to"] = [0, 0]
+            keyframe["ti"] = [0, 0]
+            keyframe["synfig_to"] = third
+            keyframe["synfig_ti"] = list(third)
+        else:
+            keyframe["i"] = {"x": [1], "y": [1]}
+            keyframe["o"] = {"x": [0], "y": [0]}
+            keyframe["synfig_o"] = third
+            keyframe["synfig_i"] = list(third)
+        lottie["k"].append(keyframe)
+
+    lottie["k"].append({"t": frames[-1]})
+    if "h" in lottie["k"][-2].keys():
+        # The value jumps to the last waypoint at the end of the hold
+        lottie["k"][-1]["h"] = 1
+        lottie["k"][-1]["s"] = converted[-1]
+
+
+def get_baked_value(samples, i):
+    """
+    Converts a sampled value into the format required by lottie
+
+    Args:
+        samples (model.Animated) : Sampled animation
+        i       (int)            : Iterator over the samples
+
+    Returns:
+        (list) : Value in lottie format
+    """
+    pos = parse_position(samples, i)
+    if samples.type == "vector":
+        x_val, y_val = pos.get_list()
+        return [x_val + settings.lottie_format["w"]/2,
+                -y_val + settings.lottie_format["h"]/2]
+    return pos.get_val()
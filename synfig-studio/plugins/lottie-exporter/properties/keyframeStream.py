@@ -0,0 +1,56 @@
+"""
+Stores the generator building the lottie keyframes of an animation in a
+single forward pass, every keyframe is yielded in its final form as soon as
+the next one is known, so no list of the whole track is needed
+"""
+
+import sys
+import settings
+from properties.timeAdjust import adjust_keyframe
+from properties.offsetKeyframe import TrackTangents
+sys.path.append("..")
+
+
+def iter_keyframes(animated, gen_keyframe):
+    """
+    Yields the lottie keyframes of an animation
+    A keyframe may still be changed while building the next one (TCB/!TCB
+    waypoints), hence a window of two keyframes is kept
+
+    Args:
+        animated     (model.Animated) : Synfig format animation
+        gen_keyframe (callable)       : Fills the last keyframe of a list given the
+                                        animation, the index of the waypoint and the
+                                        tangents of the track, e.g.
+                                        properties.valueKeyframe.gen_value_Keyframe
+
+    Yields:
+        (dict) : Keyframes in lottie format
+    """
+    # Computed a window at a time while the keyframes are built
+    tangents = TrackTangents(animated)
+    window = []
+    for i in range(len(animated) - 1):
+        window.append({})
+        gen_keyframe(window, animated, i, tangents)
+        if len(window) == 2:
+            keyframe = window.pop(0)
+            adjust_keyframe(keyframe, animated, i - 1, tangents.factors)
+            yield keyframe
+
+    last = {"t": animated[-1].time * settings.lottie_format["fr"]}
+    if window:
+        keyframe = window[0]
+        adjust_keyframe(keyframe, animated, len(animated) - 2, tangents.factors)
+        yield keyframe
+        if "h" in keyframe.keys():
+            last["h"] = 1
+            last["s"] = keyframe["e"]
+
+            # specific case for points when prev_points > cur_points
+            if animated.type == "points":
+                if keyframe["s"][0] > last["s"][0]:
+                    # Adding 1 frame to the previous time
+                    prev_frames = animated[-2].time * settings.lottie_format["fr"]
+                    last["t"] = prev_frames + 1
+    yield last
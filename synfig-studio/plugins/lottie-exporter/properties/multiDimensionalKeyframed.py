@@ -4,9 +4,10 @@ multiDimensionalKeyframed file in lottie
 """
 
 import sys
-import settings
 from properties.offsetKeyframe import gen_properties_offset_keyframe
-from properties.timeAdjust import time_adjust
+from properties.keyframeStream import iter_keyframes
+from properties.bakedKeyframed import is_baked, gen_baked_keyframed
+from properties.trackCache import load_track, store_track
 sys.path.append("..")
 
 
@@ -17,25 +18,33 @@ def gen_properties_multi_dimensional_keyframed(lottie, animated, idx):
 
     Args:
         lottie   (dict)                : Lottie generated keyframes will be stored here
-        animated (lxml.etree._Element) : Synfig format animation
+        animated (model.Animated)      : Synfig format animation
         idx      (int)                 : Index/Count of animation
 
     Returns:
         (None)
     """
+    if load_track(lottie, animated, idx, "multi"):
+        return
+    if is_baked(animated):
+        gen_baked_keyframed(lottie, animated, idx)
+        store_track(lottie, animated, "multi")
+        return
     lottie["a"] = 1
     lottie["ix"] = idx
-    lottie["k"] = []
-    for i in range(len(animated) - 1):
-        lottie["k"].append({})
-        gen_properties_offset_keyframe(lottie["k"], animated, i)
-    last_waypoint_time = float(animated[-1].attrib["time"][:-1]) * settings.lottie_format["fr"]
-    lottie["k"].append({})
-    lottie["k"][-1]["t"] = last_waypoint_time
-
-    if  "h" in lottie["k"][-2].keys():
-        lottie["k"][-1]["h"] = 1
-        lottie["k"][-1]["s"] = lottie["k"][-2]["e"]
-
-    # Time adjust of the curves
-    time_adjust(lottie, animated)
+    lottie["k"] = list(iter_offset_keyframes(animated))
+    store_track(lottie, animated, "multi")
+
+
+def iter_offset_keyframes(animated):
+    """
+    Yields the final lottie keyframes of a multi dimensional animation in
+    one pass
+
+    Args:
+        animated (model.Animated) : Synfig format animation
+
+    Yields:
+        (dict) : Keyframes in lottie format
+    """
+    yield from iter_keyframes(animated, gen_properties_offset_keyframe)
@@ -7,8 +7,21 @@ import sys
 import copy
 import settings
 from misc import parse_position, change_axis, Vector
+from properties.timeAdjust import calc_time_factors
 sys.path.append("..")
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Types whose positions are 2 dimensional misc.Vector, see calc_segments()
+BATCH_TYPES = {"vector", "real", "angle", "circle_radius", "opacity", "effects_opacity"}
+# Interpolations handled by calc_segments(), constant goes through calc_tangent()
+BATCH_INTERPOLATIONS = {"auto", "clamped", "linear", "halt"}
+# Intervals whose tangents are computed at once by TrackTangents
+TANGENT_WINDOW = 256
+
 
 def isclose(a_val, b_val, rel_tol=1e-09, abs_tol=0.0):
     """
@@ -36,7 +49,7 @@ def clamped_tangent(p1, p2, p3, animated, i):
         p1       (float)               : First point
         p2       (float)               : Second point
         p3       (float)               : Third point
-        animated (lxml.etree._Element) : Synfig format animation
+        animated (model.Animated)      : Synfig format animation
         i        (int)                 : Iterator over animation
 
     Returns:
@@ -44,9 +57,9 @@ def clamped_tangent(p1, p2, p3, animated, i):
     """
     # pw -> prev_waypoint, w -> waypoint, nw -> next_waypoint
     pw, w, nw = animated[i-1], animated[i], animated[i+1]
-    t1 = float(pw.attrib["time"][:-1]) * settings.lottie_format["fr"]
-    t2 = float(w.attrib["time"][:-1]) * settings.lottie_format["fr"]
-    t3 = float(nw.attrib["time"][:-1]) * settings.lottie_format["fr"]
+    t1 = pw.time * settings.lottie_format["fr"]
+    t2 = w.time * settings.lottie_format["fr"]
+    t3 = nw.time * settings.lottie_format["fr"]
     bias = 0.0
     tangent = 0.0
     pm = p1 + (p3 - p1)*(t2 - t1)/(t3 - t1)
@@ -86,7 +99,7 @@ def clamped_vector(p1, p2, p3, animated, i, lottie, ease):
         p1       (misc.Vector)         : First point in Co-ordinate System
         p2       (misc.Vector)         : Second point in Co-ordinate System
         p3       (misc.Vector)         : Third point in Co-ordinate System
-        animated (lxml.etree._Element) : Synfig format animation
+        animated (model.Animated)      : Synfig format animation
         i        (int)                 : Iterator over animation
         ease     (str)                 : Specifies if it is an ease in animation ease out
 
@@ -101,7 +114,7 @@ def clamped_vector(p1, p2, p3, animated, i, lottie, ease):
             ease_in(lottie)
         else:
             ease_out(lottie)
-    return Vector(x_tan, y_tan, animated.attrib["type"])
+    return Vector(x_tan, y_tan, animated.type)
 
 
 def ease_out(lottie):
@@ -147,14 +160,312 @@ def handle_color():
     return out_val, in_val
 
 
-def calc_tangent(animated, lottie, i):
+class TrackTangents:
+    """
+    Positions of the waypoints of a track and tangents of its intervals,
+    computed by calc_segments() a window of intervals at a time while the
+    track is walked forward, so that the whole track is never held at once
+    They are read by index, e.g. tangents.positions[i]
+    """
+
+    def __init__(self, animated, window=TANGENT_WINDOW, use_numpy=None):
+        """
+        Args:
+            animated  (model.Animated)    : Synfig format animation
+            window    (:obj: `int`, optional) : Number of intervals computed at once
+            use_numpy (:obj: `bool`, optional) : Computes the window as arrays, by
+                                                 default if numpy is installed
+
+        Returns:
+            (None)
+        """
+        self.animated = animated
+        self.window = window
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        self.start = 0
+        self.data = {"positions": [], "factors": [], "segments": []}
+        # misc.Vector of every waypoint, see misc.parse_position()
+        self.positions = TangentsView(self, "positions")
+        # Time factors of every interval, see properties.timeAdjust.calc_time_factors()
+        self.factors = TangentsView(self, "factors")
+        # For every interval either None, if the interval has to go through
+        # calc_tangent(), or (out_val, in_val, ease_out, ease_in)
+        self.segments = TangentsView(self, "segments")
+
+    def load(self, i):
+        """
+        Computes the window holding the i-th waypoint, it starts two waypoints
+        before as the previous keyframe is still rewritten by the TCB/!TCB
+        case and properties.timeAdjust reads the times of the waypoints
+        before it
+
+        Args:
+            i (int) : Index of a waypoint or of an interval
+
+        Returns:
+            (None)
+        """
+        num = len(self.animated)
+        self.start = max(0, i - 2)
+        end = min(num - 1, self.start + self.window)
+        # The tangents of an interval need a waypoint before and two after it
+        first = max(0, self.start - 1)
+        last = min(num, end + 2)
+        positions = [parse_position(self.animated, k) for k in range(first, last)]
+        frames = [self.animated[k].time * settings.lottie_format["fr"] for k in range(first, last)]
+        self.data = {
+            "positions": positions[self.start - first:],
+            "factors": calc_time_factors(frames, self.use_numpy)[self.start - first:end - first],
+            "segments": calc_segments(self.animated, positions, first, self.start, end, self.use_numpy),
+        }
+
+
+class TangentsView:
+    """
+    Indexable view of one of the lists of properties.offsetKeyframe.TrackTangents,
+    the window is moved when an index outside of it is read
+    """
+
+    def __init__(self, tangents, name):
+        """
+        Args:
+            tangents (properties.offsetKeyframe.TrackTangents) : Tangents of the track
+            name     (str)                                     : Name of the list
+
+        Returns:
+            (None)
+        """
+        self.tangents = tangents
+        self.name = name
+
+    def __getitem__(self, i):
+        """
+        Args:
+            i (int) : Index of the waypoint or of the interval in the track
+
+        Returns:
+            (misc.Vector | float | tuple | None) : Value stored for it
+        """
+        values = self.tangents.data[self.name]
+        if not 0 <= i - self.tangents.start < len(values):
+            self.tangents.load(i)
+            values = self.tangents.data[self.name]
+            if not 0 <= i - self.tangents.start < len(values):
+                raise IndexError("{} index out of range".format(self.name))
+        return values[i - self.tangents.start]
+
+
+def calc_tangents(animated):
+    """
+    Returns the tangents of all the intervals of a track, they are computed
+    lazily while being read, see properties.offsetKeyframe.TrackTangents
+
+    Args:
+        animated (model.Animated) : Synfig format animation
+
+    Returns:
+        (properties.offsetKeyframe.TrackTangents) : Tangents of the track
+    """
+    return TrackTangents(animated)
+
+
+def calc_segments(animated, positions, offset, first, last, use_numpy=None):
+    """
+    Calculates the tangents of the intervals first..last-1 of a track at
+    once, every tangent is computed with the same operations as
+    calc_tangent() so that the results are identical
+    Constant intervals and the types whose positions are not 2 dimensional
+    misc.Vector are left to calc_tangent()
+
+    Args:
+        animated  (model.Animated) : Synfig format animation
+        positions (list)           : misc.Vector of the waypoints from offset to last+1
+        offset    (int)            : Index of the first waypoint of positions
+        first     (int)            : Index of the first interval
+        last      (int)            : Index after the last interval
+        use_numpy (:obj: `bool`, optional) : Computes the tangents as arrays, by
+                                             default if numpy is installed
+
+    Returns:
+        (list) : For every interval None or (out_val, in_val, ease_out, ease_in)
+    """
+    num = len(animated)
+    waypoints = animated.waypoints
+    segments = [None] * max(0, last - first)
+    if animated.type not in BATCH_TYPES or not segments:
+        return segments
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if use_numpy:
+        return calc_segments_numpy(animated, positions, offset, first, last)
+
+    is_angle = animated.type == "angle"
+    vals = [(pos.val1, pos.val2) for pos in positions]
+    for i in range(first, last):
+        waypoint, next_waypoint = waypoints[i], waypoints[i+1]
+        cur_get_after, next_get_before = waypoint.after, next_waypoint.before
+        if is_angle:
+            cur_get_after = "linear" if cur_get_after == "auto" else cur_get_after
+            next_get_before = "linear" if next_get_before == "auto" else next_get_before
+        if cur_get_after not in BATCH_INTERPOLATIONS or next_get_before not in BATCH_INTERPOLATIONS:
+            continue
+
+        k = i - offset
+        cur, nxt = vals[k], vals[k+1]
+        diff = (nxt[0] - cur[0], nxt[1] - cur[1])
+        ease_out_flag, ease_in_flag = False, False
+
+        # ANY/TCB, ANY/LINEAR, ANY/EASE ---- ANY/ANY
+        if cur_get_after == "auto" and i >= 1:
+            prev = vals[k-1]
+            tens, bias, cont = waypoint.tension, waypoint.bias, waypoint.continuity
+            f_prev = (1 - tens) * (1 + bias) * (1 + cont)
+            f_next = (1 - tens) * (1 - bias) * (1 - cont)
+            out_val = tuple((f_prev * (c - p))/2 + (f_next * (n - c))/2
+                            for p, c, n in zip(prev, cur, nxt))
+        elif cur_get_after == "clamped" and i >= 1:
+            prev = vals[k-1]
+            out_val = (clamped_tangent(prev[0], cur[0], nxt[0], animated, i),
+                       clamped_tangent(prev[1], cur[1], nxt[1], animated, i))
+            ease_out_flag = isclose(out_val[0], 0.0) or isclose(out_val[1], 0.0)
+        else:
+            out_val = diff
+
+        # ANY/ANY ---- TCB/ANY, CLAMPED/ANY, LINEAR/ANY, EASE/ANY
+        if next_get_before == "auto" and i + 2 <= num - 1:
+            after_next = vals[k+2]
+            tens1, bias1, cont1 = next_waypoint.tension, next_waypoint.bias, next_waypoint.continuity
+            f_cur = (1 - tens1) * (1 + bias1) * (1 - cont1)
+            f_next = (1 - tens1) * (1 - bias1) * (1 + cont1)
+            in_val = tuple((f_cur * (n - c))/2 + (f_next * (a - n))/2
+                           for c, n, a in zip(cur, nxt, after_next))
+        elif next_get_before == "clamped" and i + 2 <= num - 1:
+            after_next = vals[k+2]
+            in_val = (clamped_tangent(cur[0], nxt[0], after_next[0], animated, i + 1),
+                      clamped_tangent(cur[1], nxt[1], after_next[1], animated, i + 1))
+            ease_in_flag = isclose(in_val[0], 0.0) or isclose(in_val[1], 0.0)
+        else:
+            in_val = diff
+
+        segments[i - first] = (Vector(out_val[0], out_val[1], animated.type),
+                               Vector(in_val[0], in_val[1], animated.type),
+                               ease_out_flag, ease_in_flag)
+    return segments
+
+
+def clamped_tangent_numpy(p1, p2, p3, t1, t2, t3):
+    """
+    Same as clamped_tangent() for arrays of points and of their times in
+    frames, the branches are replaced by masks
+
+    Args:
+        p1 (numpy.ndarray) : First points
+        p2 (numpy.ndarray) : Second points
+        p3 (numpy.ndarray) : Third points
+        t1 (numpy.ndarray) : Times of the first points
+        t2 (numpy.ndarray) : Times of the second points
+        t3 (numpy.ndarray) : Times of the third points
+
+    Returns:
+        (numpy.ndarray) : Clamped tangents
+    """
+    # The masked out values may divide by zero
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        pm = p1 + (p3 - p1)*(t2 - t1)/(t3 - t1)
+        rising = (p3 > p1) & ~((p2 >= p3) | (p2 <= p1))
+        falling = ~(p3 > p1) & (p1 > p2) & ~((p2 >= p1) | (p2 <= p3))
+        to_first = (pm - p2) / (pm - p1)
+        to_last = (pm - p2) / (p3 - pm)
+        bias = numpy.where(p2 > pm, numpy.where(rising, to_last, to_first),
+                           numpy.where(p2 < pm, numpy.where(rising, to_first, to_last), 0.0))
+        tangent = (p2 - p1) * (1.0 + bias) / 2.0 + (p3 - p2) * (1.0 - bias) / 2.0
+    return numpy.where(rising | falling, tangent, 0.0)
+
+
+def calc_segments_numpy(animated, positions, offset, first, last):
+    """
+    Same as calc_segments() with all the intervals computed as arrays, the
+    interpolations pick the tangent of every interval through masks
+
+    Args:
+        animated  (model.Animated) : Synfig format animation
+        positions (list)           : misc.Vector of the waypoints from offset to last+1
+        offset    (int)            : Index of the first waypoint of positions
+        first     (int)            : Index of the first interval
+        last      (int)            : Index after the last interval
+
+    Returns:
+        (list) : For every interval None or (out_val, in_val, ease_out, ease_in)
+    """
+    num = len(animated)
+    waypoints = animated.waypoints[offset:offset + len(positions)]
+    vals = numpy.array([(pos.val1, pos.val2) for pos in positions], dtype=float)
+    times = numpy.array([waypoint.time for waypoint in waypoints], dtype=float) * settings.lottie_format["fr"]
+    tcb = numpy.array([(w.tension, w.bias, w.continuity) for w in waypoints], dtype=float)
+    afters = [waypoint.after for waypoint in waypoints]
+    befores = [waypoint.before for waypoint in waypoints]
+    if animated.type == "angle":
+        afters = ["linear" if after == "auto" else after for after in afters]
+        befores = ["linear" if before == "auto" else before for before in befores]
+    afters, befores = numpy.array(afters), numpy.array(befores)
+
+    index = numpy.arange(first, last)
+    k = index - offset
+    # Only valid where there is a waypoint before or after next, see the masks
+    k_prev = numpy.maximum(k - 1, 0)
+    k_after = numpy.minimum(k + 2, len(positions) - 1)
+    cur_after, next_before = afters[k], befores[k+1]
+    interpolations = list(BATCH_INTERPOLATIONS)
+    batched = numpy.isin(cur_after, interpolations) & numpy.isin(next_before, interpolations)
+    has_prev = (index >= 1)[:, None]
+    has_after = (index + 2 <= num - 1)[:, None]
+
+    prev, cur, nxt, after_next = vals[k_prev], vals[k], vals[k+1], vals[k_after]
+    diff = nxt - cur
+
+    # ANY/TCB, ANY/LINEAR, ANY/EASE ---- ANY/ANY
+    tens, bias, cont = tcb[k].T
+    f_prev = ((1 - tens) * (1 + bias) * (1 + cont))[:, None]
+    f_next = ((1 - tens) * (1 - bias) * (1 - cont))[:, None]
+    tcb_out = (f_prev * (cur - prev))/2 + (f_next * (nxt - cur))/2
+    t_prev, t_cur, t_next = times[k_prev][:, None], times[k][:, None], times[k+1][:, None]
+    clamped_out = clamped_tangent_numpy(prev, cur, nxt, t_prev, t_cur, t_next)
+    auto_out = (cur_after == "auto")[:, None] & has_prev
+    clamp_out = (cur_after == "clamped")[:, None] & has_prev
+    out_val = numpy.where(auto_out, tcb_out, numpy.where(clamp_out, clamped_out, diff))
+    ease_out_flag = clamp_out[:, 0] & (clamped_out == 0.0).any(axis=1)
+
+    # ANY/ANY ---- TCB/ANY, CLAMPED/ANY, LINEAR/ANY, EASE/ANY
+    tens1, bias1, cont1 = tcb[k+1].T
+    f_cur = ((1 - tens1) * (1 + bias1) * (1 - cont1))[:, None]
+    f_next = ((1 - tens1) * (1 - bias1) * (1 + cont1))[:, None]
+    tcb_in = (f_cur * (nxt - cur))/2 + (f_next * (after_next - nxt))/2
+    t_after = times[k_after][:, None]
+    clamped_in = clamped_tangent_numpy(cur, nxt, after_next, t_cur, t_next, t_after)
+    auto_in = (next_before == "auto")[:, None] & has_after
+    clamp_in = (next_before == "clamped")[:, None] & has_after
+    in_val = numpy.where(auto_in, tcb_in, numpy.where(clamp_in, clamped_in, diff))
+    ease_in_flag = clamp_in[:, 0] & (clamped_in == 0.0).any(axis=1)
+
+    segments = [None] * (last - first)
+    rows = zip(batched.tolist(), out_val.tolist(), in_val.tolist(),
+               ease_out_flag.tolist(), ease_in_flag.tolist())
+    for j, (ok, (out0, out1), (in0, in1), ease_out_j, ease_in_j) in enumerate(rows):
+        if ok:
+            segments[j] = (Vector(out0, out1, animated.type), Vector(in0, in1, animated.type),
+                           ease_out_j, ease_in_j)
+    return segments
+
+
+def calc_tangent(animated, lottie, i, tangents=None):
     """
     Calculates the tangent, given two waypoints and there interpolation methods
 
     Args:
-        animated (lxml.etree._Element) : Synfig format animation
+        animated (model.Animated)      : Synfig format animation
         lottie   (dict)                : Lottie format animation stored here
         i        (int)                 : Iterator for animation
+        tangents (:obj: `properties.offsetKeyframe.TrackTangents`, optional) : Precomputed tangents
 
     Returns:
         (Misc.Vector) : If waypoint's value is parsed to misc.Vector by misc.parse_position()
@@ -162,11 +473,19 @@ def calc_tangent(animated, lottie, i):
         (float)       : If waypoint's value is parsed to float ...
         (None)        : If "constant" interval is detected
     """
+    if tangents is not None and tangents.segments[i] is not None:
+        out_val, in_val, ease_out_flag, ease_in_flag = tangents.segments[i]
+        if ease_out_flag:
+            ease_out(lottie)
+        if ease_in_flag:
+            ease_in(lottie)
+        return out_val, in_val
+
     waypoint, next_waypoint = animated[i], animated[i+1]
-    cur_get_after, next_get_before = waypoint.attrib["after"], next_waypoint.attrib["before"]
-    cur_get_before, next_get_after = waypoint.attrib["before"], next_waypoint.attrib["after"]
+    cur_get_after, next_get_before = waypoint.after, next_waypoint.before
+    cur_get_before, next_get_after = waypoint.before, next_waypoint.after
 
-    if animated.attrib["type"] == "angle":
+    if animated.type == "angle":
         if cur_get_after == "auto":
             cur_get_after = "linear"
         if cur_get_before == "auto":
@@ -177,7 +496,7 @@ def calc_tangent(animated, lottie, i):
             next_get_after = "linear"
 
     # Synfig only supports constant interpolations for points
-    if animated.attrib["type"] == "points":
+    if animated.type == "points":
         cur_get_after = "constant"
         cur_get_before = "constant"
         next_get_after = "constant"
@@ -185,7 +504,7 @@ def calc_tangent(animated, lottie, i):
 
     # After effects only supports linear,ease-in,ease-out and constant interpolations for color
     ##### No support for TCB and clamped interpolations in color is there yet #####
-    if animated.attrib["type"] == "color":
+    if animated.type == "color":
         if cur_get_after in {"auto", "clamped"}:
             cur_get_after = "linear"
         if cur_get_before in {"auto", "clamped"}:
@@ -197,33 +516,21 @@ def calc_tangent(animated, lottie, i):
 
     # Calculate positions of waypoints
     cur_pos = parse_position(animated, i)
-    prev_pos = copy.deepcopy(cur_pos)
+    prev_pos = copy.copy(cur_pos)
     next_pos = parse_position(animated, i + 1)
-    after_next_pos = copy.deepcopy(next_pos)
+    after_next_pos = copy.copy(next_pos)
 
     if i + 2 <= len(animated) - 1:
         after_next_pos = parse_position(animated, i + 2)
     if i - 1 >= 0:
         prev_pos = parse_position(animated, i - 1)
 
-    tens, bias, cont = 0, 0, 0   # default values
-    tens1, bias1, cont1 = 0, 0, 0
-    if "tension" in waypoint.keys():
-        tens = float(waypoint.attrib["tension"])
-    if "continuity" in waypoint.keys():
-        cont = float(waypoint.attrib["continuity"])
-    if "bias" in waypoint.keys():
-        bias = float(waypoint.attrib["bias"])
-    if "tension" in next_waypoint.keys():
-        tens1 = float(next_waypoint.attrib["tension"])
-    if "continuity" in next_waypoint.keys():
-        cont1 = float(next_waypoint.attrib["continuity"])
-    if "bias" in next_waypoint.keys():
-        bias1 = float(next_waypoint.attrib["bias"])
+    tens, bias, cont = waypoint.tension, waypoint.bias, waypoint.continuity
+    tens1, bias1, cont1 = next_waypoint.tension, next_waypoint.bias, next_waypoint.continuity
 
 
     ### Special case for color interpolations ###
-    if animated.attrib["type"] == "color":
+    if animated.type == "color":
         if cur_get_after == "linear" and next_get_before == "linear":
             return handle_color()
 
@@ -279,7 +586,7 @@ def calc_tangent(animated, lottie, i):
     # ANY/ANY      ---- CONSTANT/ANY
     if cur_get_after == "constant" or next_get_before == "constant":
         lottie["h"] = 1
-        if animated.attrib["type"] == "vector":
+        if animated.type == "vector":
             del lottie["to"], lottie["ti"]
         del lottie["i"], lottie["o"]
         # "e" is not needed, but is still not deleted as
@@ -290,9 +597,9 @@ def calc_tangent(animated, lottie, i):
         # If the number of points is decresing, then hold interpolation should
         # have reverse effect. The value should instantly decrease and remain
         # same for the rest of the interval
-        if animated.attrib["type"] == "points":
+        if animated.type == "points":
             if i > 0 and prev_pos.val1 > cur_pos.val1:
-                t_now = float(animated[i-1].attrib["time"][:-1]) * settings.lottie_format["fr"] + 1
+                t_now = animated[i-1].time * settings.lottie_format["fr"] + 1
                 lottie["t"] = t_now
         return
 
@@ -309,14 +616,15 @@ def calc_tangent(animated, lottie, i):
     return out_val, in_val
 
 
-def gen_properties_offset_keyframe(curve_list, animated, i):
+def gen_properties_offset_keyframe(curve_list, animated, i, tangents=None):
     """
     Generates the dictionary corresponding to properties/offsetKeyFrame.json
 
     Args:
         curve_list (list)                : Stores bezier curve in Lottie format
-        animated   (lxml.etree._Element) : Synfig format animation
+        animated   (model.Animated)      : Synfig format animation
         i          (int)                 : Iterator for animation
+        tangents   (:obj: `properties.offsetKeyframe.TrackTangents`, optional) : Precomputed tangents
 
     Returns:
         (TypeError) : If a constant interval is encountered
@@ -325,11 +633,11 @@ def gen_properties_offset_keyframe(curve_list, animated, i):
     lottie = curve_list[-1]
 
     waypoint, next_waypoint = animated[i], animated[i+1]
-    cur_get_after, next_get_before = waypoint.attrib["after"], next_waypoint.attrib["before"]
-    cur_get_before, next_get_after = waypoint.attrib["before"], next_waypoint.attrib["after"]
+    cur_get_after, next_get_before = waypoint.after, next_waypoint.before
+    cur_get_before, next_get_after = waypoint.before, next_waypoint.after
 
     # "angle" interpolations never call this function, can be removed by confirming
-    if animated.attrib["type"] == "angle":
+    if animated.type == "angle":
         if cur_get_after == "auto":
             cur_get_after = "linear"
         if cur_get_before == "auto":
@@ -341,15 +649,18 @@ def gen_properties_offset_keyframe(curve_list, animated, i):
 
     # Synfig only supports constant interpolations for points
     # "points" never call this function, can be removed by confirming
-    if animated.attrib["type"] == "points":
+    if animated.type == "points":
         cur_get_after = "constant"
         cur_get_before = "constant"
         next_get_after = "constant"
         next_get_before = "constant"
 
     # Calculate positions of waypoints
-    cur_pos = parse_position(animated, i)
-    next_pos = parse_position(animated, i + 1)
+    if tangents is not None:
+        cur_pos, next_pos = tangents.positions[i], tangents.positions[i+1]
+    else:
+        cur_pos = parse_position(animated, i)
+        next_pos = parse_position(animated, i + 1)
 
     lottie["i"] = {}    # Time bezier curve, not used in synfig
     lottie["o"] = {}    # Time bezier curve, not used in synfig
@@ -361,7 +672,7 @@ def gen_properties_offset_keyframe(curve_list, animated, i):
         ease_out(lottie)
     if next_get_before == "halt": # For ease in
         ease_in(lottie)
-    lottie["t"] = float(waypoint.attrib["time"][:-1]) * settings.lottie_format["fr"]
+    lottie["t"] = waypoint.time * settings.lottie_format["fr"]
     #lottie["s"] = [cur_pos.val1, cur_pos.val2]
     #lottie["e"] = [next_pos.val1, next_pos.val2]
     lottie["s"] = change_axis(cur_pos.val1, cur_pos.val2)
@@ -371,7 +682,7 @@ def gen_properties_offset_keyframe(curve_list, animated, i):
 
     # Calculating the unchanged tangent
     try:
-        out_val, in_val = calc_tangent(animated, lottie, i)
+        out_val, in_val = calc_tangent(animated, lottie, i, tangents)
     except Exception as excep:
         # This means constant interval
         return excep
@@ -382,8 +693,7 @@ def gen_properties_offset_keyframe(curve_list, animated, i):
 
     # TCB/!TCB and list is not empty
     if cur_get_before == "auto" and cur_get_after != "auto" and i > 0:
-        curve_list[-2]["ti"] = copy.deepcopy(lottie["to"])
-        curve_list[-2]["ti"] = [-item/settings.TANGENT_FACTOR for item in curve_list[-2]["ti"]]
+        curve_list[-2]["ti"] = [-item/settings.TANGENT_FACTOR for item in lottie["to"]]
         curve_list[-2]["ti"][1] = -curve_list[-2]["ti"][1]
         if cur_get_after == "halt":
             curve_list[-2]["i"]["x"] = settings.IN_TANGENT_X
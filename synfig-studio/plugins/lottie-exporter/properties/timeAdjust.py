@@ -4,8 +4,16 @@ waypoints in Synfig
 """
 
 import sys
+import settings
 sys.path.append("../")
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+TIME_ADJUST = 0.5
+
 
 def time_adjust(lottie, animated):
     """
@@ -14,54 +22,116 @@ def time_adjust(lottie, animated):
 
     Args:
         lottie   (dict)                : Holds bezier curve in Lottie format
-        animated (lxml.etree._Element) : Synfig format animation
+        animated (model.Animated)      : Synfig format animation
 
     Returns:
         (None)
     """
-    timeadjust = 0.5
+    frames = [waypoint.time * settings.lottie_format["fr"] for waypoint in animated]
+    factors = calc_time_factors(frames)
     for i in range(len(animated) - 1):
-        if i == 0:
-            continue
-        time_span_cur = lottie["k"][i+1]["t"] - lottie["k"][i]["t"]
-        time_span_prev = lottie["k"][i]["t"] - lottie["k"][i-1]["t"]
-        cur_get_after = animated[i].attrib["after"]
-        next_get_before = animated[i+1].attrib["before"]
-
-        # prev              iter
-        # ANY/CONSTANT ---- ANY/ANY
-        # ANY/ANY      ---- CONSTANT/ANY
-        if cur_get_after == "constant" or next_get_before == "constant":
-            continue
-
-        if animated.attrib["type"] == "real":
-            if cur_get_after != "linear":
-                lottie["k"][i]["o"]["x"][0] *= (time_span_cur * (timeadjust + 1)) /\
-                        (time_span_cur * timeadjust + time_span_prev)
-                lottie["k"][i]["o"]["y"][0] *= (time_span_cur * (timeadjust + 1)) /\
-                        (time_span_cur * timeadjust + time_span_prev)
-            if next_get_before != "linear":
-                if i + 2 <= len(animated) - 1:
-                    time_span_next = lottie["k"][i+2]["t"] - lottie["k"][i+1]["t"]
-                    lottie["k"][i]["i"]["x"][0] *= (time_span_cur * (timeadjust + 1)) /\
-                            (time_span_cur * timeadjust + time_span_next)
-
-        elif animated.attrib["type"] == "vector":
-
-            # prev    --- iter        --- next
-            # ANY/ANY --- ANY/!LINEAR --- ANY/ANY
-            if cur_get_after != "linear":
-                for dim in range(len(lottie["k"][i]["to"])):
-                    lottie["k"][i]["to"][dim] = lottie["k"][i]["to"][dim] *\
-                    (time_span_cur * (timeadjust + 1)) /\
-                    (time_span_cur * timeadjust + time_span_prev)
-
-            # iter    --- next        --- after_next
-            # ANY/ANY --- !LINEAR/ANY --- ANY/ANY
-            if next_get_before != "linear":
-                for dim in range(len(lottie["k"][i]["to"])):
-                    if i + 2 <= len(animated) - 1:
-                        time_span_next = lottie["k"][i+2]["t"] - lottie["k"][i+1]["t"]
-                        lottie["k"][i]["ti"][dim] = lottie["k"][i]["ti"][dim] *\
-                        (time_span_cur * (timeadjust + 1)) /\
-                        (time_span_cur * timeadjust + time_span_next)
+        adjust_keyframe(lottie["k"][i], animated, i, factors)
+
+
+def calc_time_factors(frames, use_numpy=None):
+    """
+    Calculates the factors by which adjust_keyframe() scales the tangents of
+    the intervals, they only depend upon the times of the neighbouring
+    waypoints so they are computed for all the intervals at once
+
+    Args:
+        frames    (list) : Time in frames of consecutive waypoints
+        use_numpy (:obj: `bool`, optional) : Computes the factors as arrays, by
+                                             default if numpy is installed
+
+    Returns:
+        (list) : For every waypoint None if it is the first or the last one,
+                 else the factors of the out and of the in tangent of the
+                 interval starting at it, None if there is no waypoint after
+                 it or the times of the waypoints are the same
+    """
+    num = len(frames)
+    factors = [None] * num
+    if num < 3:
+        return factors
+    if use_numpy is None:
+        use_numpy = numpy is not None
+
+    if use_numpy:
+        times = numpy.array(frames, dtype=float)
+        spans = times[1:] - times[:-1]
+        span_cur = spans[1:]
+        # Previous and next span of every interval, the last one has no next
+        span_other = numpy.stack((spans[:-1], numpy.append(spans[2:], 0.0)))
+        denominators = span_cur * TIME_ADJUST + span_other
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            ratios = (span_cur * (TIME_ADJUST + 1)) / denominators
+        valid = denominators != 0
+        out_factors, in_factors = [[ratio if ok else None for ratio, ok in zip(*row)]
+                                   for row in zip(ratios.tolist(), valid.tolist())]
+    else:
+        out_factors, in_factors = [], []
+        for k in range(1, num - 1):
+            span_cur = frames[k+1] - frames[k]
+            span_next = frames[k+2] - frames[k+1] if k + 2 < num else 0.0
+            for ratios, span in ((out_factors, frames[k] - frames[k-1]), (in_factors, span_next)):
+                denominator = span_cur * TIME_ADJUST + span
+                ratios.append((span_cur * (TIME_ADJUST + 1)) / denominator if denominator != 0 else None)
+
+    for k in range(1, num - 1):
+        factors[k] = (out_factors[k-1], in_factors[k-1] if k + 2 < num else None)
+    return factors
+
+
+def adjust_keyframe(keyframe, animated, i, factors=None):
+    """
+    Adjusts the tangents of a single keyframe, it only depends upon the times
+    of the neighbouring waypoints so it can be done as soon as the keyframe
+    is complete
+
+    Args:
+        keyframe (dict)           : i-th keyframe in Lottie format
+        animated (model.Animated) : Synfig format animation
+        i        (int)            : Index of the keyframe
+        factors  (:obj: `list`, optional) : Factors of every waypoint, see calc_time_factors()
+
+    Returns:
+        (None)
+    """
+    if i == 0 or i >= len(animated) - 1:
+        return
+    cur_get_after = animated[i].after
+    next_get_before = animated[i+1].before
+
+    # prev              iter
+    # ANY/CONSTANT ---- ANY/ANY
+    # ANY/ANY      ---- CONSTANT/ANY
+    if cur_get_after == "constant" or next_get_before == "constant":
+        return
+    if animated.type not in {"real", "vector"}:
+        return
+
+    if factors is None:
+        frames = [waypoint.time * settings.lottie_format["fr"] for waypoint in animated]
+        factors = calc_time_factors(frames)
+    out_factor, in_factor = factors[i]
+
+    if animated.type == "real":
+        if cur_get_after != "linear" and out_factor is not None:
+            keyframe["o"]["x"][0] *= out_factor
+            keyframe["o"]["y"][0] *= out_factor
+        if next_get_before != "linear" and in_factor is not None:
+            keyframe["i"]["x"][0] *= in_factor
+
+    else:
+        # prev    --- iter        --- next
+        # ANY/ANY --- ANY/!LINEAR --- ANY/ANY
+        if cur_get_after != "linear" and out_factor is not None:
+            for dim in range(len(keyframe["to"])):
+                keyframe["to"][dim] = keyframe["to"][dim] * out_factor
+
+        # iter    --- next        --- after_next
+        # ANY/ANY --- !LINEAR/ANY --- ANY/ANY
+        if next_get_before != "linear" and in_factor is not None:
+            for dim in range(len(keyframe["to"])):
+                keyframe["ti"][dim] = keyframe["ti"][dim] * in_factor
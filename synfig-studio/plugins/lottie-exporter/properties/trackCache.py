@@ -0,0 +1,64 @@
+"""
+Stores the functions which memoize the converted animations of the values
+exported in <defs>, so that a value used by several layers is converted
+only once per conversion
+"""
+
+import sys
+import copy
+import settings
+sys.path.append("..")
+
+
+def get_key(animated, kind):
+    """
+    Returns the key of the animation in the cache
+
+    Args:
+        animated (model.Animated) : Synfig format animation
+        kind     (str)            : Generator which converts the animation
+
+    Returns:
+        (tuple | None) : Key if the animation references an exported value
+    """
+    if animated.ref is None:
+        return None
+    return (animated.ref, animated.type, kind)
+
+
+def load_track(lottie, animated, idx, kind):
+    """
+    Fills lottie with the cached conversion of the animation
+
+    Args:
+        lottie   (dict)           : Lottie keyframes will be stored here
+        animated (model.Animated) : Synfig format animation
+        idx      (int)            : Index/Count of animation
+        kind     (str)            : Generator which converts the animation
+
+    Returns:
+        (bool) : True if the animation was found in the cache
+    """
+    key = get_key(animated, kind)
+    if key is None or key not in settings.track_cache.keys():
+        return False
+    lottie.update(copy.deepcopy(settings.track_cache[key]))
+    lottie["ix"] = idx
+    return True
+
+
+def store_track(lottie, animated, kind):
+    """
+    Stores the conversion of the animation in the cache
+
+    Args:
+        lottie   (dict)           : Converted lottie keyframes
+        animated (model.Animated) : Synfig format animation
+        kind     (str)            : Generator which converts the animation
+
+    Returns:
+        (None)
+    """
+    key = get_key(animated, kind)
+    if key is not None:
+        settings.track_cache[key] = copy.deepcopy(lottie)
@@ -56,15 +56,16 @@ def normalize_tangents(cur_pos, next_pos, t_in, t_out):
     t_in["y"][0] = abs(t_in["y"][0] / value_scale - value_diff)
 
 
-def gen_value_Keyframe(curve_list, animated, i):
+def gen_value_Keyframe(curve_list, animated, i, tangents=None):
     """
     Generates the dictionary corresponding to properties/valueKeyframe.json in lottie
     documentation
 
     Args:
         curve_list (list)                : Bezier curve in Lottie format
-        animated   (lxml.etree._Element) : Synfig format animation
+        animated   (model.Animated)      : Synfig format animation
         i          (int)                 : Iterator for animation
+        tangents   (:obj: `properties.offsetKeyframe.TrackTangents`, optional) : Precomputed tangents
 
     Returns:
         (TypeError) : If hold interval is encountered
@@ -72,10 +73,10 @@ def gen_value_Keyframe(curve_list, animated, i):
     """
     lottie = curve_list[-1]
     waypoint, next_waypoint = animated[i], animated[i+1]
-    cur_get_after, next_get_before = waypoint.attrib["after"], next_waypoint.attrib["before"]
-    cur_get_before, next_get_after = waypoint.attrib["before"], next_waypoint.attrib["after"]
+    cur_get_after, next_get_before = waypoint.after, next_waypoint.before
+    cur_get_before, next_get_after = waypoint.before, next_waypoint.after
     # Calculate positions of waypoints
-    if animated.attrib["type"] == "angle":
+    if animated.type == "angle":
         if cur_get_after == "auto":
             cur_get_after = "linear"
         if cur_get_before == "auto":
@@ -86,7 +87,7 @@ def gen_value_Keyframe(curve_list, animated, i):
             next_get_after = "linear"
 
     # Synfig only supports constant interpolations for points
-    if animated.attrib["type"] == "points":
+    if animated.type == "points":
         cur_get_after = "constant"
         cur_get_before = "constant"
         next_get_after = "constant"
@@ -94,7 +95,7 @@ def gen_value_Keyframe(curve_list, animated, i):
 
     # After effects only supports linear,ease-in,ease-out and constant interpolations for color
     ##### No support for TCB and clamped interpolations in color is there yet #####
-    if animated.attrib["type"] == "color":
+    if animated.type == "color":
         if cur_get_after in {"auto", "clamped"}:
             cur_get_after = "linear"
         if cur_get_before in {"auto", "clamped"}:
@@ -104,10 +105,13 @@ def gen_value_Keyframe(curve_list, animated, i):
         if next_get_after in {"auto", "clamped"}:
             next_get_after = "linear"
 
-    cur_pos = parse_position(animated, i)
-    next_pos = parse_position(animated, i + 1)
+    if tangents is not None:
+        cur_pos, next_pos = tangents.positions[i], tangents.positions[i+1]
+    else:
+        cur_pos = parse_position(animated, i)
+        next_pos = parse_position(animated, i + 1)
 
-    lottie["t"] = float(waypoint.attrib["time"][:-1]) * settings.lottie_format["fr"]
+    lottie["t"] = waypoint.time * settings.lottie_format["fr"]
     lottie["s"] = cur_pos.get_val()
     lottie["e"] = next_pos.get_val()
 
@@ -115,7 +119,7 @@ def gen_value_Keyframe(curve_list, animated, i):
     lottie["o"] = {}
 
     try:
-        out_val, in_val = calc_tangent(animated, lottie, i)
+        out_val, in_val = calc_tangent(animated, lottie, i, tangents)
     except Exception as excep:
         # That means halt/constant interval
         return excep
@@ -136,9 +140,10 @@ def gen_value_Keyframe(curve_list, animated, i):
 
         # need value for previous tangents
         # It may be helpful to store them somewhere
-        prev_ov, prev_iv = calc_tangent(animated, curve_list[-2], i - 1)
+        prev_ov, prev_iv = calc_tangent(animated, curve_list[-2], i - 1, tangents)
         prev_iv = out_val
-        set_tangents(prev_ov, prev_iv, parse_position(animated, i-1), cur_pos, curve_list[-2], animated)
+        prev_pos = tangents.positions[i-1] if tangents is not None else parse_position(animated, i-1)
+        set_tangents(prev_ov, prev_iv, prev_pos, cur_pos, curve_list[-2], animated)
         if cur_get_after == "halt":
             curve_list[-2]["i"]["x"][0] = settings.IN_TANGENT_X
             curve_list[-2]["i"]["y"][0] = settings.IN_TANGENT_Y
@@ -155,7 +160,7 @@ def set_tangents(out_val, in_val, cur_pos, next_pos, lottie, animated):
         cur_pos   (misc.Vector)         : Current position in co-ordinate system
         next_pos  (misc.Vector)         : Next position in co-ordinate system
         lottie    (dict)                : bezier interval in lottie format
-        animation (lxml.etree._Element) : Synfig format animation
+        animation (model.Animated)      : Synfig format animation
 
     Returns:
         (None)
@@ -179,5 +184,5 @@ def set_tangents(out_val, in_val, cur_pos, next_pos, lottie, animated):
     lottie["synfig_o"] = [lottie["o"]["y"][0]]
 
     # If type is color, the tangents are already normalized
-    if animated.attrib["type"] != "color":
+    if animated.type != "color":
         normalize_tangents(cur_pos, next_pos, lottie["i"], lottie["o"])
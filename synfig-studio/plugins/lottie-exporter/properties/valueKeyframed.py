@@ -3,9 +3,10 @@ Stores all the functions required for generating value key frames in lottie
 """
 
 import sys
-import settings
-from properties.timeAdjust import time_adjust
+from properties.keyframeStream import iter_keyframes
+from properties.bakedKeyframed import is_baked, gen_baked_keyframed
 from properties.valueKeyframe import gen_value_Keyframe
+from properties.trackCache import load_track, store_track
 sys.path.append("../")
 
 
@@ -16,31 +17,32 @@ def gen_value_Keyframed(lottie, animated, idx):
 
     Args:
         lottie (dict)                  : Lottie bezier curve stored in this
-        animated (lxml.etree._Element) : Synfig format animation
+        animated (model.Animated)      : Synfig format animation
         idx      (int)                 : Index of animation
 
     Returns:
         (None)
     """
+    if load_track(lottie, animated, idx, "value"):
+        return
+    if is_baked(animated):
+        gen_baked_keyframed(lottie, animated, idx)
+        store_track(lottie, animated, "value")
+        return
     lottie["ix"] = idx
     lottie["a"] = 1
-    lottie["k"] = []
-    for i in range(len(animated) - 1):
-        lottie["k"].append({})
-        gen_value_Keyframe(lottie["k"], animated, i)
-    last_waypoint_time = float(animated[-1].attrib["time"][:-1]) * settings.lottie_format["fr"]
-    lottie["k"].append({})
-    lottie["k"][-1]["t"] = last_waypoint_time
-
-    if "h" in lottie["k"][-2].keys():
-        lottie["k"][-1]["h"] = 1
-        lottie["k"][-1]["s"] = lottie["k"][-2]["e"]
-
-        # specific case for points when prev_points > cur_points
-        if animated.attrib["type"] == "points":
-            if lottie["k"][-2]["s"][0] > lottie["k"][-1]["s"][0]:
-                # Adding 1 frame to the previous time
-                prev_frames = float(animated[-2].attrib["time"][:-1]) * settings.lottie_format["fr"]
-                lottie["k"][-1]["t"] = prev_frames + 1
-
-    time_adjust(lottie, animated)
+    lottie["k"] = list(iter_value_keyframes(animated))
+    store_track(lottie, animated, "value")
+
+
+def iter_value_keyframes(animated):
+    """
+    Yields the final lottie keyframes of a value animation in one pass
+
+    Args:
+        animated (model.Animated) : Synfig format animation
+
+    Yields:
+        (dict) : Keyframes in lottie format
+    """
+    yield from iter_keyframes(animated, gen_value_Keyframe)
@@ -43,6 +43,10 @@ EFFECTS_INVERT = 7  # same as All mask, don't know why
 EFFECTS_HFEATHER = 0    # horizontal feather
 EFFECTS_VFEATHER = 0    # vertical feather
 EFFECTS_OPACITY = 0     # Opacity ty = 0
+BAKE_ALL = "all"        # Bake the animations of every type
+DEFAULT_BAKE_STEP = 1   # Bake at every frame
+DEFAULT_PRECISION = 3   # Decimal places kept by the output optimizer
+RECTANGLE_TOLERANCE = 0.1   # Pixels a rectangle may deviate from Synfig between waypoints
 
 
 def init():
@@ -65,3 +69,31 @@ def init():
     num_images = Count()
     global file_name
     file_name = {}
+    # Animation types which are baked instead of converted to bezier curves
+    global bake_types
+    bake_types = set()
+    global bake_step
+    bake_step = DEFAULT_BAKE_STEP
+    # Output optimizer
+    global optimize_output
+    optimize_output = True
+    global precision
+    precision = DEFAULT_PRECISION
+    # Returns the bytes of an image given its file name, instead of reading it
+    # from the disk
+    global image_loader
+    image_loader = None
+    # (begin, end) frames of the exported time window, None for the whole canvas
+    global time_window
+    time_window = None
+    # Frames per second of the output, None to keep the canvas frame rate
+    global frame_rate
+    frame_rate = None
+    # Gamma of the output colors, 1 keeps them linear, see helpers/color.py
+    global gamma
+    gamma = GAMMA
+    global gamma_table
+    gamma_table = {}
+    # Converted animations of the exported values, see properties/trackCache.py
+    global track_cache
+    track_cache = {}
@@ -19,7 +19,7 @@ def gen_shapes_circle(lottie, layer, idx):
 
     Args:
         lottie (dict)               : The lottie generated circle layer will be stored in it
-        layer  (lxml.etree._Element): Synfig format circle layer
+        layer  (model.Layer)        : Synfig format circle layer
         idx    (int)                : Stores the index of the circle layer
 
     Returns:
@@ -33,44 +33,43 @@ def gen_shapes_circle(lottie, layer, idx):
     lottie["ix"] = idx      # setting the index
 
     for child in layer:
-        if child.tag == "param":
-            if child.attrib["name"] in {"origin", "center"}:
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    gen_properties_multi_dimensional_keyframed(lottie["p"],
-                                                               child[0],
-                                                               index.inc())
+        if child.name in {"origin", "center"}:
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                gen_properties_multi_dimensional_keyframed(lottie["p"],
+                                                           child.value,
+                                                           index.inc())
+            else:
+                x_val, y_val = 0, 0
+                if is_animate == 0:
+                    x_val = child.value.val1 * settings.PIX_PER_UNIT
+                    y_val = child.value.val2 * settings.PIX_PER_UNIT
                 else:
-                    x_val, y_val = 0, 0
-                    if is_animate == 0:
-                        x_val = float(child[0][0].text) * settings.PIX_PER_UNIT
-                        y_val = float(child[0][1].text) * settings.PIX_PER_UNIT
-                    else:
-                        x_val = float(child[0][0][0][0].text) * settings.PIX_PER_UNIT
-                        y_val = float(child[0][0][0][1].text) * settings.PIX_PER_UNIT
-                    gen_properties_value(lottie["p"],
-                                         change_axis(x_val, y_val),
-                                         index.inc(),
-                                         settings.DEFAULT_ANIMATED,
-                                         settings.NO_INFO)
+                    x_val = child.value[0].value.val1 * settings.PIX_PER_UNIT
+                    y_val = child.value[0].value.val2 * settings.PIX_PER_UNIT
+                gen_properties_value(lottie["p"],
+                                     change_axis(x_val, y_val),
+                                     index.inc(),
+                                     settings.DEFAULT_ANIMATED,
+                                     settings.NO_INFO)
 
-            # This will be exported as size of ellipse in lottie format
-            elif child.attrib["name"] == "radius":
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    child[0].attrib['type'] = "circle_radius"
-                    gen_value_Keyframed(lottie["s"], child[0], index.inc())
+        # This will be exported as size of ellipse in lottie format
+        elif child.name == "radius":
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                child.value.type = "circle_radius"
+                gen_value_Keyframed(lottie["s"], child.value, index.inc())
+            else:
+                radius = 0             # default value for radius
+                if is_animate == 0:
+                    radius = child.value
                 else:
-                    radius = 0             # default value for radius
-                    if is_animate == 0:
-                        radius = float(child[0].attrib["value"])
-                    else:
-                        radius = float(child[0][0][0].attrib["value"])
+                    radius = child.value[0].value
 
-                    radius_pix = int(settings.PIX_PER_UNIT) * radius
-                    diam = radius_pix * 2
-                    gen_properties_value(lottie["s"],
-                                         [diam, diam],
-                                         index.inc(),
-                                         settings.DEFAULT_ANIMATED,
-                                         settings.NO_INFO)
+                radius_pix = int(settings.PIX_PER_UNIT) * radius
+                diam = radius_pix * 2
+                gen_properties_value(lottie["s"],
+                                     [diam, diam],
+                                     index.inc(),
+                                     settings.DEFAULT_ANIMATED,
+                                     settings.NO_INFO)
@@ -7,6 +7,7 @@ import settings
 from properties.value import gen_properties_value
 from properties.valueKeyframed import gen_value_Keyframed
 from misc import Count, is_animated
+from helpers.color import encode_color
 sys.path.append("..")
 
 
@@ -16,7 +17,7 @@ def gen_shapes_fill(lottie, layer):
 
     Args:
         lottie (dict)               : The lottie generated fill layer will be stored in it
-        layer  (lxml.etree._Element): Synfig format fill (can be shape/solid anything, we
+        layer  (model.Layer)        : Synfig format fill (can be shape/solid anything, we
                                       only need color and opacity part from it) layer
 
     Returns:
@@ -27,43 +28,37 @@ def gen_shapes_fill(lottie, layer):
     lottie["c"] = {}       # Color
     lottie["o"] = {}       # Opacity of the fill layer
     for child in layer:
-        if child.tag == "param":
-            if child.attrib["name"] == "color":
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    gen_value_Keyframed(lottie["c"], child[0], index.inc())
+        if child.name == "color":
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                gen_value_Keyframed(lottie["c"], child.value, index.inc())
 
+            else:
+                if is_animate == 0:
+                    val = child.value
                 else:
-                    if is_animate == 0:
-                        val = child[0]
-                    else:
-                        val = child[0][0][0]
-                    red = float(val[0].text)
-                    green = float(val[1].text)
-                    blue = float(val[2].text)
-                    red, green, blue = red ** (1/settings.GAMMA), green **\
-                    (1/settings.GAMMA), blue ** (1/ settings.GAMMA)
-                    alpha = float(val[3].text)
-                    gen_properties_value(lottie["c"],
-                                         [red, green, blue, alpha],
-                                         index.inc(),
-                                         settings.DEFAULT_ANIMATED,
-                                         settings.NO_INFO)
+                    val = child.value[0].value
+                red, green, blue, alpha = encode_color(val).get_val()
+                gen_properties_value(lottie["c"],
+                                     [red, green, blue, alpha],
+                                     index.inc(),
+                                     settings.DEFAULT_ANIMATED,
+                                     settings.NO_INFO)
 
-            elif child.attrib["name"] == "amount":
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    # Telling the function that this is for opacity
-                    child[0].attrib['type'] = 'opacity'
-                    gen_value_Keyframed(lottie["o"], child[0], index.inc())
+        elif child.name == "amount":
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                # Telling the function that this is for opacity
+                child.value.type = 'opacity'
+                gen_value_Keyframed(lottie["o"], child.value, index.inc())
 
+            else:
+                if is_animate == 0:
+                    val = child.value * settings.OPACITY_CONSTANT
                 else:
-                    if is_animate == 0:
-                        val = float(child[0].attrib["value"]) * settings.OPACITY_CONSTANT
-                    else:
-                        val = float(child[0][0][0].attrib["value"]) * settings.OPACITY_CONSTANT
-                    gen_properties_value(lottie["o"],
-                                         val,
-                                         index.inc(),
-                                         settings.DEFAULT_ANIMATED,
-                                         settings.NO_INFO)
+                    val = child.value[0].value * settings.OPACITY_CONSTANT
+                gen_properties_value(lottie["o"],
+                                     val,
+                                     index.inc(),
+                                     settings.DEFAULT_ANIMATED,
+                                     settings.NO_INFO)
@@ -4,11 +4,10 @@ Will store all functions needed to generate the rectangle layer in lottie
 """
 
 import sys
-import copy
-from lxml import etree
 import settings
 from properties.value import gen_properties_value
-from misc import Count, is_animated, Vector, get_frame, get_vector, set_vector
+from misc import Count, is_animated, Vector, get_frame, get_frame_range, get_vector, set_vector
+from model import Animated, Param, Waypoint
 from properties.multiDimensionalKeyframed import gen_properties_multi_dimensional_keyframed
 from properties.valueKeyframed import gen_value_Keyframed
 from helpers.bezier import get_bezier_val
@@ -22,7 +21,7 @@ def get_child_value(is_animate, child, what_type):
 
     Args:
         is_animate (int)                : Decides whether a parameter is animated
-        child      (lxml.etree._Element): Holds the waypoint values
+        child      (model.Param)        : Holds the waypoint values
         what_type  (str)                : Decides the type of waypoint
 
     Returns:
@@ -31,17 +30,17 @@ def get_child_value(is_animate, child, what_type):
     """
     if what_type == "position":
         if is_animate == 0:
-            x_val, y_val = float(child[0][0].text), float(child[0][1].text)
+            x_val, y_val = child.value.val1, child.value.val2
         elif is_animate == 1:
-            x_val, y_val = float(child[0][0][0][0].text), float(child[0][0][0][1].text)
+            x_val, y_val = child.value[0].value.val1, child.value[0].value.val2
         x_val *= settings.PIX_PER_UNIT
         y_val *= settings.PIX_PER_UNIT
         return x_val, y_val
     elif what_type == "value":
         if is_animate == 0:
-            val = float(child[0].attrib["value"])
+            val = child.value
         elif is_animate == 1:
-            val = float(child[0][0][0].attrib["value"])
+            val = child.value[0].value
         return val
 
 
@@ -51,7 +50,7 @@ def gen_shapes_rectangle(lottie, layer, idx):
 
     Args:
         lottie (dict)               : The lottie generated rectangle layer will be stored in it
-        layer  (lxml.etree._Element): Synfig format rectangle layer
+        layer  (model.Layer)        : Synfig format rectangle layer
         idx    (int)                : Stores the index of the rectangle layer
 
     Returns:
@@ -67,31 +66,30 @@ def gen_shapes_rectangle(lottie, layer, idx):
     points = {}
 
     for child in layer:
-        if child.tag == "param":
-            if child.attrib["name"] == "point1":
-                points["1"] = child # Store address of child here
-
-            elif child.attrib["name"] == "point2":
-                points["2"] = child # Store address of child here
-
-            elif child.attrib["name"] == "expand":
-                expand_animate = is_animated(child[0])
-                param_expand = child
-
-            elif child.attrib["name"] == "bevel":
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    gen_value_Keyframed(lottie["r"], child[0], index.inc())
-                else:
-                    bevel = get_child_value(is_animate, child, "value")
-                    bevel *= settings.PIX_PER_UNIT
-                    gen_properties_value(lottie["r"],
-                                         bevel,
-                                         index.inc(),
-                                         settings.DEFAULT_ANIMATED,
-                                         settings.NO_INFO)
-    p1_animate = is_animated(points["1"][0])
-    p2_animate = is_animated(points["2"][0])
+        if child.name == "point1":
+            points["1"] = child # Store address of child here
+
+        elif child.name == "point2":
+            points["2"] = child # Store address of child here
+
+        elif child.name == "expand":
+            expand_animate = is_animated(child.value)
+            param_expand = child
+
+        elif child.name == "bevel":
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                gen_value_Keyframed(lottie["r"], child.value, index.inc())
+            else:
+                bevel = get_child_value(is_animate, child, "value")
+                bevel *= settings.PIX_PER_UNIT
+                gen_properties_value(lottie["r"],
+                                     bevel,
+                                     index.inc(),
+                                     settings.DEFAULT_ANIMATED,
+                                     settings.NO_INFO)
+    p1_animate = is_animated(points["1"].value)
+    p2_animate = is_animated(points["2"].value)
 
     # If expand parameter is not animated
     if expand_animate in {0, 1}:
@@ -119,29 +117,24 @@ def gen_dummy_waypoint(non_animated, is_animate, anim_type):
     waypoint with constant animation
 
     Args:
-        non_animated (lxml.etree._Element): Holds the non-animated parameter in Synfig xml format
-        is_animate   (int)                : Decides if a waypoint is animated
-        anim_type    (str)                : Decides the animation type
+        non_animated (model.Param): Holds the non-animated parameter
+        is_animate   (int)        : Decides if a waypoint is animated
+        anim_type    (str)        : Decides the animation type
 
     Returns:
-        (lxml.etree._Element) : Updated non-animated parameter, which is now animated
+        (model.Param) : Updated non-animated parameter, which is now animated
     """
     if is_animate == 0:
-        st = '<param name="anything"><animated type="{anim_type}"><waypoint time="0s" before="constant" after="constant"></waypoint></animated></param>'
-        st = st.format(anim_type=anim_type)
-        root = etree.fromstring(st)
-        root[0][0].append(copy.deepcopy(non_animated[0]))
-        non_animated = root
+        waypoint = Waypoint(0.0, non_animated.value, "constant", "constant")
+        non_animated = Param(non_animated.name, Animated(anim_type, [waypoint]))
     elif is_animate == 1:
-        non_animated[0][0].attrib["before"] = non_animated[0][0].attrib["after"] = "constant"
+        non_animated.value[0].before = non_animated.value[0].after = "constant"
 
-    new_waypoint = copy.deepcopy(non_animated[0][0])
-    frame = get_frame(non_animated[0][0])
+    new_waypoint = non_animated.value[0].copy()
+    frame = get_frame(non_animated.value[0])
     frame += 1
-    time = frame / settings.lottie_format["fr"]
-    time = str(time) + "s"
-    new_waypoint.attrib["time"] = time
-    non_animated[0].insert(1, new_waypoint)
+    new_waypoint.time = frame / settings.lottie_format["fr"]
+    non_animated.value.insert(1, new_waypoint)
     return non_animated
 
 
@@ -152,19 +145,19 @@ def both_points_animated(animated_1, animated_2, param_expand, lottie, index):
     point2 are animated
 
     Args:
-        animated_1      (lxml.etree._Element): Holds the parameter `point1`'s animation in Synfig xml format
-        animated_2      (lxml.etree._Element): Holds the parameter `point2`'s animation in Synfig xml format
-        param_expand    (lxml.etree._Element): Holds the parameter `expand`'s animation in Synfig xml format
+        animated_1      (model.Param)        : Holds the parameter `point1`'s animation
+        animated_2      (model.Param)        : Holds the parameter `point2`'s animation
+        param_expand    (model.Param)        : Holds the parameter `expand`'s animation
         lottie          (dict)               : Lottie format rectangle layer will be store in this
         index           (int)                : Stores the index of parameters in rectangle layer
 
     Returns:
         (None)
     """
-    animated_1, animated_2 = animated_1[0], animated_2[0]
+    animated_1, animated_2 = animated_1.value, animated_2.value
     orig_path_1, orig_path_2 = {}, {}
     expand_path = {}
-    gen_value_Keyframed(expand_path, param_expand[0], 0)
+    gen_value_Keyframed(expand_path, param_expand.value, 0)
     gen_properties_multi_dimensional_keyframed(orig_path_1, animated_1, 0)
     gen_properties_multi_dimensional_keyframed(orig_path_2, animated_2, 0)
 
@@ -180,14 +173,16 @@ def both_points_animated(animated_1, animated_2, param_expand, lottie, index):
     #################### END OF SECTION 1 ####################
 
     ### SECTION TRY ###
-    # Every frames value is precomputed in order to achieve maximum similarity
-    # to that of Synfig
-    en_fr = max(get_frame(animated_1[-1]), get_frame(animated_2[-1]))
-    fra = 1
-    while fra <= en_fr:
-        insert_waypoint_at_frame(animated_1, orig_path_1, fra, "vector")
-        insert_waypoint_at_frame(animated_2, orig_path_2, fra, "vector")
-        fra += 1
+    # Intermediate waypoints are only placed where the rectangle would
+    # otherwise deviate from that of Synfig, including the frames at which the
+    # points cross each other
+    key_frames = set(get_frame(waypoint) for waypoint in animated_1)
+    key_frames.update(get_frame(waypoint) for waypoint in animated_2)
+    geometry = {}
+    sample = lambda frame: get_geometry(orig_path_1, orig_path_2, expand_path, frame, geometry)
+    for frame in get_adaptive_frames(key_frames, sample):
+        insert_waypoint_at_frame(animated_1, orig_path_1, frame, "vector")
+        insert_waypoint_at_frame(animated_2, orig_path_2, frame, "vector")
     ### END SECTION ###
 
     ######################### SECTION 2 ##########################
@@ -200,6 +195,11 @@ def both_points_animated(animated_1, animated_2, param_expand, lottie, index):
     for waypoint in animated_2:
         frame = get_frame(waypoint)
         insert_waypoint_at_frame(animated_1, orig_path_1, frame, "vector")
+
+    # The error of the rectangle was measured against straight lines between
+    # the waypoints, hence only linear intervals can be emitted
+    for animated in (animated_1, animated_2):
+        linearize(animated)
     ##################### END OF SECTION 2 #######################
 
     ##################### SECTION 3 ##############################
@@ -213,44 +213,22 @@ def both_points_animated(animated_1, animated_2, param_expand, lottie, index):
         expand_amount = to_Synfig_axis(expand_amount, "real")
 
         pos1, pos2 = get_vector(waypoint1), get_vector(waypoint2)
-        # Comparing the x-coordinates
-        if pos1.val1 > pos2.val1:
-            pos1.val1 += expand_amount
-            pos2.val1 -= expand_amount
-        else:
-            pos1.val1 -= expand_amount
-            pos2.val1 += expand_amount
-        # Comparing the y-coordinates
-        if pos1.val2 > pos2.val2:
-            pos1.val2 += expand_amount
-            pos2.val2 -= expand_amount
-        else:
-            pos1.val2 -= expand_amount
-            pos2.val2 += expand_amount
+        add_expand(pos1, pos2, expand_amount)
         set_vector(waypoint1, pos1)
         set_vector(waypoint2, pos2)
     ##################### END OF SECTION 3 #######################
 
-    #################### SECTION 4 #############################
-    # Place waypoints at which the x and y cross each other/cross the extremas
-    cross_list = get_cross_list(animated_1, animated_2, orig_path_1, orig_path_2)
-    for frame in cross_list:
-        insert_waypoint_at_frame(animated_1, orig_path_1, frame, "vector")
-        insert_waypoint_at_frame(animated_2, orig_path_2, frame, "vector")
-    #################### END SECTION 4 #########################
-
-
-    ################## SECTION 5 ################################################
+    ################## SECTION 4 ################################################
     # Store the position of rectangle according to the waypoints in pos_animated
     # Store the size of rectangle according to the waypoints in size_animated
-    pos_animated = copy.deepcopy(animated_1)
-    size_animated = copy.deepcopy(animated_1)
-    size_animated.attrib["type"] = "rectangle_size"
+    pos_animated = animated_1.copy()
+    size_animated = animated_1.copy()
+    size_animated.type = "rectangle_size"
 
     i, i1 = 0, 0
     while i < len(animated_1) - 1:
-        cur_get_after_1, cur_get_after_2 = animated_1[i].attrib["after"], animated_2[i].attrib["after"]
-        next_get_before_1, next_get_before_2 = animated_1[i+1].attrib["before"], animated_2[i+1].attrib["before"]
+        cur_get_after_1, cur_get_after_2 = animated_1[i].after, animated_2[i].after
+        next_get_before_1, next_get_before_2 = animated_1[i+1].before, animated_2[i+1].before
 
         dic_1 = {"linear", "auto", "clamped", "halt"}
         dic_2 = {"constant"}
@@ -274,9 +252,9 @@ def both_points_animated(animated_1, animated_2, param_expand, lottie, index):
         # Case 2 only one "constant" interval: could mean two "constant"'s are present
         elif (constant_interval_1 and not constant_interval_2) or (not constant_interval_1 and constant_interval_2):
             if constant_interval_1:
-                i, i1 = calc_pos_and_size(size_animated, pos_animated, animated_1, animated_2, orig_path_2, i, i1)
+                i, i1 = calc_pos_and_size(size_animated, pos_animated, animated_1, animated_2, (orig_path_1, orig_path_2), expand_path, i, i1)
             elif constant_interval_2:
-                i, i1 = calc_pos_and_size(size_animated, pos_animated, animated_2, animated_1, orig_path_1, i, i1)
+                i, i1 = calc_pos_and_size(size_animated, pos_animated, animated_2, animated_1, (orig_path_2, orig_path_1), expand_path, i, i1)
 
         # Case 3 both are constant
         elif constant_interval_1 and constant_interval_2:
@@ -287,15 +265,15 @@ def both_points_animated(animated_1, animated_2, param_expand, lottie, index):
             i, i1 = i + 1, i1 + 1
             get_difference(size_animated[i1], animated_1[i], animated_2[i])
             get_average(pos_animated[i1], animated_1[i], animated_2[i])
-    ######################### SECTION 5 END ##############################
+    ######################### SECTION 4 END ##############################
 
-    ######################### SECTION 6 ##################################
+    ######################### SECTION 5 ##################################
     # Generate the position and size for lottie format
     gen_properties_multi_dimensional_keyframed(lottie["p"],
                                                pos_animated,
                                                index.inc())
     gen_value_Keyframed(lottie["s"], size_animated, index.inc())
-    ########################## END OF SECTION 6 ###########################
+    ########################## END OF SECTION 5 ###########################
 
 
 def insert_waypoint_at_frame(animated, orig_path, frame, animated_name):
@@ -304,7 +282,7 @@ def insert_waypoint_at_frame(animated, orig_path, frame, animated_name):
     present at that 'frame' already
 
     Args:
-        animated      (lxml.etree._Element): Holds the animation in Synfig xml format
+        animated      (model.Animated)     : Holds the animation in Synfig format
         orig_path     (dict)               : Holds the animation in Lottie format
         frame         (int)                : The frame at which the waypoint is to be inserted
         animated_name (str)                : The name/type of animation
@@ -324,71 +302,113 @@ def insert_waypoint_at_frame(animated, orig_path, frame, animated_name):
     pos = to_Synfig_axis(pos, animated_name)
 
     if i == len(animated):
-        new_waypoint = copy.deepcopy(animated[i-1])
+        new_waypoint = animated[i-1].copy()
     else:
-        new_waypoint = copy.deepcopy(animated[i])
+        new_waypoint = animated[i].copy()
     if animated_name == "vector":
-        new_waypoint[0][0].text = str(pos[0])
-        new_waypoint[0][1].text = str(pos[1])
+        new_waypoint.value = Vector(pos[0], pos[1])
     else:
-        new_waypoint[0].attrib["value"] = str(pos)
+        new_waypoint.value = pos
 
-    new_waypoint.attrib["time"] = str(frame/settings.lottie_format["fr"]) + "s"
+    new_waypoint.time = frame/settings.lottie_format["fr"]
     if i == 0 or i == len(animated):
         # No need of tcb value copy as halt interpolation need to be copied here
-        new_waypoint.attrib["before"] = new_waypoint.attrib["after"] = "constant"
+        new_waypoint.before = new_waypoint.after = "constant"
     else:
         copy_tcb_average(new_waypoint, animated[i], animated[i-1])
-        new_waypoint.attrib["before"] = animated[i-1].attrib["after"]
-        new_waypoint.attrib["after"] = animated[i].attrib["before"]
+        new_waypoint.before = animated[i-1].after
+        new_waypoint.after = animated[i].before
         # If the interval was constant before, then the whole interval should
         # remain constant now also
-        if new_waypoint.attrib["before"] == "constant" or new_waypoint.attrib["after"] == "constant":
-            new_waypoint.attrib["before"] = new_waypoint.attrib["after"] = "constant"
+        if new_waypoint.before == "constant" or new_waypoint.after == "constant":
+            new_waypoint.before = new_waypoint.after = "constant"
     animated.insert(i, new_waypoint)
 
 
-def get_cross_list(animation_1, animation_2, orig_path_1, orig_path_2):
+def linearize(animated):
+    """
+    Makes all the intervals of an animation linear, except the constant ones
+
+    Args:
+        animated (model.Animated) : Holds the animation in Synfig format
+
+    Returns:
+        (None)
+    """
+    for waypoint in animated:
+        if waypoint.before != "constant":
+            waypoint.before = "linear"
+        if waypoint.after != "constant":
+            waypoint.after = "linear"
+
+
+def get_geometry(orig_path_1, orig_path_2, expand_path, frame, geometry):
     """
-    This function will return a list('set' technically) at which the point1 and point2 of rectangle
-    will cross each other.
-    This set might contain frames at which waypoints are already present, hence
-    this need to be taken care of
+    Returns the rectangle of Synfig at a frame as its center, its size and the
+    side of point1 with respect to point2 on both the axes
 
     Args:
-        animation_1 (lxml.etree._Element): Stores the animation of `point1` parameter in Synfig format
-        animation_2 (lxml.etree._Element): Stores the animation of `point2` parameter in Synfig format
-        orig_path_1 (dict)               : Stores the animation of `point1` parameter in Lottie format
-        orig_path_2 (dict)               : Stores the animation of `point2` parameter in Lottie format
+        orig_path_1 (dict) : Stores the animation of `point1` parameter in Lottie format
+        orig_path_2 (dict) : Stores the animation of `point2` parameter in Lottie format
+        expand_path (dict) : Stores the animation of `expand` parameter in Lottie format
+        frame       (int)  : Frame at which the rectangle is needed
+        geometry    (dict) : Already computed rectangles by frame
 
     Returns:
-        (set) : Contains the frames at which point1 and point2 cross each other
+        (tuple) : Center and size in pixels followed by the sides
+    """
+    if frame not in geometry.keys():
+        pos1 = get_vector_at_frame(orig_path_1, frame)
+        pos2 = get_vector_at_frame(orig_path_2, frame)
+        expand = 2 * get_vector_at_frame(expand_path, frame)
+        geometry[frame] = ((pos1[0] + pos2[0]) / 2,
+                           (pos1[1] + pos2[1]) / 2,
+                           abs(pos1[0] - pos2[0]) + expand,
+                           abs(pos1[1] - pos2[1]) + expand,
+                           pos1[0] < pos2[0],
+                           pos1[1] < pos2[1])
+    return geometry[frame]
+
+
+def get_adaptive_frames(key_frames, sample):
     """
-    en_fr = max(get_frame(animation_1[-1]), get_frame(animation_2[-1]))
-    # Function to determine the sign of a variable
-    sign = lambda a: (1, -1)[a < 0]
-    prev_1 = float(animation_1[0][0][0].text), float(animation_1[0][0][1].text)
-    prev_2 = float(animation_2[0][0][0].text), float(animation_2[0][0][1].text)
+    Returns the frames at which waypoints need to be inserted between the
+    given key frames, so that linearly interpolating the rectangle between
+    waypoints stays within settings.RECTANGLE_TOLERANCE of that of Synfig at
+    every frame. An interval is split at its worst frame, or in its middle if
+    point1 and point2 cross each other in it, until it is a single frame
 
-    # The list to be returned
+    Args:
+        key_frames (set)      : Frames at which waypoints are already present
+        sample     (callable) : Returns the rectangle at a frame, see get_geometry()
+
+    Returns:
+        (set) : Frames at which waypoints are to be inserted
+    """
     ret_list = set()
-    frame = 1
-    # Loop for all the frames
-    while frame <= en_fr:
-        now_1 = get_vector_at_frame(orig_path_1, frame)
-        now_1 = to_Synfig_axis(now_1, "vector")
-        now_2 = get_vector_at_frame(orig_path_2, frame)
-        now_2 = to_Synfig_axis(now_2, "vector")
-        is_needed = False
-        if sign(prev_1[0] - prev_2[0]) != sign(now_1[0] - now_2[0]):
-            is_needed = True
-        elif sign(prev_1[1] - prev_2[1]) != sign(now_1[1] - now_2[1]):
-            is_needed = True
-        if is_needed:
-            ret_list.add(frame - 1)
-            ret_list.add(frame)
-        prev_1, prev_2 = now_1, now_2
-        frame += 1
+    key_frames = sorted(key_frames)
+    intervals = list(zip(key_frames, key_frames[1:]))
+    while intervals:
+        first, last = intervals.pop()
+        lo_fr, hi_fr = get_frame_range(first, last)
+        if last - first < 2 or hi_fr <= lo_fr:
+            continue
+        start, end = sample(first), sample(last)
+        split = None
+        if start[4:] != end[4:]:
+            split = (first + last) // 2
+        else:
+            worst = settings.RECTANGLE_TOLERANCE
+            for frame in range(max(first + 1, lo_fr), min(last, hi_fr + 1)):
+                percent = (frame - first) / (last - first)
+                now = sample(frame)
+                error = max(abs(now[k] - (start[k] + (end[k] - start[k]) * percent)) for k in range(4))
+                if now[4:] != start[4:] or error > worst:
+                    split, worst = frame, max(error, worst)
+        if split is not None:
+            ret_list.add(split)
+            intervals.append((first, split))
+            intervals.append((split, last))
     return ret_list
 
 
@@ -398,22 +418,17 @@ def print_animation(b):
     Helpful in debugging
 
     Args:
-        b (lxml.etree._Element): Holds the animation to be printed
+        b (model.Animated): Holds the animation to be printed
 
     Returns:
         (None)
     """
-    a = copy.deepcopy(b)
-    """
-    for i in range(len(a)):
-        a[i].attrib["frames"] = str(get_frame(a[i]))
-        a[i][0][0].text = str(float(a[i][0][0].text) * settings.PIX_PER_UNIT)
-        a[i][0][1].text = str(float(a[i][0][1].text) * settings.PIX_PER_UNIT)
-        """
-    print(etree.tostring(a, method='xml', encoding='utf8', pretty_print=True).decode())
+    print(b.type)
+    for waypoint in b:
+        print("  frame {0}: {1}".format(get_frame(waypoint), waypoint))
 
 
-def calc_pos_and_size(size_animated, pos_animated, animated_1, animated_2, orig_path, i, i1):
+def calc_pos_and_size(size_animated, pos_animated, animated_1, animated_2, orig_paths, expand_path, i, i1):
     """
     Between two frames, this function is called if either "only point1's
     interval is constant" or "only point2's interval is constant". It calculates
@@ -423,18 +438,19 @@ def calc_pos_and_size(size_animated, pos_animated, animated_1, animated_2, orig_
     param4: Can be param2 or param1 of rectangle layer, but opposite of param3
 
     Args:
-        size_animated (lxml.etree._Element): Holds the size parameter of rectangle layer in Synfig format
-        pos_animated  (lxml.etree._Element): Holds the position parameter of rectangle layer in Synfig format
-        animated_1    (lxml.etree._Element): Holds the param3 in Synfig format
-        animated_2    (lxml.etree._Element): Holds the param4 in Synfig format
-        orig_path     (dict)               : Holds the param4 in Lottie format
+        size_animated (model.Animated)     : Holds the size parameter of rectangle layer in Synfig format
+        pos_animated  (model.Animated)     : Holds the position parameter of rectangle layer in Synfig format
+        animated_1    (model.Animated)     : Holds the param3 in Synfig format
+        animated_2    (model.Animated)     : Holds the param4 in Synfig format
+        orig_paths    (tuple)              : Holds the param3 and param4 in Lottie format
+        expand_path   (dict)               : Holds the expand parameter in Lottie format
         i             (int)                : Iterator for animated_2
         i1            (int)                : Iterator for pos_animated and size_animated
     Returns:
         (int, int)    : Updated iterators i and i1 are returned
     """
-    pos_animated[i1].attrib["after"] = animated_2[i].attrib["after"]
-    size_animated[i1].attrib["after"] = animated_2[i].attrib["after"]
+    pos_animated[i1].after = animated_2[i].after
+    size_animated[i1].after = animated_2[i].after
 
     copy_tcb(pos_animated[i1], animated_2[i])
     copy_tcb(size_animated[i1], animated_2[i])
@@ -448,16 +464,20 @@ def calc_pos_and_size(size_animated, pos_animated, animated_1, animated_2, orig_
 
     ######### Need to check if t_next - t_present < 2 #####
     if abs(t_next - t_present) >= 2:
-        pos = get_vector_at_frame(orig_path, t_next - 1)
-        pos = to_Synfig_axis(pos, "vector")
-        new_waypoint = copy.deepcopy(pos_animated[i1])
-        new_waypoint.attrib["before"] = new_waypoint.attrib["after"]
-        new_waypoint.attrib["time"] = str((t_next - 1) / settings.lottie_format["fr"]) + "s"
-        new_waypoint[0][0].text, new_waypoint[0][1].text = str(pos[0]), str(pos[1])
+        way_1, way_2 = animated_1[i].copy(), animated_2[i].copy()
+        pos_1 = to_Synfig_axis(get_vector_at_frame(orig_paths[0], t_next - 1), "vector")
+        pos_2 = to_Synfig_axis(get_vector_at_frame(orig_paths[1], t_next - 1), "vector")
+        way_1.value, way_2.value = Vector(pos_1[0], pos_1[1]), Vector(pos_2[0], pos_2[1])
+        expand_amount = to_Synfig_axis(get_vector_at_frame(expand_path, t_next - 1), "real")
+        add_expand(way_1.value, way_2.value, expand_amount)
 
-        n_size_waypoint = copy.deepcopy(new_waypoint)
-        get_average(new_waypoint, new_waypoint, animated_1[i])
-        get_difference(n_size_waypoint, n_size_waypoint, animated_1[i])
+        new_waypoint = pos_animated[i1].copy()
+        new_waypoint.before = new_waypoint.after
+        new_waypoint.time = (t_next - 1) / settings.lottie_format["fr"]
+
+        n_size_waypoint = new_waypoint.copy()
+        get_average(new_waypoint, way_1, way_2)
+        get_difference(n_size_waypoint, way_1, way_2)
 
         pos_animated.insert(i1 + 1, new_waypoint)
         size_animated.insert(i1 + 1, n_size_waypoint)
@@ -468,6 +488,35 @@ def calc_pos_and_size(size_animated, pos_animated, animated_1, animated_2, orig_
     return i, i1
 
 
+def add_expand(pos1, pos2, expand_amount):
+    """
+    Moves point1 and point2 of a rectangle away from each other by the expand
+    amount on both the axes
+
+    Args:
+        pos1          (misc.Vector) : Position of point1, changed in place
+        pos2          (misc.Vector) : Position of point2, changed in place
+        expand_amount (float)       : Expand parameter in Synfig units
+
+    Returns:
+        (None)
+    """
+    # Comparing the x-coordinates
+    if pos1.val1 > pos2.val1:
+        pos1.val1 += expand_amount
+        pos2.val1 -= expand_amount
+    else:
+        pos1.val1 -= expand_amount
+        pos2.val1 += expand_amount
+    # Comparing the y-coordinates
+    if pos1.val2 > pos2.val2:
+        pos1.val2 += expand_amount
+        pos2.val2 -= expand_amount
+    else:
+        pos1.val2 -= expand_amount
+        pos2.val2 += expand_amount
+
+
 def to_Synfig_axis(pos, animated_name):
     """
     Converts a Lottie format vector or values into Synfig format vector or
@@ -575,9 +624,11 @@ def get_vector_at_frame(path, t):
             break
         i += 1
     i -= 1
+    # The value is held before the first keyframe, the tracks of a rectangle
+    # need not start at the same frame
     if i < 0:
         pos = get_first_control_point(keyfr[0])
-    if i < len(keyfr) - 1:
+    elif i < len(keyfr) - 1:
         # If hold interpolation
         if 'h' in keyfr[i].keys():
             pos = get_first_control_point(keyfr[i])
@@ -599,16 +650,16 @@ def get_vector_at_frame(path, t):
 def get_animated_time_list(child, time_list):
     """
     Appends all the frames corresponding to the waypoints in the
-    animated(child[0]) list, in time_list
+    animated(child.value) list, in time_list
 
     Args:
-        child     (lxml.etree._Element) : Parent Element of animation
+        child     (model.Param)         : Parameter holding the animation
         time_list (set)                 : Will store all the frames at which waypoints are present
 
     Returns:
         (None)
     """
-    animated = child[0]
+    animated = child.value
     is_animate = is_animated(animated)
     if is_animate in {0, 1}:
         return
@@ -624,16 +675,15 @@ def get_difference(waypoint, way_1, way_2):
     'point2' of Synfig format
 
     Args:
-        waypoint (lxml.etree._Element) : Holds the waypoint at which the return value is to be stored
-        way_1    (lxml.etree._Element) : Waypoint contributing in calculating absolute difference
-        way_2    (lxml.etree._Element) : Waypoint contributing in calculating absolute difference
+        waypoint (model.Waypoint) : Holds the waypoint at which the return value is to be stored
+        way_1    (model.Waypoint) : Waypoint contributing in calculating absolute difference
+        way_2    (model.Waypoint) : Waypoint contributing in calculating absolute difference
 
     Returns:
         (None)
     """
-    waypoint[0].tag = "real" # If was vector before
-    waypoint[0].attrib["value"] = str(abs(float(way_1[0][0].text) - float(way_2[0][0].text)))
-    waypoint[0].attrib["value2"] = str(abs(float(way_1[0][1].text) - float(way_2[0][1].text)))
+    waypoint.value = Vector(abs(way_1.value.val1 - way_2.value.val1),
+                            abs(way_1.value.val2 - way_2.value.val2))
 
 
 def get_average(waypoint, way_1, way_2):
@@ -643,15 +693,15 @@ def get_average(waypoint, way_1, way_2):
     and 'point2' of Synfig format
 
     Args:
-        waypoint (lxml.etree._Element) : Holds the waypoint at which the return value is to be stored
-        way_1    (lxml.etree._Element) : Waypoint contributing in calculating average
-        way_2    (lxml.etree._Element) : Waypoint contributing in calculating average
+        waypoint (model.Waypoint) : Holds the waypoint at which the return value is to be stored
+        way_1    (model.Waypoint) : Waypoint contributing in calculating average
+        way_2    (model.Waypoint) : Waypoint contributing in calculating average
 
     Returns:
         (None)
     """
-    waypoint[0][0].text = str((float(way_1[0][0].text) + float(way_2[0][0].text)) / 2)
-    waypoint[0][1].text = str((float(way_1[0][1].text) + float(way_2[0][1].text)) / 2)
+    waypoint.value = Vector((way_1.value.val1 + way_2.value.val1) / 2,
+                            (way_1.value.val2 + way_2.value.val2) / 2)
 
 
 def copy_tcb_average(new_waypoint, waypoint, next_waypoint):
@@ -664,31 +714,16 @@ def copy_tcb_average(new_waypoint, waypoint, next_waypoint):
     from those tangents: IMPROVEMENT
 
     Args:
-        new_waypoint  (lxml.etree._Element) : Waypoint at which the values will be averaged
-        waypoint      (lxml.etree._Element) : Waypoint contributing in average
-        next_waypoint (lxml.etree._Element) : Waypoint contributing in average
+        new_waypoint  (model.Waypoint) : Waypoint at which the values will be averaged
+        waypoint      (model.Waypoint) : Waypoint contributing in average
+        next_waypoint (model.Waypoint) : Waypoint contributing in average
 
     Returns:
         (None)
     """
-    tens, bias, cont = 0, 0, 0      # default values
-    tens1, bias1, cont1 = 0, 0, 0   # default values
-    if "tension" in waypoint.keys():
-        tens = float(waypoint.attrib["tension"])
-    if "continuity" in waypoint.keys():
-        cont = float(waypoint.attrib["continuity"])
-    if "bias" in waypoint.keys():
-        bias = float(waypoint.attrib["bias"])
-    if "tension" in next_waypoint.keys():
-        tens1 = float(next_waypoint.attrib["tension"])
-    if "continuity" in next_waypoint.keys():
-        cont1 = float(next_waypoint.attrib["continuity"])
-    if "bias" in next_waypoint.keys():
-        bias1 = float(next_waypoint.attrib["bias"])
-    f_tens, f_bias, f_cont = (tens + tens1) / 2, (bias + bias1) / 2, (cont + cont1) / 2
-    new_waypoint.attrib["tension"] = str(f_tens)
-    new_waypoint.attrib["continuity"] = str(f_cont)
-    new_waypoint.attrib["bias"] = str(f_bias)
+    new_waypoint.tension = (waypoint.tension + next_waypoint.tension) / 2
+    new_waypoint.continuity = (waypoint.continuity + next_waypoint.continuity) / 2
+    new_waypoint.bias = (waypoint.bias + next_waypoint.bias) / 2
 
 
 def copy_tcb(new_waypoint, waypoint):
@@ -697,19 +732,12 @@ def copy_tcb(new_waypoint, waypoint):
     'new_waypoint'
 
     Args:
-        new_waypoint (lxml.etree._Element) : Waypoint at which the values will be copied
-        waypoint     (lxml.etree._Element) : Waypoint to be copied from
+        new_waypoint (model.Waypoint) : Waypoint at which the values will be copied
+        waypoint     (model.Waypoint) : Waypoint to be copied from
 
     Returns:
         (None)
     """
-    tens, bias, cont = 0, 0, 0      # default values
-    if "tension" in waypoint.keys():
-        tens = float(waypoint.attrib["tension"])
-    if "continuity" in waypoint.keys():
-        cont = float(waypoint.attrib["continuity"])
-    if "bias" in waypoint.keys():
-        bias = float(waypoint.attrib["bias"])
-    new_waypoint.attrib["tension"] = str(tens)
-    new_waypoint.attrib["continuity"] = str(cont)
-    new_waypoint.attrib["bias"] = str(bias)
+    new_waypoint.tension = waypoint.tension
+    new_waypoint.continuity = waypoint.continuity
+    new_waypoint.bias = waypoint.bias
@@ -17,7 +17,7 @@ def gen_shapes_star(lottie, layer, idx):
 
     Args:
         lottie (dict)               : The lottie generated star layer will be stored in it
-        layer  (lxml.etree._Element): Synfig format star layer
+        layer  (model.Layer)        : Synfig format star layer
         idx    (int)                : Stores the index of the star layer
 
     Returns:
@@ -32,108 +32,107 @@ def gen_shapes_star(lottie, layer, idx):
     lottie["or"] = {}       # Outer radius
     lottie["is"] = {}       # Inner roundness of the star
     lottie["os"] = {}       # Outer roundness of the star
-    regular_polygon = {"prop" : "false"}
+    regular_polygon = {"prop" : False}
     for child in layer:
-        if child.tag == "param":
-            if child.attrib["name"] == "regular_polygon":
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    regular_polygon["prop"] = "changing"
-                    # Copy the child address to dictionary
-                    regular_polygon["animated"] = child[0]
-                elif is_animate == 1:
-                    regular_polygon["prop"] = child[0][0][0].attrib["value"]
-                else:
-                    regular_polygon["prop"] = child[0].attrib["value"]
-                regular_polygon["animate"] = is_animate
+        if child.name == "regular_polygon":
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                regular_polygon["prop"] = "changing"
+                # Copy the child address to dictionary
+                regular_polygon["animated"] = child.value
+            elif is_animate == 1:
+                regular_polygon["prop"] = child.value[0].value
+            else:
+                regular_polygon["prop"] = child.value
+            regular_polygon["animate"] = is_animate
 
-            elif child.attrib["name"] == "points":
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    # To uniquely identify the points, attribute type is changed
-                    child[0].attrib['type'] = 'points'
-                    gen_value_Keyframed(lottie["pt"], child[0], index.inc())
+        elif child.name == "points":
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                # To uniquely identify the points, attribute type is changed
+                child.value.type = 'points'
+                gen_value_Keyframed(lottie["pt"], child.value, index.inc())
 
+            else:
+                num_points = 3      # default number of points
+                if is_animate == 0:
+                    num_points = child.value
                 else:
-                    num_points = 3      # default number of points
-                    if is_animate == 0:
-                        num_points = int(child[0].attrib["value"])
-                    else:
-                        num_points = int(child[0][0][0].attrib["value"])
-                    gen_properties_value(lottie["pt"],
-                                         num_points,
-                                         index.inc(),
-                                         settings.DEFAULT_ANIMATED,
-                                         settings.NO_INFO)
-            elif child.attrib["name"] == "angle":
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    gen_value_Keyframed(lottie["r"], child[0], index.inc())
+                    num_points = child.value[0].value
+                gen_properties_value(lottie["pt"],
+                                     num_points,
+                                     index.inc(),
+                                     settings.DEFAULT_ANIMATED,
+                                     settings.NO_INFO)
+        elif child.name == "angle":
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                gen_value_Keyframed(lottie["r"], child.value, index.inc())
+            else:
+                theta = 0           # default angle for the star
+                if is_animate == 0:
+                    theta = get_angle(child.value)
                 else:
-                    theta = 0           # default angle for the star
-                    if is_animate == 0:
-                        theta = get_angle(float(child[0].attrib["value"]))
-                    else:
-                        theta = get_angle(float(child[0][0][0].attrib["value"]))
-                    gen_properties_value(lottie["r"],
-                                         theta,
-                                         index.inc(),
-                                         settings.DEFAULT_ANIMATED,
-                                         settings.NO_INFO)
-            elif child.attrib["name"] == "radius1":
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    gen_value_Keyframed(lottie["or"], child[0], index.inc())
+                    theta = get_angle(child.value[0].value)
+                gen_properties_value(lottie["r"],
+                                     theta,
+                                     index.inc(),
+                                     settings.DEFAULT_ANIMATED,
+                                     settings.NO_INFO)
+        elif child.name == "radius1":
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                gen_value_Keyframed(lottie["or"], child.value, index.inc())
+            else:
+                r_outer = 0             # default value for outer radius
+                if is_animate == 0:
+                    r_outer = child.value
                 else:
-                    r_outer = 0             # default value for outer radius
-                    if is_animate == 0:
-                        r_outer = float(child[0].attrib["value"])
-                    else:
-                        r_outer = float(child[0][0][0].attrib["value"])
-
-                    gen_properties_value(lottie["or"],
-                                         int(settings.PIX_PER_UNIT * r_outer),
-                                         index.inc(),
-                                         settings.DEFAULT_ANIMATED,
-                                         settings.NO_INFO)
-            elif child.attrib["name"] == "radius2":
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    gen_value_Keyframed(lottie["ir"], child[0], index.inc())
+                    r_outer = child.value[0].value
+
+                gen_properties_value(lottie["or"],
+                                     int(settings.PIX_PER_UNIT * r_outer),
+                                     index.inc(),
+                                     settings.DEFAULT_ANIMATED,
+                                     settings.NO_INFO)
+        elif child.name == "radius2":
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                gen_value_Keyframed(lottie["ir"], child.value, index.inc())
+            else:
+                r_inner = 0             # default value for inner radius
+                if is_animate == 0:
+                    r_inner = child.value
                 else:
-                    r_inner = 0             # default value for inner radius
-                    if is_animate == 0:
-                        r_inner = float(child[0].attrib["value"])
-                    else:
-                        r_inner = float(child[0][0][0].attrib["value"])
-                    gen_properties_value(lottie["ir"],
-                                         int(settings.PIX_PER_UNIT * r_inner),
-                                         index.inc(),
-                                         settings.DEFAULT_ANIMATED,
-                                         settings.NO_INFO)
-            elif child.attrib["name"] == "origin":
-                is_animate = is_animated(child[0])
-                if is_animate == 2:
-                    gen_properties_multi_dimensional_keyframed(lottie["p"],
-                                                               child[0],
-                                                               index.inc())
+                    r_inner = child.value[0].value
+                gen_properties_value(lottie["ir"],
+                                     int(settings.PIX_PER_UNIT * r_inner),
+                                     index.inc(),
+                                     settings.DEFAULT_ANIMATED,
+                                     settings.NO_INFO)
+        elif child.name == "origin":
+            is_animate = is_animated(child.value)
+            if is_animate == 2:
+                gen_properties_multi_dimensional_keyframed(lottie["p"],
+                                                           child.value,
+                                                           index.inc())
+            else:
+                x_val, y_val = 0, 0
+                if is_animate == 0:
+                    x_val = child.value.val1 * settings.PIX_PER_UNIT
+                    y_val = child.value.val2 * settings.PIX_PER_UNIT
                 else:
-                    x_val, y_val = 0, 0
-                    if is_animate == 0:
-                        x_val = float(child[0][0].text) * settings.PIX_PER_UNIT
-                        y_val = float(child[0][1].text) * settings.PIX_PER_UNIT
-                    else:
-                        x_val = float(child[0][0][0][0].text) * settings.PIX_PER_UNIT
-                        y_val = float(child[0][0][0][1].text) * settings.PIX_PER_UNIT
-                    gen_properties_value(lottie["p"],
-                                         change_axis(x_val, y_val),
-                                         index.inc(),
-                                         settings.DEFAULT_ANIMATED,
-                                         settings.NO_INFO)
+                    x_val = child.value[0].value.val1 * settings.PIX_PER_UNIT
+                    y_val = child.value[0].value.val2 * settings.PIX_PER_UNIT
+                gen_properties_value(lottie["p"],
+                                     change_axis(x_val, y_val),
+                                     index.inc(),
+                                     settings.DEFAULT_ANIMATED,
+                                     settings.NO_INFO)
 
     # If not animated, then go to if, else
     if regular_polygon["animate"] in {0, 1}:
-        if regular_polygon["prop"] == "false":
+        if not regular_polygon["prop"]:
             lottie["sy"] = 1    # Star Type
 
             # inner property is only needed if type is star
@@ -181,11 +180,11 @@ def polygon_correction(lottie, animated):
 
     true_arr = {}
     true_arr["arr"] = []
-    true_arr["start"] = animated[0][0].attrib["value"]
+    true_arr["start"] = animated[0].value
 
     while st <= length:
         j = st + 1
-        while j <= length and animated[st][0].attrib["value"] == animated[j][0].attrib["value"]:
+        while j <= length and animated[st].value == animated[j].value:
             j += 1
         true_arr["arr"].append(j - 1)
         st = j
@@ -193,9 +192,9 @@ def polygon_correction(lottie, animated):
     # These operations will be performed on this new array created
     now = true_arr["start"]
     for st in range(len(true_arr["arr"])):
-        if now == "false":
+        if not now:
             i = true_arr["arr"][st]
-            s_frame = float(animated[i].attrib["time"][:-1]) * settings.lottie_format["fr"]
+            s_frame = animated[i].time * settings.lottie_format["fr"]
             s_frame += 1
 
             # Till the end it is a star
@@ -203,9 +202,9 @@ def polygon_correction(lottie, animated):
                 break
             else:
                 j = true_arr["arr"][st+1]
-                e_frame = float(animated[j].attrib["time"][:-1]) * settings.lottie_format["fr"]
+                e_frame = animated[j].time * settings.lottie_format["fr"]
                 e_frame -= 1
-        elif now == "true":
+        elif now:
             pass
         #modify(lottie, animated, s_frame, e_frame)
         now = toggle(now)
@@ -215,10 +214,7 @@ def toggle(val):
     """
     Nothing here
     """
-    ret = "false"
-    if val == "false":
-        ret = "true"
-    return ret
+    return not val
 
 
 def modify(lottie, animated, s_frame, e_frame):
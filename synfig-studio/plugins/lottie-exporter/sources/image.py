@@ -3,6 +3,7 @@ Will store all the functions corresponding to Image Assets in lottie
 """
 
 import os
+import io
 import sys
 import struct
 import imghdr
@@ -11,49 +12,64 @@ sys.path.append("..")
 
 
 def get_image_size(fname):
+    """
+    Determine the image type of the file and return its size
+
+    Args:
+        fname (str) : File name
+
+    Returns:
+        (int, int) : width and height of image file is returned
+        (None)     : If some exception occurs while calculating
+    """
+    with open(fname, 'rb') as fhandle:
+        return read_image_size(fhandle)
+
+
+def read_image_size(fhandle):
     '''
     https://stackoverflow.com/questions/8032642/how-to-obtain-image-size-using-standard-python-class-without-using-external-lib
     Determine the image type of fhandle and return its size.
     from draco
 
     Args:
-        fname (str) : File name
+        fhandle (file object) : Binary file object of the image, at its start
 
     Returns:
         (int, int) : width and height of image file is returned
         (None)     : If some exception occurs while calculating
     '''
-    with open(fname, 'rb') as fhandle:
-        head = fhandle.read(24)
-        if len(head) != 24:
+    head = fhandle.read(24)
+    if len(head) != 24:
+        return
+    what = imghdr.what(None, head)
+    if what == 'png':
+        check = struct.unpack('>i', head[4:8])[0]
+        if check != 0x0d0a1a0a:
             return
-        if imghdr.what(fname) == 'png':
-            check = struct.unpack('>i', head[4:8])[0]
-            if check != 0x0d0a1a0a:
-                return
-            width, height = struct.unpack('>ii', head[16:24])
-        elif imghdr.what(fname) == 'gif':
-            width, height = struct.unpack('<HH', head[6:10])
-        elif imghdr.what(fname) == 'jpeg':
-            try:
-                fhandle.seek(0) # Read 0xff next
-                size = 2
-                ftype = 0
-                while not 0xc0 <= ftype <= 0xcf:
-                    fhandle.seek(size, 1)
+        width, height = struct.unpack('>ii', head[16:24])
+    elif what == 'gif':
+        width, height = struct.unpack('<HH', head[6:10])
+    elif what == 'jpeg':
+        try:
+            fhandle.seek(0) # Read 0xff next
+            size = 2
+            ftype = 0
+            while not 0xc0 <= ftype <= 0xcf:
+                fhandle.seek(size, 1)
+                byte = fhandle.read(1)
+                while ord(byte) == 0xff:
                     byte = fhandle.read(1)
-                    while ord(byte) == 0xff:
-                        byte = fhandle.read(1)
-                    ftype = ord(byte)
-                    size = struct.unpack('>H', fhandle.read(2))[0] - 2
-                # We are at a SOFn block
-                fhandle.seek(1, 1)  # Skip `precision' byte.
-                height, width = struct.unpack('>HH', fhandle.read(4))
-            except Exception: #IGNORE:W0703
-                return
-        else:
+                ftype = ord(byte)
+                size = struct.unpack('>H', fhandle.read(2))[0] - 2
+            # We are at a SOFn block
+            fhandle.seek(1, 1)  # Skip `precision' byte.
+            height, width = struct.unpack('>HH', fhandle.read(4))
+        except Exception: #IGNORE:W0703
             return
-        return width, height
+    else:
+        return
+    return width, height
 
 
 def add_image_asset(lottie, layer):
@@ -63,7 +79,7 @@ def add_image_asset(lottie, layer):
 
     Args:
         lottie (dict)                : Lottie layer
-        layer  (lxml.etree._Element) : Synfig layer
+        layer  (model.Layer)         : Synfig layer
 
     Returns:
         (dict) : Stores address of parameters: "tl", "br", "filename"
@@ -72,23 +88,25 @@ def add_image_asset(lottie, layer):
     st = {}     # Store the address of children
 
     for chld in layer:
-        if chld.tag == "param":
-            if chld.attrib["name"] == "tl":
-                st["tl"] = chld
-            elif chld.attrib["name"] == "br":
-                st["br"] = chld
-            elif chld.attrib["name"] == "filename":
-                st["filename"] = chld
-
-    file_path = os.path.join(settings.file_name["fd"], st["filename"][0].text)
-    file_path = os.path.abspath(file_path)
-    width, height = get_image_size(file_path)
+        if chld.name == "tl":
+            st["tl"] = chld
+        elif chld.name == "br":
+            st["br"] = chld
+        elif chld.name == "filename":
+            st["filename"] = chld
+
+    if settings.image_loader is not None:
+        width, height = read_image_size(io.BytesIO(settings.image_loader(st["filename"].value)))
+    else:
+        file_path = os.path.join(settings.file_name["fd"], st["filename"].value)
+        file_path = os.path.abspath(file_path)
+        width, height = get_image_size(file_path)
     lottie["w"] = width
 
     lottie["h"] = height
 
     # Later can copy the images into a new folder: images/ for the lottie format
-    path = st["filename"][0].text.split("/")
+    path = st["filename"].value.split("/")
     lottie["p"] = path[-1]
     path = path[:-1]
     path = "/".join(path)
@@ -0,0 +1,145 @@
+"""
+sifdoc.py
+Builds small Synfig documents for the tests, so that every test states the
+layers and the waypoints it depends on instead of reading a file
+"""
+
+import os
+import re
+import sys
+import zlib
+import struct
+
+# The exporter modules import each other as top level modules
+EXPORTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if EXPORTER_DIR not in sys.path:
+    sys.path.insert(0, EXPORTER_DIR)
+
+CANVAS = ('<canvas version="1.0" width="480" height="270" xres="2834.645669" yres="2834.645669" '
+          'view-box="-4.0 2.25 4.0 -2.25" antialias="1" fps="{fps}" begin-time="0f" end-time="{end}" '
+          'bgcolor="0.5 0.5 0.5 1.0"><name>test</name>{defs}{layers}</canvas>')
+
+
+def real(value, tag="real"):
+    return '<{0} value="{1!r}"/>'.format(tag, float(value))
+
+
+def distance(value, unit="units"):
+    return '<distance value="{0!r}" unit="{1}"/>'.format(float(value), unit)
+
+
+def vector(x_val, y_val):
+    return "<vector><x>{0!r}</x><y>{1!r}</y></vector>".format(float(x_val), float(y_val))
+
+
+def color(red, green, blue, alpha=1.0):
+    return "<color><r>{0!r}</r><g>{1!r}</g><b>{2!r}</b><a>{3!r}</a></color>".format(
+        float(red), float(green), float(blue), float(alpha))
+
+
+def animated(_type, waypoints, interpolation="clamped"):
+    """
+    Args:
+        _type         (str)                   : Type of the animation
+        waypoints     (list)                  : (time, value) pairs, the time as in
+                                                Synfig, the value as returned by real()...
+        interpolation (:obj: `str`, optional) : Interpolation of all the waypoints
+
+    Returns:
+        (str) : <animated> element
+    """
+    body = "".join('<waypoint time="{0}" before="{2}" after="{2}">{1}</waypoint>'.format(
+        time, value, interpolation) for time, value in waypoints)
+    return '<animated type="{0}">{1}</animated>'.format(_type, body)
+
+
+def exported(ref, value):
+    """
+    Args:
+        ref   (str) : Id of the value in <defs>
+        value (str) : Value as returned by real()...
+
+    Returns:
+        (str) : Value carrying the id, to be put in the defs of canvas()
+    """
+    return re.sub(r"^<(\w+)", r'<\1 id="{0}"'.format(ref), value, count=1)
+
+
+def param(name, value):
+    """
+    Args:
+        name  (str) : Name of the parameter
+        value (str) : Value as returned by real()..., or a reference like
+                      ":name" to an exported value
+
+    Returns:
+        (str) : <param> element
+    """
+    if value.startswith(":"):
+        return '<param name="{0}" use="{1}"/>'.format(name, value)
+    return '<param name="{0}">{1}</param>'.format(name, value)
+
+
+def layer(_type, params, desc=None):
+    desc = ' desc="{0}"'.format(desc) if desc is not None else ""
+    return '<layer type="{0}" active="true" version="0.1"{1}>{2}</layer>'.format(
+        _type, desc, "".join(param(name, value) for name, value in params))
+
+
+def circle(radius=real(1), origin=vector(0, 0), amount=real(1)):
+    return layer("circle", [("z_depth", real(0)), ("amount", amount),
+                            ("blend_method", '<integer value="0"/>'),
+                            ("color", color(1, 0, 0)), ("radius", radius),
+                            ("feather", real(0)), ("origin", origin),
+                            ("invert", '<bool value="false"/>')], "circle")
+
+
+def rectangle(point1, point2, expand=real(0), bevel=real(0)):
+    return layer("rectangle", [("z_depth", real(0)), ("amount", real(1)),
+                               ("blend_method", '<integer value="0"/>'),
+                               ("color", color(0, 0, 1)), ("point1", point1),
+                               ("point2", point2), ("expand", expand),
+                               ("invert", '<bool value="false"/>'),
+                               ("feather_x", real(0)), ("feather_y", real(0)),
+                               ("bevel", bevel), ("bevCircle", '<bool value="true"/>')],
+                 "rectangle")
+
+
+def image(filename, top_left=vector(-1, 1), bottom_right=vector(1, -1)):
+    return layer("import", [("z_depth", real(0)), ("amount", real(1)),
+                            ("blend_method", '<integer value="0"/>'),
+                            ("tl", top_left), ("br", bottom_right), ("c", '<integer value="1"/>'),
+                            ("gamma_adjust", real(1)),
+                            ("filename", "<string>{0}</string>".format(filename)),
+                            ("time_offset", '<time value="0s"/>')], "image")
+
+
+def png(width, height):
+    """
+    Args:
+        width  (int) : Width of the image
+        height (int) : Height of the image
+
+    Returns:
+        (bytes) : Black PNG image
+    """
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\0" + b"\0" * 3 * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)) +
+            chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+
+def canvas(layers, end="5s", fps=24, defs=""):
+    """
+    Args:
+        layers (list)                    : Layers, as returned by circle()...
+        end    (:obj: `str`, optional)   : End time of the canvas
+        fps    (:obj: `int`, optional)   : Frames per second
+        defs   (:obj: `str`, optional)   : Exported values, without the <defs> tag
+
+    Returns:
+        (bytes) : Synfig document
+    """
+    defs = "<defs>{0}</defs>".format(defs) if defs else ""
+    return CANVAS.format(fps=fps, end=end, defs=defs, layers="".join(layers)).encode("utf-8")
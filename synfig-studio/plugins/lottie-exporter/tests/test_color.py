@@ -0,0 +1,49 @@
+"""
+Tests of the gamma encoding of the colors
+"""
+
+import unittest
+import sifdoc
+import converter
+import settings
+from misc import Color
+from model import Animated, Waypoint
+from helpers.color import gamma_encode, encode_color, encode_color_track
+
+S = sifdoc
+
+
+def get_fill(lottie):
+    return lottie["layers"][0]["shapes"][1]["c"]
+
+
+class ColorTest(unittest.TestCase):
+
+    def test_encode(self):
+        converter.init({"gamma": 2.0})
+        self.assertAlmostEqual(gamma_encode(0.25), 0.5)
+        color = encode_color(Color(0.25, 1.0, 0.0, 0.25))
+        self.assertEqual((color.red, color.green, color.blue, color.alpha), (0.5, 1.0, 0.0, 0.25))
+        # Every channel value is encoded once
+        self.assertEqual(sorted(settings.gamma_table.keys()), [0.0, 0.25, 1.0])
+
+    def test_linear(self):
+        converter.init({"gamma": "linear"})
+        self.assertEqual(gamma_encode(0.25), 0.25)
+        self.assertEqual(settings.gamma_table, {})
+
+    def test_track(self):
+        converter.init({"gamma": 2.0})
+        anim = Animated("color", [Waypoint(0.0, Color(0.25, 0.25, 0.25, 1.0)),
+                                  Waypoint(1.0, Color(1.0, 0.0, 0.0, 0.5))])
+        self.assertEqual(encode_color_track(anim), [[0.5, 0.5, 0.5, 1.0], [1.0, 0.0, 0.0, 0.5]])
+
+    def test_export(self):
+        doc = S.canvas([S.layer("circle", [("color", S.color(0.25, 0.25, 0.25)), ("radius", S.real(1)),
+                                           ("origin", S.vector(0, 0))])])
+        self.assertEqual(get_fill(converter.convert(doc, {"gamma": 2}))["k"], [0.5, 0.5, 0.5, 1])
+        self.assertEqual(get_fill(converter.convert(doc, {"gamma": "linear"}))["k"], [0.25, 0.25, 0.25, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
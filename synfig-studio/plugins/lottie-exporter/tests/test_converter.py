@@ -0,0 +1,57 @@
+"""
+Tests of the in-memory conversion API
+"""
+
+import io
+import json
+import unittest
+from lxml import etree
+import sifdoc
+import converter
+
+
+class ConverterTest(unittest.TestCase):
+
+    def test_sources(self):
+        doc = sifdoc.canvas([sifdoc.circle()])
+        expected = converter.convert(doc)
+        root = etree.fromstring(doc)
+        for source in (io.BytesIO(doc), root, root.getroottree(), bytearray(doc)):
+            self.assertEqual(converter.convert(source), expected)
+        with self.assertRaises(TypeError):
+            converter.convert(doc.decode("utf-8"))
+
+    def test_to_bytes(self):
+        doc = sifdoc.canvas([sifdoc.circle()])
+        data = converter.convert_to_bytes(doc)
+        self.assertNotIn(b", ", data)
+        self.assertEqual(json.loads(data.decode("utf-8")), converter.convert(doc))
+        self.assertIn(b", ", converter.convert_to_bytes(doc, {"optimize": False}))
+
+    def test_conversions_are_independent(self):
+        doc = sifdoc.canvas([sifdoc.circle()])
+        first = converter.convert(doc)
+        converter.convert(sifdoc.canvas([sifdoc.circle(), sifdoc.circle()]))
+        self.assertEqual(converter.convert(doc), first)
+
+    def test_options(self):
+        doc = sifdoc.canvas([sifdoc.circle()])
+        for options in ({"unknown": 1}, {"bake_step": 0}, {"frame_rate": -1}, {"gamma": 0}):
+            with self.assertRaises(ValueError):
+                converter.convert(doc, options)
+
+    def test_image_loader(self):
+        names = []
+
+        def loader(name):
+            names.append(name)
+            return sifdoc.png(30, 20)
+
+        lottie = converter.convert(sifdoc.canvas([sifdoc.image("images/a.png")]), image_loader=loader)
+        self.assertEqual(names, ["images/a.png"])
+        asset = lottie["assets"][0]
+        self.assertEqual((asset["w"], asset["h"], asset["p"], asset["u"]), (30, 20, "a.png", "images/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests of the warm conversion daemon
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import sifdoc
+import converter
+import daemon
+
+
+class StatsTest(unittest.TestCase):
+
+    def test_counters(self):
+        stats = daemon.Stats(2)
+        for _ in range(3):
+            stats.start()
+        stats.finish(10, True, 0.1)
+        stats.finish(11, False, 0.3)
+        ret = stats.get()
+        self.assertEqual((ret["in_flight"], ret["queue_depth"]), (1, 0))
+        self.assertEqual((ret["completed"], ret["failed"]), (1, 1))
+        self.assertEqual(ret["per_worker"], {"10": 1, "11": 1})
+        self.assertEqual(ret["latency_ms"]["p50"], 300.0)
+
+    def test_convert_job(self):
+        doc = sifdoc.canvas([sifdoc.circle()])
+        pid, response = daemon.convert_job({"sif": doc.decode("utf-8")})
+        self.assertEqual(pid, os.getpid())
+        self.assertEqual(json.loads(response["lottie"]), converter.convert(doc))
+        pid, response = daemon.convert_job({"sif": "<canvas"})
+        self.assertFalse(response["ok"])
+        self.assertIn("XMLSyntaxError", response["error"])
+
+
+class DaemonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.socket = os.path.join(self.tmp, "lottie.sock")
+        self.server = daemon.Daemon(self.socket, 1)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        daemon.request(self.socket, {"cmd": "shutdown"})
+        self.thread.join()
+        self.server.server_close()
+        shutil.rmtree(self.tmp)
+
+    def test_requests(self):
+        doc = sifdoc.canvas([sifdoc.circle()])
+        path = os.path.join(self.tmp, "a.sif")
+        with open(path, "wb") as fil:
+            fil.write(doc)
+
+        response = daemon.request(self.socket, {"cmd": "convert", "path": path,
+                                                "output": os.path.join(self.tmp, "a.json")})
+        self.assertTrue(response["ok"])
+        with open(response["output"]) as fil:
+            self.assertEqual(json.load(fil), converter.convert(doc))
+
+        response = daemon.request(self.socket, {"cmd": "convert", "sif": doc.decode("utf-8"),
+                                                "options": {"optimize": False}})
+        self.assertEqual(json.loads(response["lottie"]), converter.convert(doc, {"optimize": False}))
+
+        self.assertFalse(daemon.request(self.socket, {"cmd": "convert"})["ok"])
+        self.assertFalse(daemon.request(self.socket, {"cmd": "unknown"})["ok"])
+        stats = daemon.request(self.socket, {"cmd": "stats"})
+        self.assertEqual((stats["completed"], stats["failed"], stats["in_flight"]), (2, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Tests of the values exported in <defs> and shared by several layers
+"""
+
+import unittest
+from lxml import etree
+import sifdoc
+import converter
+import settings
+from model import parse_canvas
+
+S = sifdoc
+POSITION = S.animated("vector", [("0s", S.vector(0, 0)), ("1s", S.vector(1, 0)), ("2s", S.vector(1, 1))])
+
+
+def get_shapes(lottie):
+    return [layer["shapes"][0] for layer in lottie["layers"]]
+
+
+class DefsTest(unittest.TestCase):
+
+    def test_parsed_once_and_copied(self):
+        doc = S.canvas([S.circle(origin=":pos"), S.circle(origin=":pos")], defs=S.exported("pos", POSITION))
+        canvas = parse_canvas(etree.fromstring(doc))
+        first, second = [layer.get_param("origin").value for layer in canvas.layers]
+        self.assertEqual((first.ref, second.ref), ("pos", "pos"))
+        self.assertIsNot(first, second)
+        first[0].value.val1 = 5
+        self.assertEqual(second[0].value.val1, 0)
+
+    def test_shared_track(self):
+        inline = S.canvas([S.circle(origin=POSITION), S.circle(origin=POSITION)])
+        shared = S.canvas([S.circle(origin=":pos"), S.circle(origin=":pos")], defs=S.exported("pos", POSITION))
+        expected = converter.convert(inline)
+        lottie = converter.convert(shared)
+        self.assertEqual(lottie, expected)
+        self.assertEqual(list(settings.track_cache.keys()), [("pos", "vector", "multi")])
+        first, second = get_shapes(lottie)
+        self.assertIsNot(first["p"]["k"], second["p"]["k"])
+
+    def test_static_value(self):
+        doc = S.canvas([S.circle(radius=":radius")], defs=S.exported("radius", S.real(0.5)))
+        self.assertEqual(get_shapes(converter.convert(doc))[0]["s"]["k"], [60, 60])
+
+    def test_types_are_not_mixed(self):
+        # The same exported value converted as a radius and as a plain real
+        radius = S.animated("real", [("0s", S.real(0.5)), ("1s", S.real(1))])
+        doc = S.canvas([S.circle(radius=":r", amount=":r")], defs=S.exported("r", radius))
+        layer = converter.convert(doc)["layers"][0]
+        self.assertEqual(layer["shapes"][0]["s"]["k"][0]["s"], [60, 60])
+        self.assertEqual(layer["shapes"][1]["o"]["k"][0]["s"], [50])
+
+
+if __name__ == "__main__":
+    unittest.main()
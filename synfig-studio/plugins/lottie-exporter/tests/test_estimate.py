@@ -0,0 +1,93 @@
+"""
+Tests of the estimation of the cost of a conversion
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from lxml import etree
+import sifdoc
+import converter
+import estimate
+
+S = sifdoc
+RADIUS = S.animated("real", [("0s", S.real(0.5)), ("1s", S.real(1)), ("2s", S.real(0.2))])
+POINT1 = S.animated("vector", [("1s", S.vector(-1, -1)), ("2s", S.vector(0, 0))])
+
+
+def scan(doc, options=None):
+    converter.init(options)
+    return estimate.scan(etree.fromstring(doc))
+
+
+class ScanTest(unittest.TestCase):
+
+    def test_counts(self):
+        doc = S.canvas([S.circle(radius=RADIUS), S.circle(), S.rectangle(POINT1, S.vector(1, 1))], end="4s")
+        result = scan(doc)
+        self.assertEqual(result["frames"], 96)
+        self.assertEqual(result["layers"]["circle"], 2)
+        features = result["features"]
+        self.assertEqual((features["waypoints"], features["sampled_frames"]), (5, 0))
+        # The corners of the rectangle are converted over frames 24 to 48
+        self.assertEqual(features["rectangle_frames"], 24)
+        self.assertEqual(features["rectangle_work"], 48)
+        self.assertEqual([(p["param"], p["span_frames"]) for p in result["params"]],
+                         [("radius", 48.0), ("point1", 24.0)])
+
+    def test_baked(self):
+        doc = S.canvas([S.circle(radius=RADIUS)], end="4s")
+        self.assertEqual(scan(doc, {"bake": ["all"]})["features"]["sampled_frames"], 50)
+        self.assertEqual(scan(doc, {"bake": ["all"], "bake_step": 4})["features"]["sampled_frames"], 14)
+
+    def test_inactive_layers(self):
+        doc = S.canvas([S.circle(radius=RADIUS).replace('active="true"', 'active="false"')])
+        self.assertEqual(scan(doc)["features"], dict.fromkeys(estimate.FEATURES, 0))
+
+
+class ModelTest(unittest.TestCase):
+
+    def test_predict(self):
+        model = {target: {"intercept": 1.0, "coefs": {"waypoints": 2.0, "sampled_frames": 0.5}}
+                 for target in estimate.TARGETS}
+        predicted = estimate.predict(model, {"waypoints": 3, "sampled_frames": 5})
+        self.assertEqual(predicted, {"seconds": 9.5, "peak_bytes": 10, "output_bytes": 10})
+
+    def test_fit_nnls(self):
+        rows = [[1.0, x, y] for x, y in [(0, 1), (1, 0), (2, 3), (5, 1), (3, 7)]]
+        values = [2.0 + 3.0 * x for _, x, _ in rows]
+        coefs = estimate.fit_nnls(rows, values)
+        for got, expected in zip(coefs, [2.0, 3.0, 0.0]):
+            self.assertAlmostEqual(got, expected, 4)
+        # Coefficients are never negative
+        values = [10.0 - x + 0.1 * y for _, x, y in rows]
+        self.assertGreaterEqual(min(estimate.fit_nnls(rows, values)), 0.0)
+
+
+class EstimateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_calibrate_and_estimate(self):
+        file_names = []
+        for count in range(1, 4):
+            file_names.append(os.path.join(self.dir, "{0}.sif".format(count)))
+            with open(file_names[-1], "wb") as fil:
+                fil.write(S.canvas([S.circle(radius=RADIUS)] * count))
+        model = estimate.calibrate(file_names, {})
+        self.assertEqual(model["samples"], 3)
+        self.assertGreater(model["output_bytes"]["coefs"]["layers_circle"], 0)
+        result = estimate.estimate(file_names[1], {}, model)
+        self.assertEqual(result["layers"]["circle"], 2)
+        with open(file_names[1], "rb") as fil:
+            actual = len(converter.convert_to_bytes(fil.read(), {}))
+        self.assertLess(abs(result["predicted"]["output_bytes"] - actual), 0.1 * actual)
+
+
+if __name__ == "__main__":
+    unittest.main()
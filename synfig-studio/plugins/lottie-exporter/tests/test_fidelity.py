@@ -0,0 +1,58 @@
+"""
+Tests of the fidelity checker comparing exported keyframes with Synfig
+"""
+
+import unittest
+from lxml import etree
+import sifdoc
+import converter
+from fidelity import get_lottie_value, ease, check_canvas, summarize
+
+S = sifdoc
+
+
+class LottieValueTest(unittest.TestCase):
+
+    def test_ease(self):
+        self.assertAlmostEqual(ease(0.25, 0, 0, 1, 1), 0.25, 6)
+        self.assertLess(ease(0.25, 0.5, 0, 0.5, 1), 0.25)
+
+    def test_linear(self):
+        keyframes = [{"t": 0, "s": [0], "e": [10], "o": {"x": [0], "y": [0]}, "i": {"x": [1], "y": [1]}},
+                     {"t": 10}]
+        self.assertAlmostEqual(get_lottie_value(keyframes, 5)[0], 5, 6)
+        self.assertEqual(get_lottie_value(keyframes, -1), [0])
+        self.assertEqual(get_lottie_value(keyframes, 20), [10])
+
+    def test_empty_tangents(self):
+        for tangents in ({"o": {}, "i": {}}, {}):
+            keyframes = [dict({"t": 0, "s": [0, 0], "e": [10, 20]}, **tangents), {"t": 10}]
+            self.assertEqual([round(val, 6) for val in get_lottie_value(keyframes, 5)], [5, 10])
+            keyframes[0].update({"to": [0, 0], "ti": [0, 0]})
+            self.assertEqual([round(val, 6) for val in get_lottie_value(keyframes, 5)], [5, 10])
+
+    def test_hold(self):
+        keyframes = [{"t": 0, "s": [1], "e": [2], "h": 1, "o": {}, "i": {}}, {"t": 10, "s": [2]}]
+        self.assertEqual(get_lottie_value(keyframes, 9), [1])
+        self.assertEqual(get_lottie_value(keyframes, 10), [2])
+
+
+class CheckCanvasTest(unittest.TestCase):
+
+    def test_check(self):
+        radius = S.animated("real", [("0s", S.real(0.5)), ("1s", S.real(1)), ("2s", S.real(0.2))])
+        origin = S.animated("vector", [("0s", S.vector(0, 0)), ("2s", S.vector(1, 1))], "linear")
+        doc = S.canvas([S.circle(radius=radius, origin=origin)], end="2s")
+        converter.init({"optimize": False})
+        results = check_canvas(etree.fromstring(doc))
+        self.assertEqual([(res["param"], res["type"]) for res in results],
+                         [("radius", "circle_radius"), ("origin", "vector")])
+        for res in results:
+            self.assertLess(res["max_error"], 1e-3)
+            self.assertEqual(res["keyframes"], res["waypoints"])
+        summary = summarize(results)
+        self.assertEqual(summary["vector"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests of the output frame rate option
+"""
+
+import unittest
+import sifdoc
+import converter
+from fidelity import get_track_value
+from model import Animated, Waypoint, snap_holds
+
+S = sifdoc
+
+
+def get_position(lottie):
+    return lottie["layers"][0]["shapes"][0]["p"]
+
+
+class FrameRateTest(unittest.TestCase):
+
+    def test_snap_holds(self):
+        anim = Animated("real", [Waypoint(0.0, 0.0, "linear", "linear"),
+                                 Waypoint(0.52, 1.0, "linear", "constant"),
+                                 Waypoint(0.53, 2.0, "constant", "linear"),
+                                 Waypoint(1.0, 3.0, "linear", "linear")])
+        snap_holds(anim, 12)
+        # The second waypoint would land on the first one and is left alone
+        self.assertEqual([w.time for w in anim], [0.0, 0.5, 0.53, 1.0])
+        # Nor would it go past the next waypoint
+        anim = Animated("real", [Waypoint(0.0, 0.0, "linear", "linear"),
+                                 Waypoint(0.46, 1.0, "linear", "constant"),
+                                 Waypoint(0.48, 2.0, "linear", "linear"),
+                                 Waypoint(1.0, 3.0, "linear", "linear")])
+        snap_holds(anim, 12)
+        self.assertEqual([w.time for w in anim], [0.0, 0.46, 0.48, 1.0])
+
+    def test_rescaled(self):
+        origin = S.animated("vector", [("0s", S.vector(0, 0)), ("1s", S.vector(1, 0)),
+                                       ("2s", S.vector(1, 1))])
+        doc = S.canvas([S.circle(origin=origin)], end="2s")
+        full = converter.convert(doc, {"optimize": False})
+        half = converter.convert(doc, {"frame_rate": 12, "optimize": False})
+        self.assertEqual((half["fr"], half["ip"], half["op"]), (12, 0, 24))
+        self.assertEqual([k["t"] for k in get_position(half)["k"]], [0, 12, 24])
+        for frame in range(25):
+            for got, expected in zip(get_track_value(get_position(half), frame),
+                                     get_track_value(get_position(full), frame * 2)):
+                self.assertAlmostEqual(got, expected, 6)
+
+    def test_baked(self):
+        origin = S.animated("vector", [("0s", S.vector(0, 0)), ("1s", S.vector(1, 0)),
+                                       ("2s", S.vector(1, 1))])
+        doc = S.canvas([S.circle(origin=origin)], end="2s")
+        full = converter.convert(doc, {"bake": ["all"]})
+        half = converter.convert(doc, {"bake": ["all"], "frame_rate": 12})
+        self.assertEqual(len(get_position(half)["k"]), 25)
+        for frame in range(25):
+            self.assertEqual(get_track_value(get_position(half), frame),
+                             get_track_value(get_position(full), frame * 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Tests of the scale of the import layers computed from their corners
+"""
+
+import unittest
+from lxml import etree
+import sifdoc
+import converter
+from fidelity import get_track_value
+from model import parse_canvas
+from helpers.bezier import get_bezier_val, split_bezier
+from helpers.interpolation import evaluate
+
+S = sifdoc
+
+
+def convert(doc):
+    return converter.convert(doc, image_loader=lambda name: S.png(60, 30))["layers"][0]["ks"]["s"]
+
+
+def get_synfig_scale(doc, frames):
+    """
+    Returns the scale in percent of a 60x30 image at every frame, the canvas
+    has 60 pixels per unit
+    """
+    layer = parse_canvas(etree.fromstring(doc)).layers[0]
+    times = [frame / 24 for frame in frames]
+    top_left = evaluate(layer.get_param("tl").value, times)
+    bottom_right = evaluate(layer.get_param("br").value, times)
+    return [(100 * (x2 - x1), 200 * (y1 - y2)) for (x1, y1), (x2, y2) in zip(top_left, bottom_right)]
+
+
+class BezierTest(unittest.TestCase):
+
+    def test_split(self):
+        points = (0.0, 3.0, -1.0, 2.0)
+        part = split_bezier(*points, 0.25, 0.75)
+        for k in range(5):
+            self.assertAlmostEqual(get_bezier_val(*part, k / 4), get_bezier_val(*points, 0.25 + k / 8))
+
+
+class ImageScaleTest(unittest.TestCase):
+
+    def test_scale(self):
+        top_left = S.animated("vector", [("0s", S.vector(-2, 1)), ("1s", S.vector(-1, 1.5)),
+                                         ("2s", S.vector(-2.5, 0.5))])
+        bottom_right = S.animated("vector", [("0s", S.vector(1, -1)), ("1.5s", S.vector(2, -0.5)),
+                                             ("2s", S.vector(1.5, -1))], "linear")
+        doc = S.canvas([S.image("a.png", top_left, bottom_right)], end="2s")
+        scale = convert(doc)
+        # One keyframe for every keyframe of the corners
+        self.assertEqual([k["t"] for k in scale["k"]], [0, 24, 36, 48])
+        for frame, expected in enumerate(get_synfig_scale(doc, range(49))):
+            for got, value in zip(get_track_value(scale, frame), expected):
+                self.assertAlmostEqual(got, value, delta=0.05)
+
+    def test_hold(self):
+        top_left = S.animated("vector", [("0s", S.vector(-2, 1)), ("1s", S.vector(-1, 1))], "constant")
+        doc = S.canvas([S.image("a.png", top_left, S.vector(1, -1))], end="2s")
+        scale = convert(doc)
+        self.assertEqual(scale["k"][0]["h"], 1)
+        self.assertEqual(get_track_value(scale, 23), [300, 400])
+        self.assertEqual(get_track_value(scale, 24), [200, 400])
+
+
+if __name__ == "__main__":
+    unittest.main()
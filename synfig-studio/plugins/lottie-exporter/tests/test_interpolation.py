@@ -0,0 +1,91 @@
+"""
+Tests of the evaluation of Synfig's interpolations and of the bake mode
+"""
+
+import unittest
+import sifdoc
+import converter
+from misc import Vector
+from model import Animated, Waypoint
+from helpers.interpolation import evaluate, get_value_at_time
+
+
+def track(values, interpolation="clamped", _type="real"):
+    return Animated(_type, [Waypoint(time, value, interpolation, interpolation)
+                            for time, value in values])
+
+
+def get_position(lottie):
+    return lottie["layers"][0]["shapes"][0]["p"]
+
+
+class EvaluateTest(unittest.TestCase):
+
+    def test_linear(self):
+        anim = track([(0.0, 0.0), (2.0, 4.0)], "linear")
+        values = [c[0] for c in evaluate(anim, [0.0, 0.5, 1.0, 2.0])]
+        for value, expected in zip(values, [0.0, 1.0, 2.0, 4.0]):
+            self.assertAlmostEqual(value, expected)
+
+    def test_outside_the_waypoints(self):
+        anim = track([(1.0, 1.0), (2.0, 3.0)], "linear")
+        self.assertEqual([c[0] for c in evaluate(anim, [0.0, 5.0])], [1.0, 3.0])
+
+    def test_constant(self):
+        anim = track([(0.0, 0.0), (1.0, 5.0)], "constant")
+        self.assertEqual([c[0] for c in evaluate(anim, [0.0, 0.99, 1.0])], [0.0, 0.0, 5.0])
+
+    def test_clamped_does_not_overshoot(self):
+        anim = track([(0.0, 0.0), (1.0, 1.0), (2.0, 1.0), (3.0, 0.0)])
+        values = [c[0] for c in evaluate(anim, [i / 24 for i in range(73)])]
+        self.assertTrue(all(-1e-9 <= val <= 1 + 1e-9 for val in values))
+
+    def test_halt_eases(self):
+        anim = track([(0.0, 0.0), (1.0, 1.0)], "halt")
+        early, middle = [c[0] for c in evaluate(anim, [0.1, 0.5])]
+        self.assertAlmostEqual(middle, 0.5)
+        self.assertLess(early, 0.1)
+
+    def test_vector(self):
+        anim = track([(0.0, Vector(0, 0)), (1.0, Vector(2, -2))], "linear", "vector")
+        value = get_value_at_time(anim, 0.25)
+        self.assertEqual((value.val1, value.val2), (0.5, -0.5))
+
+
+class BakeTest(unittest.TestCase):
+
+    def convert(self, interpolation, step):
+        origin = sifdoc.animated("vector", [("0s", sifdoc.vector(0, 0)), ("1s", sifdoc.vector(1, 0)),
+                                            ("2s", sifdoc.vector(1, 1))], interpolation)
+        doc = sifdoc.canvas([sifdoc.circle(origin=origin)], end="2s")
+        return converter.convert(doc, {"bake": ["all"], "bake_step": step, "optimize": False})
+
+    def test_step(self):
+        keyframes = get_position(self.convert("clamped", 5))["k"]
+        self.assertEqual([k["t"] for k in keyframes],
+                         [0, 5, 10, 15, 20, 24, 25, 30, 35, 40, 45, 48])
+        # Linear keyframes continuing each other
+        for cur, nxt in zip(keyframes, keyframes[1:-1]):
+            self.assertEqual(cur["e"], nxt["s"])
+            self.assertEqual(cur["o"], {"x": 0, "y": 0})
+        self.assertEqual(keyframes[5]["s"], [300, 135])
+
+    def test_values(self):
+        keyframes = get_position(self.convert("linear", 1))["k"]
+        self.assertEqual(keyframes[12]["s"], [270, 135])
+        self.assertEqual(keyframes[36]["s"], [300, 105])
+
+    def test_constant_holds(self):
+        keyframes = get_position(self.convert("constant", 1))["k"]
+        self.assertEqual([k["t"] for k in keyframes], [0, 24, 48])
+        self.assertTrue(all(k.get("h") == 1 for k in keyframes))
+        self.assertEqual(keyframes[-1]["s"], [300, 75])
+
+    def test_not_baked_by_default(self):
+        origin = sifdoc.animated("vector", [("0s", sifdoc.vector(0, 0)), ("1s", sifdoc.vector(1, 0))])
+        lottie = converter.convert(sifdoc.canvas([sifdoc.circle(origin=origin)], end="1s"))
+        self.assertEqual(len(get_position(lottie)["k"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Tests of the generation of the keyframes of a track
+"""
+
+import unittest
+from lxml import etree
+import sifdoc
+import converter
+from fidelity import check_canvas
+from misc import Vector, Color, parse_position
+from model import Animated, Waypoint
+from properties.keyframeStream import iter_keyframes
+from properties import offsetKeyframe
+from properties.offsetKeyframe import TrackTangents, calc_tangents, calc_tangent, calc_segments
+from properties.timeAdjust import calc_time_factors
+from properties.valueKeyframe import gen_value_Keyframe
+from properties.multiDimensionalKeyframed import iter_offset_keyframes
+
+S = sifdoc
+
+
+def track(values, interpolations, _type="vector"):
+    return Animated(_type, [Waypoint(time, value, before, after)
+                            for (time, value), (before, after) in zip(values, interpolations)])
+
+
+def unpack(value):
+    # misc.Vector has no equality, compare the values it holds
+    if isinstance(value, tuple):
+        return tuple(unpack(item) for item in value)
+    return (value.val1, value.val2) if isinstance(value, Vector) else value
+
+
+def setup_canvas():
+    # Sets the frame rate and the canvas size used to position the keyframes
+    converter.convert(S.canvas([]))
+
+
+class KeyframeStreamTest(unittest.TestCase):
+
+    def setUp(self):
+        setup_canvas()
+
+    def test_single_pass(self):
+        anim = track([(0.0, 0.0), (1.0, 1.0), (2.0, 0.5), (3.0, 2.0)], [("auto", "auto")] * 4, "real")
+        built = []
+
+        def gen_keyframe(curve_list, animated, i, tangents):
+            built.append(i)
+            gen_value_Keyframe(curve_list, animated, i, tangents)
+
+        keyframes = iter_keyframes(anim, gen_keyframe)
+        # A keyframe is final once the next one is built
+        first = next(keyframes)
+        self.assertEqual(built, [0, 1])
+        self.assertEqual([first] + list(keyframes), list(iter_keyframes(anim, gen_value_Keyframe)))
+        self.assertEqual(built, [0, 1, 2])
+
+    def test_last_hold(self):
+        anim = track([(0.0, Vector(0, 0)), (1.0, Vector(1, 0)), (2.0, Vector(1, 1))],
+                     [("linear", "linear"), ("linear", "constant"), ("constant", "constant")])
+        keyframes = list(iter_offset_keyframes(anim))
+        self.assertEqual([k["t"] for k in keyframes], [0, 24, 48])
+        self.assertEqual(keyframes[1]["h"], 1)
+        self.assertEqual(keyframes[-1], {"t": 48, "h": 1, "s": keyframes[1]["e"]})
+
+    def test_fidelity(self):
+        radius = S.animated("real", [("0s", S.real(0.5)), ("1s", S.real(1)), ("2s", S.real(0.2)),
+                                     ("3s", S.real(0.8))])
+        origin = S.animated("vector", [("0s", S.vector(0, 0)), ("1s", S.vector(1, 0)),
+                                       ("2s", S.vector(1, 1)), ("3s", S.vector(0, 1))], "linear")
+        doc = S.canvas([S.circle(radius=radius, origin=origin)], end="3s")
+        converter.init({"optimize": False})
+        for res in check_canvas(etree.fromstring(doc)):
+            self.assertEqual(res["keyframes"], res["waypoints"])
+            self.assertLess(res["max_error"], 1e-3)
+
+
+class TangentsTest(unittest.TestCase):
+
+    def setUp(self):
+        setup_canvas()
+
+    def check_batch(self, anim):
+        tangents = calc_tangents(anim)
+        for i in range(len(anim) - 1):
+            if tangents.segments[i] is None:
+                continue
+            batch = {"i": {}, "o": {}}
+            single = {"i": {}, "o": {}}
+            got = calc_tangent(anim, batch, i, tangents)
+            expected = calc_tangent(anim, single, i)
+            self.assertEqual([(v.val1, v.val2) for v in got], [(v.val1, v.val2) for v in expected])
+            self.assertEqual(batch, single)
+
+    def test_same_as_single(self):
+        values = [(0.0, 0.0), (0.5, 1.0), (1.0, 1.0), (1.5, -0.5), (2.0, 2.0), (3.0, 1.0)]
+        interpolations = ["auto", "clamped", "linear", "halt"]
+        for _type in ("real", "angle", "circle_radius", "opacity"):
+            for before in interpolations:
+                for after in interpolations:
+                    pairs = [(before, after), (after, before), ("clamped", "auto"),
+                             (after, after), (before, before), ("auto", "clamped")]
+                    self.check_batch(track(values, pairs, _type))
+        vectors = [(time, Vector(value, value * value)) for time, value in values]
+        anim = track(vectors, [("auto", "clamped"), ("clamped", "auto"), ("linear", "clamped"),
+                               ("clamped", "clamped"), ("halt", "auto"), ("auto", "auto")])
+        self.check_batch(anim)
+        for i, waypoint in enumerate(anim):
+            waypoint.tension, waypoint.continuity, waypoint.bias = 0.1 * i, -0.2, 0.3
+            waypoint.before, waypoint.after = "auto", "auto"
+        self.check_batch(anim)
+
+    def test_window(self):
+        values = [(0.1 * k, 0.5 * k * (k % 3)) for k in range(12)]
+        interpolations = [("clamped", "auto"), ("auto", "clamped"), ("halt", "linear")] * 4
+        anim = track(values, interpolations, "real")
+        whole = TrackTangents(anim)
+        windowed = TrackTangents(anim, window=3)
+        for i in range(len(anim) - 1):
+            self.assertEqual(unpack(windowed.positions[i + 1]), unpack(whole.positions[i + 1]))
+            self.assertEqual(unpack(windowed.segments[i]), unpack(whole.segments[i]))
+            self.assertEqual(windowed.factors[i], whole.factors[i])
+            # The previous interval is still held after moving the window
+            if i > 0:
+                self.assertEqual(unpack(windowed.segments[i - 1]), unpack(whole.segments[i - 1]))
+        self.assertLessEqual(len(windowed.data["segments"]), 3)
+        with self.assertRaises(IndexError):
+            windowed.segments[len(anim) - 1]
+
+    @unittest.skipIf(offsetKeyframe.numpy is None, 'numpy is not installed')
+    def test_numpy_same_as_loop(self):
+        # Rising, falling, flat and exactly midway points for the clamped bias
+        values = [(0.0, 0.0), (0.5, 1.0), (1.0, 2.0), (1.5, 1.0), (2.0, 1.0), (2.5, 1.0), (3.0, -1.0),
+                  (4.0, 0.5), (4.5, 0.75), (5.0, 2.0), (6.0, 1.0)]
+        interpolations = ["auto", "clamped", "linear", "halt", "constant"]
+        for _type in ("real", "angle", "vector"):
+            for before in interpolations:
+                for after in interpolations:
+                    pairs = [(before, after), (after, "clamped"), ("clamped", before), ("auto", after),
+                             (before, "auto")] * 3
+                    points = values if _type != "vector" else [(time, Vector(value, 1 - value)) for time, value in values]
+                    anim = track(points, pairs[:len(values)], _type)
+                    for k, waypoint in enumerate(anim):
+                        waypoint.tension, waypoint.continuity, waypoint.bias = 0.1 * (k % 3), -0.2, 0.3
+                    positions = [parse_position(anim, k) for k in range(len(anim))]
+                    for first, last in ((0, len(anim) - 1), (1, 4), (len(anim) - 2, len(anim) - 1)):
+                        offset = max(0, first - 1)
+                        window = positions[offset:last + 2]
+                        self.assertEqual(unpack(tuple(calc_segments(anim, window, offset, first, last, True))),
+                                         unpack(tuple(calc_segments(anim, window, offset, first, last, False))))
+        frames = [0, 12, 18, 18, 30, 31.5, 48]
+        self.assertEqual(calc_time_factors(frames, True), calc_time_factors(frames, False))
+        self.assertIsNone(calc_time_factors(frames, True)[-2][1])
+
+    def test_left_to_single(self):
+        anim = track([(0.0, 0.0), (1.0, 1.0), (2.0, 0.0)], [("linear", "constant"), ("constant", "linear"),
+                                                           ("linear", "linear")], "real")
+        self.assertEqual(calc_tangents(anim).segments[0], None)
+        self.assertIsNotNone(calc_tangents(anim).segments[1])
+        colors = track([(0.0, Color(0, 0, 0, 1)), (1.0, Color(1, 1, 1, 1))],
+                       [("linear", "linear")] * 2, "color")
+        self.assertIsNone(calc_tangents(colors).segments[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Tests of the typed animation model parsed from the .sif documents
+"""
+
+import unittest
+from lxml import etree
+import sifdoc
+import converter
+import misc
+from model import parse_value, parse_canvas, Animated
+
+FPS = 24.0
+
+
+def parse(text):
+    return parse_value(etree.fromstring(text), FPS)
+
+
+class ParseValueTest(unittest.TestCase):
+
+    def test_scalars(self):
+        self.assertEqual(parse(sifdoc.real(1.5)), 1.5)
+        self.assertEqual(parse(sifdoc.real(90, "angle")), 90.0)
+        self.assertEqual(parse('<integer value="3"/>'), 3)
+        self.assertIs(parse('<bool value="true"/>'), True)
+        self.assertEqual(parse("<string/>"), "")
+        self.assertEqual(parse('<time value="1s 12f"/>'), 1.5)
+
+    def test_distance(self):
+        self.assertEqual(parse(sifdoc.distance(0.25)), 0.25)
+
+    def test_vector_and_color(self):
+        vec = parse(sifdoc.vector(1, -2))
+        self.assertIsInstance(vec, misc.Vector)
+        self.assertEqual((vec.val1, vec.val2), (1.0, -2.0))
+        col = parse(sifdoc.color(0.1, 0.2, 0.3, 0.4))
+        self.assertEqual((col.red, col.green, col.blue, col.alpha), (0.1, 0.2, 0.3, 0.4))
+
+    def test_animated(self):
+        anim = parse(sifdoc.animated("real", [("2s", sifdoc.real(2)), ("12f", sifdoc.real(1))], "linear"))
+        self.assertIsInstance(anim, Animated)
+        self.assertEqual([w.time for w in anim], [0.5, 2.0])
+        self.assertEqual([w.value for w in anim], [1.0, 2.0])
+        self.assertEqual((anim[0].before, anim[0].after), ("linear", "linear"))
+
+    def test_unknown_kept(self):
+        node = parse("<bline/>")
+        self.assertEqual(node.tag, "bline")
+
+
+class ParseCanvasTest(unittest.TestCase):
+
+    def test_canvas(self):
+        root = etree.fromstring(sifdoc.canvas([sifdoc.circle()], end="2s", fps=25))
+        canvas = parse_canvas(root)
+        self.assertEqual((canvas.width, canvas.height, canvas.fps), (480, 270, 25.0))
+        self.assertEqual((canvas.begin_frame, canvas.end_frame), (0, 50))
+        self.assertEqual(canvas.layers[0].type, "circle")
+        self.assertEqual(canvas.layers[0].get_param("radius").value, 1.0)
+
+    def test_distance_radius(self):
+        lottie = converter.convert(sifdoc.canvas([sifdoc.circle(sifdoc.distance(0.5))]))
+        size = lottie["layers"][0]["shapes"][0]["s"]
+        self.assertEqual(size["k"], [60, 60])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Tests of the output optimizer
+"""
+
+import unittest
+import sifdoc
+import converter
+from optimizer import optimize, trim, quantize, strip_internal, trim_keyframes
+
+
+def keyframes(*times):
+    return [{"t": t, "s": [t], "e": [t + 1]} for t in times[:-1]] + [{"t": times[-1]}]
+
+
+class OptimizerTest(unittest.TestCase):
+
+    def test_strip_internal(self):
+        obj = {"k": [{"t": 0, "synfig_o": [1]}], "synfig_x": 1}
+        strip_internal(obj)
+        self.assertEqual(obj, {"k": [{"t": 0}]})
+
+    def test_quantize(self):
+        obj = {"a": [1.23456, 2.0, 3], "b": {"c": 0.0004}}
+        quantize(obj, 3)
+        self.assertEqual(obj, {"a": [1.235, 2, 3], "b": {"c": 0}})
+        self.assertIsInstance(obj["a"][1], int)
+
+    def test_trim_keyframes(self):
+        kfs = keyframes(0, 10, 20, 30, 40, 50)
+        self.assertEqual([k["t"] for k in trim_keyframes(kfs, 15, 35)], [10, 20, 30, 40])
+        self.assertEqual([k["t"] for k in trim_keyframes(kfs, 20, 30)], [20, 30])
+        # One interval is always kept
+        self.assertEqual([k["t"] for k in trim_keyframes(kfs, 60, 70)], [40, 50])
+
+    def test_fold_static(self):
+        lottie = {"ip": 0, "op": 10, "layers": [
+            {"ty": 4, "ip": 0, "op": 10, "ks": {"o": {"a": 1, "k": [{"t": 0, "s": [100], "e": [100]},
+                                                                    {"t": 10}]}}}]}
+        optimize(lottie)
+        self.assertEqual(lottie["layers"][0]["ks"]["o"], {"a": 0, "k": 100})
+
+    def test_trim_does_not_fold(self):
+        prop = {"a": 1, "k": [{"t": 0, "s": [1], "e": [1]}, {"t": 10}]}
+        trim({"ip": 0, "op": 10, "p": prop})
+        self.assertEqual(prop["a"], 1)
+
+    def test_export(self):
+        origin = sifdoc.animated("vector", [("0s", sifdoc.vector(0, 0)), ("1s", sifdoc.vector(1, 0))])
+        doc = sifdoc.canvas([sifdoc.circle(origin=origin)], end="1s")
+        plain = converter.convert(doc, {"optimize": False})
+        optimized = converter.convert(doc)
+        self.assertIn("synfig_to", plain["layers"][0]["shapes"][0]["p"]["k"][0])
+        self.assertNotIn("synfig_to", optimized["layers"][0]["shapes"][0]["p"]["k"][0])
+        # Constant properties are folded
+        self.assertEqual(optimized["layers"][0]["shapes"][0]["s"]["a"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
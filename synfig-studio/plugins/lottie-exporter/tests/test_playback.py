@@ -0,0 +1,59 @@
+"""
+Tests of the playback cost analysis of exported animations
+"""
+
+import unittest
+import sifdoc
+import converter
+import playback
+
+S = sifdoc
+RADIUS = S.animated("real", [("0s", S.real(0.5)), ("1s", S.real(1)), ("2s", S.real(0.2))])
+
+
+class PlaybackTest(unittest.TestCase):
+
+    def test_is_baked(self):
+        even = [{"t": t} for t in range(0, 40, 4)]
+        self.assertTrue(playback.is_baked(even))
+        self.assertFalse(playback.is_baked(even[:playback.BAKED_MIN_KEYFRAMES - 1]))
+        self.assertFalse(playback.is_baked([{"t": t * t} for t in range(10)]))
+
+    def test_tracks(self):
+        lottie = converter.convert(S.canvas([S.circle(radius=RADIUS)], end="2s"))
+        baked = converter.convert(S.canvas([S.circle(radius=RADIUS)], end="2s"), {"bake": ["all"]})
+        layer = playback.analyze(lottie)["layers"][0]
+        baked_layer = playback.analyze(baked)["layers"][0]
+        self.assertEqual((layer["type"], layer["shapes"], layer["paints"]), ("shape", 1, 1))
+        self.assertEqual((layer["tracks"], layer["baked_tracks"], layer["keyframes"]), (1, 0, 3))
+        self.assertEqual((baked_layer["tracks"], baked_layer["baked_tracks"], baked_layer["dense_tracks"]),
+                         (1, 1, 1))
+        self.assertGreater(baked_layer["cost"], layer["cost"])
+        self.assertIn("1 baked tracks", playback.get_flags(baked_layer))
+
+    def test_visible_part(self):
+        lottie = {"ip": 0, "op": 100, "fr": 25, "layers": [
+            {"ty": 4, "nm": "a", "ip": 0, "op": 100, "shapes": [{"ty": "el"}, {"ty": "fl"}]},
+            {"ty": 4, "nm": "b", "ip": 50, "op": 200, "shapes": [{"ty": "el"}, {"ty": "fl"}]}]}
+        report = playback.analyze(lottie)
+        first, second = report["layers"]
+        self.assertEqual(second["visible_frames"], 50)
+        self.assertEqual(first["breakdown"]["shapes"], 2 * second["breakdown"]["shapes"])
+        self.assertEqual(report["offenders"][0]["name"], "a")
+        self.assertAlmostEqual(sum(o["share"] for o in report["offenders"]), 1.0, 2)
+
+    def test_precomp_and_image(self):
+        lottie = {"ip": 0, "op": 10, "fr": 10,
+                  "assets": [{"id": "img", "w": 1000, "h": 500},
+                             {"id": "comp", "layers": [{"ty": 2, "refId": "img"}]}],
+                  "layers": [{"ty": 0, "refId": "comp"}]}
+        layer = playback.analyze(lottie)["layers"][0]
+        self.assertEqual(layer["type"], "precomp")
+        image = layer["layers"][0]
+        self.assertEqual((image["type"], image["pixel_area"]), ("image", 500000))
+        self.assertEqual(image["breakdown"]["pixels"], playback.WEIGHTS["megapixel"] / 2)
+        self.assertEqual(layer["breakdown"]["precomp"], image["cost"])
+
+
+if __name__ == "__main__":
+    unittest.main()
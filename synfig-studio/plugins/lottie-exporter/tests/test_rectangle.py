@@ -0,0 +1,84 @@
+"""
+Tests of the waypoints placed between those of an animated rectangle
+"""
+
+import unittest
+from lxml import etree
+import sifdoc
+import converter
+import settings
+from fidelity import get_track_value
+from model import parse_canvas, Animated
+from helpers.interpolation import evaluate
+from shapes.rectangle import get_adaptive_frames
+
+S = sifdoc
+FPS = 24
+POINT1 = S.animated("vector", [("0s", S.vector(-2, -1)), ("1s", S.vector(1, 1.5)),
+                               ("2s", S.vector(-1, 0.5)), ("3s", S.vector(2, -1))])
+POINT2 = S.animated("vector", [("0s", S.vector(1, 1)), ("1.5s", S.vector(-1, -1)),
+                               ("3s", S.vector(0.5, 1.2))], "auto")
+EXPAND = S.animated("real", [("0s", S.real(0)), ("2s", S.real(0.3)), ("3s", S.real(0.1))])
+
+
+def get_synfig_rectangle(doc, frames):
+    """
+    Returns the center and the size in pixels of the rectangle of Synfig at
+    every frame, the canvas has 60 pixels per unit
+    """
+    layer = parse_canvas(etree.fromstring(doc)).layers[0]
+    times = [frame / FPS for frame in frames]
+    values = []
+    for name in ("point1", "point2", "expand"):
+        value = layer.get_param(name).value
+        values.append(evaluate(value, times) if isinstance(value, Animated) else [[value]] * len(times))
+    ret = []
+    for (x1, y1), (x2, y2), (expand,) in zip(*values):
+        ret.append((240 + 30 * (x1 + x2), 135 - 30 * (y1 + y2),
+                    60 * abs(x1 - x2) + 120 * expand, 60 * abs(y1 - y2) + 120 * expand))
+    return ret
+
+
+class RectangleTest(unittest.TestCase):
+
+    def check_rectangle(self, doc, end):
+        frames = list(range(end + 1))
+        rect = converter.convert(doc)["layers"][0]["shapes"][0]
+        for frame, (x_val, y_val, width, height) in zip(frames, get_synfig_rectangle(doc, frames)):
+            pos = get_track_value(rect["p"], frame)
+            size = get_track_value(rect["s"], frame)
+            self.assertLessEqual(abs(size[0] - width), settings.RECTANGLE_TOLERANCE)
+            self.assertLessEqual(abs(size[1] - height), settings.RECTANGLE_TOLERANCE)
+            # The positions of the keyframes are truncated to whole pixels by
+            # misc.change_axis()
+            self.assertLess(abs(pos[0] - x_val), settings.RECTANGLE_TOLERANCE + 1)
+            self.assertLess(abs(pos[1] - y_val), settings.RECTANGLE_TOLERANCE + 1)
+        return rect
+
+    def test_within_tolerance(self):
+        self.check_rectangle(S.canvas([S.rectangle(POINT1, POINT2)], end="3s"), 72)
+        self.check_rectangle(S.canvas([S.rectangle(POINT1, POINT2, EXPAND)], end="3s"), 72)
+
+    def test_few_waypoints(self):
+        point1 = S.animated("vector", [("0s", S.vector(-2, -1)), ("3s", S.vector(-1, 1))])
+        point2 = S.animated("vector", [("0s", S.vector(2, 1)), ("1s", S.vector(2, 1.5)), ("3s", S.vector(1, 1.5))])
+        rect = self.check_rectangle(S.canvas([S.rectangle(point1, point2)], end="3s"), 72)
+        self.assertLess(len(rect["s"]["k"]), 36)
+
+    def test_adaptive_frames(self):
+        converter.init()
+        # The width follows a parabola, the height a straight line
+        sample = lambda frame: (0, 0, frame * frame / 100, frame, True, True)
+        frames = get_adaptive_frames({0, 40}, sample)
+        frames = sorted(frames | {0, 40})
+        for first, last in zip(frames, frames[1:]):
+            for frame in range(first, last + 1):
+                chord = (first * first + (last * last - first * first) * (frame - first) / (last - first)) / 100
+                self.assertLessEqual(abs(chord - frame * frame / 100), settings.RECTANGLE_TOLERANCE)
+        # The points crossing each other is always split
+        sample = lambda frame: (0, 0, 1, 1, frame < 5, True)
+        self.assertIn(5, get_adaptive_frames({0, 9}, sample) | {9})
+
+
+if __name__ == "__main__":
+    unittest.main()
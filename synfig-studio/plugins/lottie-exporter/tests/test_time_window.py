@@ -0,0 +1,69 @@
+"""
+Tests of the export of a sub-range of the animation with --time-window
+"""
+
+import unittest
+import sifdoc
+import converter
+from fidelity import get_track_value
+
+S = sifdoc
+
+
+def get_shape(lottie):
+    return lottie["layers"][0]["shapes"][0]
+
+
+class TimeWindowTest(unittest.TestCase):
+
+    def test_window_frame(self):
+        self.assertEqual(converter.get_window_frame("2s", 24), 48)
+        self.assertEqual(converter.get_window_frame("12f", 24), 12)
+        self.assertEqual(converter.get_window_frame("1s 6f", 24), 30)
+        self.assertEqual(converter.get_window_frame(1.5, 24), 36)
+
+    def test_circle(self):
+        origin = S.animated("vector", [("0s", S.vector(0, 0)), ("2s", S.vector(1, 0)),
+                                       ("3s", S.vector(1, 1)), ("5s", S.vector(0, 1))])
+        doc = S.canvas([S.circle(origin=origin)], end="5s")
+        full = converter.convert(doc, {"optimize": False})
+        window = converter.convert(doc, {"time_window": ["2s 12f", "3s 12f"]})
+        self.assertEqual((window["ip"], window["op"]), (60, 84))
+        self.assertEqual(window["layers"][0]["ip"], 60)
+        keyframes = get_shape(window)["p"]["k"]
+        # Only the keyframes around the window are left
+        self.assertEqual([k["t"] for k in keyframes], [48, 72, 120])
+        for frame in range(60, 85):
+            for got, expected in zip(get_track_value(get_shape(window)["p"], frame),
+                                     get_track_value(get_shape(full)["p"], frame)):
+                self.assertAlmostEqual(got, expected, 2)
+
+    def test_rectangle_tracks_starting_apart(self):
+        # Clipping leaves point1 with its waypoints before the window only, so
+        # the tracks of the rectangle start at different frames
+        point1 = S.animated("vector", [("0s", S.vector(-2, 1)), ("1s", S.vector(-1, 1.5))])
+        point2 = S.animated("vector", [("0s", S.vector(1, -1)), ("2s", S.vector(2, -1)),
+                                       ("4s", S.vector(1.5, -0.5)), ("5s", S.vector(2.5, -1))])
+        expand = S.animated("real", [("0s", S.real(0)), ("3s", S.real(0)), ("4s 12f", S.real(0.2)),
+                                     ("5s", S.real(0.1))])
+        doc = S.canvas([S.rectangle(point1, point2, expand)], end="5s")
+        full = get_shape(converter.convert(doc, {"optimize": False}))
+        for optimize in (True, False):
+            window = converter.convert(doc, {"time_window": ["4.5s", "5s"], "optimize": optimize})
+            self.assertEqual((window["ip"], window["op"]), (108, 120))
+            for frame in range(108, 121):
+                for key in ("p", "s"):
+                    for got, expected in zip(get_track_value(get_shape(window)[key], frame),
+                                             get_track_value(full[key], frame)):
+                        self.assertAlmostEqual(got, expected, 2)
+
+    def test_rectangle_track_starting_late(self):
+        point1 = S.animated("vector", [("2s", S.vector(-2, 1)), ("3s", S.vector(-1, 1.5))])
+        doc = S.canvas([S.rectangle(point1, S.vector(1, -1))], end="5s")
+        size = get_shape(converter.convert(doc))["s"]
+        self.assertEqual(get_track_value(size, 0), [180, 120])
+        self.assertEqual(get_track_value(size, 72), [120, 150])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Tests of the evaluation of the convert value nodes
+"""
+
+import unittest
+from lxml import etree
+import sifdoc
+import converter
+from fidelity import get_track_value
+from model import parse_value, parse_canvas, ValueNode, Animated
+from helpers.valueNode import evaluate_value, get_sample_frames, resolve_value_nodes
+
+S = sifdoc
+FPS = 24.0
+
+
+def node(kind, _type, **links):
+    return '<{0} type="{1}">{2}</{0}>'.format(
+        kind, _type, "".join("<{0}>{1}</{0}>".format(name, value) for name, value in links.items()))
+
+
+def evaluate(text, times):
+    return evaluate_value(parse_value(etree.fromstring(text), FPS), times, {})
+
+
+class ValueNodeTest(unittest.TestCase):
+
+    def test_parse(self):
+        value = parse_value(etree.fromstring(node("add", "real", lhs=S.real(1), rhs=S.real(2),
+                                                  scalar=S.real(1))), FPS)
+        self.assertIsInstance(value, ValueNode)
+        self.assertEqual(sorted(value.links.keys()), ["lhs", "rhs", "scalar"])
+        # Links which are not numeric leave the node unsupported
+        value = parse_value(etree.fromstring(node("add", "real", lhs="<bline/>", rhs=S.real(2),
+                                                  scalar=S.real(1))), FPS)
+        self.assertEqual(value.tag, "add")
+
+    def test_arithmetic(self):
+        ramp = S.animated("real", [("0s", S.real(0)), ("1s", S.real(2))], "linear")
+        self.assertEqual(evaluate(node("add", "real", lhs=S.real(1), rhs=ramp, scalar=S.real(2)), [0.5]),
+                         [[4.0]])
+        self.assertEqual(evaluate(node("subtract", "vector", lhs=S.vector(3, 3), rhs=S.vector(1, 2),
+                                       scalar=S.real(1)), [0.0]), [[2.0, 1.0]])
+        value = evaluate(node("scale", "vector", link=S.vector(1, 2), scalar=ramp), [0.5])
+        self.assertAlmostEqual(value[0][0], 1.0)
+        self.assertAlmostEqual(value[0][1], 2.0)
+        self.assertEqual(evaluate(node("linear", "real", slope=S.real(2), offset=S.real(1)), [0.0, 1.5]),
+                         [[1.0], [4.0]])
+        self.assertEqual(evaluate('<linear type="angle"><rate><real value="90"/></rate>'
+                                  '<offset><real value="0"/></offset></linear>', [1.0]), [[90.0]])
+
+    def test_composite(self):
+        ramp = S.animated("real", [("0s", S.real(0)), ("1s", S.real(2))], "linear")
+        self.assertEqual(evaluate(node("composite", "vector", x=S.real(1), y=ramp), [0.0, 1.0]),
+                         [[1.0, 0.0], [1.0, 2.0]])
+        value = evaluate(node("radial_composite", "vector", radius=S.real(2), theta=S.real(90, "angle")), [0.0])
+        self.assertAlmostEqual(value[0][0], 0.0)
+        self.assertAlmostEqual(value[0][1], 2.0)
+
+    def test_sample_frames(self):
+        self.assertEqual(get_sample_frames(0, 3), [0, 1, 2, 3])
+        self.assertEqual(get_sample_frames(5, 5), [5])
+
+    def test_export(self):
+        ramp = S.animated("real", [("0s", S.real(0)), ("1s", S.real(1))], "linear")
+        origin = node("composite", "vector", x=ramp, y=S.real(0))
+        radius = node("scale", "real", link=S.real(0.5), scalar=S.real(2))
+        lottie = converter.convert(S.canvas([S.circle(radius=radius, origin=origin)], end="1s"))
+        shape = lottie["layers"][0]["shapes"][0]
+        # Constant nodes become static values
+        self.assertEqual(shape["s"]["k"], [120, 120])
+        # Positions are truncated to whole pixels by misc.change_axis()
+        for frame in range(25):
+            x_val, y_val = get_track_value(shape["p"], frame)
+            self.assertLess(abs(x_val - (240 + 60 * frame / 24)), 1)
+            self.assertEqual(y_val, 135)
+
+    def test_resolved_as_animation(self):
+        ramp = S.animated("real", [("0s", S.real(0)), ("1s", S.real(1))], "linear")
+        doc = S.canvas([S.circle(origin=node("composite", "vector", x=ramp, y=S.real(0)))], end="1s")
+        canvas = parse_canvas(etree.fromstring(doc))
+        resolve_value_nodes(canvas)
+        origin = canvas.layers[0].get_param("origin").value
+        self.assertIsInstance(origin, Animated)
+        self.assertEqual(len(origin), 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
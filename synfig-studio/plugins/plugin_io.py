@@ -0,0 +1,162 @@
+"""
+plugin_io.py
+Shared file handling of the Synfig Studio plugins. A plugin rewrites the
+document it is given in place; here the document is streamed from the
+original file to a temporary one next to it, which then atomically replaces
+the original, so that the whole file is never held in memory and a plugin
+dying mid-write leaves the document untouched. Compressed documents (.sifz)
+are read and written back compressed.
+
+    import plugin_io
+    plugin_io.rewrite_lines(filename, lambda line: line.replace("a", "b"))
+    plugin_io.rewrite_tags(filename, {"layer"}, set_active)
+
+Plugins living in a subdirectory import it with
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+"""
+
+import os
+import io
+import re
+import gzip
+import shutil
+import tempfile
+import contextlib
+
+GZIP_MAGIC = b"\x1f\x8b"
+ENCODING = "utf-8"
+START_TAG = re.compile(r"<([A-Za-z_][\w.-]*)(\s[^<>]*?)?(/?)>")
+ATTRIBUTE = re.compile(r"([A-Za-z_][\w.:-]*)\s*=\s*\"([^\"]*)\"")
+
+
+def is_compressed(filename):
+    """
+    Tells whether a file is gzip compressed, from its first bytes
+
+    Args:
+        filename (str) : Path of the file
+
+    Returns:
+        (bool) : True for gzip compressed files
+    """
+    with open(filename, "rb") as fil:
+        return fil.read(2) == GZIP_MAGIC
+
+
+def open_text(filename, mode="r", compressed=None):
+    """
+    Opens a document as text, compressed or not. Line endings are kept as they
+    are in the file
+
+    Args:
+        filename   (str)                     : Path of the document
+        mode       (:obj: `str`, optional)   : "r" or "w"
+        compressed (:obj: `bool`, optional)  : Whether to use gzip, detected from
+                                               the file when reading by default
+
+    Returns:
+        (io.TextIOWrapper) : Text stream of the document
+    """
+    if compressed is None:
+        compressed = mode == "r" and is_compressed(filename)
+    if compressed:
+        return io.TextIOWrapper(gzip.open(filename, mode + "b"), encoding=ENCODING, newline="")
+    return open(filename, mode, encoding=ENCODING, newline="")
+
+
+def read_lines(filename):
+    """
+    Yields the lines of a document one at a time
+
+    Args:
+        filename (str) : Path of the document
+
+    Yields:
+        (str) : Lines of the document, with their line ending
+    """
+    with open_text(filename) as fil:
+        for line in fil:
+            yield line
+
+
+@contextlib.contextmanager
+def rewrite(filename):
+    """
+    Context manager giving the lines of a document and a stream to write its
+    new contents to. The document is replaced when the block exits without an
+    exception, and is left untouched otherwise
+
+    Args:
+        filename (str) : Path of the document
+
+    Yields:
+        (io.TextIOWrapper, io.TextIOWrapper) : Input and output text streams
+    """
+    filename = os.path.realpath(filename)
+    compressed = is_compressed(filename)
+    handle, tmp_filename = tempfile.mkstemp(prefix="." + os.path.basename(filename) + ".",
+                                            suffix=".tmp",
+                                            dir=os.path.dirname(filename))
+    os.close(handle)
+    try:
+        with open_text(filename) as src, open_text(tmp_filename, "w", compressed) as dst:
+            yield src, dst
+        # The new contents have to be on the disk before they replace the old
+        handle = os.open(tmp_filename, os.O_RDONLY)
+        try:
+            os.fsync(handle)
+        finally:
+            os.close(handle)
+        shutil.copymode(filename, tmp_filename)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.unlink(tmp_filename)
+        raise
+
+
+def rewrite_lines(filename, transform):
+    """
+    Rewrites a document line by line
+
+    Args:
+        filename  (str)      : Path of the document
+        transform (callable) : Given a line, returns the text which replaces it,
+                               which may hold any number of lines
+
+    Returns:
+        (None)
+    """
+    with rewrite(filename) as (src, dst):
+        for line in src:
+            dst.write(transform(line))
+
+
+def rewrite_tags(filename, names, transform):
+    """
+    Rewrites the attributes of the start tags of some elements. Synfig writes
+    every start tag on a single line, tags spanning lines are left unchanged
+
+    Args:
+        filename  (str)      : Path of the document
+        names     (set)      : Names of the elements to be transformed
+        transform (callable) : Given the name and the attributes (dict) of an
+                               element, changes the attributes in place, the
+                               values are as written in the file
+
+    Returns:
+        (None)
+    """
+    def replace_tag(match):
+        name = match.group(1)
+        if name not in names:
+            return match.group(0)
+        before = dict(ATTRIBUTE.findall(match.group(2) or ""))
+        attributes = dict(before)
+        transform(name, attributes)
+        if attributes == before:
+            return match.group(0)
+        text = "".join(' {0}="{1}"'.format(key, value) for key, value in attributes.items())
+        return "<{0}{1}{2}>".format(name, text, match.group(3))
+
+    rewrite_lines(filename, lambda line: START_TAG.sub(replace_tag, line) if "<" in line else line)
@@ -0,0 +1,452 @@
+"""
+plugin_runner.py
+Runs a Synfig Studio plugin without Studio over every document of a
+directory tree. The plugins are discovered from the plugin.xml (or
+plugin.xml.in) files of the subdirectories, and each document is handed to
+the plugin's <exec> script the way Studio does, in its own process, with
+several documents processed at once
+
+    python3 plugin_runner.py list
+    python3 plugin_runner.py run view-unhide-all-layers scenes/ --jobs 8
+    python3 plugin_runner.py run lottie-exporter scenes/ -- --bake all
+    python3 plugin_runner.py run lottie-exporter scenes/ --timeout 600 --memory 2048 \
+        --retry="--bake-step 8" --retry=--no-optimize --retry="" -- --bake all
+
+Every document may be given a wall-clock and a memory budget. A plugin going
+over its time is asked to terminate, then killed after a grace period, and
+its memory is capped by the address space limit of its process, so that a
+single pathological document fails on its own while the rest of the batch
+keeps running. A failed document can be retried with lighter plugin
+arguments, each --retry replacing the arguments given after --. The retry
+arguments start with a dash, so they are given as --retry=ARGS, which
+argparse does not take for another option
+"""
+
+import os
+import sys
+import json
+import time
+import shlex
+import signal
+import fnmatch
+import argparse
+import subprocess
+import multiprocessing
+import concurrent.futures
+from xml.etree import ElementTree
+try:
+    import resource
+except ImportError:     # Not available on Windows, memory is not limited there
+    resource = None
+
+PLUGINS_DIR = os.path.dirname(os.path.abspath(__file__))
+PLUGIN_FILES = ("plugin.xml", "plugin.xml.in")
+DEFAULT_PATTERNS = ("*.sif", "*.sifz")
+DEFAULT_JOBS = max(1, multiprocessing.cpu_count())
+ERROR_LINES = 5     # Last lines of the output of a failed plugin kept in the report
+GRACE_SECONDS = 5   # Time given to a plugin to exit once asked to terminate
+MEMORY_ERRORS = ("MemoryError", "std::bad_alloc", "Cannot allocate memory")
+
+# Runs a plugin script as "python3 SCRIPT ..." would, once the address space
+# of the process is limited to argv[1] bytes
+LAUNCHER = ("import os, sys, resource, runpy; "
+            "size = int(sys.argv.pop(1)); "
+            "resource.setrlimit(resource.RLIMIT_AS, (size, size)); "
+            "sys.argv = sys.argv[1:]; "
+            "sys.path[0] = os.path.dirname(os.path.abspath(sys.argv[0])); "
+            "runpy.run_path(sys.argv[0], run_name='__main__')")
+
+# Statuses of a run
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_TIMEOUT = "timeout"
+STATUS_MEMORY = "memory"
+
+
+class Plugin:
+    """
+    A plugin as declared in its plugin.xml
+    """
+
+    def __init__(self, key, name, script):
+        """
+        Args:
+            key    (str) : Name of the plugin directory
+            name   (str) : Name shown in Studio
+            script (str) : Path of the script to be executed
+
+        Returns:
+            (None)
+        """
+        self.key = key
+        self.name = name
+        self.script = script
+
+
+def discover_plugins(plugins_dir=PLUGINS_DIR):
+    """
+    Finds the plugins in the subdirectories of a directory
+
+    Args:
+        plugins_dir (:obj: `str`, optional) : Directory holding the plugins
+
+    Returns:
+        (dict) : Plugins by the name of their directory
+    """
+    ret = {}
+    for key in sorted(os.listdir(plugins_dir)):
+        directory = os.path.join(plugins_dir, key)
+        for xml_name in PLUGIN_FILES:
+            xml_file = os.path.join(directory, xml_name)
+            if os.path.isfile(xml_file):
+                break
+        else:
+            continue
+        root = ElementTree.parse(xml_file).getroot()
+        # Translatable elements are prefixed with an underscore in .xml.in
+        name = root.findtext("name") or root.findtext("_name") or key
+        script = root.findtext("exec")
+        if script:
+            ret[key] = Plugin(key, name.strip(), os.path.join(directory, script.strip()))
+    return ret
+
+
+def find_plugin(plugins, wanted):
+    """
+    Looks a plugin up by its directory or its Studio name
+
+    Args:
+        plugins (dict) : Plugins by the name of their directory
+        wanted  (str)  : Directory or Studio name of the plugin
+
+    Returns:
+        (Plugin) : The plugin
+    """
+    if wanted in plugins.keys():
+        return plugins[wanted]
+    for plugin in plugins.values():
+        if plugin.name.lower() == wanted.lower():
+            return plugin
+    raise KeyError("Unknown plugin: " + wanted)
+
+
+def find_documents(paths, patterns=DEFAULT_PATTERNS):
+    """
+    Yields the documents matching the patterns in files and directory trees
+
+    Args:
+        paths    (list)                     : Files and directories
+        patterns (:obj: `tuple`, optional)  : File name patterns of the documents
+
+    Yields:
+        (str) : Paths of the documents, sorted in every directory
+    """
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if any(fnmatch.fnmatch(filename, pattern) for pattern in patterns):
+                    yield os.path.join(dirpath, filename)
+
+
+class Limits:
+    """
+    Budget of a single run of a plugin, None meaning unlimited
+    """
+
+    def __init__(self, seconds=None, megabytes=None):
+        """
+        Args:
+            seconds   (:obj: `float`, optional) : Wall-clock time of the run
+            megabytes (:obj: `int`, optional)   : Address space of the process
+
+        Returns:
+            (None)
+        """
+        self.seconds = seconds
+        self.megabytes = megabytes
+
+    def get_command(self, script, path, args):
+        """
+        Returns the command running a plugin over a document. With a memory
+        budget, the plugin is started by LAUNCHER, which applies the limit in
+        the new interpreter: the runner has threads running, so the limit can
+        not be applied between fork and exec
+
+        Args:
+            script (str)  : Script of the plugin
+            path   (str)  : Document to be processed
+            args   (list) : Arguments passed to the plugin after the document
+
+        Returns:
+            (list) : Command line of the plugin process
+        """
+        if self.megabytes is None:
+            return [sys.executable, script, path] + list(args)
+        size = int(self.megabytes * 1024 * 1024)
+        return [sys.executable, "-c", LAUNCHER, str(size), script, path] + list(args)
+
+
+def run_attempt(script, path, args, limits):
+    """
+    Runs a plugin once over one document in a new process, within the limits
+
+    Args:
+        script (str)    : Script of the plugin
+        path   (str)    : Document to be processed
+        args   (list)   : Arguments passed to the plugin after the document
+        limits (Limits) : Budget of the run
+
+    Returns:
+        (dict) : Arguments, status, exit status, seconds spent and error of the run
+    """
+    attempt = {"args": list(args)}
+    begin = time.time()
+    try:
+        proc = subprocess.Popen(limits.get_command(script, path, args),
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    except OSError as excep:
+        attempt["status"] = STATUS_FAILED
+        attempt["error"] = "{0}: {1}".format(type(excep).__name__, excep)
+        attempt["seconds"] = round(time.time() - begin, 3)
+        return attempt
+
+    timed_out = False
+    try:
+        output, _ = proc.communicate(timeout=limits.seconds)
+    except subprocess.TimeoutExpired:
+        # Asked to terminate first, so that the plugin may clean up
+        timed_out = True
+        proc.terminate()
+        try:
+            output, _ = proc.communicate(timeout=GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            output, _ = proc.communicate()
+    attempt["seconds"] = round(time.time() - begin, 3)
+    attempt["returncode"] = proc.returncode
+
+    output = output.decode("utf-8", "replace")
+    lines = output.strip().splitlines()[-ERROR_LINES:]
+    if timed_out:
+        attempt["status"] = STATUS_TIMEOUT
+        attempt["error"] = "exceeded {0}s".format(limits.seconds)
+    elif proc.returncode == 0:
+        attempt["status"] = STATUS_OK
+    else:
+        memory = limits.megabytes is not None and any(error in output for error in MEMORY_ERRORS)
+        attempt["status"] = STATUS_MEMORY if memory else STATUS_FAILED
+        if proc.returncode < 0:
+            reason = "killed by signal {0}".format(signal.Signals(-proc.returncode).name)
+        else:
+            reason = "exit status {0}".format(proc.returncode)
+        if memory:
+            reason = "exceeded {0} MB, {1}".format(limits.megabytes, reason)
+        attempt["error"] = "{0}: {1}".format(reason, "\n".join(lines))
+    return attempt
+
+
+def run_document(script, path, extra_args, limits=None, retries=()):
+    """
+    Runs a plugin over one document, and again with the retry arguments
+    as long as it fails
+
+    Args:
+        script     (str)                      : Script of the plugin
+        path       (str)                      : Document to be processed
+        extra_args (list)                     : Arguments passed to the plugin after the document
+        limits     (:obj: `Limits`, optional) : Budget of every run
+        retries    (:obj: `list`, optional)   : Lists of lighter arguments replacing
+                                                extra_args, tried in order
+
+    Returns:
+        (dict) : Path, size, status, seconds spent and error of the run, and
+                 every attempt if the document was retried
+    """
+    if limits is None:
+        limits = Limits()
+    record = {"path": path, "size": os.path.getsize(path)}
+    attempts = []
+    for args in [extra_args] + list(retries):
+        attempts.append(run_attempt(script, path, args, limits))
+        if attempts[-1]["status"] == STATUS_OK:
+            break
+    last = attempts[-1]
+    record["ok"] = last["status"] == STATUS_OK
+    record["status"] = last["status"]
+    if not record["ok"]:
+        record["error"] = last["error"]
+    record["seconds"] = round(sum(attempt["seconds"] for attempt in attempts), 3)
+    if len(attempts) > 1:
+        record["attempts"] = attempts
+    return record
+
+
+def run_plugin(plugin, documents, extra_args=(), jobs=DEFAULT_JOBS, report=None,
+               limits=None, retries=()):
+    """
+    Runs a plugin over many documents, jobs of them at a time
+
+    Args:
+        plugin     (Plugin)                   : Plugin to be run
+        documents  (iterable)                 : Paths of the documents
+        extra_args (:obj: `list`, optional)   : Arguments passed to the plugin after the document
+        jobs       (:obj: `int`, optional)    : Number of documents processed at once
+        report     (:obj: `callable`, optional) : Called with the record of every finished document
+        limits     (:obj: `Limits`, optional) : Budget of every run of the plugin
+        retries    (:obj: `list`, optional)   : Lighter arguments a failed document is retried with
+
+    Returns:
+        (dict) : Summary of the run and the records of all the documents
+    """
+    begin = time.time()
+    records = []
+    # Every document runs in its own process, the threads only wait for them
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_document, plugin.script, os.path.abspath(path), list(extra_args),
+                               limits, retries)
+                   for path in documents]
+        for future in concurrent.futures.as_completed(futures):
+            record = future.result()
+            records.append(record)
+            if report is not None:
+                report(record)
+    return summarize(records, time.time() - begin, jobs)
+
+
+def summarize(records, seconds, jobs):
+    """
+    Aggregates the records of a run
+
+    Args:
+        records (list)  : Records of the documents
+        seconds (float) : Wall-clock duration of the run
+        jobs    (int)   : Number of documents processed at once
+
+    Returns:
+        (dict) : Counts, throughput and the records sorted by path
+    """
+    size = sum(record["size"] for record in records)
+    return {
+        "documents": len(records),
+        "ok": sum(1 for record in records if record["ok"]),
+        "failed": sum(1 for record in records if not record["ok"]),
+        "timeouts": sum(1 for record in records if record["status"] == STATUS_TIMEOUT),
+        "out_of_memory": sum(1 for record in records if record["status"] == STATUS_MEMORY),
+        "retried": sum(1 for record in records if "attempts" in record),
+        "jobs": jobs,
+        "seconds": round(seconds, 3),
+        "documents_per_second": round(len(records) / seconds, 3) if seconds > 0 else None,
+        "megabytes_per_second": round(size / 1e6 / seconds, 3) if seconds > 0 else None,
+        "records": sorted(records, key=lambda record: record["path"]),
+    }
+
+
+def print_record(record):
+    """
+    Prints the status line of a finished document
+
+    Args:
+        record (dict) : Record of the document
+
+    Returns:
+        (None)
+    """
+    status = {STATUS_OK: "OK  ", STATUS_TIMEOUT: "TIME", STATUS_MEMORY: "MEM "}.get(record["status"], "FAIL")
+    retried = ""
+    if "attempts" in record:
+        retried = " (attempt {0}: {1})".format(len(record["attempts"]),
+                                               " ".join(record["attempts"][-1]["args"]) or "no arguments")
+    print("{0} {1:8.3f}s {2}{3}".format(status, record["seconds"], record["path"], retried))
+    if not record["ok"]:
+        for line in record["error"].splitlines():
+            print("     " + line)
+    sys.stdout.flush()
+
+
+def print_summary(summary):
+    """
+    Prints the totals of a run
+
+    Args:
+        summary (dict) : Summary of the run
+
+    Returns:
+        (None)
+    """
+    print("{0} documents, {1} ok, {2} failed in {3}s with {4} jobs".format(
+        summary["documents"], summary["ok"], summary["failed"], summary["seconds"], summary["jobs"]))
+    if summary["timeouts"] or summary["out_of_memory"] or summary["retried"]:
+        print("{0} timed out, {1} out of memory, {2} retried".format(
+            summary["timeouts"], summary["out_of_memory"], summary["retried"]))
+    if summary["documents_per_second"] is not None:
+        print("{0} documents/s, {1} MB/s".format(summary["documents_per_second"],
+                                                 summary["megabytes_per_second"]))
+
+
+def main(argv):
+    """
+    Command line entry point
+
+    Args:
+        argv (list) : Command line arguments without the program name
+
+    Returns:
+        (int) : Exit status, 1 if any document failed
+    """
+    extra_args = []
+    if "--" in argv:
+        extra_args = argv[argv.index("--") + 1:]
+        argv = argv[:argv.index("--")]
+
+    parser = argparse.ArgumentParser(description="Runs a Synfig Studio plugin over many documents",
+                                     epilog="Arguments after -- are passed to the plugin")
+    parser.add_argument("--plugins-dir", default=PLUGINS_DIR, help="directory holding the plugins")
+    sub = parser.add_subparsers(dest="cmd")
+    sub.add_parser("list", help="list the plugins")
+    run = sub.add_parser("run", help="run a plugin over documents")
+    run.add_argument("plugin", help="directory or name of the plugin")
+    run.add_argument("paths", nargs="+", help="documents or directories to be searched")
+    run.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="documents processed at once")
+    run.add_argument("--pattern", action="append", help="file name pattern, *.sif and *.sifz by default")
+    run.add_argument("--json", action="store_true", help="print the report as JSON")
+    run.add_argument("--timeout", type=float, metavar="SECONDS", help="wall-clock budget of a document")
+    run.add_argument("--memory", type=int, metavar="MB", help="memory budget of a document")
+    run.add_argument("--retry", action="append", default=[], metavar="ARGS",
+                     help="plugin arguments a failed document is retried with, replacing those "
+                          "after --, given as --retry=ARGS, e.g. --retry=--no-optimize; may be "
+                          "given more than once, --retry=\"\" retries without arguments")
+    args = parser.parse_args(argv)
+
+    plugins = discover_plugins(args.plugins_dir)
+    if args.cmd == "list":
+        for plugin in plugins.values():
+            print("{0:30} {1}".format(plugin.key, plugin.name))
+        return 0
+    elif args.cmd != "run":
+        parser.print_help()
+        return 1
+
+    try:
+        plugin = find_plugin(plugins, args.plugin)
+    except KeyError as excep:
+        parser.error(excep.args[0])
+    if args.memory is not None and resource is None:
+        parser.error("--memory is not supported on this platform")
+    limits = Limits(args.timeout, args.memory)
+    retries = [shlex.split(retry) for retry in args.retry]
+    documents = find_documents(args.paths, tuple(args.pattern or DEFAULT_PATTERNS))
+    report = None if args.json else print_record
+    summary = run_plugin(plugin, documents, extra_args, max(1, args.jobs), report, limits, retries)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
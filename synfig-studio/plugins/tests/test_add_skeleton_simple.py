@@ -0,0 +1,109 @@
+"""
+Tests of the add-skeleton-simple plugin, run as Synfig Studio runs it
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "add-skeleton-simple")
+SCRIPT = os.path.join(PLUGIN_DIR, "add-skeleton-simple.py")
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<canvas version="1.0" width="480" height="270" fps="24.000" end-time="5s">
+  <defs>
+    <real value="1.0" id="(stk3)-body-r"/>
+  </defs>
+  <layer type="circle" active="true" version="0.2" desc="circle"/>
+</canvas>
+"""
+
+
+class AddSkeletonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.env = dict(os.environ, XDG_CACHE_HOME=os.path.join(self.dir, "cache"))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, text):
+        filename = os.path.join(self.dir, name)
+        with open(filename, "w", encoding="utf-8") as fil:
+            fil.write(text)
+        return filename
+
+    def run_plugin(self, filename, *args):
+        subprocess.run([sys.executable, SCRIPT, filename] + list(args), env=self.env, check=True)
+        with open(filename, encoding="utf-8") as fil:
+            return fil.read()
+
+    def get_indexes(self, text):
+        return sorted(set(int(num) for num in re.findall(r"\(stk(\d+)", text)))
+
+    def test_numbered_after_highest(self):
+        text = self.run_plugin(self.write("a.sif", DOCUMENT), "2")
+        self.assertEqual(self.get_indexes(text), [3, 4, 5])
+        self.assertEqual(text.count("<defs>"), 1)
+        # The exported values of the new skeletons are in the existing <defs>
+        defs = text[text.index("<defs>"):text.index("</defs>")]
+        self.assertIn('id="(stk4)-body-r"', defs)
+        self.assertIn('id="(stk5)-body-r"', defs)
+        # Their layers are added after those of the document
+        self.assertLess(text.index('desc="circle"'), text.index('desc="(stk4)"'))
+        self.assertLess(text.index('desc="(stk4)"'), text.index('desc="(stk5)"'))
+
+    def test_index_after_defs(self):
+        # The index is only known at the end of the file, after the new
+        # exported values are due
+        document = DOCUMENT.replace('desc="circle"', 'desc="(stk7)"')
+        text = self.run_plugin(self.write("a.sif", document))
+        self.assertEqual(self.get_indexes(text), [3, 7, 8])
+        defs = text[text.index("<defs>"):text.index("</defs>")]
+        self.assertIn('id="(stk8)-body-r"', defs)
+        self.assertLess(text.index('desc="(stk7)"'), text.index('desc="(stk8)"'))
+
+    def test_without_defs(self):
+        document = DOCUMENT.replace('  <defs>\n    <real value="1.0" id="(stk3)-body-r"/>\n  </defs>\n', "")
+        text = self.run_plugin(self.write("a.sif", document))
+        self.assertEqual(self.get_indexes(text), [1])
+        self.assertEqual(text.count("<defs>"), 1)
+        self.assertLess(text.index("</defs>"), text.index('desc="(stk1)"'))
+
+
+    def test_template_cache(self):
+        template = self.write("template.sif", '<canvas>\n  <layer type="circle" desc="(stk)-head"/>\n</canvas>\n')
+        document = self.write("a.sif", DOCUMENT)
+        text = self.run_plugin(document, "--template", template)
+        self.assertIn('<layer type="circle" desc="(stk4)-head"/>\n</canvas>\n', text)
+        cache_dir = os.path.join(self.dir, "cache", "synfig", "add-skeleton-simple")
+        cache_filename = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+
+        # The cached template is used while the template is unchanged
+        with open(cache_filename, encoding="utf-8") as fil:
+            cached = json.load(fil)
+        cached["template"]["canvas"] = ['  <layer type="rectangle" desc="', ')-cached"/>\n']
+        with open(cache_filename, "w", encoding="utf-8") as fil:
+            json.dump(cached, fil)
+        text = self.run_plugin(document, "--template", template)
+        self.assertIn('<layer type="rectangle" desc="(stk5)-cached"/>\n</canvas>\n', text)
+
+        # and compiled again once it changes
+        self.write("template.sif", '<canvas>\n  <layer type="circle" desc="(stk)-torso"/>\n</canvas>\n')
+        text = self.run_plugin(document, "--template", template)
+        self.assertIn('<layer type="circle" desc="(stk6)-torso"/>\n</canvas>\n', text)
+
+    def test_unwritable_cache(self):
+        self.env["XDG_CACHE_HOME"] = self.write("cache", "not a directory")
+        text = self.run_plugin(self.write("a.sif", DOCUMENT))
+        self.assertEqual(self.get_indexes(text), [3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
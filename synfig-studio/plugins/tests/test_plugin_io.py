@@ -0,0 +1,85 @@
+"""
+Tests of the streaming, atomic rewrite of the documents shared by the plugins
+"""
+
+import os
+import sys
+import gzip
+import stat
+import shutil
+import tempfile
+import unittest
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import plugin_io
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<canvas version="1.0">
+  <layer type="circle" active="false" version="0.2" desc="a"/>
+  <layer type="circle" active="true" version="0.2" desc="b"/>
+</canvas>
+"""
+
+
+class RewriteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, "a.sif")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, text, compressed=False):
+        opener = gzip.open if compressed else open
+        with opener(self.filename, "wb") as fil:
+            fil.write(text.encode("utf-8"))
+
+    def read(self):
+        with plugin_io.open_text(self.filename) as fil:
+            return fil.read()
+
+    def test_lines(self):
+        self.write(DOCUMENT.replace("\n", "\r\n"))
+        os.chmod(self.filename, 0o640)
+        plugin_io.rewrite_lines(self.filename, lambda line: line.replace("circle", "rectangle"))
+        self.assertEqual(self.read(), DOCUMENT.replace("\n", "\r\n").replace("circle", "rectangle"))
+        self.assertEqual(stat.S_IMODE(os.stat(self.filename).st_mode), 0o640)
+        self.assertEqual(os.listdir(self.dir), ["a.sif"])
+
+    def test_compressed(self):
+        self.write(DOCUMENT, compressed=True)
+        self.assertTrue(plugin_io.is_compressed(self.filename))
+        self.assertEqual(list(plugin_io.read_lines(self.filename)), DOCUMENT.splitlines(True))
+        plugin_io.rewrite_lines(self.filename, lambda line: line.upper())
+        # The document stays compressed
+        self.assertTrue(plugin_io.is_compressed(self.filename))
+        self.assertEqual(self.read(), DOCUMENT.upper())
+
+    def test_failure_leaves_document(self):
+        self.write(DOCUMENT)
+
+        def transform(line):
+            if "desc=\"b\"" in line:
+                raise ValueError("broken plugin")
+            return ""
+
+        with self.assertRaises(ValueError):
+            plugin_io.rewrite_lines(self.filename, transform)
+        self.assertEqual(self.read(), DOCUMENT)
+        self.assertEqual(os.listdir(self.dir), ["a.sif"])
+
+    def test_tags(self):
+        self.write(DOCUMENT)
+        names = []
+
+        def set_active(name, attributes):
+            names.append(name)
+            attributes["active"] = "true"
+
+        plugin_io.rewrite_tags(self.filename, {"layer"}, set_active)
+        self.assertEqual(names, ["layer", "layer"])
+        self.assertEqual(self.read(), DOCUMENT.replace('active="false"', 'active="true"'))
+
+
+if __name__ == "__main__":
+    unittest.main()
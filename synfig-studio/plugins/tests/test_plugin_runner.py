@@ -0,0 +1,160 @@
+"""
+Tests of the headless runner of the plugins, with a dummy plugin whose
+behaviour is picked by the contents of the document
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import contextlib
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import plugin_runner
+
+PLUGIN_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<plugin>
+  <_name>Dummy Plugin</_name>
+  <exec>dummy.py</exec>
+</plugin>
+"""
+
+DUMMY = """
+import sys
+import time
+import helper
+with open(sys.argv[1]) as fil:
+    text = fil.read()
+if "fail" in text and "--light" not in sys.argv:
+    print("broken document")
+    sys.exit(3)
+if "sleep" in text:
+    time.sleep(30)
+if "memory" in text:
+    data = bytearray(helper.ALLOCATION)
+with open(sys.argv[1], "w") as fil:
+    fil.write(text + " ".join(sys.argv[2:]) + "\\n")
+"""
+
+
+class RunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.plugins_dir = os.path.join(self.dir, "plugins")
+        plugin_dir = os.path.join(self.plugins_dir, "dummy")
+        os.makedirs(plugin_dir)
+        os.makedirs(os.path.join(self.plugins_dir, "not-a-plugin"))
+        self.write(os.path.join(plugin_dir, "plugin.xml.in"), PLUGIN_XML)
+        self.write(os.path.join(plugin_dir, "dummy.py"), DUMMY)
+        # The plugins import the modules next to them
+        self.write(os.path.join(plugin_dir, "helper.py"), "ALLOCATION = 1024 ** 3\n")
+        self.docs_dir = os.path.join(self.dir, "docs")
+        os.makedirs(os.path.join(self.docs_dir, "sub"))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, filename, text):
+        with open(filename, "w") as fil:
+            fil.write(text)
+        return filename
+
+    def document(self, name, text="ok\n"):
+        return self.write(os.path.join(self.docs_dir, name), text)
+
+    def read(self, name):
+        with open(os.path.join(self.docs_dir, name)) as fil:
+            return fil.read()
+
+    def get_plugin(self):
+        return plugin_runner.find_plugin(plugin_runner.discover_plugins(self.plugins_dir), "dummy plugin")
+
+    def test_discover(self):
+        plugins = plugin_runner.discover_plugins(self.plugins_dir)
+        self.assertEqual(list(plugins.keys()), ["dummy"])
+        self.assertEqual(plugins["dummy"].name, "Dummy Plugin")
+        self.assertIs(plugin_runner.find_plugin(plugins, "dummy"), plugins["dummy"])
+        with self.assertRaises(KeyError):
+            plugin_runner.find_plugin(plugins, "missing")
+
+    def test_find_documents(self):
+        for name in ("b.sif", "a.sifz", "sub/c.sif", "notes.txt"):
+            self.document(name)
+        documents = list(plugin_runner.find_documents([self.docs_dir]))
+        self.assertEqual([os.path.relpath(doc, self.docs_dir) for doc in documents],
+                         ["a.sifz", "b.sif", os.path.join("sub", "c.sif")])
+        # Files given explicitly are taken whatever their name
+        notes = os.path.join(self.docs_dir, "notes.txt")
+        self.assertEqual(list(plugin_runner.find_documents([notes], ("*.sif",))), [notes])
+
+    def test_run(self):
+        self.document("a.sif")
+        self.document("sub/b.sif", "fail\n")
+        records = []
+        summary = plugin_runner.run_plugin(self.get_plugin(), plugin_runner.find_documents([self.docs_dir]),
+                                           ["--x"], jobs=2, report=records.append)
+        self.assertEqual((summary["documents"], summary["ok"], summary["failed"]), (2, 1, 1))
+        self.assertEqual(len(records), 2)
+        first, second = summary["records"]
+        self.assertTrue(first["ok"])
+        self.assertEqual(self.read("a.sif"), "ok\n--x\n")
+        self.assertEqual(second["status"], plugin_runner.STATUS_FAILED)
+        self.assertEqual(second["error"], "exit status 3: broken document")
+        self.assertEqual(self.read("sub/b.sif"), "fail\n")
+
+    @unittest.skipIf(plugin_runner.resource is None, "memory limits are not supported")
+    def test_memory(self):
+        script = self.get_plugin().script
+        record = plugin_runner.run_document(script, self.document("a.sif", "memory\n"), [],
+                                            plugin_runner.Limits(megabytes=256))
+        self.assertEqual(record["status"], plugin_runner.STATUS_MEMORY)
+        self.assertIn("MemoryError", record["error"])
+        # Within the limit, the plugin runs as it would without it
+        record = plugin_runner.run_document(script, self.document("b.sif"), ["--z"],
+                                            plugin_runner.Limits(megabytes=2048))
+        self.assertEqual(record["status"], plugin_runner.STATUS_OK)
+        self.assertEqual(self.read("b.sif"), "ok\n--z\n")
+
+    def test_timeout(self):
+        record = plugin_runner.run_document(self.get_plugin().script, self.document("a.sif", "sleep\n"), [],
+                                            plugin_runner.Limits(seconds=0.5))
+        self.assertEqual(record["status"], plugin_runner.STATUS_TIMEOUT)
+        self.assertLess(record["seconds"], 10)
+
+    def test_retry(self):
+        record = plugin_runner.run_document(self.get_plugin().script, self.document("a.sif", "fail\n"),
+                                            ["--x"], retries=[["--y"], ["--light"], ["--never"]])
+        self.assertTrue(record["ok"])
+        self.assertEqual([attempt["args"] for attempt in record["attempts"]], [["--x"], ["--y"], ["--light"]])
+        self.assertEqual(self.read("a.sif"), "fail\n--light\n")
+
+    def test_main(self):
+        self.document("a.sif")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = plugin_runner.main(["--plugins-dir", self.plugins_dir, "run", "dummy", self.docs_dir,
+                                         "--json", "--", "--y"])
+        self.assertEqual(status, 0)
+        self.assertEqual(json.loads(output.getvalue())["ok"], 1)
+        self.assertEqual(self.read("a.sif"), "ok\n--y\n")
+        self.document("b.sif", "fail\n")
+        with contextlib.redirect_stdout(io.StringIO()):
+            status = plugin_runner.main(["--plugins-dir", self.plugins_dir, "run", "dummy", self.docs_dir])
+        self.assertEqual(status, 1)
+
+    def test_main_retry(self):
+        self.document("a.sif", "fail\n")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = plugin_runner.main(["--plugins-dir", self.plugins_dir, "run", "dummy", self.docs_dir,
+                                         "--json", "--retry=--y", "--retry=--light --z"])
+        self.assertEqual(status, 0)
+        record = json.loads(output.getvalue())["records"][0]
+        self.assertEqual([attempt["args"] for attempt in record["attempts"]], [[], ["--y"], ["--light", "--z"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,23 +10,15 @@
 
 import os
 import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import plugin_io
 
-def process(filename):
-	
-	# Read the input file
-	inputfile_f = open(filename, 'r')
-	inputfile_contents = inputfile_f.readlines()
-	inputfile_f.close()
-	
-	# Now write results to the same file
-	inputfile_f = open(filename, 'w')
+def unhide(name, attributes):
+	if attributes.get("active") == "false":
+		attributes["active"] = "true"
 
-	for line in inputfile_contents:
-		if "<layer " in line:
-			inputfile_f.write(line.replace(' active="false" ',' active="true" '))
-		else:
-			inputfile_f.write(line)
-	inputfile_f.close()
+def process(filename):
+	plugin_io.rewrite_tags(filename, {"layer"}, unhide)
 
 if len(sys.argv) < 2:
 	sys.exit()
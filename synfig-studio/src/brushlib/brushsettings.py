@@ -19,20 +19,28 @@ This is used to generate brushsettings.hpp (see generate.py)
 It is also imported at runtime.
 """
 
-from gettext import gettext as _
+from gettext import gettext
+
+def N_(message):
+    """Marks a string for translation without translating it.
+
+    The strings of the lists below are kept untranslated, gettext runs
+    when the displayed name or the tooltip of an input or setting is read.
+    """
+    return message
 
 inputs_list = [
     # name, hard minimum, soft minimum, normal[1], soft maximum, hard maximum, displayed name, tooltip
-    ['pressure', 0.0,  0.0,  0.4,  1.0, 1.0,  _("Pressure"), _("The pressure reported by the tablet, between 0.0 and 1.0. If you use the mouse, it will be 0.5 when a button is pressed and 0.0 otherwise.")],
-    ['speed1',   None, 0.0,  0.5,  4.0, None, _("Fine speed"), _("How fast you currently move. This can change very quickly. Try 'print input values' from the 'help' menu to get a feeling for the range; negative values are rare but possible for very low speed.")],
-    ['speed2',   None, 0.0,  0.5,  4.0, None, _("Gross speed"), _("Same as fine speed, but changes slower. Also look at the 'gross speed filter' setting.")],
-    ['random',   0.0,  0.0,  0.5,  1.0, 1.0, _("Random"), _("Fast random noise, changing at each evaluation. Evenly distributed between 0 and 1.")],
-    ['stroke',   0.0,  0.0,  0.5,  1.0, 1.0, _("Stroke"), _("This input slowly goes from zero to one while you draw a stroke. It can also be configured to jump back to zero periodically while you move. Look at the 'stroke duration' and 'stroke hold time' settings.")],
-    ['direction',0.0,  0.0,  0.0,  180.0, 180.0, _("Direction"), _("The angle of the stroke, in degrees. The value will stay between 0.0 and 180.0, effectively ignoring turns of 180 degrees.")],
-    ['tilt_declination',0.0,  0.0,  0.0,  90.0, 90.0,  _("Declination"), _("Declination of stylus tilt. 0 when stylus is parallel to tablet and 90.0 when it's perpendicular to tablet.")],
-    ['tilt_ascension',-180.0,  -180.0,  0.0,  180.0, 180.0, _("Ascension"),  _("Right ascension of stylus tilt. 0 when stylus working end points to you, +90 when rotated 90 degrees clockwise, -90 when rotated 90 degrees counterclockwise.")],
+    ['pressure', 0.0,  0.0,  0.4,  1.0, 1.0,  N_("Pressure"), N_("The pressure reported by the tablet, between 0.0 and 1.0. If you use the mouse, it will be 0.5 when a button is pressed and 0.0 otherwise.")],
+    ['speed1',   None, 0.0,  0.5,  4.0, None, N_("Fine speed"), N_("How fast you currently move. This can change very quickly. Try 'print input values' from the 'help' menu to get a feeling for the range; negative values are rare but possible for very low speed.")],
+    ['speed2',   None, 0.0,  0.5,  4.0, None, N_("Gross speed"), N_("Same as fine speed, but changes slower. Also look at the 'gross speed filter' setting.")],
+    ['random',   0.0,  0.0,  0.5,  1.0, 1.0, N_("Random"), N_("Fast random noise, changing at each evaluation. Evenly distributed between 0 and 1.")],
+    ['stroke',   0.0,  0.0,  0.5,  1.0, 1.0, N_("Stroke"), N_("This input slowly goes from zero to one while you draw a stroke. It can also be configured to jump back to zero periodically while you move. Look at the 'stroke duration' and 'stroke hold time' settings.")],
+    ['direction',0.0,  0.0,  0.0,  180.0, 180.0, N_("Direction"), N_("The angle of the stroke, in degrees. The value will stay between 0.0 and 180.0, effectively ignoring turns of 180 degrees.")],
+    ['tilt_declination',0.0,  0.0,  0.0,  90.0, 90.0,  N_("Declination"), N_("Declination of stylus tilt. 0 when stylus is parallel to tablet and 90.0 when it's perpendicular to tablet.")],
+    ['tilt_ascension',-180.0,  -180.0,  0.0,  180.0, 180.0, N_("Ascension"),  N_("Right ascension of stylus tilt. 0 when stylus working end points to you, +90 when rotated 90 degrees clockwise, -90 when rotated 90 degrees counterclockwise.")],
     #['motion_strength',0.0,0.0,  0.0,  1.0, 1.0,  "[EXPERIMENTAL] Same as angle, but wraps at 180 degrees. The dynamics are shared with BRUSH_OFFSET_BY_SPEED_FILTER (FIXME: which is a bad thing)."],
-    ['custom',   None,-2.0,  0.0, +2.0, None, _("Custom"), _("This is a user defined input. Look at the 'custom input' setting for details.")],
+    ['custom',   None,-2.0,  0.0, +2.0, None, N_("Custom"), N_("This is a user defined input. Look at the 'custom input' setting for details.")],
     ]
     # [1] If, for example, the user increases the "by pressure" slider
     # in the "radius" control, then this should change the reaction to
@@ -41,52 +49,52 @@ inputs_list = [
 
 settings_list = [
     # internal name, displayed name, constant, minimum, default, maximum, tooltip
-    ['opaque', _('Opacity'), False, 0.0, 1.0, 2.0, _("0 means brush is transparent, 1 fully visible\n(also known as alpha or opacity)")],
-    ['opaque_multiply', _('Opacity multiply'), False, 0.0, 0.0, 2.0, _("This gets multiplied with opaque. You should only change the pressure input of this setting. Use 'opaque' instead to make opacity depend on speed.\nThis setting is responsible to stop painting when there is zero pressure. This is just a convention, the behaviour is identical to 'opaque'.")],
-    ['opaque_linearize', _('Opacity linearize'), True, 0.0, 0.9, 2.0, _("Correct the nonlinearity introduced by blending multiple dabs on top of each other. This correction should get you a linear (\"natural\") pressure response when pressure is mapped to opaque_multiply, as it is usually done. 0.9 is good for standard strokes, set it smaller if your brush scatters a lot, or higher if you use dabs_per_second.\n0.0 the opaque value above is for the individual dabs\n1.0 the opaque value above is for the final brush stroke, assuming each pixel gets (dabs_per_radius*2) brushdabs on average during a stroke")],
-    ['radius_logarithmic', _('Radius'), False, -2.0, 2.0, 5.0, _("Basic brush radius (logarithmic)\n 0.7 means 2 pixels\n 3.0 means 20 pixels")],
-    ['hardness', _('Hardness'), False, 0.0, 0.8, 1.0, _("Hard brush-circle borders (setting to zero will draw nothing). To reach the maximum hardness, you need to disable Anti-aliasing.")],
-    ['anti_aliasing', _('Anti-aliasing'), False, 0.0, 1.0, 5.0, _("This setting decreases the hardness when necessary to prevent a pixel staircase effect.\n 0.0 disable (for very strong erasers and pixel brushes)\n 1.0 blur one pixel (good value)\n 5.0 notable blur, thin strokes will disappear")],
-    ['dabs_per_basic_radius', _('Dabs per basic radius'), True, 0.0, 0.0, 6.0, _("How many dabs to draw while the pointer moves a distance of one brush radius (more precise: the base value of the radius)")],
-    ['dabs_per_actual_radius', _('Dabs per actual radius'), True, 0.0, 2.0, 6.0, _("Same as above, but the radius actually drawn is used, which can change dynamically")],
-    ['dabs_per_second', _('Dabs per second'), True, 0.0, 0.0, 80.0, _("Dabs to draw each second, no matter how far the pointer moves")],
-    ['radius_by_random', _('Radius by random'), False, 0.0, 0.0, 1.5, _("Alter the radius randomly each dab. You can also do this with the by_random input on the radius setting. If you do it here, there are two differences:\n1) the opaque value will be corrected such that a big-radius dabs is more transparent\n2) it will not change the actual radius seen by dabs_per_actual_radius")],
-    ['speed1_slowness', _('Fine speed filter'), False, 0.0, 0.04, 0.2, _("How slow the input fine speed is following the real speed\n0.0 change immediately as your speed changes (not recommended, but try it)")],
-    ['speed2_slowness', _('Gross speed filter'), False, 0.0, 0.8, 3.0, _("Same as 'fine speed filter', but note that the range is different")],
-    ['speed1_gamma', _('Fine speed gamma'), True, -8.0, 4.0, 8.0, _("This changes the reaction of the 'fine speed' input to extreme physical speed. You will see the difference best if 'fine speed' is mapped to the radius.\n-8.0 very fast speed does not increase 'fine speed' much more\n+8.0 very fast speed increases 'fine speed' a lot\nFor very slow speed the opposite happens.")],
-    ['speed2_gamma', _('Gross speed gamma'), True, -8.0, 4.0, 8.0, _("Same as 'fine speed gamma' for gross speed")],
-    ['offset_by_random', _('Jitter'), False, 0.0, 0.0, 25.0, _("Add a random offset to the position where each dab is drawn\n 0.0 disabled\n 1.0 standard deviation is one basic radius away\n<0.0 negative values produce no jitter")],
-    ['offset_by_speed', _('Offset by speed'), False, -3.0, 0.0, 3.0, _("Change position depending on pointer speed\n= 0 disable\n> 0 draw where the pointer moves to\n< 0 draw where the pointer comes from")],
-    ['offset_by_speed_slowness', _('Offset by speed filter'), False, 0.0, 1.0, 15.0, _("How slow the offset goes back to zero when the cursor stops moving")],
-    ['slow_tracking', _('Slow position tracking'), True, 0.0, 0.0, 10.0, _("Slowdown pointer tracking speed. 0 disables it, higher values remove more jitter in cursor movements. Useful for drawing smooth, comic-like outlines.")],
-    ['slow_tracking_per_dab', _('Slow tracking per dab'), False, 0.0, 0.0, 10.0, _("Similar as above but at brushdab level (ignoring how much time has past, if brushdabs do not depend on time)")],
-    ['tracking_noise', _('Tracking noise'), True, 0.0, 0.0, 12.0, _("Add randomness to the mouse pointer; this usually generates many small lines in random directions; maybe try this together with 'slow tracking'")],
-
-    ['color_h', _('Color hue'), True, 0.0, 0.0, 1.0, _("Color hue")],
-    ['color_s', _('Color saturation'), True, -0.5, 0.0, 1.5, _("Color saturation")],
-    ['color_v', _('Color value'), True, -0.5, 0.0, 1.5, _("Color value (brightness, intensity)")],
-    ['restore_color', _('Save color'), True, 0.0, 0.0, 1.0, _("When selecting a brush, the color can be restored to the color that the brush was saved with.\n 0.0 do not modify the active color when selecting this brush\n 0.5 change active color towards brush color\n 1.0 set the active color to the brush color when selected")],
-    ['change_color_h', _('Change color hue'), False, -2.0, 0.0, 2.0, _("Change color hue.\n-0.1 small clockwise color hue shift\n 0.0 disable\n 0.5 counterclockwise hue shift by 180 degrees")],
-    ['change_color_l', _('Change color lightness (HSL)'), False, -2.0, 0.0, 2.0, _("Change the color lightness (luminance) using the HSL color model.\n-1.0 blacker\n 0.0 disable\n 1.0 whiter")],
-    ['change_color_hsl_s', _('Change color satur. (HSL)'), False, -2.0, 0.0, 2.0, _("Change the color saturation using the HSL color model.\n-1.0 more grayish\n 0.0 disable\n 1.0 more saturated")],
-    ['change_color_v', _('Change color value (HSV)'), False, -2.0, 0.0, 2.0, _("Change the color value (brightness, intensity) using the HSV color model. HSV changes are applied before HSL.\n-1.0 darker\n 0.0 disable\n 1.0 brighter")],
-    ['change_color_hsv_s', _('Change color satur. (HSV)'), False, -2.0, 0.0, 2.0, _("Change the color saturation using the HSV color model. HSV changes are applied before HSL.\n-1.0 more grayish\n 0.0 disable\n 1.0 more saturated")],
-    ['smudge', _('Smudge'), False, 0.0, 0.0, 1.0, _("Paint with the smudge color instead of the brush color. The smudge color is slowly changed to the color you are painting on.\n 0.0 do not use the smudge color\n 0.5 mix the smudge color with the brush color\n 1.0 use only the smudge color")],
-    ['smudge_length', _('Smudge length'), False, 0.0, 0.5, 1.0, _("This controls how fast the smudge color becomes the color you are painting on.\n0.0 immediately update the smudge color (requires more CPU cycles because of the frequent color checks)\n0.5 change the smudge color steadily towards the canvas color\n1.0 never change the smudge color")],
-    ['smudge_radius_log', _('Smudge radius'), False, -1.6, 0.0, 1.6, _("This modifies the radius of the circle where color is picked up for smudging.\n 0.0 use the brush radius\n-0.7 half the brush radius (fast, but not always intuitive)\n+0.7 twice the brush radius\n+1.6 five times the brush radius (slow performance)")],
-    ['eraser', _('Eraser'), False, 0.0, 0.0, 1.0, _("how much this tool behaves like an eraser\n 0.0 normal painting\n 1.0 standard eraser\n 0.5 pixels go towards 50% transparency")],
-
-    ['stroke_threshold', _('Stroke threshold'), True, 0.0, 0.0, 0.5, _("How much pressure is needed to start a stroke. This affects the stroke input only. Mypaint does not need a minimal pressure to start drawing.")],
-    ['stroke_duration_logarithmic', _('Stroke duration'), False, -1.0, 4.0, 7.0, _("How far you have to move until the stroke input reaches 1.0. This value is logarithmic (negative values will not inverse the process).")],
-    ['stroke_holdtime', _('Stroke hold time'), False, 0.0, 0.0, 10.0, _("This defines how long the stroke input stays at 1.0. After that it will reset to 0.0 and start growing again, even if the stroke is not yet finished.\n2.0 means twice as long as it takes to go from 0.0 to 1.0\n9.9 and bigger stands for infinite")],
-    ['custom_input', _('Custom input'), False, -5.0, 0.0, 5.0, _("Set the custom input to this value. If it is slowed down, move it towards this value (see below). The idea is that you make this input depend on a mixture of pressure/speed/whatever, and then make other settings depend on this 'custom input' instead of repeating this combination everywhere you need it.\nIf you make it change 'by random' you can generate a slow (smooth) random input.")],
-    ['custom_input_slowness', _('Custom input filter'), False, 0.0, 0.0, 10.0, _("How slow the custom input actually follows the desired value (the one above). This happens at brushdab level (ignoring how much time has past, if brushdabs do not depend on time).\n0.0 no slowdown (changes apply instantly)")],
-
-    ['elliptical_dab_ratio', _('Elliptical dab: ratio'), False, 1.0, 1.0, 10.0, _("Aspect ratio of the dabs; must be >= 1.0, where 1.0 means a perfectly round dab. TODO: linearize? start at 0.0 maybe, or log?")],
-    ['elliptical_dab_angle', _('Elliptical dab: angle'), False, 0.0, 90.0, 180.0, _("Angle by which elliptical dabs are tilted\n 0.0 horizontal dabs\n 45.0 45 degrees, turned clockwise\n 180.0 horizontal again")],
-    ['direction_filter', _('Direction filter'), False, 0.0, 2.0, 10.0, _("A low value will make the direction input adapt more quickly, a high value will make it smoother")],
-
-    ['lock_alpha', _('Lock alpha'), False, 0.0, 0.0, 1.0, _("Do not modify the alpha channel of the layer (paint only where there is paint already)\n 0.0 normal painting\n 0.5 half of the paint gets applied normally\n 1.0 alpha channel fully locked")],
+    ['opaque', N_('Opacity'), False, 0.0, 1.0, 2.0, N_("0 means brush is transparent, 1 fully visible\n(also known as alpha or opacity)")],
+    ['opaque_multiply', N_('Opacity multiply'), False, 0.0, 0.0, 2.0, N_("This gets multiplied with opaque. You should only change the pressure input of this setting. Use 'opaque' instead to make opacity depend on speed.\nThis setting is responsible to stop painting when there is zero pressure. This is just a convention, the behaviour is identical to 'opaque'.")],
+    ['opaque_linearize', N_('Opacity linearize'), True, 0.0, 0.9, 2.0, N_("Correct the nonlinearity introduced by blending multiple dabs on top of each other. This correction should get you a linear (\"natural\") pressure response when pressure is mapped to opaque_multiply, as it is usually done. 0.9 is good for standard strokes, set it smaller if your brush scatters a lot, or higher if you use dabs_per_second.\n0.0 the opaque value above is for the individual dabs\n1.0 the opaque value above is for the final brush stroke, assuming each pixel gets (dabs_per_radius*2) brushdabs on average during a stroke")],
+    ['radius_logarithmic', N_('Radius'), False, -2.0, 2.0, 5.0, N_("Basic brush radius (logarithmic)\n 0.7 means 2 pixels\n 3.0 means 20 pixels")],
+    ['hardness', N_('Hardness'), False, 0.0, 0.8, 1.0, N_("Hard brush-circle borders (setting to zero will draw nothing). To reach the maximum hardness, you need to disable Anti-aliasing.")],
+    ['anti_aliasing', N_('Anti-aliasing'), False, 0.0, 1.0, 5.0, N_("This setting decreases the hardness when necessary to prevent a pixel staircase effect.\n 0.0 disable (for very strong erasers and pixel brushes)\n 1.0 blur one pixel (good value)\n 5.0 notable blur, thin strokes will disappear")],
+    ['dabs_per_basic_radius', N_('Dabs per basic radius'), True, 0.0, 0.0, 6.0, N_("How many dabs to draw while the pointer moves a distance of one brush radius (more precise: the base value of the radius)")],
+    ['dabs_per_actual_radius', N_('Dabs per actual radius'), True, 0.0, 2.0, 6.0, N_("Same as above, but the radius actually drawn is used, which can change dynamically")],
+    ['dabs_per_second', N_('Dabs per second'), True, 0.0, 0.0, 80.0, N_("Dabs to draw each second, no matter how far the pointer moves")],
+    ['radius_by_random', N_('Radius by random'), False, 0.0, 0.0, 1.5, N_("Alter the radius randomly each dab. You can also do this with the by_random input on the radius setting. If you do it here, there are two differences:\n1) the opaque value will be corrected such that a big-radius dabs is more transparent\n2) it will not change the actual radius seen by dabs_per_actual_radius")],
+    ['speed1_slowness', N_('Fine speed filter'), False, 0.0, 0.04, 0.2, N_("How slow the input fine speed is following the real speed\n0.0 change immediately as your speed changes (not recommended, but try it)")],
+    ['speed2_slowness', N_('Gross speed filter'), False, 0.0, 0.8, 3.0, N_("Same as 'fine speed filter', but note that the range is different")],
+    ['speed1_gamma', N_('Fine speed gamma'), True, -8.0, 4.0, 8.0, N_("This changes the reaction of the 'fine speed' input to extreme physical speed. You will see the difference best if 'fine speed' is mapped to the radius.\n-8.0 very fast speed does not increase 'fine speed' much more\n+8.0 very fast speed increases 'fine speed' a lot\nFor very slow speed the opposite happens.")],
+    ['speed2_gamma', N_('Gross speed gamma'), True, -8.0, 4.0, 8.0, N_("Same as 'fine speed gamma' for gross speed")],
+    ['offset_by_random', N_('Jitter'), False, 0.0, 0.0, 25.0, N_("Add a random offset to the position where each dab is drawn\n 0.0 disabled\n 1.0 standard deviation is one basic radius away\n<0.0 negative values produce no jitter")],
+    ['offset_by_speed', N_('Offset by speed'), False, -3.0, 0.0, 3.0, N_("Change position depending on pointer speed\n= 0 disable\n> 0 draw where the pointer moves to\n< 0 draw where the pointer comes from")],
+    ['offset_by_speed_slowness', N_('Offset by speed filter'), False, 0.0, 1.0, 15.0, N_("How slow the offset goes back to zero when the cursor stops moving")],
+    ['slow_tracking', N_('Slow position tracking'), True, 0.0, 0.0, 10.0, N_("Slowdown pointer tracking speed. 0 disables it, higher values remove more jitter in cursor movements. Useful for drawing smooth, comic-like outlines.")],
+    ['slow_tracking_per_dab', N_('Slow tracking per dab'), False, 0.0, 0.0, 10.0, N_("Similar as above but at brushdab level (ignoring how much time has past, if brushdabs do not depend on time)")],
+    ['tracking_noise', N_('Tracking noise'), True, 0.0, 0.0, 12.0, N_("Add randomness to the mouse pointer; this usually generates many small lines in random directions; maybe try this together with 'slow tracking'")],
+
+    ['color_h', N_('Color hue'), True, 0.0, 0.0, 1.0, N_("Color hue")],
+    ['color_s', N_('Color saturation'), True, -0.5, 0.0, 1.5, N_("Color saturation")],
+    ['color_v', N_('Color value'), True, -0.5, 0.0, 1.5, N_("Color value (brightness, intensity)")],
+    ['restore_color', N_('Save color'), True, 0.0, 0.0, 1.0, N_("When selecting a brush, the color can be restored to the color that the brush was saved with.\n 0.0 do not modify the active color when selecting this brush\n 0.5 change active color towards brush color\n 1.0 set the active color to the brush color when selected")],
+    ['change_color_h', N_('Change color hue'), False, -2.0, 0.0, 2.0, N_("Change color hue.\n-0.1 small clockwise color hue shift\n 0.0 disable\n 0.5 counterclockwise hue shift by 180 degrees")],
+    ['change_color_l', N_('Change color lightness (HSL)'), False, -2.0, 0.0, 2.0, N_("Change the color lightness (luminance) using the HSL color model.\n-1.0 blacker\n 0.0 disable\n 1.0 whiter")],
+    ['change_color_hsl_s', N_('Change color satur. (HSL)'), False, -2.0, 0.0, 2.0, N_("Change the color saturation using the HSL color model.\n-1.0 more grayish\n 0.0 disable\n 1.0 more saturated")],
+    ['change_color_v', N_('Change color value (HSV)'), False, -2.0, 0.0, 2.0, N_("Change the color value (brightness, intensity) using the HSV color model. HSV changes are applied before HSL.\n-1.0 darker\n 0.0 disable\n 1.0 brighter")],
+    ['change_color_hsv_s', N_('Change color satur. (HSV)'), False, -2.0, 0.0, 2.0, N_("Change the color saturation using the HSV color model. HSV changes are applied before HSL.\n-1.0 more grayish\n 0.0 disable\n 1.0 more saturated")],
+    ['smudge', N_('Smudge'), False, 0.0, 0.0, 1.0, N_("Paint with the smudge color instead of the brush color. The smudge color is slowly changed to the color you are painting on.\n 0.0 do not use the smudge color\n 0.5 mix the smudge color with the brush color\n 1.0 use only the smudge color")],
+    ['smudge_length', N_('Smudge length'), False, 0.0, 0.5, 1.0, N_("This controls how fast the smudge color becomes the color you are painting on.\n0.0 immediately update the smudge color (requires more CPU cycles because of the frequent color checks)\n0.5 change the smudge color steadily towards the canvas color\n1.0 never change the smudge color")],
+    ['smudge_radius_log', N_('Smudge radius'), False, -1.6, 0.0, 1.6, N_("This modifies the radius of the circle where color is picked up for smudging.\n 0.0 use the brush radius\n-0.7 half the brush radius (fast, but not always intuitive)\n+0.7 twice the brush radius\n+1.6 five times the brush radius (slow performance)")],
+    ['eraser', N_('Eraser'), False, 0.0, 0.0, 1.0, N_("how much this tool behaves like an eraser\n 0.0 normal painting\n 1.0 standard eraser\n 0.5 pixels go towards 50% transparency")],
+
+    ['stroke_threshold', N_('Stroke threshold'), True, 0.0, 0.0, 0.5, N_("How much pressure is needed to start a stroke. This affects the stroke input only. Mypaint does not need a minimal pressure to start drawing.")],
+    ['stroke_duration_logarithmic', N_('Stroke duration'), False, -1.0, 4.0, 7.0, N_("How far you have to move until the stroke input reaches 1.0. This value is logarithmic (negative values will not inverse the process).")],
+    ['stroke_holdtime', N_('Stroke hold time'), False, 0.0, 0.0, 10.0, N_("This defines how long the stroke input stays at 1.0. After that it will reset to 0.0 and start growing again, even if the stroke is not yet finished.\n2.0 means twice as long as it takes to go from 0.0 to 1.0\n9.9 and bigger stands for infinite")],
+    ['custom_input', N_('Custom input'), False, -5.0, 0.0, 5.0, N_("Set the custom input to this value. If it is slowed down, move it towards this value (see below). The idea is that you make this input depend on a mixture of pressure/speed/whatever, and then make other settings depend on this 'custom input' instead of repeating this combination everywhere you need it.\nIf you make it change 'by random' you can generate a slow (smooth) random input.")],
+    ['custom_input_slowness', N_('Custom input filter'), False, 0.0, 0.0, 10.0, N_("How slow the custom input actually follows the desired value (the one above). This happens at brushdab level (ignoring how much time has past, if brushdabs do not depend on time).\n0.0 no slowdown (changes apply instantly)")],
+
+    ['elliptical_dab_ratio', N_('Elliptical dab: ratio'), False, 1.0, 1.0, 10.0, N_("Aspect ratio of the dabs; must be >= 1.0, where 1.0 means a perfectly round dab. TODO: linearize? start at 0.0 maybe, or log?")],
+    ['elliptical_dab_angle', N_('Elliptical dab: angle'), False, 0.0, 90.0, 180.0, N_("Angle by which elliptical dabs are tilted\n 0.0 horizontal dabs\n 45.0 45 degrees, turned clockwise\n 180.0 horizontal again")],
+    ['direction_filter', N_('Direction filter'), False, 0.0, 2.0, 10.0, N_("A low value will make the direction input adapt more quickly, a high value will make it smoother")],
+
+    ['lock_alpha', N_('Lock alpha'), False, 0.0, 0.0, 1.0, N_("Do not modify the alpha channel of the layer (paint only where there is paint already)\n 0.0 normal painting\n 0.5 half of the paint gets applied normally\n 1.0 alpha channel fully locked")],
     ]
 
 settings_hidden = 'color_h color_s color_v'.split()
@@ -130,37 +138,42 @@ direction_dx, direction_dy
 declination, ascension
 '''
 
-class BrushInput:
-    pass
+class BrushInput(object):
+    dname = property(lambda self: gettext(self.dname_msgid))
+    tooltip = property(lambda self: gettext(self.tooltip_msgid))
 
 inputs = []
 inputs_dict = {}
 for i_list in inputs_list:
     i = BrushInput()
-    i.name, i.hard_min, i.soft_min, i.normal, i.soft_max, i.hard_max, i.dname, i.tooltip = i_list
+    i.name, i.hard_min, i.soft_min, i.normal, i.soft_max, i.hard_max, i.dname_msgid, i.tooltip_msgid = i_list
     i.index = len(inputs)
     inputs.append(i)
     inputs_dict[i.name] = i
 
-class BrushSetting:
-    pass
+class BrushSetting(object):
+    name = property(lambda self: gettext(self.name_msgid))
+    tooltip = property(lambda self: gettext(self.tooltip_msgid))
 
 settings = []
 settings_dict = {}
+settings_by_name = {}
 for s_list in settings_list:
     s = BrushSetting()
-    s.cname, s.name, s.constant, s.min, s.default, s.max, s.tooltip = s_list
+    s.cname, s.name_msgid, s.constant, s.min, s.default, s.max, s.tooltip_msgid = s_list
     s.index = len(settings)
     settings.append(s)
     settings_dict[s.cname] = s
+    settings_by_name[s.name_msgid] = s
     globals()[s.cname] = s
 
 settings_visible = [s for s in settings if s.cname not in settings_hidden]
 
-class BrushState:
+class BrushState(object):
     pass
 
 states = []
+states_dict = {}
 for line in states_list.split('\n'):
     line = line.split('#')[0]
     for cname in line.split(','):
@@ -170,3 +183,15 @@ for line in states_list.split('\n'):
         st.cname = cname
         st.index = len(states)
         states.append(st)
+        states_dict[cname] = st
+
+def get_setting(cname):
+    """Looks a setting up by its cname, old cnames of settings_migrate included.
+
+    Returns the setting and the function scaling an old value into the
+    range of the new setting (None when no scaling is needed).
+    """
+    if cname in settings_dict:
+        return settings_dict[cname], None
+    new_cname, scale = settings_migrate[cname]
+    return settings_dict[new_cname], scale
@@ -0,0 +1,221 @@
+# brushlib - The MyPaint Brush Library
+# Copyright (C) 2007-2011 Martin Renold <martinxyz@gmx.ch>
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+"""Brush Dynamics
+
+Evaluates the input to setting curves of a brush in Python, the same way
+as Mapping::calculate() in mapping.hpp, but over whole arrays of stroke
+samples at once. numpy is used when it is installed, plain lists otherwise.
+
+    samples = StrokeSamples({'pressure': [0.1, 0.5, 0.9], 'speed1': [0.0, 1.0, 2.0]})
+    dynamics = Dynamics({'radius_logarithmic': (0.78, {'pressure': [(0.0, -0.5), (1.0, 0.0)]})})
+    values = dynamics.evaluate(samples, ['radius_logarithmic', 'opaque'])
+"""
+
+from bisect import bisect_left
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import brushsettings
+
+MAX_POINTS = 8 # size of the ControlPoints arrays in mapping.hpp
+
+
+class Curve(object):
+    """Stepwise linear curve of one input, extrapolated past its ends.
+
+    Every segment is stored as slope and offset, segment k being used for
+    the inputs above the k first inner control points like in mapping.hpp.
+    """
+
+    def __init__(self, points):
+        points = [(float(x), float(y)) for x, y in points]
+        if len(points) < 2 or len(points) > MAX_POINTS:
+            raise ValueError('a curve needs 2 to %d points, got %d' % (MAX_POINTS, len(points)))
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            if x1 < x0:
+                raise ValueError('the x values of a curve must not decrease')
+        self.points = points
+        self.inner = [x for x, y in points[1:-1]]
+        self.slopes = []
+        self.offsets = []
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            if x0 == x1:
+                self.slopes.append(0.0)
+                self.offsets.append(y0)
+            else:
+                slope = (y1 - y0) / (x1 - x0)
+                self.slopes.append(slope)
+                self.offsets.append(y0 - slope*x0)
+
+    def calculate(self, x):
+        """Returns the value of the curve for a single input value."""
+        k = bisect_left(self.inner, x)
+        return self.slopes[k]*x + self.offsets[k]
+
+    def calculate_array(self, values):
+        """Returns the values of the curve for an array of input values."""
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            k = numpy.searchsorted(numpy.array(self.inner), values, side='left')
+            return numpy.array(self.slopes)[k]*values + numpy.array(self.offsets)[k]
+        if not self.inner:
+            slope, offset = self.slopes[0], self.offsets[0]
+            return [slope*x + offset for x in values]
+        inner, slopes, offsets = self.inner, self.slopes, self.offsets
+        return [slopes[k]*x + offsets[k] for x, k in ((x, bisect_left(inner, x)) for x in values)]
+
+
+class Mapping(object):
+    """Base value of a setting plus one curve per input used."""
+
+    def __init__(self, base_value=0.0, curves=None):
+        self.base_value = float(base_value)
+        self.curves = {}
+        for input_name, points in (curves or {}).items():
+            self.set_points(input_name, points)
+
+    def set_points(self, input_name, points):
+        """Sets the curve of an input, no points removes it."""
+        if input_name not in brushsettings.inputs_dict:
+            raise KeyError('unknown brush input: %s' % input_name)
+        if points:
+            self.curves[input_name] = Curve(points)
+        else:
+            self.curves.pop(input_name, None)
+
+    def is_constant(self):
+        return not self.curves
+
+    def calculate(self, samples):
+        """Returns the values of the setting for all the samples."""
+        if numpy is not None and samples.use_numpy:
+            result = numpy.full(samples.count, self.base_value)
+            for input_name, curve in self.curves.items():
+                result += curve.calculate_array(samples[input_name])
+            return result
+        result = [self.base_value]*samples.count
+        for input_name, curve in self.curves.items():
+            result = [a + b for a, b in zip(result, curve.calculate_array(samples[input_name]))]
+        return result
+
+
+class StrokeSamples(object):
+    """Input values of a stroke, one array per input, all of the same length.
+
+    Inputs which are not given keep their normal value, and the values are
+    clamped to the hard limits of inputs_list. The arrays are prepared once
+    and can be shared by the evaluation of many brushes.
+    """
+
+    def __init__(self, values, use_numpy=None):
+        unknown = set(values) - set(brushsettings.inputs_dict)
+        if unknown:
+            raise KeyError('unknown brush inputs: %s' % ', '.join(sorted(unknown)))
+        lengths = set(len(v) for v in values.values())
+        if len(lengths) > 1:
+            raise ValueError('all the inputs must have the same number of samples')
+        self.count = lengths.pop() if lengths else 0
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        if self.use_numpy and numpy is None:
+            raise ImportError('numpy is not installed')
+        self.arrays = {}
+        for i in brushsettings.inputs:
+            if i.name in values:
+                self.arrays[i.name] = self.clamp(i, values[i.name])
+            elif self.use_numpy:
+                self.arrays[i.name] = numpy.full(self.count, i.normal)
+            else:
+                self.arrays[i.name] = [i.normal]*self.count
+
+    def clamp(self, i, values):
+        """Converts the values of an input to floats within its hard limits."""
+        if self.use_numpy:
+            array = numpy.asarray(values, dtype=float)
+            if i.hard_min is not None or i.hard_max is not None:
+                array = numpy.clip(array, i.hard_min, i.hard_max)
+            return array
+        low = float('-inf') if i.hard_min is None else i.hard_min
+        high = float('inf') if i.hard_max is None else i.hard_max
+        return [min(max(float(x), low), high) for x in values]
+
+    def __getitem__(self, input_name):
+        return self.arrays[input_name]
+
+    def __len__(self):
+        return self.count
+
+
+class Dynamics(object):
+    """Mappings of all the settings of a brush.
+
+    Settings without a mapping are constant at their default value from
+    settings_list.
+    """
+
+    def __init__(self, mappings=None):
+        self.mappings = {}
+        for cname, mapping in (mappings or {}).items():
+            if not isinstance(mapping, Mapping):
+                base_value, curves = mapping
+                mapping = Mapping(base_value, curves)
+            self.set_mapping(cname, mapping)
+
+    def set_mapping(self, cname, mapping):
+        if cname not in brushsettings.settings_dict:
+            raise KeyError('unknown brush setting: %s' % cname)
+        self.mappings[cname] = mapping
+
+    def get_mapping(self, cname):
+        """Returns the mapping of a setting, its default value if it has none."""
+        if cname in self.mappings:
+            return self.mappings[cname]
+        return Mapping(brushsettings.settings_dict[cname].default)
+
+    def evaluate(self, samples, cnames=None, clamp=False):
+        """Returns the values of the settings for all the samples.
+
+        samples is a StrokeSamples or a dict of input arrays, cnames the
+        settings to evaluate (all by default). With clamp, the values are
+        limited to the min and max of the settings.
+        """
+        if not isinstance(samples, StrokeSamples):
+            samples = StrokeSamples(samples)
+        if cnames is None:
+            cnames = [s.cname for s in brushsettings.settings]
+        result = {}
+        for cname in cnames:
+            values = self.get_mapping(cname).calculate(samples)
+            if clamp:
+                s = brushsettings.settings_dict[cname]
+                if samples.use_numpy:
+                    values = numpy.clip(values, s.min, s.max)
+                else:
+                    values = [min(max(y, s.min), s.max) for y in values]
+            result[cname] = values
+        return result
+
+
+def evaluate_many(brushes, samples, cnames=None, clamp=False):
+    """Evaluates many brushes on the same stroke.
+
+    brushes maps a key (eg. the preset name) to Dynamics, the result maps
+    the same keys to the values of the settings.
+    """
+    if not isinstance(samples, StrokeSamples):
+        samples = StrokeSamples(samples)
+    return dict((key, dynamics.evaluate(samples, cnames, clamp)) for key, dynamics in brushes.items())
@@ -0,0 +1,265 @@
+# brushlib - The MyPaint Brush Library
+# Copyright (C) 2007-2011 Martin Renold <martinxyz@gmx.ch>
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+"""Brush Presets
+
+Parses brush preset files (.myb, version 2) in bulk and checks every value
+against the limits of brushsettings, so that broken presets are found before
+they are loaded into Studio.
+
+    python presets.py --jobs 8 brushes/
+
+Errors are values Studio cannot load (unparsable lines, curves brushlib
+asserts on, inputs past their hard limits). Warnings are values which load
+but look wrong (base values outside the min and max of the setting, curve
+points outside the soft range of the input, unknown or missing settings).
+"""
+
+from __future__ import print_function
+
+import os
+import re
+import sys
+import json
+import math
+import fnmatch
+import multiprocessing
+from array import array
+
+import brushsettings
+
+SUPPORTED_VERSION = 2
+MAX_POINTS = 8 # size of the ControlPoints arrays in mapping.hpp
+PRESET_PATTERN = '*.myb'
+POINT = re.compile(r'\(\s*(\S+?)\s+(\S+?)\s*\)')
+
+ERROR = 'error'
+WARNING = 'warning'
+
+
+class Preset(object):
+    """Validated preset, compact enough to keep thousands of them around.
+
+    base_values holds one float per setting, by setting index, and mappings
+    holds (setting index, input index, ((x, y), ...)) for every curve.
+    """
+    __slots__ = ('path', 'base_values', 'mappings')
+
+    def __init__(self, path, base_values, mappings):
+        self.path = path
+        self.base_values = base_values
+        self.mappings = mappings
+
+    def __getstate__(self):
+        return (self.path, self.base_values, self.mappings)
+
+    def __setstate__(self, state):
+        self.path, self.base_values, self.mappings = state
+
+    def to_dynamics(self):
+        """Returns the mappings of the preset for the dynamics evaluator."""
+        import dynamics
+        result = dynamics.Dynamics()
+        for s in brushsettings.settings:
+            result.set_mapping(s.cname, dynamics.Mapping(self.base_values[s.index]))
+        for setting_index, input_index, points in self.mappings:
+            mapping = result.get_mapping(brushsettings.settings[setting_index].cname)
+            mapping.set_points(brushsettings.inputs[input_index].name, points)
+        return result
+
+
+def parse_float(text):
+    value = float(text)
+    if math.isnan(value) or math.isinf(value):
+        raise ValueError('not a finite number: %s' % text)
+    return value
+
+
+def check_points(i, points, issue):
+    """Checks the control points of a curve of input i, returns whether they can be used."""
+    if len(points) < 2 or len(points) > MAX_POINTS:
+        issue(ERROR, '%s curve has %d points, 2 to %d are needed' % (i.name, len(points), MAX_POINTS))
+        return False
+    ok = True
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if x1 < x0:
+            issue(ERROR, '%s curve goes back from x=%g to x=%g' % (i.name, x0, x1))
+            ok = False
+    for x, y in points:
+        if (i.hard_min is not None and x < i.hard_min) or (i.hard_max is not None and x > i.hard_max):
+            issue(ERROR, '%s curve point x=%g is past the hard limits %s..%s' % (i.name, x, i.hard_min, i.hard_max))
+            ok = False
+        elif x < i.soft_min or x > i.soft_max:
+            issue(WARNING, '%s curve point x=%g is outside the soft range %g..%g' % (i.name, x, i.soft_min, i.soft_max))
+    return ok
+
+
+def parse_preset(path, text):
+    """Parses and validates the text of a preset.
+
+    Returns the Preset, or None if it has errors, and the list of issues as
+    (path, line number, severity, message).
+    """
+    issues = []
+    base_values = array('f', [0.0]*len(brushsettings.settings))
+    found = set()
+    mappings = []
+    line_number = [0]
+
+    def issue(severity, message):
+        issues.append((path, line_number[0], severity, message))
+
+    for line_number[0], line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split('|')
+        words = parts[0].split()
+        if len(words) != 2:
+            issue(ERROR, 'expected a setting name and a value: %s' % parts[0].strip())
+            continue
+        cname, value = words
+        if cname == 'version':
+            if value != str(SUPPORTED_VERSION):
+                issue(ERROR, 'unsupported version %s' % value)
+                break
+            continue
+        try:
+            s, scale = brushsettings.get_setting(cname)
+        except KeyError:
+            issue(WARNING, 'unknown setting %s is ignored' % cname)
+            continue
+        if s.cname != cname:
+            issue(WARNING, 'old setting %s is read as %s, Studio ignores it' % (cname, s.cname))
+        try:
+            base_value = parse_float(value)
+        except ValueError as e:
+            issue(ERROR, '%s: %s' % (cname, e))
+            continue
+        if scale is not None:
+            base_value = scale(base_value)
+        if base_value < s.min or base_value > s.max:
+            issue(WARNING, '%s=%g is outside %g..%g' % (s.cname, base_value, s.min, s.max))
+        if s.index in found:
+            issue(WARNING, '%s is set more than once' % s.cname)
+        found.add(s.index)
+        base_values[s.index] = base_value
+
+        for part in parts[1:]:
+            words = part.split(None, 1)
+            if not words or words[0] not in brushsettings.inputs_dict:
+                issue(ERROR, '%s: unknown input %s' % (s.cname, words[0] if words else "''"))
+                continue
+            i = brushsettings.inputs_dict[words[0]]
+            try:
+                points = tuple((parse_float(x), parse_float(y)) for x, y in POINT.findall(words[1] if len(words) > 1 else ''))
+            except ValueError as e:
+                issue(ERROR, '%s %s: %s' % (s.cname, i.name, e))
+                continue
+            if scale is not None:
+                points = tuple((x, scale(y)) for x, y in points)
+            if check_points(i, points, issue):
+                mappings.append((s.index, i.index, points))
+
+    line_number[0] = 0
+    for s in brushsettings.settings:
+        if s.index not in found:
+            issue(WARNING, '%s is missing, Studio uses 0' % s.cname)
+
+    if any(severity == ERROR for p, l, severity, m in issues):
+        return None, issues
+    return Preset(path, base_values, tuple(mappings)), issues
+
+
+def load_preset(path):
+    """Reads, parses and validates a preset file, see parse_preset()."""
+    try:
+        with open(path, 'rb') as f:
+            text = f.read().decode('utf-8', 'replace')
+    except (IOError, OSError) as e:
+        return None, [(path, 0, ERROR, str(e))]
+    return parse_preset(path, text)
+
+
+def find_presets(paths, pattern=PRESET_PATTERN):
+    """Yields the preset files among paths, searching directories recursively."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(fnmatch.filter(filenames, pattern)):
+                yield os.path.join(dirpath, filename)
+
+
+def load_presets(paths, jobs=None, chunksize=16):
+    """Loads many preset files, jobs of them at a time (one per CPU by default).
+
+    Returns the valid presets by path and the report.
+    """
+    paths = list(paths)
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+    if jobs > 1 and len(paths) > chunksize:
+        pool = multiprocessing.Pool(jobs)
+        try:
+            results = pool.map(load_preset, paths, chunksize)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [load_preset(path) for path in paths]
+
+    presets = {}
+    issues = []
+    for path, (preset, preset_issues) in zip(paths, results):
+        if preset is not None:
+            presets[path] = preset
+        issues.extend(preset_issues)
+    report = {
+        'files': len(paths),
+        'valid': len(presets),
+        'invalid': len(paths) - len(presets),
+        'errors': sum(1 for issue in issues if issue[2] == ERROR),
+        'warnings': sum(1 for issue in issues if issue[2] == WARNING),
+        'issues': issues,
+        }
+    return presets, report
+
+
+def main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description='Validates brush preset files')
+    parser.add_argument('paths', nargs='+', help='preset files or directories')
+    parser.add_argument('--jobs', type=int, default=None, help='files parsed at once')
+    parser.add_argument('--errors-only', action='store_true', help='do not print the warnings')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    presets, report = load_presets(find_presets(args.paths), args.jobs)
+    if args.errors_only:
+        report['issues'] = [issue for issue in report['issues'] if issue[2] == ERROR]
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for path, line, severity, message in report['issues']:
+            print('%s:%d: %s: %s' % (path, line, severity, message))
+        print('%(files)d files, %(valid)d valid, %(invalid)d invalid, %(errors)d errors, %(warnings)d warnings' % report)
+    return 1 if report['invalid'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""Tests of the brush settings, inputs and states tables."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import brushsettings
+
+
+class BrushSettingsTest(unittest.TestCase):
+
+    def test_indexes(self):
+        for table in (brushsettings.inputs, brushsettings.settings, brushsettings.states):
+            self.assertEqual([item.index for item in table], list(range(len(table))))
+        self.assertIs(brushsettings.settings_dict['opaque'], brushsettings.settings[0])
+        self.assertIs(brushsettings.inputs_dict['pressure'], brushsettings.inputs[0])
+        self.assertEqual(brushsettings.states_dict['y'].index, 1)
+        self.assertEqual(brushsettings.states[-1].cname, 'ascension')
+        self.assertIs(brushsettings.opaque, brushsettings.settings_dict['opaque'])
+
+    def test_get_setting(self):
+        self.assertEqual(brushsettings.get_setting('hardness'), (brushsettings.hardness, None))
+        setting, scale = brushsettings.get_setting('color_hue')
+        self.assertIs(setting, brushsettings.settings_dict['change_color_h'])
+        self.assertAlmostEqual(scale(360.0), 64.0)
+        self.assertIs(brushsettings.get_setting('speed_slowness')[0], brushsettings.speed1_slowness)
+        with self.assertRaises(KeyError):
+            brushsettings.get_setting('no_such_setting')
+
+    def test_lazy_translation(self):
+        setting = brushsettings.settings_by_name['Opacity']
+        self.assertIs(setting, brushsettings.opaque)
+        translated = []
+
+        def gettext(message):
+            translated.append(message)
+            return message.upper()
+
+        original = brushsettings.gettext
+        brushsettings.gettext = gettext
+        try:
+            # The messages are translated when read, not when imported
+            self.assertEqual(setting.name, 'OPACITY')
+            self.assertEqual(brushsettings.inputs_dict['pressure'].dname, 'PRESSURE')
+        finally:
+            brushsettings.gettext = original
+        self.assertEqual(translated, ['Opacity', 'Pressure'])
+        self.assertEqual(setting.name_msgid, 'Opacity')
+
+    def test_visible(self):
+        cnames = [s.cname for s in brushsettings.settings_visible]
+        self.assertNotIn('color_h', cnames)
+        self.assertEqual(len(cnames), len(brushsettings.settings) - len(brushsettings.settings_hidden))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Tests of the Python evaluation of the brush dynamics."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import brushsettings
+import dynamics
+
+
+def calculate(points, x):
+    """Mapping::calculate() of mapping.hpp for a single input."""
+    (x0, y0), (x1, y1) = points[0], points[1]
+    i = 2
+    while i < len(points) and x > x1:
+        x0, y0 = x1, y1
+        x1, y1 = points[i]
+        i += 1
+    if x0 == x1:
+        return y0
+    return (y1*(x - x0) + y0*(x1 - x)) / (x1 - x0)
+
+
+CURVES = [
+    [(0.0, 0.0), (1.0, 1.0)],
+    [(0.0, -0.5), (0.25, 0.5), (0.5, 0.5), (1.0, -1.0)],
+    [(0.0, 1.0), (0.5, 0.0), (0.5, 2.0), (1.0, 3.0)],
+]
+INPUTS = [-1.0, 0.0, 0.1, 0.25, 0.3, 0.5, 0.75, 1.0, 2.0]
+
+
+class CurveTest(unittest.TestCase):
+
+    def test_same_as_mapping(self):
+        for points in CURVES:
+            curve = dynamics.Curve(points)
+            expected = [calculate(points, x) for x in INPUTS]
+            for got, value in zip([curve.calculate(x) for x in INPUTS], expected):
+                self.assertAlmostEqual(got, value)
+            for got, value in zip(curve.calculate_array(INPUTS), expected):
+                self.assertAlmostEqual(got, value)
+
+    def test_invalid(self):
+        for points in ([(0.0, 0.0)], [(x, 0.0) for x in range(dynamics.MAX_POINTS + 1)],
+                       [(1.0, 0.0), (0.0, 1.0)]):
+            with self.assertRaises(ValueError):
+                dynamics.Curve(points)
+
+
+class DynamicsTest(unittest.TestCase):
+
+    def test_samples(self):
+        samples = dynamics.StrokeSamples({'pressure': [-1.0, 0.5, 2.0]}, use_numpy=False)
+        self.assertEqual(len(samples), 3)
+        # Clamped to the hard limits, the other inputs are at their normal value
+        self.assertEqual(samples['pressure'], [0.0, 0.5, 1.0])
+        self.assertEqual(samples['speed1'], [brushsettings.inputs_dict['speed1'].normal]*3)
+        with self.assertRaises(KeyError):
+            dynamics.StrokeSamples({'pressur': [0.0]})
+        with self.assertRaises(ValueError):
+            dynamics.StrokeSamples({'pressure': [0.0], 'speed1': [0.0, 1.0]})
+
+    def test_evaluate(self):
+        brush = dynamics.Dynamics({'radius_logarithmic': (1.0, {'pressure': CURVES[1], 'speed1': CURVES[0]})})
+        samples = {'pressure': [0.1, 0.3, 0.9], 'speed1': [0.0, 2.0, 4.0]}
+        values = brush.evaluate(samples, ['radius_logarithmic', 'opaque'])
+        for got, pressure, speed in zip(values['radius_logarithmic'], samples['pressure'], samples['speed1']):
+            self.assertAlmostEqual(got, 1.0 + calculate(CURVES[1], pressure) + calculate(CURVES[0], speed))
+        # Settings without a mapping keep their default value
+        self.assertEqual(list(values['opaque']), [brushsettings.opaque.default]*3)
+        clamped = brush.evaluate(samples, ['radius_logarithmic'], clamp=True)['radius_logarithmic']
+        self.assertLessEqual(max(clamped), brushsettings.radius_logarithmic.max)
+        self.assertEqual(len(brush.evaluate(samples)), len(brushsettings.settings))
+
+    def test_evaluate_many(self):
+        brushes = {'a': dynamics.Dynamics({'hardness': (0.5, {})}),
+                   'b': dynamics.Dynamics({'hardness': (0.2, {'pressure': CURVES[0]})})}
+        values = dynamics.evaluate_many(brushes, {'pressure': [0.0, 1.0]}, ['hardness'])
+        self.assertEqual(list(values['a']['hardness']), [0.5, 0.5])
+        self.assertEqual(list(values['b']['hardness']), [0.2, 1.2])
+
+    def test_unknown(self):
+        with self.assertRaises(KeyError):
+            dynamics.Dynamics({'no_such_setting': (0.0, {})})
+        with self.assertRaises(KeyError):
+            dynamics.Mapping(0.0, {'no_such_input': CURVES[0]})
+
+    @unittest.skipIf(dynamics.numpy is None, 'numpy is not installed')
+    def test_numpy(self):
+        brush = dynamics.Dynamics({'radius_logarithmic': (1.0, {'pressure': CURVES[2]})})
+        samples = {'pressure': [x for x in INPUTS if 0.0 <= x <= 1.0]}
+        lists = brush.evaluate(dynamics.StrokeSamples(samples, use_numpy=False), ['radius_logarithmic'])
+        arrays = brush.evaluate(dynamics.StrokeSamples(samples, use_numpy=True), ['radius_logarithmic'])
+        for got, value in zip(arrays['radius_logarithmic'], lists['radius_logarithmic']):
+            self.assertAlmostEqual(got, value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Tests of the parsing and the validation of the brush presets."""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import brushsettings
+import presets
+
+
+def preset_text(**values):
+    """Returns a version 2 preset with every setting at its default value."""
+    lines = ['version 2']
+    for s in brushsettings.settings:
+        lines.append('%s %s' % (s.cname, values.pop(s.cname, s.default)))
+    lines.extend('%s %s' % item for item in values.items())
+    return '\n'.join(lines) + '\n'
+
+
+def get_issues(text):
+    return [(severity, message) for path, line, severity, message in presets.parse_preset('a.myb', text)[1]]
+
+
+class ParsePresetTest(unittest.TestCase):
+
+    def test_valid(self):
+        text = preset_text(radius_logarithmic='2.5 | pressure (0.0 -0.5) (1.0 0.5) | speed1 (0 0) (4 1)')
+        preset, issues = presets.parse_preset('a.myb', text)
+        self.assertEqual(issues, [])
+        self.assertEqual(preset.base_values[brushsettings.radius_logarithmic.index], 2.5)
+        self.assertEqual(preset.mappings[0], (brushsettings.radius_logarithmic.index,
+                                              brushsettings.inputs_dict['pressure'].index,
+                                              ((0.0, -0.5), (1.0, 0.5))))
+        values = preset.to_dynamics().evaluate({'pressure': [0.5], 'speed1': [2.0]}, ['radius_logarithmic'])
+        self.assertEqual(list(values['radius_logarithmic']), [3.0])
+
+    def test_errors(self):
+        for text, message in [
+                ('version 3\n', 'unsupported version 3'),
+                (preset_text(hardness='nan'), 'hardness: not a finite number: nan'),
+                (preset_text(hardness='0.5 | pressure (0 0)'), 'pressure curve has 1 points, 2 to 8 are needed'),
+                (preset_text(hardness='0.5 | pressure (0.5 0) (0.2 1)'), 'pressure curve goes back from x=0.5 to x=0.2'),
+                (preset_text(hardness='0.5 | pressure (0 0) (2 1)'), 'pressure curve point x=2 is past the hard limits 0.0..1.0'),
+                (preset_text(hardness='0.5 | pressur (0 0) (1 1)'), 'hardness: unknown input pressur'),
+                (preset_text(hardness=''), 'expected a setting name and a value: hardness')]:
+            preset, issues = presets.parse_preset('a.myb', text)
+            self.assertIsNone(preset)
+            self.assertIn((presets.ERROR, message), [(i[2], i[3]) for i in issues])
+
+    def test_warnings(self):
+        text = preset_text(hardness='1.5', bogus='1', color_hue='9')
+        preset, issues = presets.parse_preset('a.myb', text)
+        self.assertIsNotNone(preset)
+        self.assertEqual(get_issues(text), [
+            (presets.WARNING, 'hardness=1.5 is outside 0..1'),
+            (presets.WARNING, 'unknown setting bogus is ignored'),
+            (presets.WARNING, 'old setting color_hue is read as change_color_h, Studio ignores it'),
+            (presets.WARNING, 'change_color_h is set more than once')])
+        # Old settings are scaled to the range of the new one
+        self.assertAlmostEqual(preset.base_values[brushsettings.change_color_h.index], 1.6, 6)
+        self.assertIn((presets.WARNING, 'opaque is missing, Studio uses 0'),
+                      get_issues(preset_text().replace('\nopaque ', '\n#opaque ')))
+
+
+class LoadPresetsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_load(self):
+        for n in range(4):
+            self.write('good%d.myb' % n, preset_text(hardness=n / 4.0))
+        bad = self.write('bad.myb', 'version 3\n')
+        self.write('notes.txt', 'version 3\n')
+        paths = list(presets.find_presets([self.dir]))
+        self.assertEqual([os.path.basename(path) for path in paths],
+                         ['bad.myb'] + ['good%d.myb' % n for n in range(4)])
+        for jobs in (1, 2):
+            loaded, report = presets.load_presets(paths + [os.path.join(self.dir, 'missing.myb')], jobs, chunksize=1)
+            self.assertEqual((report['files'], report['valid'], report['invalid'], report['errors']), (6, 4, 2, 2))
+            self.assertNotIn(bad, loaded)
+            good = loaded[os.path.join(self.dir, 'good2.myb')]
+            self.assertEqual(good.base_values[brushsettings.hardness.index], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()